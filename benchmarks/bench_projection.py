@@ -0,0 +1,77 @@
+"""
+Benchmark: full vs. partial-response payloads for the calls behind list_events and retrieve_emails.
+
+For each call it reports the bytes on the wire (gzip), the decoded JSON size and
+the estimated tokens of what the tool hands to the model. Needs an authorized
+token file (TOKEN in .env) and makes real, read-only API calls.
+
+Run from the repository root:
+    python -m benchmarks.bench_projection [calendar_id]
+"""
+import gzip
+import json
+import os
+import sys
+from urllib.parse import quote
+from dotenv import load_dotenv
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.credential_manager import get_credential_manager
+from gmail_calendar_automation.tools.projection import (
+    DEFAULT_EVENT_FIELDS, MESSAGE_LIST_FIELDS, MESSAGE_METADATA_FIELDS, list_fields, payload_size
+)
+from gmail_calendar_automation.tools.async_client import GMAIL_BASE_URL, CALENDAR_BASE_URL
+
+HEADERS = {"Accept-Encoding": "gzip", "User-Agent": "gmail-calendar-automation-bench (gzip)"}
+
+
+def _fetch(session, url: str, params: dict) -> tuple:
+    """Return (wire bytes, decoded body) of a GET request."""
+    response = session.get(url, params=params, headers=HEADERS, stream=True)
+    response.raise_for_status()
+    raw = response.raw.read(decode_content=False)
+    body = gzip.decompress(raw) if response.headers.get("Content-Encoding") == "gzip" else raw
+    return len(raw), json.loads(body)
+
+
+def _report(label: str, wire: int, decoded: dict, result) -> None:
+    size = payload_size(result)
+    print(f"{label:<34} wire {wire:9d} B   json {len(json.dumps(decoded)):9d} B   "
+          f"to model {size['bytes']:9d} B / ~{size['tokens']:7d} tokens")
+
+
+def main() -> None:
+    load_dotenv()
+    calendar_id = sys.argv[1] if len(sys.argv) > 1 else "primary"
+    manager = get_credential_manager(os.getenv("TOKEN"), os.getenv("CREDENTIALS"))
+    if not manager.ensure_valid():
+        sys.exit("No valid credentials: authenticate the agent first.")
+    session = google_api.AuthorizedSession(manager.credentials)
+
+    events_url = f"{CALENDAR_BASE_URL}/calendars/{quote(calendar_id, safe='')}/events"
+    params = {"maxResults": 50, "singleEvents": "true", "orderBy": "startTime", "timeMin": "2000-01-01T00:00:00Z"}
+    print("events.list (50 events)")
+    wire, full = _fetch(session, events_url, params)
+    _report("  full resources", wire, full, full.get("items", []))
+    wire, compact = _fetch(session, events_url, dict(params, fields=list_fields(DEFAULT_EVENT_FIELDS, "nextPageToken")))
+    _report("  fields=DEFAULT_EVENT_FIELDS", wire, compact, compact.get("items", []))
+
+    print("messages.list + messages.get (10 messages)")
+    wire, listing = _fetch(session, f"{GMAIL_BASE_URL}/messages", {"maxResults": 10})
+    _report("  list, full", wire, listing, listing)
+    wire, listing = _fetch(session, f"{GMAIL_BASE_URL}/messages", {"maxResults": 10, "fields": MESSAGE_LIST_FIELDS})
+    _report("  list, fields", wire, listing, listing)
+
+    metadata = {"format": "metadata", "metadataHeaders": ["From", "Subject", "Date"]}
+    totals = {"full": [0, 0], "fields": [0, 0]}
+    for message in listing.get("messages", []):
+        url = f"{GMAIL_BASE_URL}/messages/{message['id']}"
+        for label, extra in (("full", {}), ("fields", {"fields": MESSAGE_METADATA_FIELDS})):
+            wire, resource = _fetch(session, url, dict(metadata, **extra))
+            totals[label][0] += wire
+            totals[label][1] += len(json.dumps(resource))
+    for label, (wire, decoded) in totals.items():
+        print(f"  get x{len(listing.get('messages', []))}, {label:<24} wire {wire:9d} B   json {decoded:9d} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: fast-path intent routing on a labelled set of requests.
+
+Reports how many requests the local classifier routes (hit rate), how many of
+those go to the wrong agent, the classifier's cost per request, and the
+routing time saved per turn for an assumed LLM latency per routing hop. A
+fast-path turn skips two hops: the root router and the Gmail/Calendar router.
+
+Run from the repository root:
+    python -m benchmarks.bench_router [--llm-hop-ms 900]
+"""
+import argparse
+import time
+from gmail_calendar_automation.tools import intent
+from gmail_calendar_automation.tools.intent import IntentClassifier
+
+ROUTING_HOPS_SAVED = 2
+
+# (request, intent the LLM routers would pick, or None for requests that need the root agent)
+LABELLED_REQUESTS = [
+    ("Send an email to bob@example.com saying I'll be late", intent.SEND_EMAIL),
+    ("email alice@example.com about lunch tomorrow", intent.SEND_EMAIL),
+    ("Write a message to my manager asking for Friday off", intent.SEND_EMAIL),
+    ("Compose an email to the team about the release", intent.SEND_EMAIL),
+    ("Forward the mail from HR to jane@example.com", intent.SEND_EMAIL),
+    ("Reply to the last message from John", intent.SEND_EMAIL),
+    ("Draft an email thanking the client", intent.SEND_EMAIL),
+    ("Show my unread emails", intent.READ_EMAIL),
+    ("Check my inbox", intent.READ_EMAIL),
+    ("What are my latest messages?", intent.READ_EMAIL),
+    ("Search my mail for invoices from March", intent.READ_EMAIL),
+    ("Get the 5 most recent emails from amazon", intent.READ_EMAIL),
+    ("Do I have any new emails?", intent.READ_EMAIL),
+    ("Read the email from my landlord", intent.READ_EMAIL),
+    ("Archive all emails from the newsletter", intent.ORGANIZE_EMAIL),
+    ("Delete every promotional email older than a year", intent.ORGANIZE_EMAIL),
+    ("Label the mails from my accountant as Taxes", intent.ORGANIZE_EMAIL),
+    ("Mark all emails from GitHub as read", intent.ORGANIZE_EMAIL),
+    ("Schedule a meeting with Tom at 3pm tomorrow", intent.CREATE_EVENT),
+    ("Add an event on Friday at noon called team lunch", intent.CREATE_EVENT),
+    ("Book a dentist appointment Monday 10am", intent.CREATE_EVENT),
+    ("Create a calendar event for my flight on the 12th", intent.CREATE_EVENT),
+    ("Put a reminder meeting in my calendar for 9am", intent.CREATE_EVENT),
+    ("Set up a weekly sync meeting every Tuesday", intent.CREATE_EVENT),
+    ("What's on my calendar tomorrow?", intent.MANAGE_EVENTS),
+    ("List my upcoming events", intent.MANAGE_EVENTS),
+    ("Delete the meeting tomorrow at 4", intent.MANAGE_EVENTS),
+    ("Cancel my 3pm appointment", intent.MANAGE_EVENTS),
+    ("Show me my agenda for next week", intent.MANAGE_EVENTS),
+    ("Am I free at 3pm on Thursday? Find free slots", intent.MANAGE_EVENTS),
+    ("Do I have any conflicts on Monday?", intent.MANAGE_EVENTS),
+    ("What's on my schedule today", intent.MANAGE_EVENTS),
+    ("Add the meeting invitations from my emails to my calendar", None),
+    ("Read my latest emails and create events from them", None),
+    ("yes", None),
+    ("Hello, what can you do?", None),
+    ("Send the agenda of tomorrow's meeting to the team by email", None),
+    ("Import the .ics invite I received", None),
+    ("Did I send an email to bob@example.com yesterday?", None),
+    ("Do not send the email to bob@example.com", None),
+    ("Send the email to bob@example.com if he confirms", None),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fast-path intent routing.")
+    parser.add_argument("--llm-hop-ms", type=float, default=900.0, help="assumed latency of one LLM routing hop")
+    parser.add_argument("--repeat", type=int, default=1000, help="classifier passes over the set for timing")
+    args = parser.parse_args()
+
+    classifier = IntentClassifier()
+    routed = wrong = 0
+    for text, expected in LABELLED_REQUESTS:
+        predicted = classifier.classify(text)
+        if predicted is None:
+            status = "llm"
+        else:
+            routed += 1
+            status = "ok" if predicted == expected else "WRONG"
+            wrong += predicted != expected
+        print(f"{status:<6} {str(predicted):<16} {text}")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text, _ in LABELLED_REQUESTS:
+            classifier.classify(text)
+    classify_us = (time.perf_counter() - start) * 1e6 / (args.repeat * len(LABELLED_REQUESTS))
+
+    total = len(LABELLED_REQUESTS)
+    hit_rate = routed / total
+    print()
+    print(f"hit rate           {routed}/{total} = {hit_rate:.0%}")
+    print(f"wrong routes       {wrong}")
+    print(f"classifier cost    {classify_us:.1f} us/request")
+    print(f"saved per turn     ~{hit_rate * ROUTING_HOPS_SAVED * args.llm_hop_ms:.0f} ms "
+          f"(at {args.llm_hop_ms:g} ms per LLM routing hop)")
+
+
+if __name__ == "__main__":
+    main()
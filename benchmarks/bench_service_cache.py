@@ -0,0 +1,41 @@
+"""
+Micro-benchmark: googleapiclient build() on every call vs. the shared service cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_service_cache
+"""
+import time
+import tracemalloc
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+from gmail_calendar_automation.tools.service_cache import ServiceCache
+
+ITERATIONS = 50
+
+
+def _measure(label: str, factory) -> float:
+    factory()  # warm-up
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        factory()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / ITERATIONS
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed_ms:8.3f} ms/call   peak {peak / 1024:8.1f} KiB")
+    return elapsed_ms
+
+
+def main() -> None:
+    credentials = Credentials(token="benchmark-token")
+    cache = ServiceCache()
+
+    for api, version in [("gmail", "v1"), ("calendar", "v3")]:
+        print(f"{api} {version}")
+        uncached = _measure("build() per call", lambda: build(api, version, credentials=credentials))
+        cached = _measure("ServiceCache.get()", lambda: cache.get(api, version, credentials))
+        print(f"{'saved per call':<28} {uncached - cached:8.3f} ms\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Startup benchmark: import time and peak memory of the agent modules.
+
+Every measurement runs in a fresh interpreter so module caches from earlier
+runs do not hide import costs. The Google client stack is measured on its own
+to show what the lazy imports keep off the startup path.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup
+"""
+import json
+import subprocess
+import sys
+
+RUNS = 5
+
+TARGETS = [
+    ("tools.gmail_tool", ["gmail_calendar_automation.tools.gmail_tool"]),
+    ("tools.google_calendar_tool", ["gmail_calendar_automation.tools.google_calendar_tool"]),
+    ("agent (root_agent)", ["gmail_calendar_automation.agent"]),
+    ("google client stack", [
+        "googleapiclient.discovery",
+        "google_auth_oauthlib.flow",
+        "google.auth.transport.requests",
+    ]),
+]
+
+_PROBE = """
+import importlib, json, sys, time, tracemalloc
+tracemalloc.start()
+start = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+elapsed_ms = (time.perf_counter() - start) * 1000
+_, peak = tracemalloc.get_traced_memory()
+google = sorted(m for m in ("googleapiclient", "google_auth_oauthlib", "httpx") if m in sys.modules)
+print(json.dumps({{"ms": elapsed_ms, "peak": peak, "loaded": google}}))
+"""
+
+
+def _measure(modules):
+    """Import modules in a fresh interpreter and return its measurements."""
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(modules=modules)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    print(f"{'target':<28} {'import ms (median)':>18} {'peak KiB':>10}   heavy modules loaded")
+    for label, modules in TARGETS:
+        try:
+            samples = [_measure(modules) for _ in range(RUNS)]
+        except subprocess.CalledProcessError as e:
+            print(f"{label:<28} failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        times = sorted(sample["ms"] for sample in samples)
+        peak = max(sample["peak"] for sample in samples)
+        loaded = ", ".join(samples[0]["loaded"]) or "-"
+        print(f"{label:<28} {times[len(times) // 2]:18.1f} {peak / 1024:10.1f}   {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Offline benchmark: the agent tools at scale against the fake Gmail/Calendar backend.
+
+Starts benchmarks.fake_google in a child process (so its memory does not count)
+and points the tools at it through GOOGLE_API_ROOT_URL. For each scenario it
+reports the API round-trips and batched sub-requests per call, as seen by the
+server, p50/p99 latency, the peak memory allocated by the tools and the share
+of GET requests answered by the response cache (fresh or after a 304).
+
+Quotas are lifted by default so the numbers show the tools rather than the
+pacing of the quota scheduler; pass --quota to keep the real limits.
+
+Run from the repository root:
+    python -m benchmarks.bench_tools [--messages 2000] [--events 2000] [--latency-ms 20] [--iterations 20]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, -(-len(ordered) * percent // 100) - 1)]
+
+
+def _control(root_url: str, path: str) -> Dict[str, Any]:
+    method = "POST" if path == "__reset" else "GET"
+    with urllib.request.urlopen(urllib.request.Request(root_url + path, method=method)) as response:
+        body = response.read()
+    return json.loads(body) if body else {}
+
+
+def _start_server(args) -> tuple:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_google", "--port", "0",
+         "--messages", str(args.messages), "--events", str(args.events), "--latency-ms", str(args.latency_ms)],
+        stdout=subprocess.PIPE, text=True
+    )
+    return server, server.stdout.readline().strip()
+
+
+def _write_token(directory: str) -> str:
+    # No expiry and a token present, so the credential manager never refreshes
+    path = os.path.join(directory, "token.json")
+    with open(path, "w") as token_file:
+        json.dump({"token": "bench-token", "refresh_token": "bench", "client_id": "bench", "client_secret": "bench"},
+                  token_file)
+    return path
+
+
+def _run(label: str, root_url: str, iterations: int, call: Callable[[int], Dict[str, Any]]) -> Dict[str, Any]:
+    """Call a tool repeatedly and collect server-side call counts, latency and memory."""
+    _control(root_url, "__reset")
+    latencies = []
+    tracemalloc.start()
+    for iteration in range(iterations):
+        start = time.perf_counter()
+        result = call(iteration)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not result.get("success"):
+            raise RuntimeError(f"{label}: {result.get('message')}")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = _control(root_url, "__stats")
+    return {
+        "scenario": label,
+        "calls": iterations,
+        "round_trips": sum(stats["round_trips"].values()) / iterations,
+        "sub_requests": sum(stats["sub_requests"].values()) / iterations,
+        "operations": stats,
+        "p50_ms": _percentile(latencies, 50),
+        "p99_ms": _percentile(latencies, 99),
+        "first_ms": latencies[0],
+        "peak_kib": peak / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the tools against a fake Gmail/Calendar backend.")
+    parser.add_argument("--messages", type=int, default=2000, help="messages in the fake mailbox")
+    parser.add_argument("--events", type=int, default=2000, help="events in the fake primary calendar")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="server latency per HTTP round-trip")
+    parser.add_argument("--iterations", type=int, default=20, help="calls per scenario")
+    parser.add_argument("--page", type=int, default=100, help="max_results of retrieve_emails and list_events")
+    parser.add_argument("--quota", action="store_true", help="keep the quota schedulers' real rates")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to a JSON file")
+    args = parser.parse_args()
+
+    server, root_url = _start_server(args)
+    try:
+        # Must be set before the tools are imported: the endpoints are read at import time
+        os.environ["GOOGLE_API_ROOT_URL"] = root_url
+        from gmail_calendar_automation.tools import rate_limiter
+        from gmail_calendar_automation.tools.credential_manager import get_credential_manager
+        from gmail_calendar_automation.tools.service_cache import get_service
+        from gmail_calendar_automation.tools.gmail_tool import GmailTool
+        from gmail_calendar_automation.tools.google_calendar_tool import GoogleCalendarTool
+        from gmail_calendar_automation.tools.http_cache import response_cache
+
+        if not args.quota:
+            for scheduler in (rate_limiter.gmail_scheduler, rate_limiter.calendar_scheduler):
+                scheduler.bucket = rate_limiter.TokenBucket(1e9, 1e9)
+                scheduler.project_bucket = None
+
+        with tempfile.TemporaryDirectory() as directory:
+            token_path = _write_token(directory)
+            gmail = GmailTool(None, token_path, sync_store_path=None, index_path=None)
+            calendar = GoogleCalendarTool(None, token_path, use_event_cache=False)
+            # Load the client libraries and build the services outside the measurements
+            credentials = get_credential_manager(token_path, None).credentials
+            for api, version in (("gmail", "v1"), ("calendar", "v3")):
+                get_service(api, version, credentials)
+            slot = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=3650)
+
+            def _event(iteration: int) -> Dict[str, Any]:
+                start = slot + timedelta(hours=iteration)
+                return {
+                    "summary": f"Benchmark {iteration}",
+                    "start": {"dateTime": start.isoformat()},
+                    "end": {"dateTime": (start + timedelta(minutes=30)).isoformat()},
+                }
+
+            def _recipients(count: int) -> List[Dict[str, str]]:
+                return [
+                    {"to": f"attendee{n}@example.com", "name": f"Attendee {n}", "event": "the benchmark"}
+                    for n in range(count)
+                ]
+
+            scenarios = [
+                ("retrieve_emails", lambda i: gmail.retrieve_emails(max_results=args.page)),
+                ("retrieve_emails incremental", lambda i: gmail.retrieve_emails(max_results=args.page, incremental=True)),
+                ("list_events", lambda i: calendar.list_events("primary", max_results=args.page)),
+                ("list_events verbose", lambda i: calendar.list_events("primary", max_results=args.page, verbose=True)),
+                ("list_events cached", lambda i: calendar.list_events("primary", max_results=args.page, use_cache=True)),
+                ("create_event", lambda i: calendar.create_event("primary", _event(i), send_notifications=False)),
+                ("create_event reject", lambda i: calendar.create_event(
+                    "primary", _event(args.iterations + i), send_notifications=False, conflict_policy="reject"
+                )),
+                ("get_mail_info", lambda i: gmail.get_mail_info(f"{i % 5 + 1:016x}")),
+                ("send_email", lambda i: gmail.send_email("bench@example.com", f"Benchmark {i}", "Hello")),
+                ("send_bulk_emails x50", lambda i: gmail.send_bulk_emails(
+                    _recipients(50), "Your seat for {event}", "Hi {name}, see you at {event}.", job_id=f"bench-{i}"
+                )),
+                ("create_drafts x50", lambda i: gmail.create_drafts(
+                    _recipients(50), "Your seat for {event}", "Hi {name}, see you at {event}.", job_id=f"bench-{i}"
+                )),
+            ]
+            results = []
+            for label, call in scenarios:
+                before = response_cache.stats()
+                result = _run(label, root_url, args.iterations, call)
+                after = response_cache.stats()
+                lookups = {key: after[key] - before[key] for key in ("hits", "revalidated", "misses")}
+                total = sum(lookups.values())
+                result["cache"] = dict(lookups, hit_ratio=(lookups["hits"] + lookups["revalidated"]) / total if total else None)
+                results.append(result)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{args.messages} messages, {args.events} events, {args.latency_ms:g} ms/round-trip, "
+          f"{args.iterations} calls per scenario, page {args.page}")
+    print(f"{'scenario':<30} {'trips/call':>10} {'sub/call':>9} {'first ms':>9} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'peak KiB':>9} {'cache hit':>9}")
+    for result in results:
+        hit_ratio = result["cache"]["hit_ratio"]
+        print(f"{result['scenario']:<30} {result['round_trips']:10.2f} {result['sub_requests']:9.1f} "
+              f"{result['first_ms']:9.1f} {result['p50_ms']:8.1f} {result['p99_ms']:8.1f} {result['peak_kib']:9.1f} "
+              f"{'-' if hit_ratio is None else f'{hit_ratio:.0%}':>9}")
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump({"config": vars(args), "results": results}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+In-memory fake of the Gmail v1 and Calendar v3 endpoints used by the tools.
+
+Serves the REST paths, multipart batch requests and partial responses
+(fields=) with a configurable latency per HTTP round-trip, and answers GETs
+with ETags, honoring If-None-Match with 304 Not Modified, so the tools can be
+exercised at scale without a Google account. Point them at it with
+GOOGLE_API_ROOT_URL=http://127.0.0.1:<port>/.
+
+Covers users.getProfile, messages.list/get/send, history.list and
+events.list/insert/delete (including syncToken listings). Search queries (q)
+are ignored.
+
+Run from the repository root:
+    python -m benchmarks.fake_google [--port 8089] [--messages 1000] [--events 1000] [--latency-ms 20]
+"""
+import argparse
+import base64
+import email
+import email.policy
+import email.utils
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from gmail_calendar_automation.tools.calendar_sync import parse_rfc3339
+from gmail_calendar_automation.tools.projection import apply_field_mask
+
+GMAIL_PATH = "/gmail/v1/users/me"
+CALENDAR_PATH = "/calendar/v3/calendars"
+BATCH_PATHS = ("/batch/gmail/v1", "/batch/calendar/v3")
+
+REASONS = {200: "OK", 204: "No Content", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 410: "Gone"}
+
+Response = Tuple[int, Optional[Dict[str, Any]]]
+
+
+def _error(status: int, message: str, reason: str) -> Response:
+    return status, {"error": {"code": status, "message": message, "errors": [{"reason": reason, "message": message}]}}
+
+
+def _param(params: Dict[str, List[str]], name: str, default: Optional[str] = None) -> Optional[str]:
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def _rfc3339(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class FakeGoogleBackend:
+    """Mailbox and calendars answering API requests; thread-safe."""
+
+    def __init__(self, messages: int = 1000, events: int = 1000, latency_ms: float = 0.0):
+        """
+        Initialize backend with generated data.
+
+        Args:
+            messages: Number of messages in the mailbox
+            events: Number of events in the 'primary' calendar, spread over the coming weeks
+            latency_ms: Delay added to every HTTP round-trip (batch requests count once)
+        """
+        self.latency = latency_ms / 1000
+        self._lock = threading.Lock()
+        self.round_trips: Counter = Counter()
+        self.sub_requests: Counter = Counter()
+        self.not_modified = 0
+
+        self._history_id = 1
+        self._history: List[Dict[str, Any]] = []
+        self._messages: Dict[str, Dict[str, Any]] = {}
+        # Newest first, like messages.list
+        self._message_order: List[str] = []
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for number in range(messages):
+            self._add_message(
+                f"sender{number % 50}@example.com",
+                f"Message {number}",
+                base + timedelta(minutes=number),
+                ["INBOX", "UNREAD"] if number % 3 else ["INBOX"]
+            )
+
+        self._sequence = 0
+        self._calendars: Dict[str, Dict[str, Dict[str, Any]]] = {"primary": {}}
+        start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        for number in range(events):
+            # Four one-hour events per day, two hours apart
+            day, slot = divmod(number, 4)
+            event_start = start + timedelta(days=day, hours=2 * slot)
+            self._insert_event("primary", {
+                "summary": f"Event {number}",
+                "location": f"Room {number % 10}",
+                "start": {"dateTime": _rfc3339(event_start)},
+                "end": {"dateTime": _rfc3339(event_start + timedelta(hours=1))},
+                "attendees": [{"email": f"guest{number % 20}@example.com", "responseStatus": "accepted"}],
+                "description": "Generated by benchmarks.fake_google. " * 4,
+                "reminders": {"useDefault": True},
+            })
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests received so far, by operation."""
+        with self._lock:
+            return {
+                "round_trips": dict(self.round_trips),
+                "sub_requests": dict(self.sub_requests),
+                "not_modified": self.not_modified
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.round_trips.clear()
+            self.sub_requests.clear()
+            self.not_modified = 0
+
+    def handle_http(self,
+                    method: str,
+                    target: str,
+                    headers: Dict[str, str],
+                    body: bytes) -> Tuple[int, str, bytes, Dict[str, str]]:
+        """
+        Answer one HTTP request.
+
+        Returns:
+            (status, content type, body, extra response headers)
+        """
+        time.sleep(self.latency)
+        path = urlsplit(target).path
+        if method == "POST" and path in BATCH_PATHS:
+            with self._lock:
+                self.round_trips["batch"] += 1
+            return self._handle_batch(headers.get("Content-Type", ""), body) + ({},)
+
+        status, payload = self.handle(method, target, body)
+        content = json.dumps(payload).encode() if payload is not None else b""
+        if method != "GET" or status != 200:
+            return status, "application/json; charset=UTF-8", content, {}
+        etag = f'W/"{hashlib.sha1(content).hexdigest()}"'
+        if_none_match = next((v for k, v in headers.items() if k.lower() == "if-none-match"), None)
+        if if_none_match == etag:
+            with self._lock:
+                self.not_modified += 1
+            return 304, "application/json; charset=UTF-8", b"", {"ETag": etag}
+        return status, "application/json; charset=UTF-8", content, {"ETag": etag}
+
+    def handle(self, method: str, target: str, body: bytes, in_batch: bool = False) -> Response:
+        """Answer one API request, applying the fields mask of the query string."""
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        operation, status, payload = self._route(method, unquote(url.path), params, body)
+        with self._lock:
+            (self.sub_requests if in_batch else self.round_trips)[operation] += 1
+        fields = _param(params, "fields")
+        if fields and payload is not None and status < 300:
+            payload = apply_field_mask(payload, fields)
+        return status, payload
+
+    def _route(self, method: str, path: str, params: Dict[str, List[str]], body: bytes) -> Tuple[str, int, Any]:
+        if path.startswith(GMAIL_PATH):
+            resource = path[len(GMAIL_PATH):]
+            if resource == "/profile":
+                return ("users.getProfile",) + self._profile()
+            if resource == "/messages" and method == "GET":
+                return ("messages.list",) + self._list_messages(params)
+            if resource == "/messages/send" and method == "POST":
+                return ("messages.send",) + self._send_message(json.loads(body or b"{}"))
+            if resource == "/drafts" and method == "POST":
+                return ("drafts.create",) + self._create_draft(json.loads(body or b"{}"))
+            if resource.startswith("/messages/") and method == "GET":
+                return ("messages.get",) + self._get_message(resource[len("/messages/"):], params)
+            if resource == "/history":
+                return ("history.list",) + self._list_history(params)
+
+        match = re.fullmatch(rf"{CALENDAR_PATH}/([^/]+)/events(?:/([^/]+))?", path)
+        if match:
+            calendar_id, event_id = match.groups()
+            if event_id is None and method == "GET":
+                return ("events.list",) + self._list_events(calendar_id, params)
+            if event_id is None and method == "POST":
+                return ("events.insert",) + self._create_event(calendar_id, json.loads(body or b"{}"))
+            if event_id is not None and method == "DELETE":
+                return ("events.delete",) + self._delete_event(calendar_id, event_id)
+
+        return ("unknown",) + _error(404, f"No fake for {method} {path}", "notFound")
+
+    # Gmail
+
+    def _add_message(self, sender: str, subject: str, sent: datetime, labels: List[str]) -> Dict[str, Any]:
+        message_id = f"{len(self._messages) + 1:016x}"
+        message = {
+            "id": message_id,
+            "threadId": message_id,
+            "labelIds": labels,
+            "snippet": f"Body of {subject}",
+            "internalDate": str(int(sent.timestamp() * 1000)),
+            "sizeEstimate": 2048,
+            "payload": {
+                "mimeType": "text/plain",
+                "headers": [
+                    {"name": "From", "value": sender},
+                    {"name": "To", "value": "me@example.com"},
+                    {"name": "Subject", "value": subject},
+                    {"name": "Date", "value": email.utils.format_datetime(sent)},
+                ],
+            },
+        }
+        self._messages[message_id] = message
+        self._message_order.insert(0, message_id)
+        self._history_id += 1
+        message["historyId"] = str(self._history_id)
+        self._history.append({"id": str(self._history_id), "messagesAdded": [{"message": {"id": message_id}}]})
+        return message
+
+    def _profile(self) -> Response:
+        with self._lock:
+            return 200, {
+                "emailAddress": "me@example.com",
+                "messagesTotal": len(self._messages),
+                "historyId": str(self._history_id),
+            }
+
+    def _list_messages(self, params: Dict[str, List[str]]) -> Response:
+        offset = int(_param(params, "pageToken", "0"))
+        page_size = min(int(_param(params, "maxResults", "100")), 500)
+        with self._lock:
+            page = self._message_order[offset:offset + page_size]
+            total = len(self._message_order)
+        response: Dict[str, Any] = {
+            "messages": [{"id": message_id, "threadId": message_id} for message_id in page],
+            "resultSizeEstimate": total,
+        }
+        if offset + page_size < total:
+            response["nextPageToken"] = str(offset + page_size)
+        return 200, response
+
+    def _get_message(self, message_id: str, params: Dict[str, List[str]]) -> Response:
+        with self._lock:
+            message = self._messages.get(message_id)
+        if message is None:
+            return _error(404, "Requested entity was not found.", "notFound")
+        message = json.loads(json.dumps(message))
+        wanted = params.get("metadataHeaders")
+        if _param(params, "format") == "metadata" and wanted:
+            message["payload"]["headers"] = [h for h in message["payload"]["headers"] if h["name"] in wanted]
+        return 200, message
+
+    def _send_message(self, body: Dict[str, Any]) -> Response:
+        try:
+            parsed = email.message_from_bytes(base64.urlsafe_b64decode(body["raw"]), policy=email.policy.default)
+        except (KeyError, ValueError):
+            return _error(400, "Invalid raw message.", "invalidArgument")
+        with self._lock:
+            message = self._add_message(
+                parsed.get("From", "me@example.com"), parsed.get("Subject", ""), datetime.now(timezone.utc), ["SENT"]
+            )
+        return 200, {"id": message["id"], "threadId": message["threadId"], "labelIds": message["labelIds"]}
+
+    def _create_draft(self, body: Dict[str, Any]) -> Response:
+        try:
+            parsed = email.message_from_bytes(
+                base64.urlsafe_b64decode(body["message"]["raw"]), policy=email.policy.default
+            )
+        except (KeyError, TypeError, ValueError):
+            return _error(400, "Invalid draft message.", "invalidArgument")
+        with self._lock:
+            message = self._add_message(
+                parsed.get("From", "me@example.com"), parsed.get("Subject", ""), datetime.now(timezone.utc), ["DRAFT"]
+            )
+        return 200, {"id": f"r{message['id']}", "message": {"id": message["id"], "threadId": message["threadId"]}}
+
+    def _list_history(self, params: Dict[str, List[str]]) -> Response:
+        start = int(_param(params, "startHistoryId", "0"))
+        with self._lock:
+            records = [record for record in self._history if int(record["id"]) > start]
+            return 200, {"history": records, "historyId": str(self._history_id)}
+
+    # Calendar
+
+    def _insert_event(self, calendar_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        self._sequence += 1
+        event = dict(event, id=event.get("id") or uuid.uuid4().hex, status="confirmed")
+        event["htmlLink"] = f"https://calendar.example.com/event?eid={event['id']}"
+        event["iCalUID"] = f"{event['id']}@example.com"
+        event["updated"] = _rfc3339(datetime.now(timezone.utc))
+        event["_sequence"] = self._sequence
+        self._calendars.setdefault(calendar_id, {})[event["id"]] = event
+        return event
+
+    def _list_events(self, calendar_id: str, params: Dict[str, List[str]]) -> Response:
+        if calendar_id not in self._calendars:
+            return _error(404, "Not Found", "notFound")
+        sync_token = _param(params, "syncToken")
+        offset = int(_param(params, "pageToken", "0"))
+        page_size = min(int(_param(params, "maxResults", "250")), 2500)
+        time_min = _param(params, "timeMin")
+        time_max = _param(params, "timeMax")
+
+        with self._lock:
+            events = list(self._calendars[calendar_id].values())
+            sequence = self._sequence
+        if sync_token is not None:
+            events = [event for event in events if event["_sequence"] > int(sync_token)]
+        else:
+            events = [event for event in events if event["status"] != "cancelled"]
+            if time_min:
+                events = [e for e in events if parse_rfc3339(e["end"]["dateTime"]) > parse_rfc3339(time_min)]
+            if time_max:
+                events = [e for e in events if parse_rfc3339(e["start"]["dateTime"]) < parse_rfc3339(time_max)]
+        events.sort(key=lambda event: parse_rfc3339(event["start"]["dateTime"]))
+
+        response: Dict[str, Any] = {
+            "kind": "calendar#events",
+            "summary": calendar_id,
+            "timeZone": "UTC",
+            "items": [{k: v for k, v in event.items() if k != "_sequence"} for event in events[offset:offset + page_size]],
+        }
+        if offset + page_size < len(events):
+            response["nextPageToken"] = str(offset + page_size)
+        else:
+            response["nextSyncToken"] = str(sequence)
+        return 200, response
+
+    def _create_event(self, calendar_id: str, event: Dict[str, Any]) -> Response:
+        if "start" not in event or "end" not in event:
+            return _error(400, "Missing end time.", "required")
+        with self._lock:
+            created = self._insert_event(calendar_id, event)
+        return 200, {k: v for k, v in created.items() if k != "_sequence"}
+
+    def _delete_event(self, calendar_id: str, event_id: str) -> Response:
+        with self._lock:
+            event = self._calendars.get(calendar_id, {}).get(event_id)
+            if event is None or event["status"] == "cancelled":
+                return _error(410, "Resource has been deleted", "deleted")
+            self._sequence += 1
+            event.update(status="cancelled", _sequence=self._sequence)
+        return 204, None
+
+    # Batch
+
+    def _handle_batch(self, content_type: str, body: bytes) -> Tuple[int, str, bytes]:
+        """Answer a multipart/mixed batch request the way the Google batch endpoints do."""
+        envelope = email.message_from_bytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for part in envelope.get_payload():
+            http = part.get_payload().replace("\r\n", "\n")
+            head, _, sub_body = http.partition("\n\n")
+            method, target = head.split("\n", 1)[0].split(" ")[:2]
+            status, payload = self.handle(method, target, sub_body.encode(), in_batch=True)
+            content_id = part["Content-ID"].strip("<>")
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(payload) if payload is not None else ''}\r\n"
+            )
+        parts.append(f"--{boundary}--\r\n")
+        return 200, f"multipart/mixed; boundary={boundary}", "".join(parts).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    backend: FakeGoogleBackend
+
+    def _respond(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        # Control endpoints for benchmarks running the server in another process
+        if self.path == "/__stats":
+            self._respond(200, "application/json", json.dumps(self.backend.stats()).encode())
+        elif self.path == "/__reset":
+            self.backend.reset_stats()
+            self._respond(204, "application/json", b"")
+        else:
+            self._respond(*self.backend.handle_http(self.command, self.path, dict(self.headers), body))
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeGoogleServer:
+    """HTTP server for a FakeGoogleBackend, running in a background thread."""
+
+    def __init__(self, backend: FakeGoogleBackend, host: str = "127.0.0.1", port: int = 0):
+        handler = type("Handler", (_Handler,), {"backend": backend})
+        self.backend = backend
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def root_url(self) -> str:
+        """Value for GOOGLE_API_ROOT_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def start(self) -> "FakeGoogleServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeGoogleServer(FakeGoogleBackend(args.messages, args.events, args.latency_ms), args.host, args.port)
+    print(server.root_url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
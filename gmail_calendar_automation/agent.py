@@ -1,15 +1,66 @@
 from google.adk import Agent
 from dotenv import load_dotenv
 import os
+import threading
+from typing import Optional
 from gmail_calendar_automation.prompt import root_agent_prompt
-from gmail_calendar_automation.sub_agents.gmail_agent.agent import gmail_root_agent
-from gmail_calendar_automation.sub_agents.google_calendar_agent.agent import google_calendar_root_agent
+from gmail_calendar_automation.router import FastPathRouter
+from gmail_calendar_automation.sub_agents.gmail_agent.agent import (
+    gmail_root_agent, gmail_sender_agent, gmail_retriever_agent, gmail_organizer_agent, get_gmail
+)
+from gmail_calendar_automation.sub_agents.google_calendar_agent.agent import (
+    google_calendar_root_agent, google_calendar_creator_agent, google_calendar_manager_agent, get_google_calendar
+)
+from gmail_calendar_automation.tools import intent
+from gmail_calendar_automation.tools.invite_pipeline import InvitePipeline
+from gmail_calendar_automation.tools.lazy import lazy_instance, user_tool
+from gmail_calendar_automation.tools.notifications import NotificationManager
+from gmail_calendar_automation.tools.user_tools import get_user_tools
 
 load_dotenv()
 
-root_agent = Agent(
-    name="main_root_agent",
+
+def get_invite_pipeline(user_id: Optional[str] = None) -> InvitePipeline:
+    """Invite pipeline over a session user's Gmail and Calendar tools, created on first use."""
+    return get_user_tools(user_id).invite_pipeline
+
+
+import_calendar_invites = user_tool(get_invite_pipeline, InvitePipeline.import_calendar_invites)
+
+
+@lazy_instance
+def get_notification_manager() -> Optional[NotificationManager]:
+    """Push notifications for the default user's tools, when configured in the environment."""
+    manager = NotificationManager.from_env(get_gmail(), get_google_calendar())
+    if manager is not None:
+        # Opening the watches takes API calls, so keep them off the request path
+        threading.Thread(target=manager.start, daemon=True).start()
+    return manager
+
+
+def start_notifications(callback_context):
+    """Start push notifications on the first request rather than at import."""
+    get_notification_manager()
+    return None
+
+llm_router_agent = Agent(
+    name="llm_router_agent",
     model=os.getenv("MODEL"),
     instruction=root_agent_prompt,
+    tools=[import_calendar_invites],
     sub_agents=[gmail_root_agent, google_calendar_root_agent]
 )
+
+# Clear-cut requests go straight to a leaf agent; the rest are routed by the LLM agents
+root_agent = FastPathRouter(
+    name="main_root_agent",
+    fallback=llm_router_agent,
+    routes={
+        intent.SEND_EMAIL: gmail_sender_agent.name,
+        intent.READ_EMAIL: gmail_retriever_agent.name,
+        intent.ORGANIZE_EMAIL: gmail_organizer_agent.name,
+        intent.CREATE_EVENT: google_calendar_creator_agent.name,
+        intent.MANAGE_EVENTS: google_calendar_manager_agent.name,
+    },
+    before_agent_callback=start_notifications
+)
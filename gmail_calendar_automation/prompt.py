@@ -9,5 +9,7 @@ Your job is to determine whether the user's request is related to:
 Instructions:
 - If the user asks about emails (e.g., send, read, retrieve, or manage emails) → forward the request to gmail_root_agent.
 - If the user asks about calendar events (e.g., create, list, or manage events) → forward the request to google_calendar_root_agent.
+- If the user asks to add meeting invitations from their emails to the calendar → call the import_calendar_invites tool first.
+  Only the messages it reports with status "needs_llm" should then be read via gmail_root_agent and scheduled via google_calendar_root_agent.
 - Always forward the user's original request without modifying meaning.
 """
\ No newline at end of file
@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import AsyncGenerator, Dict, Any, Optional
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from gmail_calendar_automation.tools.intent import IntentClassifier
+from gmail_calendar_automation.tools.tracing import tracer
+
+# How a turn reached its agent
+FAST_PATH = "fast"
+STICKY = "sticky"
+LLM = "llm"
+
+
+class RouterStats:
+    """Thread-safe counters of routing decisions and the LLM routing time they avoided."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths: Dict[str, int] = {FAST_PATH: 0, STICKY: 0, LLM: 0}
+        self._routes: Dict[str, int] = {}
+        self._classify_ms = 0.0
+        self._llm_routed = 0
+        self._llm_routing_ms = 0.0
+
+    def record(self, path: str, route: Optional[str], classify_ms: float, llm_routing_ms: Optional[float] = None) -> None:
+        """
+        Count one turn.
+
+        Args:
+            path: FAST_PATH, STICKY or LLM
+            route: Name of the agent that answered, if known
+            classify_ms: Time spent in the local classifier
+            llm_routing_ms: For LLM-routed turns, time until a leaf agent produced its first event
+        """
+        with self._lock:
+            self._paths[path] += 1
+            if route:
+                self._routes[route] = self._routes.get(route, 0) + 1
+            self._classify_ms += classify_ms
+            if llm_routing_ms is not None:
+                self._llm_routed += 1
+                self._llm_routing_ms += llm_routing_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the counters with derived rates.
+
+        The time saved by a fast-path turn is estimated as the average time LLM
+        routing took to reach a leaf agent on the turns that needed it. Sticky
+        turns are not counted as savings: ADK skips the routing agents for
+        those on its own.
+
+        Returns:
+            Dict with turns per path, fast-path hit rate, average classifier and
+            LLM routing time, and the estimated time saved per turn and in total
+        """
+        with self._lock:
+            paths = dict(self._paths)
+            routes = dict(self._routes)
+            classify_ms = self._classify_ms
+            llm_routed, llm_routing_ms = self._llm_routed, self._llm_routing_ms
+
+        turns = sum(paths.values())
+        avg_llm_routing_ms = llm_routing_ms / llm_routed if llm_routed else None
+        saved_ms = paths[FAST_PATH] * avg_llm_routing_ms if avg_llm_routing_ms is not None else None
+        return {
+            "turns": turns,
+            "paths": paths,
+            "routes": routes,
+            "hit_rate": paths[FAST_PATH] / turns if turns else None,
+            "avg_classify_ms": classify_ms / turns if turns else None,
+            "avg_llm_routing_ms": avg_llm_routing_ms,
+            "saved_ms": saved_ms,
+            "saved_ms_per_turn": saved_ms / turns if saved_ms is not None and turns else None
+        }
+
+
+class FastPathRouter(BaseAgent):
+    """
+    Root agent that routes clear-cut requests to a leaf agent without LLM hops.
+
+    Each turn is classified locally. A confident intent runs its leaf agent
+    directly. Otherwise the conversation stays with the leaf agent that answered
+    the previous turn, as ADK does after an LLM transfer. Without either, the
+    turn goes to the LLM router.
+    """
+
+    fallback: BaseAgent
+    classifier: IntentClassifier
+    routes: Dict[str, str]
+    stats: RouterStats
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def __init__(self,
+                 name: str,
+                 fallback: BaseAgent,
+                 routes: Dict[str, str],
+                 classifier: Optional[IntentClassifier] = None,
+                 **kwargs):
+        """
+        Initialize router.
+
+        Args:
+            name: Agent name
+            fallback: LLM agent routing the requests the classifier is unsure about.
+                The leaf agents must be among its descendants.
+            routes: Leaf agent name per intent
+            classifier: Intent classifier (defaults to IntentClassifier())
+            kwargs: Other BaseAgent fields, e.g. before_agent_callback
+        """
+        super().__init__(
+            name=name,
+            fallback=fallback,
+            classifier=classifier or IntentClassifier(),
+            routes=routes,
+            stats=RouterStats(),
+            sub_agents=[fallback],
+            **kwargs
+        )
+
+    @staticmethod
+    def _user_text(ctx: InvocationContext) -> str:
+        content = ctx.user_content
+        if not content or not content.parts:
+            return ""
+        return " ".join(part.text for part in content.parts if part.text)
+
+    def _previous_leaf(self, ctx: InvocationContext) -> Optional[str]:
+        """Name of the leaf agent that answered the last turn, if one did."""
+        leaves = set(self.routes.values())
+        for event in reversed(ctx.session.events):
+            if event.author == "user" or event.invocation_id == ctx.invocation_id:
+                continue
+            return event.author if event.author in leaves else None
+        return None
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        start = time.perf_counter()
+        intent = self.classifier.classify(self._user_text(ctx))
+        classify_ms = (time.perf_counter() - start) * 1000
+
+        route = self.routes.get(intent) if intent else self._previous_leaf(ctx)
+        leaf = self.find_agent(route) if route else None
+        leaves = set(self.routes.values())
+
+        if leaf is not None:
+            path = FAST_PATH if intent else STICKY
+            self.stats.record(path, route, classify_ms)
+            tracer.record("route", path=path, route=route, intent=intent, classify_ms=round(classify_ms, 3))
+            async for event in leaf.run_async(ctx):
+                yield event
+            return
+
+        answered_by = None
+        llm_routing_ms = None
+        async for event in self.fallback.run_async(ctx):
+            if answered_by is None and event.author in leaves:
+                answered_by = event.author
+                llm_routing_ms = (time.perf_counter() - start) * 1000
+            yield event
+        self.stats.record(LLM, answered_by, classify_ms, llm_routing_ms)
+        tracer.record("route", path=LLM, route=answered_by, classify_ms=round(classify_ms, 3),
+                      llm_routing_ms=round(llm_routing_ms, 3) if llm_routing_ms is not None else None)
@@ -1,32 +1,52 @@
 from google.adk import Agent
 from dotenv import load_dotenv
 import os
+from typing import Optional
 from gmail_calendar_automation.tools.gmail_tool import GmailTool
-from gmail_calendar_automation.sub_agents.gmail_agent.prompt import prompt_retriever, prompt_sender, prompt_root
+from gmail_calendar_automation.tools.lazy import user_tool
+from gmail_calendar_automation.tools.user_tools import get_user_tools
+from gmail_calendar_automation.sub_agents.gmail_agent.prompt import prompt_retriever, prompt_sender, prompt_organizer, prompt_root
 
 
 load_dotenv()
 
-app_crednitals = os.getenv('CREDENTIALS')
-gmail = GmailTool(app_credentials_path=app_crednitals)
 
-authentication_status = gmail.get_auth_status
-authenticate_user = gmail.authenticate
-send_email = gmail.send_email
-retrieve_emails = gmail.retrieve_emails
+def get_gmail(user_id: Optional[str] = None) -> GmailTool:
+    """GmailTool of a session's user, created on first tool call rather than at import."""
+    return get_user_tools(user_id).gmail
+
+
+authentication_status = user_tool(get_gmail, GmailTool.get_auth_status)
+authenticate_user = user_tool(get_gmail, GmailTool.authenticate)
+# Async variants keep API calls from blocking the ADK event loop
+send_email = user_tool(get_gmail, GmailTool.send_email_async)
+send_bulk_emails = user_tool(get_gmail, GmailTool.send_bulk_emails_async)
+create_drafts = user_tool(get_gmail, GmailTool.create_drafts_async)
+retrieve_emails = user_tool(get_gmail, GmailTool.retrieve_emails_async)
+get_mail_info = user_tool(get_gmail, GmailTool.get_mail_info_async)
+save_attachments = user_tool(get_gmail, GmailTool.save_attachments_async)
+arrange_mails = user_tool(get_gmail, GmailTool.arrange_mails_async)
+delete_mails = user_tool(get_gmail, GmailTool.delete_mails_async)
 
 gmail_sender_agent = Agent(
     name = 'gmail_sender_agent',
     model = os.getenv('MODEL'),
     instruction = prompt_sender,
-    tools = [send_email,authenticate_user,authentication_status]
+    tools = [send_email,send_bulk_emails,create_drafts,authenticate_user,authentication_status]
 )
 
 gmail_retriever_agent = Agent(
     name = 'gmail_retriever_agent',
     model = os.getenv('MODEL'),
     instruction = prompt_retriever,
-    tools = [retrieve_emails,authenticate_user,authentication_status]
+    tools = [retrieve_emails,get_mail_info,save_attachments,authenticate_user,authentication_status]
+)
+
+gmail_organizer_agent = Agent(
+    name = 'gmail_organizer_agent',
+    model = os.getenv('MODEL'),
+    instruction = prompt_organizer,
+    tools = [arrange_mails,delete_mails,retrieve_emails,authenticate_user,authentication_status]
 )
 
 # Root Gmail Agent
@@ -34,5 +54,5 @@ gmail_root_agent = Agent(
     name='gmail_root_agent',
     model=os.getenv('MODEL'),
     instruction=prompt_root,
-    sub_agents=[gmail_sender_agent, gmail_retriever_agent]
+    sub_agents=[gmail_sender_agent, gmail_retriever_agent, gmail_organizer_agent]
 )
\ No newline at end of file
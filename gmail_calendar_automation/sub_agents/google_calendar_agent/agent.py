@@ -1,31 +1,47 @@
 from google.adk import Agent
 from dotenv import load_dotenv
 import os
+from typing import Optional
 from gmail_calendar_automation.tools.google_calendar_tool import GoogleCalendarTool
+from gmail_calendar_automation.tools.lazy import user_tool
+from gmail_calendar_automation.tools.user_tools import get_user_tools
 
 load_dotenv()
 
-app_credentials = os.getenv('CREDENTIALS')
-google_calendar = GoogleCalendarTool(app_credentials_path=app_credentials)
 
-authentication_status = google_calendar.get_auth_status
-authenticate_user = google_calendar.authenticate
-create_event = google_calendar.create_event
-list_events = google_calendar.list_events
-delete_event = google_calendar.delete_event
+def get_google_calendar(user_id: Optional[str] = None) -> GoogleCalendarTool:
+    """GoogleCalendarTool of a session's user, created on first tool call rather than at import."""
+    return get_user_tools(user_id).calendar
+
+
+authentication_status = user_tool(get_google_calendar, GoogleCalendarTool.get_auth_status)
+authenticate_user = user_tool(get_google_calendar, GoogleCalendarTool.authenticate)
+# Async variants keep API calls from blocking the ADK event loop
+create_event = user_tool(get_google_calendar, GoogleCalendarTool.create_event_async)
+list_events = user_tool(get_google_calendar, GoogleCalendarTool.list_events_async)
+delete_event = user_tool(get_google_calendar, GoogleCalendarTool.delete_event_async)
+create_events = user_tool(get_google_calendar, GoogleCalendarTool.create_events_async)
+delete_events = user_tool(get_google_calendar, GoogleCalendarTool.delete_events_async)
+find_conflicts = user_tool(get_google_calendar, GoogleCalendarTool.find_conflicts_async)
+find_free_slots = user_tool(get_google_calendar, GoogleCalendarTool.find_free_slots_async)
 
 google_calendar_creator_agent = Agent(
     name='google_calendar_creator_agent',
     model=os.getenv('MODEL'),
-    instruction="Create events in Google Calendar.",
-    tools=[create_event, authenticate_user, authentication_status]
+    instruction="Create events in Google Calendar. Use create_events_async to create several events in one call. "
+                "To avoid double-booking, call create_event with conflict_policy='flag' or 'reject' instead of "
+                "listing events first, and use find_free_slots_async to propose an alternative time. "
+                "If create_events_async reports events with status 'unknown', list the events of that time "
+                "before creating them again.",
+    tools=[create_event, create_events, find_conflicts, find_free_slots, authenticate_user, authentication_status]
 )
 
 google_calendar_manager_agent = Agent(
     name='google_calendar_manager_agent',
     model=os.getenv('MODEL'),
-    instruction="Manage and list events in Google Calendar.",
-    tools=[list_events, delete_event, authenticate_user, authentication_status]
+    instruction="Manage and list events in Google Calendar. Use delete_events_async to delete several events in one call. "
+                "Use find_conflicts_async to check whether a time is busy and find_free_slots_async to find free time.",
+    tools=[list_events, delete_event, delete_events, find_conflicts, find_free_slots, authenticate_user, authentication_status]
 )
 
 # Root Google Calendar Agent
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from gmail_calendar_automation.tools.credential_manager import CredentialManager
+from gmail_calendar_automation.tools.http_cache import response_cache, credential_key, cache_url
+from gmail_calendar_automation.tools.tracing import tracer
+
+# Optional root URL replacing the Google API hosts, e.g. a local test server
+API_ROOT_URL = os.getenv("GOOGLE_API_ROOT_URL")
+GMAIL_BASE_URL = (API_ROOT_URL or "https://gmail.googleapis.com/") + "gmail/v1/users/me"
+CALENDAR_BASE_URL = (API_ROOT_URL or "https://www.googleapis.com/") + "calendar/v3"
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class GoogleApiError(Exception):
+    """Error response from a Google REST API called through AsyncGoogleClient."""
+
+    def __init__(self,
+                 status: int,
+                 reason: str,
+                 content: Optional[Dict[str, Any]] = None,
+                 retry_after: Optional[str] = None):
+        super().__init__(f"{status} {reason}")
+        self.status = status
+        self.reason = reason
+        self.content = content or {}
+        self.retry_after = retry_after
+
+
+def _cached_json(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode the body of a response cache entry."""
+    return json.loads(entry["content"]) if entry["content"] else {}
+
+
+# One pooled client per event loop: httpx clients cannot be shared across loops
+_clients: Dict[asyncio.AbstractEventLoop, "httpx.AsyncClient"] = {}
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the pooled HTTP client for the running event loop."""
+    # Imported here so that only the async tools pay for loading httpx
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        for closed_loop in [l for l in _clients if l.is_closed()]:
+            del _clients[closed_loop]
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            # Google only compresses responses for user agents containing "gzip"
+            headers={"Accept-Encoding": "gzip", "User-Agent": "gmail-calendar-automation (gzip)"}
+        )
+        _clients[loop] = client
+    return client
+
+
+class AsyncGoogleClient:
+    """Minimal asyncio client for the Gmail and Calendar REST endpoints used by the tools."""
+
+    def __init__(self, credential_manager: CredentialManager):
+        """
+        Initialize async client.
+
+        Args:
+            credential_manager: Source of OAuth access tokens
+        """
+        self._credential_manager = credential_manager
+
+    async def ensure_valid_credentials(self) -> bool:
+        """Validate and refresh credentials without blocking the event loop."""
+        return await asyncio.to_thread(self._credential_manager.ensure_valid)
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      params: Optional[Dict[str, Any]] = None,
+                      json: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Send an authorized request and decode the JSON response.
+
+        GET responses are served from and stored in the process-wide
+        response cache, revalidated with their ETags.
+
+        Args:
+            method: HTTP method
+            url: Absolute endpoint URL
+            params: Query parameters; None values are dropped
+            json: JSON request body
+
+        Returns:
+            Decoded response body (empty dict for empty responses)
+
+        Raises:
+            GoogleApiError: If the API returns an error status
+        """
+        credentials = self._credential_manager.credentials
+        headers = {"Authorization": f"Bearer {credentials.token}"}
+        if params:
+            params = {key: value for key, value in params.items() if value is not None}
+
+        # GETs go through the response cache shared with the googleapiclient transports
+        user = credential_key(credentials)
+        entry, key = None, None
+        if method == "GET" and response_cache.enabled:
+            key = cache_url(url, params)
+            entry, fresh = response_cache.lookup(user, key)
+            if fresh:
+                return _cached_json(entry)
+            if entry is not None and entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+
+        with tracer.span("http", method=method, url=url) as span:
+            response = await get_http_client().request(method, url, params=params, json=json, headers=headers)
+            span.set(
+                status_code=response.status_code,
+                request_bytes=len(response.request.content),
+                response_bytes=len(response.content)
+            )
+            if response.status_code >= 400:
+                span.status = "error"
+        if response.status_code >= 400:
+            try:
+                content = response.json()
+                reason = content.get("error", {}).get("message", response.reason_phrase)
+            except ValueError:
+                content, reason = {}, response.reason_phrase
+            raise GoogleApiError(response.status_code, reason, content, response.headers.get("Retry-After"))
+        if key is not None:
+            if response.status_code == 304 and entry is not None:
+                response_cache.revalidated(user, key, entry)
+                return _cached_json(entry)
+            if response.status_code == 200:
+                etag = response.headers.get("ETag")
+                cached_headers = {"status": "200", "content-type": response.headers.get("Content-Type", "")}
+                if etag:
+                    cached_headers["etag"] = etag
+                response_cache.store(user, key, etag, cached_headers, response.content)
+        elif response_cache.enabled:
+            response_cache.wrote(user, method, url)
+        if not response.content:
+            return {}
+        return response.json()
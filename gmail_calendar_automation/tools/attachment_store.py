@@ -0,0 +1,117 @@
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Any, Optional, Tuple
+from gmail_calendar_automation.tools.credential_manager import atomic_write
+
+MANIFEST_NAME = ".attachments.json"
+
+_UNSAFE_CHARS = re.compile(r"[^\w.\- ]+")
+
+
+def safe_filename(filename: str, default: str = "attachment") -> str:
+    """Reduce an attachment filename to a safe basename."""
+    name = _UNSAFE_CHARS.sub("_", os.path.basename(filename.replace("\\", "/"))).strip(" .")
+    return name[:200] or default
+
+
+class AttachmentStore:
+    """
+    Directory of downloaded attachments, deduplicated by content hash.
+
+    A manifest in the directory maps each SHA-256 digest to the file holding
+    that content, and each downloaded attachment ('message_id/part_id') to its
+    digest, so the same file sent in several messages is stored once and
+    attachments already downloaded are not fetched again.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize store.
+
+        Args:
+            directory: Directory receiving the files; created if missing
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._sources: Dict[str, str] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self._manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        # Forget files deleted since the manifest was written
+        self._files = {
+            sha256: entry for sha256, entry in manifest.get("files", {}).items()
+            if os.path.exists(os.path.join(self.directory, entry["path"]))
+        }
+        self._sources = {
+            source: sha256 for source, sha256 in manifest.get("sources", {}).items() if sha256 in self._files
+        }
+
+    def _save(self) -> None:
+        """Persist the manifest; called with the lock held."""
+        atomic_write(self._manifest_path, json.dumps({"files": self._files, "sources": self._sources}))
+
+    def temp_file(self) -> Tuple[int, str]:
+        """Create a temporary file in the directory, so finished downloads are moved into place by a rename."""
+        return tempfile.mkstemp(dir=self.directory, prefix=".download-")
+
+    def known(self, message_id: str, part_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an attachment downloaded before.
+
+        Args:
+            message_id: ID of the message
+            part_id: MIME part ID of the attachment
+
+        Returns:
+            Dict with the file's path, size and sha256, or None
+        """
+        with self._lock:
+            sha256 = self._sources.get(f"{message_id}/{part_id}")
+            if sha256 is None:
+                return None
+            return self._entry(sha256)
+
+    def _entry(self, sha256: str) -> Dict[str, Any]:
+        entry = self._files[sha256]
+        return {"path": os.path.join(self.directory, entry["path"]), "size": entry["size"], "sha256": sha256}
+
+    def add(self, tmp_path: str, filename: str, sha256: str, size: int, message_id: str, part_id: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Move a downloaded file into the store, unless the same content is already there.
+
+        Args:
+            tmp_path: Downloaded file, created with temp_file()
+            filename: Attachment filename
+            sha256: Hex digest of the file's content
+            size: Size of the file in bytes
+            message_id: ID of the message the attachment came from
+            part_id: MIME part ID of the attachment
+
+        Returns:
+            Tuple of the stored file (path, size, sha256) and whether it was a duplicate
+        """
+        with self._lock:
+            duplicate = sha256 in self._files
+            if duplicate:
+                os.remove(tmp_path)
+            else:
+                name = safe_filename(filename)
+                if os.path.exists(os.path.join(self.directory, name)):
+                    stem, ext = os.path.splitext(name)
+                    name = f"{stem}-{sha256[:12]}{ext}"
+                os.replace(tmp_path, os.path.join(self.directory, name))
+                self._files[sha256] = {"path": name, "size": size}
+            self._sources[f"{message_id}/{part_id}"] = sha256
+            self._save()
+            return self._entry(sha256), duplicate
@@ -0,0 +1,222 @@
+import contextvars
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable, Iterator, Tuple
+from gmail_calendar_automation.tools.credential_manager import atomic_write
+from gmail_calendar_automation.tools.projection import MESSAGE_LIST_FIELDS
+from gmail_calendar_automation.tools.tracing import tracer
+
+BATCH_MODIFY = "messages.batchModify"
+BATCH_DELETE = "messages.batchDelete"
+
+
+def bulk_job_id(operation: str, query: str, body: Dict[str, Any]) -> str:
+    """Identify a bulk job by what it does, so running it again resumes it."""
+    key = json.dumps([operation, query, body], sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+class BulkCheckpoint:
+    """Progress of bulk mail jobs, persisted so an interrupted job resumes where it stopped."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            path: Optional JSON file used to persist progress between runs
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path) as checkpoint_file:
+                self._jobs = json.load(checkpoint_file).get("jobs", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+    def _save(self) -> None:
+        """Persist the jobs; called with the lock held."""
+        if self.path:
+            atomic_write(self.path, json.dumps({"jobs": self._jobs}))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the saved state of a job, or None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def jobs(self) -> Dict[str, Dict[str, Any]]:
+        """Return the saved state of every job."""
+        with self._lock:
+            return {job_id: dict(job) for job_id, job in self._jobs.items()}
+
+    def update(self, job_id: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Update and persist the state of a job.
+
+        Args:
+            job_id: Job identifier
+            fields: State fields to set
+
+        Returns:
+            The job's new state
+        """
+        with self._lock:
+            job = self._jobs.setdefault(job_id, {})
+            job.update(fields, updated_at=time.time())
+            self._save()
+            return dict(job)
+
+
+class BulkMailEngine:
+    """
+    Applies one batchModify or batchDelete operation to every message matching a query.
+
+    Message IDs are listed page by page and grouped into chunks of up to
+    CHUNK_SIZE IDs, the batch methods' limit. Chunks run on a few threads as
+    soon as they fill up, each paced by the quota scheduler, while listing
+    continues. The checkpoint records the page token after the last chunk of
+    an unbroken run of finished chunks, so a job that fails or is interrupted
+    continues from there when it is run again.
+    """
+
+    # batchModify and batchDelete accept at most 1000 IDs
+    CHUNK_SIZE = 1000
+    # messages.list returns at most 500 IDs per page; two pages fill a chunk
+    LIST_PAGE_SIZE = 500
+    WORKERS = 4
+
+    def __init__(self,
+                 get_service: Callable[[], Any],
+                 execute: Callable[[Any, str], Any],
+                 checkpoint: Optional[BulkCheckpoint] = None,
+                 workers: int = WORKERS):
+        """
+        Initialize bulk engine.
+
+        Args:
+            get_service: Callable returning a Gmail service object for the calling thread
+            execute: Callable executing a request given its operation name
+                (applies quota pacing and call statistics)
+            checkpoint: Where job progress is kept (defaults to an in-memory BulkCheckpoint)
+            workers: Chunks run concurrently
+        """
+        self._get_service = get_service
+        self._execute = execute
+        self.checkpoint = checkpoint or BulkCheckpoint()
+        self.workers = workers
+
+    def _iter_chunks(self,
+                     service,
+                     query: str,
+                     page_token: Optional[str],
+                     limit: Optional[int]) -> Iterator[Tuple[List[str], Optional[str]]]:
+        """Yield chunks of message IDs with the page token listing the messages after them."""
+        chunk: List[str] = []
+        remaining = limit
+        while remaining is None or remaining > 0:
+            max_results = self.LIST_PAGE_SIZE if remaining is None else min(self.LIST_PAGE_SIZE, remaining)
+            response = self._execute(service.users().messages().list(
+                userId="me", q=query, maxResults=max_results, pageToken=page_token, fields=MESSAGE_LIST_FIELDS
+            ), "messages.list")
+            message_ids = [message["id"] for message in response.get("messages", [])]
+            if remaining is not None:
+                message_ids = message_ids[:remaining]
+                remaining -= len(message_ids)
+            chunk.extend(message_ids)
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+            # Chunks end on page boundaries so that page_token marks exactly where they stop
+            if len(chunk) + self.LIST_PAGE_SIZE > self.CHUNK_SIZE:
+                yield chunk, page_token
+                chunk = []
+        if chunk:
+            yield chunk, None
+
+    def _apply(self, operation: str, message_ids: List[str], body: Dict[str, Any]) -> None:
+        """Run one batch call from a worker thread, on that thread's service object."""
+        messages = self._get_service().users().messages()
+        method = messages.batchModify if operation == BATCH_MODIFY else messages.batchDelete
+        self._execute(method(userId="me", body=dict(body, ids=message_ids)), operation)
+
+    def run(self,
+            operation: str,
+            query: str,
+            body: Optional[Dict[str, Any]] = None,
+            limit: Optional[int] = None,
+            progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Apply an operation to the messages matching a query, resuming an unfinished run of the same job.
+
+        Args:
+            operation: BATCH_MODIFY or BATCH_DELETE
+            query: Gmail search query selecting the messages
+            body: batchModify fields other than ids (addLabelIds, removeLabelIds)
+            limit: Stop after this many messages, counting those done by earlier runs
+            progress: Callable receiving the job state after each finished chunk
+
+        Returns:
+            Job state: job_id, processed, done, resumed, seconds and, if the
+            job stopped on an error, the error
+        """
+        body = body or {}
+        job_id = bulk_job_id(operation, query, body)
+        saved = self.checkpoint.get(job_id)
+        resumed = bool(saved) and not saved.get("done")
+        page_token = saved.get("page_token") if resumed else None
+        processed = saved.get("processed", 0) if resumed else 0
+        state = self.checkpoint.update(
+            job_id, operation=operation, query=query, page_token=page_token, processed=processed, done=False
+        )
+        if limit is not None and processed >= limit:
+            return dict(self.checkpoint.update(job_id, done=True), job_id=job_id, resumed=resumed, seconds=0.0)
+
+        start = time.monotonic()
+        service = self._get_service()
+        in_flight: deque = deque()
+        error: Optional[Exception] = None
+
+        def _collect(max_in_flight: int) -> None:
+            # Chunks are recorded in listing order, so the checkpoint never skips an unfinished chunk
+            nonlocal processed, state
+            while in_flight and (in_flight[0][0].done() or len(in_flight) > max_in_flight):
+                future, count, next_token = in_flight.popleft()
+                future.result()
+                processed += count
+                state = self.checkpoint.update(job_id, page_token=next_token, processed=processed)
+                tracer.record("bulk.progress", job_id=job_id, operation=operation, processed=processed)
+                if progress is not None:
+                    progress(dict(state, job_id=job_id))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                remaining = limit - processed if limit is not None else None
+                for chunk, next_token in self._iter_chunks(service, query, page_token, remaining):
+                    # Each task runs in a copy of this context so its spans nest under the caller's
+                    future = pool.submit(contextvars.copy_context().run, self._apply, operation, chunk, body)
+                    in_flight.append((future, len(chunk), next_token))
+                    # Bound the IDs held in memory while listing runs ahead of the workers
+                    _collect(2 * self.workers)
+                _collect(0)
+            except Exception as e:
+                error = e
+                for future, _, _ in in_flight:
+                    future.cancel()
+
+        result = dict(state, job_id=job_id, resumed=resumed, seconds=round(time.monotonic() - start, 3))
+        if error is not None:
+            result["error"] = str(error)
+            return result
+        result.update(self.checkpoint.update(job_id, done=True))
+        return result
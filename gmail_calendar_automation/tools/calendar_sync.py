@@ -0,0 +1,381 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.interval_index import IntervalIndex
+from gmail_calendar_automation.tools.projection import list_fields
+
+
+def parse_event_time(value: Dict[str, str], time_zone: Optional[str] = None) -> datetime:
+    """
+    Convert a Calendar event start/end value to an aware datetime.
+
+    Args:
+        value: Event 'start' or 'end' dict with either 'dateTime' or 'date'
+        time_zone: Zone used for all-day dates (defaults to the value's own zone, then UTC)
+
+    Returns:
+        Timezone-aware datetime (date-times without an offset are taken in the
+        value's zone)
+    """
+    zone_name = value.get("timeZone") or time_zone
+    try:
+        zone = ZoneInfo(zone_name) if zone_name else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = timezone.utc
+    if value.get("dateTime"):
+        parsed = datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=zone)
+    return datetime.fromisoformat(value["date"]).replace(tzinfo=zone)
+
+
+def parse_rfc3339(value: str) -> datetime:
+    """Parse an RFC 3339 timestamp; naive values are taken as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def event_interval(event: Dict[str, Any], time_zone: Optional[str] = None) -> Optional[Tuple[datetime, datetime]]:
+    """Return an event's (start, end) as aware datetimes, or None if it has no times."""
+    if "start" not in event or "end" not in event:
+        return None
+    return parse_event_time(event["start"], time_zone), parse_event_time(event["end"], time_zone)
+
+
+def is_busy(event: Dict[str, Any]) -> bool:
+    """Whether an event blocks time: opaque and not declined by the calendar owner."""
+    if event.get("transparency") == "transparent":
+        return False
+    return not any(
+        attendee.get("self") and attendee.get("responseStatus") == "declined"
+        for attendee in event.get("attendees", [])
+    )
+
+
+class CalendarEventStore:
+    """
+    Local copy of one calendar's events, kept current through syncToken incremental sync.
+
+    Events are also held in an interval index, so window, conflict and
+    free-slot queries cost O(log n + k) instead of a scan of the calendar.
+    Reads and writes take the store's lock, since tools update the store
+    directly after creating or deleting events while other calls query it.
+    """
+
+    def __init__(self, calendar_id: str):
+        """
+        Initialize event store.
+
+        Args:
+            calendar_id: ID of the calendar mirrored by this store
+        """
+        self.calendar_id = calendar_id
+        self.sync_token: Optional[str] = None
+        self.time_zone: Optional[str] = None
+        # End of the window the last full sync expanded recurring events up to
+        self.horizon: Optional[datetime] = None
+        # Number of listings applied, so a sync can tell whether another one finished first
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._events: Dict[str, Dict[str, Any]] = {}
+        self._index = IntervalIndex()
+        # Zero-length events cannot be stored in the interval index
+        self._instants: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def clear(self) -> None:
+        """Drop all events and the sync token."""
+        with self._lock:
+            self.sync_token = None
+            self.horizon = None
+            self._events = {}
+            self._index.clear()
+            self._instants = {}
+
+    def apply(self,
+              events: List[Dict[str, Any]],
+              sync_token: Optional[str],
+              time_zone: Optional[str],
+              horizon: Optional[datetime] = None) -> None:
+        """
+        Apply a complete listing in one step, so queries never see it half done.
+
+        Args:
+            events: Listed events (cancelled ones are removed)
+            sync_token: nextSyncToken of the listing
+            time_zone: Calendar time zone reported by the listing
+            horizon: End of a full listing's window; the store is replaced
+                by the listing when given, and updated by it otherwise
+        """
+        with self._lock:
+            if horizon is not None:
+                self.clear()
+                self.horizon = horizon
+            self.time_zone = time_zone or self.time_zone
+            for event in events:
+                self.upsert(event)
+            self.sync_token = sync_token
+            self.generation += 1
+
+    def upsert(self, event: Dict[str, Any]) -> None:
+        """Add or replace an event; cancelled events are removed."""
+        with self._lock:
+            if event.get("status") == "cancelled":
+                self.remove(event["id"])
+            else:
+                self._events[event["id"]] = event
+                self._index_event(event)
+
+    def _index_event(self, event: Dict[str, Any]) -> None:
+        interval = event_interval(event, self.time_zone)
+        self._index.remove(event["id"])
+        self._instants.pop(event["id"], None)
+        if interval is None:
+            return
+        start, end = interval[0].timestamp(), interval[1].timestamp()
+        if end > start:
+            self._index.add(event["id"], start, end)
+        else:
+            self._instants[event["id"]] = start
+
+    def remove(self, event_id: str) -> None:
+        """Remove an event and any expanded instances of it."""
+        with self._lock:
+            instances = [i for i, e in self._events.items() if e.get("recurringEventId") == event_id]
+            for removed_id in [event_id] + instances:
+                self._events.pop(removed_id, None)
+                self._index.remove(removed_id)
+                self._instants.pop(removed_id, None)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Return all stored events."""
+        with self._lock:
+            return list(self._events.values())
+
+    def query(self,
+              time_min: Optional[str] = None,
+              time_max: Optional[str] = None,
+              max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Return events overlapping a window, ordered by start time.
+
+        Matches events.list semantics: an event is included when it ends after
+        time_min and starts before time_max.
+
+        Args:
+            time_min: Window start (RFC 3339), unbounded when omitted
+            time_max: Window end (RFC 3339), unbounded when omitted
+            max_results: Maximum number of events to return
+
+        Returns:
+            List of event resources
+        """
+        lower = parse_rfc3339(time_min).timestamp() if time_min else float("-inf")
+        upper = parse_rfc3339(time_max).timestamp() if time_max else float("inf")
+        with self._lock:
+            matches = [(start, event_id) for start, _, event_id in self._index.overlapping(lower, upper)]
+            matches.extend((start, event_id) for event_id, start in self._instants.items() if lower < start < upper)
+            matches.sort(key=lambda match: match[0])
+            return [self._events[event_id] for _, event_id in matches[:max_results]]
+
+    def conflicts(self,
+                  start: datetime,
+                  end: datetime,
+                  exclude_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return busy events overlapping [start, end), ordered by start time.
+
+        Args:
+            start: Start of the proposed time range
+            end: End of the proposed time range
+            exclude_id: Event to ignore, e.g. the one being rescheduled
+
+        Returns:
+            List of event resources
+        """
+        with self._lock:
+            matches = sorted(self._index.overlapping(start.timestamp(), end.timestamp()), key=lambda match: match[0])
+            return [
+                self._events[event_id] for _, _, event_id in matches
+                if event_id != exclude_id and is_busy(self._events[event_id])
+            ]
+
+    def free_slots(self,
+                   start: datetime,
+                   end: datetime,
+                   min_duration: timedelta) -> List[Tuple[datetime, datetime]]:
+        """
+        Return stretches of [start, end) at least min_duration long with no busy events.
+
+        Args:
+            start: Window start
+            end: Window end
+            min_duration: Shortest slot to report
+
+        Returns:
+            List of (start, end) UTC datetimes in ascending order
+        """
+        busy = IntervalIndex()
+        for event in self.conflicts(start, end):
+            event_start, event_end = event_interval(event, self.time_zone)
+            busy.add(event["id"], event_start.timestamp(), event_end.timestamp())
+        return [
+            (datetime.fromtimestamp(slot_start, timezone.utc), datetime.fromtimestamp(slot_end, timezone.utc))
+            for slot_start, slot_end in busy.gaps(start.timestamp(), end.timestamp(), min_duration.total_seconds())
+        ]
+
+
+class CalendarSync:
+    """
+    Keeps one CalendarEventStore per calendar current using Calendar sync tokens.
+
+    Each calendar has a lock of its own, held only while the sync state is
+    read and a finished listing is applied, never during the requests, so a
+    slow calendar does not hold up syncs of the others.
+    """
+
+    PAGE_SIZE = 2500
+    # How far ahead full syncs expand recurring events; singleEvents listings
+    # of series without an end would otherwise never finish
+    SYNC_HORIZON = timedelta(days=365)
+
+    def __init__(self, execute: Callable[[Any, str], Any], event_fields: Optional[str] = None):
+        """
+        Initialize calendar sync.
+
+        Args:
+            execute: Callable executing a request given its operation name
+                (applies quota pacing and call statistics)
+            event_fields: Partial-response mask for stored events (full resources when omitted)
+        """
+        self._execute = execute
+        self._fields = list_fields(event_fields, "nextPageToken", "nextSyncToken", "timeZone") if event_fields else None
+        self._lock = threading.Lock()
+        self._stores: Dict[str, CalendarEventStore] = {}
+        self._calendar_locks: Dict[str, threading.Lock] = {}
+        # Calendars with an active events.watch channel, mapped to the channel expiry
+        self._watch_until: Dict[str, float] = {}
+        self._dirty: set = set()
+
+    def set_watch(self, calendar_id: str, expires_at: Optional[float]) -> None:
+        """
+        Enable push mode for a calendar until its watch channel expires.
+
+        Args:
+            calendar_id: Watched calendar
+            expires_at: Channel expiry as a Unix timestamp, or None to disable push mode
+        """
+        if expires_at is None:
+            self._watch_until.pop(calendar_id, None)
+        else:
+            self._watch_until[calendar_id] = expires_at
+        # Changes made before the channel was opened have not been notified
+        self._dirty.add(calendar_id)
+
+    def is_watched(self, calendar_id: str) -> bool:
+        """Whether a calendar has an active watch channel."""
+        return time.time() < self._watch_until.get(calendar_id, 0)
+
+    def mark_dirty(self, calendar_id: str) -> None:
+        """Record a change notification for a calendar."""
+        self._dirty.add(calendar_id)
+
+    def store(self, calendar_id: str) -> CalendarEventStore:
+        """Return the store for a calendar, creating an empty one if needed."""
+        with self._lock:
+            if calendar_id not in self._stores:
+                self._stores[calendar_id] = CalendarEventStore(calendar_id)
+                self._calendar_locks[calendar_id] = threading.Lock()
+            return self._stores[calendar_id]
+
+    def sync(self, service, calendar_id: str, until: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Bring a calendar's store up to date, incrementally when possible.
+
+        While the calendar has an active watch channel the sync is skipped until
+        a change notification arrives. Full syncs cover events up to
+        SYNC_HORIZON ahead, or up to until when that is later; a store whose
+        window ends before until is reloaded.
+
+        Args:
+            service: Calendar service object
+            calendar_id: ID of the calendar to sync
+            until: Latest time the caller is about to query (optional)
+
+        Returns:
+            Dict describing the sync that was performed
+        """
+        store = self.store(calendar_id)
+        lock = self._calendar_locks[calendar_id]
+        with lock:
+            full = store.sync_token is None or (
+                until is not None and store.horizon is not None and until > store.horizon
+            )
+            if not full and self.is_watched(calendar_id) and calendar_id not in self._dirty:
+                return {"mode": "cached", "changed": 0}
+            # Cleared before syncing so notifications arriving meanwhile trigger another sync
+            self._dirty.discard(calendar_id)
+            sync_token, generation = store.sync_token, store.generation
+
+        horizon = None
+        try:
+            if not full:
+                try:
+                    events, next_token, time_zone = self._fetch(service, calendar_id, sync_token=sync_token)
+                except google_api.HttpError as e:
+                    # 410 Gone means the sync token expired and a full sync is required
+                    if e.resp.status != 410:
+                        raise
+                    full = True
+            if full:
+                horizon = datetime.now(timezone.utc) + self.SYNC_HORIZON
+                if until is not None:
+                    horizon = max(horizon, until)
+                events, next_token, time_zone = self._fetch(service, calendar_id, time_max=horizon)
+        except Exception:
+            self._dirty.add(calendar_id)
+            raise
+
+        with lock:
+            if store.generation != generation:
+                # Another sync of this calendar applied its listing while this one ran
+                return {"mode": "superseded", "changed": 0}
+            store.apply(events, next_token, time_zone, horizon)
+        return {"mode": "full" if full else "incremental", "changed": len(events)}
+
+    def _fetch(self,
+               service,
+               calendar_id: str,
+               sync_token: Optional[str] = None,
+               time_max: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+        """
+        Fetch every page of a full or incremental listing.
+
+        Returns:
+            Tuple of the events, the next sync token and the calendar's time zone
+        """
+        events: List[Dict[str, Any]] = []
+        time_zone = None
+        page_token = None
+        while True:
+            response = self._execute(service.events().list(
+                calendarId=calendar_id,
+                singleEvents=True,
+                maxResults=self.PAGE_SIZE,
+                syncToken=sync_token,
+                timeMax=time_max.isoformat() if time_max is not None else None,
+                pageToken=page_token,
+                fields=self._fields
+            ), "events.list[sync]")
+
+            time_zone = response.get("timeZone", time_zone)
+            events.extend(response.get("items", []))
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return events, response.get("nextSyncToken"), time_zone
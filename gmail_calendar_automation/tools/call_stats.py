@@ -0,0 +1,87 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+from gmail_calendar_automation.tools.projection import payload_size
+from gmail_calendar_automation.tools.tracing import tracer
+
+
+class CallStats:
+    """Thread-safe counter of API round-trips, their latency and the size of tool results."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, float]] = {}
+        self._payloads: Dict[str, Dict[str, int]] = {}
+
+    @contextmanager
+    def track(self, operation: str, sub_requests: int = 1) -> Iterator[None]:
+        """
+        Time one HTTP round-trip, also recorded as an 'api' span.
+
+        Args:
+            operation: Name of the API operation (e.g. 'messages.list').
+            sub_requests: Number of logical requests carried by the round-trip
+                (greater than 1 for batch requests).
+        """
+        start = time.perf_counter()
+        try:
+            with tracer.span("api", operation=operation, sub_requests=sub_requests):
+                yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                entry = self._operations.setdefault(operation, {
+                    "round_trips": 0,
+                    "sub_requests": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0
+                })
+                entry["round_trips"] += 1
+                entry["sub_requests"] += sub_requests
+                entry["total_ms"] += elapsed_ms
+                entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def record_payload(self, tool: str, payload: Any) -> None:
+        """
+        Count the size of a result handed back to the agent.
+
+        Args:
+            tool: Name of the tool that produced the result (e.g. 'list_events').
+            payload: The returned items, measured as compact JSON.
+        """
+        size = payload_size(payload)
+        with self._lock:
+            entry = self._payloads.setdefault(tool, {"calls": 0, "bytes": 0, "tokens": 0, "max_tokens": 0})
+            entry["calls"] += 1
+            entry["bytes"] += size["bytes"]
+            entry["tokens"] += size["tokens"]
+            entry["max_tokens"] = max(entry["max_tokens"], size["tokens"])
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return a copy of the counters.
+
+        Returns:
+            Dict with per-operation counters, overall totals and per-tool result sizes
+        """
+        with self._lock:
+            operations = {name: dict(entry) for name, entry in self._operations.items()}
+            payloads = {name: dict(entry) for name, entry in self._payloads.items()}
+
+        for entry in operations.values():
+            entry["avg_ms"] = entry["total_ms"] / entry["round_trips"]
+
+        return {
+            "operations": operations,
+            "round_trips": sum(e["round_trips"] for e in operations.values()),
+            "sub_requests": sum(e["sub_requests"] for e in operations.values()),
+            "total_ms": sum(e["total_ms"] for e in operations.values()),
+            "payloads": payloads
+        }
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._operations.clear()
+            self._payloads.clear()
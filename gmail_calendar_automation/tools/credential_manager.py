@@ -0,0 +1,220 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.service_cache import service_cache
+from gmail_calendar_automation.tools.tracing import tracer
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from gmail_calendar_automation.tools.token_store import TokenStore
+
+# Union of the scopes used by GmailTool and GoogleCalendarTool, so one token
+# file serves both tools. Scopes only some operations need are added by those
+# operations and requested on the next authentication.
+DEFAULT_SCOPES = [
+    "https://www.googleapis.com/auth/gmail.send",
+    "https://www.googleapis.com/auth/gmail.readonly",
+    "https://www.googleapis.com/auth/calendar"
+]
+
+
+def atomic_write(path: str, content: str) -> None:
+    """Write content to path via a temporary file and rename, so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'w') as tmp_file:
+            tmp_file.write(content)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class CredentialManager:
+    """Owns the OAuth credentials stored in one token file and shared by every tool using it."""
+
+    # Refresh this long before the access token expires
+    REFRESH_MARGIN = timedelta(minutes=5)
+
+    def __init__(self,
+                 user_token_path: Optional[str],
+                 app_credentials_path: str,
+                 scopes: Optional[List[str]] = None,
+                 token_store: Optional["TokenStore"] = None,
+                 user_id: str = ""):
+        """
+        Initialize credential manager.
+
+        Args:
+            user_token_path: Path to user token JSON file (ignored when token_store is given)
+            app_credentials_path: Path to app credentials JSON file
+            scopes: OAuth scopes to request in addition to DEFAULT_SCOPES
+            token_store: Store holding the token instead of user_token_path (optional)
+            user_id: User whose token is read from and written to token_store
+        """
+        self.user_token_path = user_token_path
+        self.app_credentials_path = app_credentials_path
+        self.token_store = token_store
+        self.user_id = user_id
+        self.scopes = list(DEFAULT_SCOPES)
+        self.add_scopes(scopes or [])
+        self._lock = threading.Lock()
+        self._credentials: Optional["Credentials"] = None
+        self._persisted_json: Optional[str] = None
+        self._load_credentials()
+
+    @property
+    def credentials(self) -> Optional["Credentials"]:
+        """Current credentials, or None if the user has not authenticated."""
+        return self._credentials
+
+    def add_scopes(self, scopes: List[str]) -> None:
+        """Add scopes to the set requested on the next authentication."""
+        for scope in scopes:
+            if scope not in self.scopes:
+                self.scopes.append(scope)
+
+    def has_scopes(self, scopes: List[str]) -> bool:
+        """Whether the current credentials were granted every one of scopes."""
+        return bool(self._credentials) and self._credentials.has_scopes(scopes)
+
+    def _load_credentials(self) -> None:
+        """Load credentials from the token store or file if available."""
+        try:
+            if self.token_store is not None:
+                token_json = self.token_store.load(self.user_id)
+            else:
+                with open(self.user_token_path) as token_file:
+                    token_json = token_file.read()
+            # Refreshes must ask for the scopes the token was granted, not the ones wanted next time
+            self._credentials = google_api.Credentials.from_authorized_user_info(json.loads(token_json))
+            self._persisted_json = self._credentials.to_json()
+        except (TypeError, FileNotFoundError, json.JSONDecodeError):
+            self._credentials = None
+
+    def _save_credentials(self, credentials: "Credentials") -> None:
+        """Save credentials to the token store or file if they changed since the last write."""
+        token_json = credentials.to_json()
+        if token_json == self._persisted_json:
+            return
+        if self.token_store is not None:
+            self.token_store.save(self.user_id, token_json)
+        else:
+            atomic_write(self.user_token_path, token_json)
+        self._persisted_json = token_json
+
+    def _needs_refresh(self) -> bool:
+        """Whether the access token is expired or about to expire."""
+        if not self._credentials.token or not self._credentials.expiry:
+            return not self._credentials.token
+        # google-auth stores expiry as a naive UTC datetime
+        return self._credentials.expiry - self.REFRESH_MARGIN <= datetime.utcnow()
+
+    def ensure_valid(self) -> bool:
+        """
+        Ensure credentials are valid, refreshing them shortly before expiry.
+
+        Concurrent callers share a single refresh: the first one refreshes while
+        the others wait on the lock and then reuse the new token.
+
+        Returns:
+            True if usable credentials are available
+        """
+        if not self._credentials:
+            return False
+        if not self._needs_refresh():
+            return True
+        if not self._credentials.refresh_token:
+            return not self._credentials.expired
+
+        with self._lock:
+            # Another caller may have refreshed while we were waiting
+            if not self._needs_refresh():
+                return True
+            try:
+                with tracer.span("credentials.refresh"):
+                    self._credentials.refresh(google_api.Request())
+            except google_api.RefreshError:
+                return False
+            service_cache.invalidate(self._credentials)
+            self._save_credentials(self._credentials)
+            return True
+
+    def authenticate(self) -> "Credentials":
+        """
+        Run the OAuth flow for all registered scopes and persist the token.
+
+        Returns:
+            The new credentials
+        """
+        flow = google_api.InstalledAppFlow.from_client_secrets_file(
+            self.app_credentials_path, scopes=list(self.scopes)
+        )
+        credentials = flow.run_local_server(port=0)
+        with self._lock:
+            if self._credentials:
+                service_cache.invalidate(self._credentials)
+            self._credentials = credentials
+            self._save_credentials(credentials)
+        return credentials
+
+    def get_auth_status(self) -> Dict[str, Any]:
+        """
+        Check current authentication status.
+
+        Returns:
+            Dict with authentication status details
+        """
+        if not self._credentials:
+            return {
+                "authenticated": False,
+                "valid": False,
+                "message": "No credentials found. Please authenticate first."
+            }
+
+        has_refresh_token = bool(self._credentials.refresh_token)
+        is_valid = self.ensure_valid()
+
+        return {
+            "authenticated": True,
+            "valid": is_valid,
+            "expired": self._credentials.expired,
+            "has_refresh_token": has_refresh_token
+        }
+
+
+_managers: Dict[str, CredentialManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_credential_manager(user_token_path: str,
+                           app_credentials_path: str,
+                           scopes: Optional[List[str]] = None) -> CredentialManager:
+    """
+    Return the shared credential manager for a token file, creating it on first use.
+
+    Args:
+        user_token_path: Path to user token JSON file
+        app_credentials_path: Path to app credentials JSON file
+        scopes: Scopes the caller needs; merged into the manager's scopes
+
+    Returns:
+        CredentialManager shared by every tool using the same token file
+    """
+    key = os.path.abspath(user_token_path) if user_token_path else ""
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = CredentialManager(user_token_path, app_credentials_path, scopes)
+            _managers[key] = manager
+        else:
+            manager.add_scopes(scopes or [])
+        return manager
@@ -0,0 +1,345 @@
+import calendar
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from typing import Dict, Any, Optional, List, Tuple
+
+# Gmail search operators that map onto system label IDs
+_LABEL_OPERATORS = {
+    ("is", "unread"): "UNREAD",
+    ("is", "starred"): "STARRED",
+    ("is", "important"): "IMPORTANT",
+    ("in", "inbox"): "INBOX",
+    ("in", "sent"): "SENT",
+    ("in", "draft"): "DRAFT",
+    ("in", "trash"): "TRASH",
+    ("in", "spam"): "SPAM",
+    ("label", "inbox"): "INBOX",
+    ("label", "unread"): "UNREAD",
+    ("label", "starred"): "STARRED",
+    ("label", "important"): "IMPORTANT",
+    ("category", "primary"): "CATEGORY_PERSONAL",
+    ("category", "social"): "CATEGORY_SOCIAL",
+    ("category", "promotions"): "CATEGORY_PROMOTIONS",
+    ("category", "updates"): "CATEGORY_UPDATES",
+    ("category", "forums"): "CATEGORY_FORUMS",
+}
+_NEGATED_LABEL_OPERATORS = {
+    ("is", "read"): "UNREAD",
+}
+_FTS_COLUMNS = {"from": "sender", "subject": "subject"}
+# Values Gmail resolves to the account's own addresses, which the index does not know
+_SELF_ALIASES = ("me",)
+# Gmail reads after:/before: dates as midnight Pacific time, whatever the account's time zone
+_GMAIL_DATE_ZONE = ZoneInfo("America/Los_Angeles")
+_MONTHS_PER_UNIT = {"m": 1, "y": 12}
+
+_TOKEN_RE = re.compile(
+    r'(?P<neg>-?)'
+    r'(?:(?P<op>[a-z_]+):(?:"(?P<quoted_value>[^"]*)"|\((?P<group_value>[^)]*)\)|(?P<value>\S+))'
+    r'|"(?P<phrase>[^"]*)"'
+    r'|(?P<word>\S+))'
+)
+
+
+def _fts_phrase(text: str) -> str:
+    """Quote text as an FTS5 phrase."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _parse_date(value: str) -> Optional[int]:
+    """Parse a Gmail after:/before: date, midnight Pacific time like Gmail, into epoch milliseconds."""
+    for fmt in ("%Y/%m/%d", "%Y-%m-%d", "%m/%d/%Y"):
+        try:
+            parsed = datetime.strptime(value, fmt).replace(tzinfo=_GMAIL_DATE_ZONE)
+            return int(parsed.timestamp() * 1000)
+        except ValueError:
+            continue
+    if value.isdigit():
+        return int(value) * 1000
+    return None
+
+
+def _duration_cutoff(value: str, now: Optional[datetime] = None) -> Optional[int]:
+    """
+    Parse a Gmail newer_than:/older_than: duration into its cutoff in epoch milliseconds.
+
+    Days are 24 hours; months and years are calendar months counted back from
+    now, with the day clamped to the end of shorter months.
+    """
+    unit, amount = value[-1:].lower(), value[:-1]
+    if unit not in ("d", *_MONTHS_PER_UNIT) or not amount.isdigit():
+        return None
+    now = now or datetime.now(timezone.utc)
+    if unit == "d":
+        return int((now - timedelta(days=int(amount))).timestamp() * 1000)
+    months = now.year * 12 + now.month - 1 - int(amount) * _MONTHS_PER_UNIT[unit]
+    year, month = divmod(months, 12)
+    if year < 1:
+        return 0
+    day = min(now.day, calendar.monthrange(year, month + 1)[1])
+    return int(now.replace(year=year, month=month + 1, day=day).timestamp() * 1000)
+
+
+def translate_query(query: str) -> Optional[Tuple[List[str], List[Any], List[str], bool]]:
+    """
+    Translate the common subset of Gmail search syntax into SQL conditions.
+
+    Supported: from:, subject:, is:, in:, category:, system label:, after:,
+    before:, newer_than:, older_than:, and negated label operators (e.g.
+    -is:unread). Bare words and "phrases" are not: Gmail also matches them
+    against message bodies, which the index does not hold.
+
+    Args:
+        query: Gmail search query
+
+    Returns:
+        (sql conditions, sql parameters, FTS5 match clauses, includes trash/spam),
+        or None if the query uses syntax that cannot be answered locally.
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+    fts_clauses: List[str] = []
+    include_hidden = False
+
+    for match in _TOKEN_RE.finditer(query.strip()):
+        negated = bool(match.group("neg"))
+        op = match.group("op")
+
+        if op is None:
+            # Free text searches bodies too
+            return None
+
+        value = next(v for v in (match.group("quoted_value"), match.group("group_value"), match.group("value"))
+                     if v is not None)
+        key = (op, value.lower())
+
+        if op in _FTS_COLUMNS:
+            if negated or not value.strip() or (op == "from" and value.lower() in _SELF_ALIASES):
+                return None
+            fts_clauses.append(f"{_FTS_COLUMNS[op]} : {_fts_phrase(value)}")
+        elif key in _LABEL_OPERATORS or key in _NEGATED_LABEL_OPERATORS:
+            label = _LABEL_OPERATORS.get(key) or _NEGATED_LABEL_OPERATORS[key]
+            present = (key in _LABEL_OPERATORS) != negated
+            conditions.append("labels LIKE ?" if present else "labels NOT LIKE ?")
+            params.append(f"% {label} %")
+            if present and label in ("TRASH", "SPAM"):
+                include_hidden = True
+        elif op in ("after", "before") and not negated:
+            timestamp = _parse_date(value)
+            if timestamp is None:
+                return None
+            conditions.append("internal_date >= ?" if op == "after" else "internal_date < ?")
+            params.append(timestamp)
+        elif op in ("newer_than", "older_than") and not negated:
+            cutoff = _duration_cutoff(value)
+            if cutoff is None:
+                return None
+            conditions.append("internal_date >= ?" if op == "newer_than" else "internal_date < ?")
+            params.append(cutoff)
+        else:
+            return None
+
+    return conditions, params, fts_clauses, include_hidden
+
+
+class EmailIndex:
+    """
+    On-disk SQLite index of email metadata with FTS5 search.
+
+    Implements the same interface as GmailMessageStore so GmailSync can keep it
+    current. Messages from the most recent full sync onward form a complete
+    window of the mailbox, which is what makes local answers trustworthy.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Initialize email index.
+
+        Args:
+            path: SQLite database file (defaults to an in-memory database)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS emails (
+                id TEXT PRIMARY KEY,
+                sender TEXT,
+                subject TEXT,
+                date TEXT,
+                internal_date INTEGER NOT NULL DEFAULT 0,
+                labels TEXT NOT NULL DEFAULT ' ',
+                snippet TEXT
+            );
+            CREATE INDEX IF NOT EXISTS emails_internal_date ON emails (internal_date);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS emails_fts USING fts5(id UNINDEXED, sender, subject, snippet)"
+            )
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: only label/date queries can be answered locally
+            self.fts_enabled = False
+        self._conn.commit()
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Optional[str]) -> None:
+        if value is None:
+            self._conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+        else:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def history_id(self) -> Optional[str]:
+        """History ID the index is synced to, or None before the first full sync."""
+        with self._lock:
+            return self._get_meta("history_id")
+
+    @history_id.setter
+    def history_id(self, value: Optional[str]) -> None:
+        with self._lock:
+            self._set_meta("history_id", value)
+            if value is not None and self._get_meta("window_start") is None:
+                # First sync after clear(): everything currently indexed is the complete window
+                row = self._conn.execute("SELECT MIN(internal_date) FROM emails").fetchone()
+                self._set_meta("window_start", row[0] if row[0] is not None else 0)
+            self._conn.commit()
+
+    def save(self) -> None:
+        """Commit pending changes."""
+        with self._lock:
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Drop all messages and sync state."""
+        with self._lock:
+            self._conn.execute("DELETE FROM emails")
+            if self.fts_enabled:
+                self._conn.execute("DELETE FROM emails_fts")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.commit()
+
+    def __contains__(self, message_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM emails WHERE id = ?", (message_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM emails").fetchone()[0]
+
+    def upsert(self, message: Dict[str, Any]) -> None:
+        """
+        Add or replace a message.
+
+        Args:
+            message: Metadata-format message resource from the Gmail API
+        """
+        headers = {h["name"]: h["value"] for h in message.get("payload", {}).get("headers", [])}
+        row = (
+            message["id"],
+            headers.get("From"),
+            headers.get("Subject"),
+            headers.get("Date"),
+            int(message.get("internalDate", 0)),
+            " " + " ".join(message.get("labelIds", [])) + " ",
+            message.get("snippet")
+        )
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO emails VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+            if self.fts_enabled:
+                self._conn.execute("DELETE FROM emails_fts WHERE id = ?", (message["id"],))
+                self._conn.execute(
+                    "INSERT INTO emails_fts (id, sender, subject, snippet) VALUES (?, ?, ?, ?)",
+                    (row[0], row[1], row[2], row[6])
+                )
+
+    def remove(self, message_id: str) -> None:
+        """Remove a message if present."""
+        with self._lock:
+            self._conn.execute("DELETE FROM emails WHERE id = ?", (message_id,))
+            if self.fts_enabled:
+                self._conn.execute("DELETE FROM emails_fts WHERE id = ?", (message_id,))
+
+    def update_labels(self, message_id: str, added: List[str] = (), removed: List[str] = ()) -> None:
+        """Apply label changes to an indexed message."""
+        with self._lock:
+            row = self._conn.execute("SELECT labels FROM emails WHERE id = ?", (message_id,)).fetchone()
+            if row is None:
+                return
+            labels = [label for label in row[0].split() if label not in removed]
+            labels.extend(label for label in added if label not in labels)
+            self._conn.execute(
+                "UPDATE emails SET labels = ? WHERE id = ?", (" " + " ".join(labels) + " ", message_id)
+            )
+
+    def recent(self, max_results: int = 10) -> List[Dict[str, Any]]:
+        """Return the most recent messages, newest first, excluding trash and spam."""
+        return self._select(["labels NOT LIKE '% TRASH %'", "labels NOT LIKE '% SPAM %'"], [], [], max_results)
+
+    def _select(self, conditions: List[str], params: List[Any], fts_clauses: List[str],
+                max_results: int) -> List[Dict[str, Any]]:
+        sql = "SELECT id, sender, subject, date FROM emails"
+        where = list(conditions)
+        args = list(params)
+        if fts_clauses:
+            where.append("id IN (SELECT id FROM emails_fts WHERE emails_fts MATCH ?)")
+            args.append(" AND ".join(fts_clauses))
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY internal_date DESC LIMIT ?"
+        args.append(max_results)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [{"id": r[0], "from": r[1], "subject": r[2], "date": r[3]} for r in rows]
+
+    def search(self, query: str, max_results: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a Gmail search query from the index.
+
+        Results are only returned when they are guaranteed to match what the
+        API would return: the query must be translatable, and at least
+        max_results matches must fall inside the completely synced window.
+
+        Args:
+            query: Gmail search query
+            max_results: Maximum number of emails to return
+
+        Returns:
+            List of email dicts, newest first, or None if the API must be used.
+        """
+        translated = translate_query(query)
+        if translated is None:
+            return None
+        conditions, params, fts_clauses, include_hidden = translated
+        # Syncs list messages without spam and trash, so those are never complete locally
+        if include_hidden or (fts_clauses and not self.fts_enabled):
+            return None
+
+        with self._lock:
+            history_id = self._get_meta("history_id")
+            window_start = self._get_meta("window_start")
+        if history_id is None or window_start is None:
+            return None
+
+        conditions = conditions + ["labels NOT LIKE '% TRASH %'", "labels NOT LIKE '% SPAM %'"]
+        try:
+            emails = self._select(
+                conditions + ["internal_date >= ?"], params + [int(window_start)], fts_clauses, max_results
+            )
+        except sqlite3.OperationalError:
+            # FTS5 rejected the match expression
+            return None
+
+        if len(emails) < max_results:
+            # Older matches may exist outside the synced window
+            return None
+        return emails
@@ -0,0 +1,296 @@
+import json
+import threading
+import time
+from typing import Dict, Any, Optional, List, Callable
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.credential_manager import atomic_write
+from gmail_calendar_automation.tools.projection import MESSAGE_LIST_FIELDS, HISTORY_LIST_FIELDS
+
+
+class GmailMessageStore:
+    """Local store of message metadata, kept current through Gmail history sync."""
+
+    HIDDEN_LABELS = {"TRASH", "SPAM"}
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize message store.
+
+        Args:
+            path: Optional JSON file used to persist the store between runs
+        """
+        self.path = path
+        self.history_id: Optional[str] = None
+        self._messages: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        """Load store contents from disk if available."""
+        if not self.path:
+            return
+        try:
+            with open(self.path) as store_file:
+                data = json.load(store_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self.history_id = data.get("history_id")
+        self._messages = data.get("messages", {})
+
+    def save(self) -> None:
+        """Persist store contents to disk."""
+        if not self.path:
+            return
+        atomic_write(self.path, json.dumps({
+            "history_id": self.history_id,
+            "messages": self._messages
+        }))
+
+    def clear(self) -> None:
+        """Drop all messages and the stored history ID."""
+        self.history_id = None
+        self._messages = {}
+
+    def __contains__(self, message_id: str) -> bool:
+        return message_id in self._messages
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def upsert(self, message: Dict[str, Any]) -> None:
+        """
+        Add or replace a message.
+
+        Args:
+            message: Metadata-format message resource from the Gmail API
+        """
+        headers = {h["name"]: h["value"] for h in message.get("payload", {}).get("headers", [])}
+        self._messages[message["id"]] = {
+            "email": {
+                "id": message["id"],
+                "from": headers.get("From"),
+                "subject": headers.get("Subject"),
+                "date": headers.get("Date")
+            },
+            "label_ids": message.get("labelIds", []),
+            "internal_date": int(message.get("internalDate", 0))
+        }
+
+    def remove(self, message_id: str) -> None:
+        """Remove a message if present."""
+        self._messages.pop(message_id, None)
+
+    def update_labels(self, message_id: str, added: List[str] = (), removed: List[str] = ()) -> None:
+        """Apply label changes to a stored message."""
+        entry = self._messages.get(message_id)
+        if entry is None:
+            return
+        labels = [label for label in entry["label_ids"] if label not in removed]
+        labels.extend(label for label in added if label not in labels)
+        entry["label_ids"] = labels
+
+    def recent(self, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Return the most recent messages, newest first, excluding trash and spam.
+
+        Args:
+            max_results: Maximum number of emails to return
+
+        Returns:
+            List of email dicts
+        """
+        visible = [
+            entry for entry in self._messages.values()
+            if not self.HIDDEN_LABELS.intersection(entry["label_ids"])
+        ]
+        visible.sort(key=lambda entry: entry["internal_date"], reverse=True)
+        return [dict(entry["email"]) for entry in visible[:max_results]]
+
+
+class GmailSync:
+    """Keeps a GmailMessageStore current using users.history.list."""
+
+    # Number of most recent messages loaded by a full sync
+    FULL_SYNC_LIMIT = 500
+    LIST_PAGE_SIZE = 500
+
+    def __init__(self,
+                 store: GmailMessageStore,
+                 fetch_metadata: Callable[[List[str], Any], List[Dict[str, Any]]],
+                 execute: Callable[[Any, str], Any]):
+        """
+        Initialize Gmail sync.
+
+        Args:
+            store: Store to keep up to date
+            fetch_metadata: Callable returning metadata-format message resources
+                for a list of IDs, in order (used to fetch added messages)
+            execute: Callable executing a request given its operation name
+                (applies quota pacing and call statistics)
+        """
+        self.store = store
+        self._fetch_metadata = fetch_metadata
+        self._execute = execute
+        self._lock = threading.Lock()
+        self._last_sync: Optional[float] = None
+        # While a users.watch is active, syncs are skipped until a notification marks the store dirty
+        self._watch_until: Optional[float] = None
+        self._dirty = True
+
+    def set_watch(self, expires_at: Optional[float]) -> None:
+        """
+        Enable push mode until a mailbox watch expires.
+
+        Args:
+            expires_at: Watch expiry as a Unix timestamp, or None to disable push mode
+        """
+        self._watch_until = expires_at
+        # Changes made before the watch started have not been notified
+        self._dirty = True
+
+    def is_watched(self) -> bool:
+        """Whether a mailbox watch is currently active."""
+        return self._watch_until is not None and time.time() < self._watch_until
+
+    def mark_dirty(self, history_id: Optional[str] = None) -> bool:
+        """
+        Record a change notification.
+
+        Args:
+            history_id: Mailbox history ID carried by the notification (optional)
+
+        Returns:
+            True if the store is now stale, False if it already covers the change
+        """
+        if history_id is not None and self.store.history_id is not None:
+            if int(history_id) <= int(self.store.history_id):
+                return False
+        self._dirty = True
+        return True
+
+    def sync(self, service, max_age: float = 0) -> Dict[str, Any]:
+        """
+        Bring the store up to date, incrementally when possible.
+
+        While a mailbox watch is active the sync is skipped until a change
+        notification arrives, so no API calls are made while the mailbox is idle.
+
+        Args:
+            service: Gmail service object
+            max_age: Skip the sync if the store was synced less than this many seconds ago
+
+        Returns:
+            Dict describing the sync that was performed
+        """
+        with self._lock:
+            if self.store.history_id is not None:
+                if self.is_watched():
+                    if not self._dirty:
+                        return {"mode": "cached"}
+                elif (max_age and self._last_sync is not None
+                        and time.monotonic() - self._last_sync < max_age):
+                    return {"mode": "cached"}
+            # Cleared before syncing so notifications arriving meanwhile trigger another sync
+            self._dirty = False
+            try:
+                if self.store.history_id is None:
+                    result = self._full_sync(service)
+                else:
+                    try:
+                        result = self._incremental_sync(service)
+                    except google_api.HttpError as e:
+                        # 404 means the stored history ID is too old to replay
+                        if e.resp.status != 404:
+                            raise
+                        result = self._full_sync(service)
+            except Exception:
+                self._dirty = True
+                raise
+            self.store.save()
+            self._last_sync = time.monotonic()
+            return result
+
+    def _store_messages(self, message_ids: List[str], service) -> int:
+        """Fetch and store metadata for the given IDs, returning how many failed."""
+        failed = 0
+        for message in self._fetch_metadata(message_ids, service):
+            if "error" in message:
+                failed += 1
+            else:
+                self.store.upsert(message)
+        return failed
+
+    def _full_sync(self, service) -> Dict[str, Any]:
+        """Reload the most recent messages from scratch."""
+        # Read the history ID first so changes made during the listing are replayed next time
+        history_id = self._execute(service.users().getProfile(userId="me"), "users.getProfile")["historyId"]
+
+        message_ids: List[str] = []
+        page_token = None
+        while len(message_ids) < self.FULL_SYNC_LIMIT:
+            response = self._execute(service.users().messages().list(
+                userId="me",
+                maxResults=min(self.LIST_PAGE_SIZE, self.FULL_SYNC_LIMIT - len(message_ids)),
+                pageToken=page_token,
+                fields=MESSAGE_LIST_FIELDS
+            ), "messages.list")
+            message_ids.extend(msg["id"] for msg in response.get("messages", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        self.store.clear()
+        failed = self._store_messages(message_ids, service)
+        # Without a history ID the store is not trusted as complete, and the next sync starts over
+        if not failed:
+            self.store.history_id = history_id
+        return {"mode": "full", "added": len(message_ids) - failed, "failed": failed}
+
+    def _incremental_sync(self, service) -> Dict[str, Any]:
+        """Replay mailbox history since the stored history ID."""
+        added: List[str] = []
+        deleted = 0
+        label_changes = 0
+        page_token = None
+        history_id = self.store.history_id
+
+        while True:
+            response = self._execute(service.users().history().list(
+                userId="me",
+                startHistoryId=self.store.history_id,
+                pageToken=page_token,
+                fields=HISTORY_LIST_FIELDS
+            ), "history.list")
+
+            for record in response.get("history", []):
+                for item in record.get("messagesAdded", []):
+                    if item["message"]["id"] not in added:
+                        added.append(item["message"]["id"])
+                for item in record.get("messagesDeleted", []):
+                    message_id = item["message"]["id"]
+                    if message_id in added:
+                        added.remove(message_id)
+                    self.store.remove(message_id)
+                    deleted += 1
+                for item in record.get("labelsAdded", []):
+                    self.store.update_labels(item["message"]["id"], added=item.get("labelIds", []))
+                    label_changes += 1
+                for item in record.get("labelsRemoved", []):
+                    self.store.update_labels(item["message"]["id"], removed=item.get("labelIds", []))
+                    label_changes += 1
+
+            history_id = response.get("historyId", history_id)
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        # Added messages are fetched last so they carry their current labels
+        failed = self._store_messages(added, service) if added else 0
+        # Messages missing from the store would be left out of local answers: reload it all next time
+        self.store.history_id = history_id if not failed else None
+        return {
+            "mode": "incremental",
+            "added": len(added) - failed,
+            "deleted": deleted,
+            "label_changes": label_changes,
+            "failed": failed
+        }
@@ -1,62 +1,155 @@
+import asyncio
 import base64
-import json
+import contextvars
+import hashlib
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.message import EmailMessage
-from typing import Dict, Any, Optional
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from google.auth.exceptions import RefreshError
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Iterator, Tuple, Callable
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.credential_manager import CredentialManager, get_credential_manager
+from gmail_calendar_automation.tools.service_cache import get_service
+from gmail_calendar_automation.tools.call_stats import CallStats
+from gmail_calendar_automation.tools.gmail_sync import GmailSync, GmailMessageStore
+from gmail_calendar_automation.tools.email_index import EmailIndex
+from gmail_calendar_automation.tools.async_client import AsyncGoogleClient, GoogleApiError, GMAIL_BASE_URL
+from gmail_calendar_automation.tools.rate_limiter import QuotaScheduler, gmail_scheduler, is_rejected
+from gmail_calendar_automation.tools.mime_utils import (
+    iter_parts, decode_base64url, part_charset, find_body_part, attachment_parts, iter_base64url_chunks, extract_text,
+    Base64urlStreamDecoder, iter_json_string_field
+)
+from gmail_calendar_automation.tools.projection import (
+    MESSAGE_LIST_FIELDS, MESSAGE_METADATA_FIELDS, MESSAGE_FULL_FIELDS, MESSAGE_PARTS_FIELDS, CHARS_PER_TOKEN
+)
+from gmail_calendar_automation.tools.attachment_store import AttachmentStore
+from gmail_calendar_automation.tools.bulk_mail import BulkMailEngine, BulkCheckpoint, BATCH_MODIFY, BATCH_DELETE
+from gmail_calendar_automation.tools.send_queue import (
+    SendQueue, MessageTemplate, SEND, DRAFT, DONE, FAILED, idempotency_key, message_id_header
+)
+from gmail_calendar_automation.tools.tracing import traced_tool, tracer
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
 
+
+@traced_tool("gmail")
 class GmailTool:
     """Tool for Gmail operations designed for AI agent use."""
 
     SCOPES = ["https://www.googleapis.com/auth/gmail.send", "https://www.googleapis.com/auth/gmail.readonly"]
+    # Labelling, trashing and drafts need gmail.modify; it is requested when first needed
+    MODIFY_SCOPE = "https://www.googleapis.com/auth/gmail.modify"
+    # messages.batchDelete deletes permanently and needs full mailbox access
+    FULL_ACCESS_SCOPE = "https://mail.google.com/"
+    # Labels every mailbox has; they are addressed by ID rather than by name
+    SYSTEM_LABELS = {"INBOX", "UNREAD", "STARRED", "IMPORTANT", "SPAM", "TRASH", "SENT", "DRAFT"}
+    METADATA_HEADERS = ["From", "Subject", "Date"]
+    # Gmail accepts at most 100 sub-requests per batch HTTP request
+    BATCH_SIZE = 100
+    # Seconds a synced local index is trusted before the next history check
+    INDEX_MAX_AGE = 30
+    # messages.list returns at most 500 IDs per page
+    MAX_PAGE_SIZE = 500
+    # Default size of a message body returned by get_mail_info, in tokens
+    BODY_TOKEN_BUDGET = int(os.getenv("MAIL_BODY_TOKEN_BUDGET") or 2000)
+    # Directory receiving attachments saved by save_attachments
+    ATTACHMENTS_DIR = os.getenv("ATTACHMENTS_DIR") or "attachments"
+    # Concurrent attachment downloads per save_attachments call
+    ATTACHMENT_WORKERS = 4
+    # Bytes of an attachment response read at a time
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    # Threads sending queued messages; the quota scheduler sets the actual pace
+    SEND_WORKERS = 4
 
-    def __init__(self, app_credentials_path: str, user_token_path:str = os.getenv('TOKEN')):
+    def __init__(self,
+                 app_credentials_path: str,
+                 user_token_path:str = os.getenv('TOKEN'),
+                 sync_store_path: Optional[str] = os.getenv('GMAIL_SYNC_STORE'),
+                 index_path: Optional[str] = os.getenv('GMAIL_INDEX_PATH'),
+                 bulk_checkpoint_path: Optional[str] = os.getenv('GMAIL_BULK_CHECKPOINT'),
+                 send_queue_path: Optional[str] = os.getenv('GMAIL_SEND_QUEUE'),
+                 credential_manager: Optional[CredentialManager] = None,
+                 scheduler: Optional[QuotaScheduler] = None,
+                 attachments_dir: Optional[str] = None):
         """
         Initialize Gmail tool.
 
         Args:
             user_token_path: Path to user token JSON file
             app_credentials_path: Path to app credentials JSON file
+            sync_store_path: Path to JSON file persisting the incremental sync store (optional)
+            index_path: Path to SQLite file for the local search index (optional).
+                When set, the index replaces the JSON sync store.
+            bulk_checkpoint_path: Path to JSON file keeping the progress of
+                arrange_mails and delete_mails jobs, so they resume after a restart (optional)
+            send_queue_path: Path to SQLite file persisting the outbound queue of
+                send_bulk_emails and create_drafts (optional)
+            credential_manager: Credential manager to use instead of the one shared
+                by every tool using user_token_path, e.g. one per user (optional)
+            scheduler: Quota scheduler of the user, e.g. one per user (defaults to
+                the scheduler of the single-account tools)
+            attachments_dir: Directory receiving attachments (defaults to ATTACHMENTS_DIR)
         """
         self.user_token_path = user_token_path
         self.app_credentials_path = app_credentials_path
-        self._credentials = None
-        self._load_credentials()
-
-    def _load_credentials(self) -> None:
-        """Load credentials from token file if available."""
-        try:
-            self._credentials = Credentials.from_authorized_user_file(
-                self.user_token_path, self.SCOPES
+        self.attachments_dir = attachments_dir or self.ATTACHMENTS_DIR
+        self.call_stats = CallStats()
+        self.scheduler = scheduler or gmail_scheduler
+        self._index = EmailIndex(index_path) if index_path else None
+        self._sync = GmailSync(
+            self._index or GmailMessageStore(sync_store_path), self._batch_get_metadata, self._execute
+        )
+        if credential_manager is not None:
+            credential_manager.add_scopes(self.SCOPES)
+            self._credential_manager = credential_manager
+        else:
+            self._credential_manager = get_credential_manager(
+                user_token_path, app_credentials_path, self.SCOPES
             )
-        except (FileNotFoundError, json.JSONDecodeError):
-            self._credentials = None
+        self._async_client = AsyncGoogleClient(self._credential_manager)
+        self._bulk = BulkMailEngine(self._require_service, self._execute, BulkCheckpoint(bulk_checkpoint_path))
+        self._outbox = SendQueue(send_queue_path or ":memory:")
+        # One AuthorizedSession per download thread; requests sessions are not thread-safe
+        self._download_sessions = threading.local()
+
+    @property
+    def credential_manager(self) -> CredentialManager:
+        """Credential manager holding this tool's OAuth credentials."""
+        return self._credential_manager
 
-    def _save_credentials(self, credentials: Credentials) -> None:
-        """Save credentials to token file."""
-        with open(self.user_token_path, 'w') as token_file:
-            token_file.write(credentials.to_json())
+    @property
+    def _credentials(self) -> Optional["Credentials"]:
+        """Credentials shared with every tool using the same credential manager."""
+        return self._credential_manager.credentials
 
     def _ensure_valid_credentials(self) -> bool:
         """Ensure credentials are valid and refresh if needed."""
-        if not self._credentials:
-            return False
+        return self._credential_manager.ensure_valid()
 
-        if self._credentials.expired and self._credentials.refresh_token:
-            try:
-                self._credentials.refresh(Request())
-                self._save_credentials(self._credentials)
-                return True
-            except RefreshError:
-                return False
+    def _missing_scope(self, scope: str) -> Optional[Dict[str, Any]]:
+        """
+        Check that the token grants a scope an operation needs.
 
-        return not self._credentials.expired
+        A missing scope is registered with the credential manager, so the next
+        authenticate() requests it; the current token keeps working for
+        everything else.
+
+        Args:
+            scope: Scope needed by the operation
+
+        Returns:
+            Error result for the agent, or None if the scope is granted
+        """
+        if self._credential_manager.has_scopes([scope]) or self._credential_manager.has_scopes([self.FULL_ACCESS_SCOPE]):
+            return None
+        self._credential_manager.add_scopes([scope])
+        return {
+            "success": False,
+            "message": "This operation needs additional Gmail permissions. Please call authenticate() again to grant them.",
+            "error_code": "SCOPE_REQUIRED"
+        }
 
     def authenticate(self) -> Dict[str, Any]:
         """
@@ -66,12 +159,7 @@ class GmailTool:
             Dict with success status and message
         """
         try:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                self.app_credentials_path, scopes=self.SCOPES
-            )
-            credentials = flow.run_local_server(port=0)
-            self._credentials = credentials
-            self._save_credentials(credentials)
+            self._credential_manager.authenticate()
 
             return {
                 "success": True,
@@ -97,18 +185,9 @@ class GmailTool:
                 "message": "No credentials found. Please authenticate first."
             }
 
-        has_refresh_token = bool(self._credentials.refresh_token)
-        is_valid = self._ensure_valid_credentials()
-        is_expired = self._credentials.expired
-
-
-        return {
-            "authenticated": True,
-            "valid": is_valid,
-            'expired' : is_expired,
-            "has_refresh_token": has_refresh_token,
-            "message": "Ready to send emails" if is_valid else "Authentication required"
-        }
+        status = self._credential_manager.get_auth_status()
+        status["message"] = "Ready to send emails" if status["valid"] else "Authentication required"
+        return status
 
     def send_email(self,
                    to: str,
@@ -143,24 +222,14 @@ class GmailTool:
 
         try:
             # Build Gmail service
-            service = build("gmail", "v1", credentials=self._credentials)
+            service = get_service("gmail", "v1", self._credentials)
 
-            # Create email message
-            message = EmailMessage()
-            message.set_content(content)
-            message["To"] = to
-            if from_email:
-                message["From"] = from_email
-            message["Subject"] = subject
+            # Create, encode and send email message
+            create_message = self._encode_message(to, subject, content, from_email)
 
-            # Encode and send
-            encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-            create_message = {"raw": encoded_message}
-
-            result = service.users().messages().send(
-                userId="me",
-                body=create_message
-            ).execute()
+            result = self._execute(
+                service.users().messages().send(userId="me", body=create_message), "messages.send"
+            )
 
             return {
                 "success": True,
@@ -168,16 +237,10 @@ class GmailTool:
                 "message": f"Email sent successfully to {to}"
             }
 
-        except HttpError as e:
-            error_msg = f"Gmail API error: {str(e)}"
-            if e.resp.status == 401:
-                error_msg = "Authentication expired. Please re-authenticate."
-            elif e.resp.status == 403:
-                error_msg = "Insufficient permissions. Check Gmail API access."
-
+        except google_api.HttpError as e:
             return {
                 "success": False,
-                "message": error_msg
+                "message": self._api_error_message(e.resp.status, str(e))
             }
         except Exception as e:
             return {
@@ -185,13 +248,19 @@ class GmailTool:
                 "message": f"Unexpected error: {str(e)}"
             }
 
-    def retrieve_emails(self, max_results: int = 10, query: Optional[str] = None) -> Dict[str, Any]:
+    def retrieve_emails(self,
+                        max_results: int = 10,
+                        query: Optional[str] = None,
+                        incremental: bool = False) -> Dict[str, Any]:
         """
         Retrieve recent emails from Gmail.
 
         Args:
             max_results: Maximum number of emails to retrieve.
             query: Gmail search query (e.g., 'is:unread', 'from:example@gmail.com').
+            incremental: Answer from the local message store after syncing only
+                the mailbox changes since the last call. Ignored when a query is given.
+                Always on when a local index is configured or a mailbox watch is active.
 
         Returns:
             Dict with success status and list of emails.
@@ -204,55 +273,694 @@ class GmailTool:
             }
 
         try:
-            service = build("gmail", "v1", credentials=self._credentials)
+            service = get_service("gmail", "v1", self._credentials)
 
-            # 📩 List messages
-            results = service.users().messages().list(
-                userId="me",
-                maxResults=max_results,
-                q=query
-            ).execute()
+            if self._index is not None:
+                self._sync.sync(service, max_age=self.INDEX_MAX_AGE)
+                emails = self._index.search(query, max_results) if query else self._index.recent(max_results)
+                if emails is not None:
+                    self.call_stats.record_payload("retrieve_emails", emails)
+                    return {
+                        "success": True,
+                        "emails": emails,
+                        "message": f"Retrieved {len(emails)} messages from the local index."
+                    }
+            elif (incremental or self._sync.is_watched()) and not query:
+                sync_result = self._sync.sync(service)
+                emails = self._sync.store.recent(max_results)
+                self.call_stats.record_payload("retrieve_emails", emails)
+                return {
+                    "success": True,
+                    "emails": emails,
+                    "message": f"Retrieved {len(emails)} messages ({sync_result['mode']} sync)."
+                }
 
-            messages = results.get("messages", [])
-            if not messages:
+            # 📩 List messages, following page tokens until max_results is reached
+            emails = list(self.iter_emails(
+                query=query, page_size=min(max_results, self.MAX_PAGE_SIZE), limit=max_results, service=service
+            ))
+            if not emails:
                 return {
                     "success": True,
                     "emails": [],
                     "message": "No messages found."
                 }
 
-            emails = []
-            for msg in messages:
-                msg_data = service.users().messages().get(
-                    userId="me",
-                    id=msg["id"],
-                    format="metadata",
-                    metadataHeaders=["From", "Subject", "Date"]
-                ).execute()
+            failed = [email for email in emails if "error" in email]
 
-                headers = {h["name"]: h["value"] for h in msg_data["payload"]["headers"]}
-                emails.append({
-                    "id": msg["id"],
-                    "from": headers.get("From"),
-                    "subject": headers.get("Subject"),
-                    "date": headers.get("Date")
-                })
+            result = {
+                "success": True,
+                "emails": emails,
+                "message": f"Retrieved {len(emails) - len(failed)} messages."
+            }
+            if failed:
+                result["message"] += f" {len(failed)} could not be fetched."
+            self.call_stats.record_payload("retrieve_emails", result["emails"])
+            return result
+
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": self._api_error_message(e.resp.status, str(e))
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}"
+            }
+
+    def _iter_message_id_pages(self,
+                               service,
+                               query: Optional[str],
+                               page_size: int,
+                               limit: Optional[int]) -> Iterator[List[str]]:
+        """Yield pages of message IDs matching a query, following nextPageToken lazily."""
+        remaining = limit
+        page_token = None
+        while remaining is None or remaining > 0:
+            max_results = min(page_size, self.MAX_PAGE_SIZE)
+            if remaining is not None:
+                max_results = min(max_results, remaining)
+            response = self._execute(service.users().messages().list(
+                userId="me",
+                maxResults=max_results,
+                q=query,
+                pageToken=page_token,
+                fields=MESSAGE_LIST_FIELDS
+            ), "messages.list")
+
+            message_ids = [msg["id"] for msg in response.get("messages", [])]
+            if remaining is not None:
+                message_ids = message_ids[:remaining]
+                remaining -= len(message_ids)
+            if message_ids:
+                yield message_ids
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return
+
+    def _require_service(self, service=None):
+        """Return a Gmail service, raising PermissionError if credentials are unusable."""
+        if service is not None:
+            return service
+        if not self._ensure_valid_credentials():
+            raise PermissionError("Authentication required. Please call authenticate() first.")
+        return get_service("gmail", "v1", self._credentials)
+
+    def iter_message_ids(self,
+                         query: Optional[str] = None,
+                         page_size: int = MAX_PAGE_SIZE,
+                         limit: Optional[int] = None,
+                         service=None) -> Iterator[str]:
+        """
+        Lazily iterate over the IDs of messages matching a query.
+
+        Args:
+            query: Gmail search query
+            page_size: Number of IDs requested per page (at most 500)
+            limit: Stop after this many IDs (unbounded when omitted)
+            service: Gmail service object to reuse (optional)
+
+        Yields:
+            Message IDs, newest first
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If a Gmail API request fails
+        """
+        service = self._require_service(service)
+        for page in self._iter_message_id_pages(service, query, page_size, limit):
+            yield from page
+
+    def iter_emails(self,
+                    query: Optional[str] = None,
+                    page_size: int = 100,
+                    limit: Optional[int] = None,
+                    service=None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over emails matching a query.
+
+        Only one page of messages is held in memory at a time; the metadata of
+        each page is fetched with batch requests. Stopping the iteration early
+        stops further API calls.
+
+        Args:
+            query: Gmail search query
+            page_size: Number of messages fetched per page (at most 500)
+            limit: Stop after this many emails (unbounded when omitted)
+            service: Gmail service object to reuse (optional)
+
+        Yields:
+            Email dicts with id, from, subject and date (or id and error)
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If a Gmail API request fails
+        """
+        service = self._require_service(service)
+        for page in self._iter_message_id_pages(service, query, page_size, limit):
+            yield from self._fetch_metadata(page, service)
+
+    def _fetch_metadata(self, message_ids: List[str], service) -> List[Dict[str, Any]]:
+        """
+        Fetch From/Subject/Date metadata for many messages using batch requests.
+
+        Args:
+            message_ids: IDs of the messages to fetch
+            service: Gmail service object
+
+        Returns:
+            List of email dicts in the same order as message_ids. Messages that
+            could not be fetched carry an "error" key instead of headers.
+        """
+        emails = []
+        for message in self._batch_get_metadata(message_ids, service):
+            if "error" in message:
+                emails.append(message)
+                continue
+            if self._index is not None:
+                self._index.upsert(message)
+            emails.append(self._email_from_metadata(message))
+        if self._index is not None:
+            self._index.save()
+        return emails
+
+    def _batch_get_metadata(self, message_ids: List[str], service) -> List[Dict[str, Any]]:
+        """
+        Fetch metadata-format message resources using batch requests.
+
+        Args:
+            message_ids: IDs of the messages to fetch
+            service: Gmail service object
+
+        Returns:
+            List of message resources in the same order as message_ids, or
+            {"id", "error"} dicts for messages that could not be fetched.
+        """
+        return self._batch_get(
+            message_ids, service, format="metadata", metadataHeaders=self.METADATA_HEADERS, fields=MESSAGE_METADATA_FIELDS
+        )
+
+    def _batch_get(self, message_ids: List[str], service, **params) -> List[Dict[str, Any]]:
+        """
+        Fetch message resources using batch requests.
+
+        Args:
+            message_ids: IDs of the messages to fetch
+            service: Gmail service object
+            params: Other messages.get parameters (format, fields...)
+
+        Returns:
+            List of message resources in the same order as message_ids, or
+            {"id", "error"} dicts for messages that could not be fetched.
+        """
+        requests = [service.users().messages().get(userId="me", id=message_id, **params) for message_id in message_ids]
+        results = self.scheduler.execute_batch(
+            service, requests, "messages.get", self.BATCH_SIZE, self.call_stats
+        )
+        return [
+            {"id": message_id, "error": str(exception)} if exception is not None else response
+            for message_id, (response, exception) in zip(message_ids, results)
+        ]
+
+    @staticmethod
+    def _email_from_metadata(msg_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a metadata-format message resource to the email dict returned to the agent."""
+        headers = {h["name"]: h["value"] for h in msg_data.get("payload", {}).get("headers", [])}
+        return {
+            "id": msg_data["id"],
+            "from": headers.get("From"),
+            "subject": headers.get("Subject"),
+            "date": headers.get("Date")
+        }
+
+    def _execute(self, request, operation: str) -> Any:
+        """Execute a request through the shared Gmail quota scheduler."""
+        return self.scheduler.execute(request, operation, self.call_stats)
+
+    @staticmethod
+    def _encode_message(to: str,
+                        subject: str,
+                        content: str,
+                        from_email: Optional[str] = None,
+                        message_id: Optional[str] = None) -> Dict[str, str]:
+        """Build the messages.send request body for a plain-text email."""
+        message = EmailMessage()
+        message.set_content(content)
+        message["To"] = to
+        if from_email:
+            message["From"] = from_email
+        message["Subject"] = subject
+        if message_id:
+            message["Message-ID"] = message_id
+        return {"raw": base64.urlsafe_b64encode(message.as_bytes()).decode()}
+
+    @staticmethod
+    def _api_error_message(status: int, detail: str) -> str:
+        """Translate a Gmail API error status into a message for the agent."""
+        if status == 401:
+            return "Authentication expired. Please re-authenticate."
+        if status == 403:
+            return "Insufficient permissions. Check Gmail API access."
+        return f"Gmail API error: {detail}"
+
+    async def send_email_async(self,
+                               to: str,
+                               subject: str,
+                               content: str,
+                               from_email: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send an email via Gmail without blocking the event loop.
+
+        Args:
+            to: Recipient email address
+            subject: Email subject
+            content: Email content/body
+            from_email: Sender email (optional, uses authenticated user's email)
+
+        Returns:
+            Dict with operation result
+        """
+        if not to or not subject or not content:
+            return {
+                "success": False,
+                "message": "Missing required fields: to, subject, and content are required"
+            }
+
+        if not await self._async_client.ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first."
+            }
+
+        try:
+            create_message = self._encode_message(to, subject, content, from_email)
+            result = await self.scheduler.execute_async(
+                lambda: self._async_client.request("POST", f"{GMAIL_BASE_URL}/messages/send", json=create_message),
+                "messages.send",
+                self.call_stats
+            )
 
             return {
                 "success": True,
-                "emails": emails,
-                "message": f"Retrieved {len(emails)} messages."
+                "message_id": result.get("id"),
+                "message": f"Email sent successfully to {to}"
+            }
+
+        except GoogleApiError as e:
+            return {
+                "success": False,
+                "message": self._api_error_message(e.status, str(e))
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}"
+            }
+
+    async def retrieve_emails_async(self,
+                                    max_results: int = 10,
+                                    query: Optional[str] = None,
+                                    incremental: bool = False) -> Dict[str, Any]:
+        """
+        Retrieve recent emails from Gmail without blocking the event loop.
+
+        Runs retrieve_emails in a worker thread, so message metadata is still
+        fetched with batch requests and the local index or sync store is used.
+
+        Args:
+            max_results: Maximum number of emails to retrieve.
+            query: Gmail search query (e.g., 'is:unread', 'from:example@gmail.com').
+            incremental: Answer from the local message store after syncing only
+                the mailbox changes since the last call. Ignored when a query is given.
+
+        Returns:
+            Dict with success status and list of emails.
+        """
+        return await asyncio.to_thread(self.retrieve_emails, max_results, query, incremental)
+
+    CALENDAR_MIME_TYPES = ("text/calendar", "application/ics")
+
+    def get_calendar_invites(self, message_id: str, service=None) -> List[str]:
+        """
+        Return the iCalendar documents attached to or embedded in a message.
+
+        Args:
+            message_id: ID of the message
+            service: Gmail service object to reuse (optional)
+
+        Returns:
+            List of iCalendar texts (empty if the message has no invite)
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If a Gmail API request fails
+        """
+        service = self._require_service(service)
+        message = self._execute(
+            service.users().messages().get(userId="me", id=message_id, format="full", fields="id,payload"),
+            "messages.get"
+        )
+
+        invites = []
+        for part in iter_parts(message.get("payload", {})):
+            is_calendar = (part.get("mimeType", "").lower() in self.CALENDAR_MIME_TYPES
+                           or part.get("filename", "").lower().endswith(".ics"))
+            if not is_calendar:
+                continue
+            body = part.get("body", {})
+            if body.get("data"):
+                data = decode_base64url(body["data"])
+            elif body.get("attachmentId"):
+                attachment = self._execute(service.users().messages().attachments().get(
+                    userId="me", messageId=message_id, id=body["attachmentId"]
+                ), "messages.attachments.get")
+                data = decode_base64url(attachment["data"])
+            else:
+                continue
+            invites.append(data.decode(part_charset(part), errors="replace"))
+        return invites
+
+    def watch_mailbox(self, topic_name: str, label_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Start (or renew) push notifications for mailbox changes.
+
+        Gmail publishes a message to the Pub/Sub topic whenever the mailbox
+        changes. While the watch is active, syncs are skipped until
+        mark_mailbox_changed() reports a change.
+
+        Args:
+            topic_name: Pub/Sub topic, e.g. 'projects/my-project/topics/gmail'
+            label_ids: Only notify changes to these labels (all changes when omitted)
+
+        Returns:
+            users.watch response with 'historyId' and 'expiration' (ms since epoch)
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If the Gmail API request fails
+        """
+        service = self._require_service()
+        body: Dict[str, Any] = {"topicName": topic_name}
+        if label_ids:
+            body["labelIds"] = label_ids
+            body["labelFilterBehavior"] = "include"
+        response = self._execute(service.users().watch(userId="me", body=body), "users.watch")
+        self._sync.set_watch(int(response["expiration"]) / 1000)
+        return response
+
+    def stop_mailbox_watch(self) -> None:
+        """
+        Stop push notifications and go back to syncing on every read.
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If the Gmail API request fails
+        """
+        self._sync.set_watch(None)
+        service = self._require_service()
+        self._execute(service.users().stop(userId="me"), "users.stop")
+
+    def mark_mailbox_changed(self, history_id: Optional[str] = None) -> bool:
+        """
+        Record a mailbox change notification.
+
+        Args:
+            history_id: History ID carried by the notification (optional)
+
+        Returns:
+            True if the local store needs a sync to include the change
+        """
+        return self._sync.mark_dirty(history_id)
+
+    def refresh_mailbox(self) -> Dict[str, Any]:
+        """
+        Sync the local store now, e.g. after a change notification.
+
+        Returns:
+            Dict describing the sync that was performed
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If a Gmail API request fails
+        """
+        return self._sync.sync(self._require_service())
+
+    def get_mail_info(self, message_id: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Retrieve one email with its readable body and the list of its attachments.
+
+        The body is the plain-text part (or the HTML part converted to text),
+        truncated to a token budget. Attachments are listed with their IDs but
+        not downloaded.
+
+        Args:
+            message_id: ID of the message (as returned by retrieve_emails).
+            max_tokens: Maximum size of the returned body in tokens (defaults to MAIL_BODY_TOKEN_BUDGET or 2000).
+
+        Returns:
+            Dict with success status and the email (headers, body, attachments).
+        """
+        if not message_id:
+            return {
+                "success": False,
+                "message": "Missing required field: message_id"
+            }
+
+        if not self._ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first."
+            }
+
+        try:
+            service = get_service("gmail", "v1", self._credentials)
+            message = self._execute(service.users().messages().get(
+                userId="me", id=message_id, format="full", fields=MESSAGE_FULL_FIELDS
+            ), "messages.get")
+
+            body_part = find_body_part(message.get("payload", {}))
+            data = ""
+            if body_part is not None:
+                body = body_part.get("body", {})
+                data = body.get("data", "")
+                # Gmail moves large body parts out of the message like attachments
+                if not data and body.get("attachmentId"):
+                    data = self._execute(service.users().messages().attachments().get(
+                        userId="me", messageId=message_id, id=body["attachmentId"]
+                    ), "messages.attachments.get").get("data", "")
+
+            return self._mail_info_result(message, body_part, data, max_tokens)
+
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": self._api_error_message(e.resp.status, str(e))
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}"
+            }
+
+    async def get_mail_info_async(self, message_id: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Retrieve one email with its readable body and the list of its attachments, without blocking the event loop.
+
+        The body is the plain-text part (or the HTML part converted to text),
+        truncated to a token budget. Attachments are listed with their IDs but
+        not downloaded.
+
+        Args:
+            message_id: ID of the message (as returned by retrieve_emails).
+            max_tokens: Maximum size of the returned body in tokens (defaults to MAIL_BODY_TOKEN_BUDGET or 2000).
+
+        Returns:
+            Dict with success status and the email (headers, body, attachments).
+        """
+        if not message_id:
+            return {
+                "success": False,
+                "message": "Missing required field: message_id"
+            }
+
+        if not await self._async_client.ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first."
+            }
+
+        try:
+            message = await self.scheduler.execute_async(
+                lambda: self._async_client.request(
+                    "GET", f"{GMAIL_BASE_URL}/messages/{message_id}",
+                    params={"format": "full", "fields": MESSAGE_FULL_FIELDS}
+                ),
+                "messages.get",
+                self.call_stats
+            )
+
+            body_part = find_body_part(message.get("payload", {}))
+            data = ""
+            if body_part is not None:
+                body = body_part.get("body", {})
+                data = body.get("data", "")
+                if not data and body.get("attachmentId"):
+                    attachment = await self.scheduler.execute_async(
+                        lambda: self._async_client.request(
+                            "GET", f"{GMAIL_BASE_URL}/messages/{message_id}/attachments/{body['attachmentId']}"
+                        ),
+                        "messages.attachments.get",
+                        self.call_stats
+                    )
+                    data = attachment.get("data", "")
+
+            return self._mail_info_result(message, body_part, data, max_tokens)
+
+        except GoogleApiError as e:
+            return {
+                "success": False,
+                "message": self._api_error_message(e.status, str(e))
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}"
             }
 
-        except HttpError as e:
-            error_msg = f"Gmail API error: {str(e)}"
-            if e.resp.status == 401:
-                error_msg = "Authentication expired. Please re-authenticate."
-            elif e.resp.status == 403:
-                error_msg = "Insufficient permissions. Check Gmail API access."
+    def _mail_info_result(self,
+                          message: Dict[str, Any],
+                          body_part: Optional[Dict[str, Any]],
+                          data: str,
+                          max_tokens: Optional[int]) -> Dict[str, Any]:
+        """Build the get_mail_info result, decoding only as much of the body as the budget needs."""
+        payload = message.get("payload", {})
+        headers = {h["name"].lower(): h["value"] for h in payload.get("headers", [])}
+        budget = (max_tokens or self.BODY_TOKEN_BUDGET) * CHARS_PER_TOKEN
+
+        text, truncated = "", False
+        if body_part is not None and data:
+            text, truncated = extract_text(
+                iter_base64url_chunks(data), body_part.get("mimeType", "text/plain"), part_charset(body_part), budget
+            )
+
+        email = {
+            "id": message["id"],
+            "thread_id": message.get("threadId"),
+            "from": headers.get("from"),
+            "to": headers.get("to"),
+            "cc": headers.get("cc"),
+            "subject": headers.get("subject"),
+            "date": headers.get("date"),
+            "labels": message.get("labelIds", []),
+            "body": text or message.get("snippet", ""),
+            "body_truncated": truncated,
+            "attachments": attachment_parts(payload)
+        }
+        self.call_stats.record_payload("get_mail_info", email)
+
+        result = {
+            "success": True,
+            "email": email,
+            "message": "Retrieved the message." if text else "Retrieved the message; it has no text body."
+        }
+        if truncated:
+            result["message"] += f" The body was truncated to about {max_tokens or self.BODY_TOKEN_BUDGET} tokens."
+        return result
+
+    def save_attachments(self, message_ids: List[str], directory: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Download the attachments of emails to a local directory.
+
+        Each attachment is decoded while it arrives and written straight to disk,
+        several at a time, so memory use does not grow with attachment size. Files
+        with the same content are stored once, and attachments saved by an earlier
+        call are not downloaded again.
+
+        Args:
+            message_ids: IDs of the messages (as returned by retrieve_emails).
+            directory: Subdirectory of ATTACHMENTS_DIR (default 'attachments') receiving the
+                files (optional). Absolute paths and '..' are rejected.
+
+        Returns:
+            Dict with success status and, per attachment, the message ID, filename,
+            path, size, sha256 and status ('saved', 'duplicate', 'skipped' or 'error').
+        """
+        if not message_ids:
             return {
                 "success": False,
-                "message": error_msg
+                "message": "Missing required field: message_ids"
+            }
+
+        if not self._ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first."
+            }
+
+        try:
+            target = self._attachments_directory(directory)
+        except ValueError as e:
+            return {
+                "success": False,
+                "message": str(e)
+            }
+
+        try:
+            store = AttachmentStore(target)
+            service = get_service("gmail", "v1", self._credentials)
+            # Only the MIME structure: attachment bodies are streamed separately
+            messages = self._batch_get(message_ids, service, format="full", fields=MESSAGE_PARTS_FIELDS)
+
+            results: List[Dict[str, Any]] = []
+            downloads = []
+            for message in messages:
+                if "error" in message:
+                    results.append({"message_id": message["id"], "status": "error", "error": message["error"]})
+                    continue
+                for attachment in attachment_parts(message.get("payload", {})):
+                    result = {"message_id": message["id"], "filename": attachment["filename"]}
+                    saved = store.known(message["id"], attachment["part_id"])
+                    if saved is not None:
+                        result.update(saved, status="skipped")
+                    elif not attachment["attachment_id"]:
+                        result.update(status="error", error="Attachment has no downloadable content")
+                    else:
+                        downloads.append((result, attachment))
+                    results.append(result)
+
+            with ThreadPoolExecutor(max_workers=self.ATTACHMENT_WORKERS) as pool:
+                # Each task runs in a copy of this context so its spans nest under the tool call
+                futures = [
+                    pool.submit(contextvars.copy_context().run, self._save_attachment, store, result["message_id"], attachment)
+                    for result, attachment in downloads
+                ]
+                for (result, _), future in zip(downloads, futures):
+                    result.update(future.result())
+
+            if not results:
+                return {
+                    "success": True,
+                    "attachments": [],
+                    "message": "The messages have no attachments."
+                }
+
+            counts = {status: sum(r["status"] == status for r in results) for status in ("saved", "duplicate", "skipped", "error")}
+            return {
+                "success": counts["error"] < len(results),
+                "attachments": results,
+                "directory": store.directory,
+                "message": (
+                    f"Saved {counts['saved']} attachment(s) to {store.directory}; {counts['duplicate']} duplicate(s), "
+                    f"{counts['skipped']} already saved, {counts['error']} failed."
+                )
+            }
+
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": self._api_error_message(e.resp.status, str(e))
             }
         except Exception as e:
             return {
@@ -260,14 +968,649 @@ class GmailTool:
                 "message": f"Unexpected error: {str(e)}"
             }
 
-    def get_mail_info(self):
-            pass
+    async def save_attachments_async(self, message_ids: List[str], directory: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Download the attachments of emails to a local directory, without blocking the event loop.
+
+        Files with the same content are stored once, and attachments saved by an
+        earlier call are not downloaded again.
+
+        Args:
+            message_ids: IDs of the messages (as returned by retrieve_emails).
+            directory: Subdirectory of ATTACHMENTS_DIR (default 'attachments') receiving the
+                files (optional). Absolute paths and '..' are rejected.
+
+        Returns:
+            Dict with success status and, per attachment, the message ID, filename,
+            path, size, sha256 and status ('saved', 'duplicate', 'skipped' or 'error').
+        """
+        # Downloads stream to disk on a thread pool, so the blocking variant is reused
+        return await asyncio.to_thread(self.save_attachments, message_ids, directory)
+
+    def _attachments_directory(self, directory: Optional[str]) -> str:
+        """
+        Resolve the directory save_attachments writes to.
 
-    def arrange_mails(self):
-            pass
+        The directory comes from the model and the files from untrusted mail, so
+        it may only name a subdirectory of the tool's attachments directory.
 
-    def delete_mails(self):
-            pass
+        Args:
+            directory: Subdirectory requested by the caller, if any
+
+        Returns:
+            Path of the directory
+
+        Raises:
+            ValueError: If the directory is absolute or leaves the attachments directory
+        """
+        base = self.attachments_dir
+        if not directory:
+            return base
+        parts = directory.replace("\\", "/").split("/")
+        if os.path.isabs(directory) or os.path.splitdrive(directory)[0] or parts[0] == "" or ".." in parts:
+            raise ValueError(f"Invalid directory '{directory}': use a relative subdirectory without '..'")
+        path = os.path.join(base, *[part for part in parts if part not in ("", ".")])
+        real_base = os.path.realpath(base)
+        if os.path.commonpath([real_base, os.path.realpath(path)]) != real_base:
+            raise ValueError(f"Invalid directory '{directory}': it resolves outside the attachments directory")
+        return path
+
+    def _save_attachment(self, store: AttachmentStore, message_id: str, attachment: Dict[str, Any]) -> Dict[str, Any]:
+        """Download one attachment into the store, returning its result fields."""
+        try:
+            tmp_path, sha256, size = self.scheduler.call(
+                lambda: self._download_attachment(store, message_id, attachment["attachment_id"]),
+                "messages.attachments.get",
+                self.call_stats
+            )
+            saved, duplicate = store.add(tmp_path, attachment["filename"], sha256, size, message_id, attachment["part_id"])
+            return dict(saved, status="duplicate" if duplicate else "saved")
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+    def _download_session(self):
+        """Return this thread's AuthorizedSession for the current credentials."""
+        credentials = self._credentials
+        session = getattr(self._download_sessions, "session", None)
+        if session is None or session.credentials is not credentials:
+            session = google_api.AuthorizedSession(credentials)
+            self._download_sessions.session = session
+        return session
+
+    def _download_attachment(self, store: AttachmentStore, message_id: str, attachment_id: str) -> Tuple[str, str, int]:
+        """
+        Stream an attachment to a temporary file in the store's directory.
+
+        The response body, {"data": "<base64url>"}, is read in chunks; the value
+        is decoded and hashed as it arrives, so neither the encoded nor the
+        decoded content is ever held in memory as a whole.
+
+        Args:
+            store: Store whose directory receives the file
+            message_id: ID of the message
+            attachment_id: ID of the attachment
+
+        Returns:
+            Tuple of the temporary file's path, its SHA-256 hex digest and its size
+
+        Raises:
+            GoogleApiError: If Gmail answers with an error status
+        """
+        url = f"{GMAIL_BASE_URL}/messages/{message_id}/attachments/{attachment_id}"
+        with tracer.span("http", method="GET", url=url) as span:
+            response = self._download_session().get(url, params={"fields": "data"}, stream=True, timeout=60)
+            with response:
+                span.set(status_code=response.status_code)
+                if response.status_code >= 400:
+                    span.status = "error"
+                    try:
+                        content = response.json()
+                    except ValueError:
+                        content = {}
+                    raise GoogleApiError(
+                        response.status_code, response.reason, content, response.headers.get("Retry-After")
+                    )
+
+                received = 0
+
+                def _chunks() -> Iterator[bytes]:
+                    nonlocal received
+                    for chunk in response.iter_content(self.DOWNLOAD_CHUNK_SIZE):
+                        received += len(chunk)
+                        yield chunk
+
+                digest = hashlib.sha256()
+                decoder = Base64urlStreamDecoder()
+                size = 0
+                fd, tmp_path = store.temp_file()
+                try:
+                    with os.fdopen(fd, "wb") as tmp_file:
+                        for text in iter_json_string_field(_chunks(), "data"):
+                            data = decoder.feed(text)
+                            digest.update(data)
+                            tmp_file.write(data)
+                            size += len(data)
+                        data = decoder.finish()
+                        digest.update(data)
+                        tmp_file.write(data)
+                        size += len(data)
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
+                span.set(response_bytes=received)
+        return tmp_path, digest.hexdigest(), size
+
+    def arrange_mails(self,
+                      query: str,
+                      add_labels: Optional[List[str]] = None,
+                      remove_labels: Optional[List[str]] = None,
+                      archive: bool = False,
+                      mark_read: bool = False,
+                      limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Label, archive or mark as read every email matching a query.
+
+        Messages are changed with batch calls of up to 1000 messages. A job that
+        stops early (error, interruption or limit) continues where it stopped
+        when it is called again with the same arguments.
+
+        Args:
+            query: Gmail search query selecting the emails (e.g. 'from:news@example.com older_than:1y').
+            add_labels: Label names to add; missing labels are created.
+            remove_labels: Label names to remove.
+            archive: Remove the emails from the inbox.
+            mark_read: Mark the emails as read.
+            limit: Maximum number of emails to change.
+
+        Returns:
+            Dict with success status, the job ID and the number of emails changed.
+        """
+        if not query:
+            return {
+                "success": False,
+                "message": "Missing required field: query"
+            }
+        if not (add_labels or remove_labels or archive or mark_read):
+            return {
+                "success": False,
+                "message": "Nothing to do: give labels to add or remove, archive or mark_read"
+            }
+
+        def _body(service) -> Dict[str, Any]:
+            remove = self._label_ids(service, remove_labels or [], create=False)
+            if archive:
+                remove.append("INBOX")
+            if mark_read:
+                remove.append("UNREAD")
+            body = {}
+            if add_labels:
+                body["addLabelIds"] = self._label_ids(service, add_labels, create=True)
+            if remove:
+                body["removeLabelIds"] = remove
+            return body
+
+        return self._run_bulk(BATCH_MODIFY, query, _body, limit, "Changed", self.MODIFY_SCOPE)
+
+    def delete_mails(self, query: str, permanent: bool = False, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Move every email matching a query to the trash, or delete them permanently.
+
+        Messages are deleted with batch calls of up to 1000 messages. A job that
+        stops early (error, interruption or limit) continues where it stopped
+        when it is called again with the same arguments.
+
+        Args:
+            query: Gmail search query selecting the emails (e.g. 'category:promotions older_than:6m').
+            permanent: Delete immediately instead of moving to the trash. Cannot be undone
+                and needs full mailbox access (the user may have to authenticate again).
+            limit: Maximum number of emails to delete.
+
+        Returns:
+            Dict with success status, the job ID and the number of emails deleted.
+        """
+        if not query:
+            return {
+                "success": False,
+                "message": "Missing required field: query"
+            }
+
+        if permanent:
+            return self._run_bulk(
+                BATCH_DELETE, query, lambda service: {}, limit, "Permanently deleted", self.FULL_ACCESS_SCOPE
+            )
+        # Adding the TRASH label trashes messages like messages.trash, a thousand at a time
+        return self._run_bulk(
+            BATCH_MODIFY, query, lambda service: {"addLabelIds": ["TRASH"]}, limit, "Moved to trash", self.MODIFY_SCOPE
+        )
+
+    async def arrange_mails_async(self,
+                                  query: str,
+                                  add_labels: Optional[List[str]] = None,
+                                  remove_labels: Optional[List[str]] = None,
+                                  archive: bool = False,
+                                  mark_read: bool = False,
+                                  limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Label, archive or mark as read every email matching a query, without blocking the event loop.
+
+        A job that stops early continues where it stopped when it is called
+        again with the same arguments.
+
+        Args:
+            query: Gmail search query selecting the emails (e.g. 'from:news@example.com older_than:1y').
+            add_labels: Label names to add; missing labels are created.
+            remove_labels: Label names to remove.
+            archive: Remove the emails from the inbox.
+            mark_read: Mark the emails as read.
+            limit: Maximum number of emails to change.
 
-    def create_drafts(self):
-            pass
\ No newline at end of file
+        Returns:
+            Dict with success status, the job ID and the number of emails changed.
+        """
+        # Chunks run on the engine's thread pool, so the blocking variant is reused
+        return await asyncio.to_thread(
+            self.arrange_mails, query, add_labels, remove_labels, archive, mark_read, limit
+        )
+
+    async def delete_mails_async(self, query: str, permanent: bool = False, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Move every email matching a query to the trash, or delete them permanently, without blocking the event loop.
+
+        A job that stops early continues where it stopped when it is called
+        again with the same arguments.
+
+        Args:
+            query: Gmail search query selecting the emails (e.g. 'category:promotions older_than:6m').
+            permanent: Delete immediately instead of moving to the trash. Cannot be undone
+                and needs full mailbox access (the user may have to authenticate again).
+            limit: Maximum number of emails to delete.
+
+        Returns:
+            Dict with success status, the job ID and the number of emails deleted.
+        """
+        return await asyncio.to_thread(self.delete_mails, query, permanent, limit)
+
+    def bulk_jobs(self) -> Dict[str, Any]:
+        """
+        Report the progress of arrange_mails and delete_mails jobs.
+
+        Returns:
+            Dict with success status and the state of each job by job ID
+        """
+        return {
+            "success": True,
+            "jobs": self._bulk.checkpoint.jobs()
+        }
+
+    def _run_bulk(self,
+                  operation: str,
+                  query: str,
+                  make_body: Callable[[Any], Dict[str, Any]],
+                  limit: Optional[int],
+                  verb: str,
+                  scope: str) -> Dict[str, Any]:
+        """Run a bulk job needing a scope and describe its outcome for the agent."""
+        if not self._ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first."
+            }
+        missing = self._missing_scope(scope)
+        if missing is not None:
+            return missing
+
+        try:
+            job = self._bulk.run(operation, query, make_body(self._require_service()), limit)
+            # Cached listings and the index no longer match the mailbox
+            self.mark_mailbox_changed()
+
+            result = {
+                "success": "error" not in job,
+                "job_id": job["job_id"],
+                "processed": job["processed"],
+                "message": f"{verb} {job['processed']} email(s) matching '{query}'."
+            }
+            if job["resumed"]:
+                result["message"] += " Continued an earlier run of the same job."
+            if "error" in job:
+                result["message"] += f" Stopped on an error: {job['error']}. Call again with the same arguments to resume."
+            return result
+
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": self._api_error_message(e.resp.status, str(e))
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}"
+            }
+
+    def _label_ids(self, service, names: List[str], create: bool) -> List[str]:
+        """
+        Resolve label names to label IDs.
+
+        Args:
+            service: Gmail service object
+            names: Label names (case-insensitive) or IDs
+            create: Create user labels that do not exist yet
+
+        Returns:
+            Label IDs in the order of names
+
+        Raises:
+            ValueError: If a label does not exist and create is False
+        """
+        ids = []
+        labels = None
+        for name in names:
+            if name.upper() in self.SYSTEM_LABELS or name.upper().startswith("CATEGORY_"):
+                ids.append(name.upper())
+                continue
+            if labels is None:
+                response = self._execute(
+                    service.users().labels().list(userId="me", fields="labels(id,name)"), "labels.list"
+                )
+                labels = {}
+                for label in response.get("labels", []):
+                    labels[label["name"].lower()] = label["id"]
+                    labels[label["id"].lower()] = label["id"]
+            label_id = labels.get(name.lower())
+            if label_id is None:
+                if not create:
+                    raise ValueError(f"Label '{name}' does not exist")
+                label_id = self._execute(service.users().labels().create(
+                    userId="me", body={"name": name}, fields="id"
+                ), "labels.create")["id"]
+                labels[name.lower()] = label_id
+            ids.append(label_id)
+        return ids
+
+    def send_bulk_emails(self,
+                         recipients: List[Dict[str, str]],
+                         subject_template: str,
+                         body_template: str,
+                         from_email: Optional[str] = None,
+                         job_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send a personalised email to each of many recipients in one call (mail merge).
+
+        The templates use {field} placeholders filled from each recipient's
+        fields. Messages go through a persistent queue with one idempotency key
+        per message, so calling again with the same job (or the same templates)
+        resumes the job and never sends a message twice.
+
+        Args:
+            recipients: One dict per recipient with 'to' (email address), the template
+                fields (e.g. 'name') and optionally its own 'idempotency_key'.
+            subject_template: Subject with placeholders, e.g. 'Your seat for {event}'.
+            body_template: Body with placeholders, e.g. 'Hi {name}, ...'.
+            from_email: Sender email (optional, uses authenticated user's email).
+            job_id: Name of the job (defaults to one derived from the templates).
+
+        Returns:
+            Dict with success status, counts per outcome, failures and throughput in messages per second.
+        """
+        return self._run_outbox(SEND, recipients, subject_template, body_template, from_email, job_id)
+
+    def create_drafts(self,
+                      recipients: List[Dict[str, str]],
+                      subject_template: str,
+                      body_template: str,
+                      from_email: Optional[str] = None,
+                      job_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create a personalised draft for each of many recipients in one call.
+
+        The templates use {field} placeholders filled from each recipient's
+        fields. Calling again with the same job (or the same templates) resumes
+        the job and never creates a draft twice.
+
+        Args:
+            recipients: One dict per recipient with 'to' (email address), the template
+                fields (e.g. 'name') and optionally its own 'idempotency_key'.
+            subject_template: Subject with placeholders, e.g. 'Your seat for {event}'.
+            body_template: Body with placeholders, e.g. 'Hi {name}, ...'.
+            from_email: Sender email (optional, uses authenticated user's email).
+            job_id: Name of the job (defaults to one derived from the templates).
+
+        Returns:
+            Dict with success status, counts per outcome, failures and throughput in drafts per second.
+        """
+        return self._run_outbox(DRAFT, recipients, subject_template, body_template, from_email, job_id)
+
+    async def send_bulk_emails_async(self,
+                                     recipients: List[Dict[str, str]],
+                                     subject_template: str,
+                                     body_template: str,
+                                     from_email: Optional[str] = None,
+                                     job_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send a personalised email to each of many recipients in one call, without blocking the event loop.
+
+        The templates use {field} placeholders filled from each recipient's
+        fields. Calling again with the same job (or the same templates) resumes
+        the job and never sends a message twice.
+
+        Args:
+            recipients: One dict per recipient with 'to' (email address), the template
+                fields (e.g. 'name') and optionally its own 'idempotency_key'.
+            subject_template: Subject with placeholders, e.g. 'Your seat for {event}'.
+            body_template: Body with placeholders, e.g. 'Hi {name}, ...'.
+            from_email: Sender email (optional, uses authenticated user's email).
+            job_id: Name of the job (defaults to one derived from the templates).
+
+        Returns:
+            Dict with success status, counts per outcome, failures and throughput in messages per second.
+        """
+        # Messages are sent by the queue's worker threads, so the blocking variant is reused
+        return await asyncio.to_thread(
+            self.send_bulk_emails, recipients, subject_template, body_template, from_email, job_id
+        )
+
+    async def create_drafts_async(self,
+                                  recipients: List[Dict[str, str]],
+                                  subject_template: str,
+                                  body_template: str,
+                                  from_email: Optional[str] = None,
+                                  job_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create a personalised draft for each of many recipients in one call, without blocking the event loop.
+
+        The templates use {field} placeholders filled from each recipient's
+        fields. Calling again with the same job (or the same templates) resumes
+        the job and never creates a draft twice.
+
+        Args:
+            recipients: One dict per recipient with 'to' (email address), the template
+                fields (e.g. 'name') and optionally its own 'idempotency_key'.
+            subject_template: Subject with placeholders, e.g. 'Your seat for {event}'.
+            body_template: Body with placeholders, e.g. 'Hi {name}, ...'.
+            from_email: Sender email (optional, uses authenticated user's email).
+            job_id: Name of the job (defaults to one derived from the templates).
+
+        Returns:
+            Dict with success status, counts per outcome, failures and throughput in drafts per second.
+        """
+        return await asyncio.to_thread(
+            self.create_drafts, recipients, subject_template, body_template, from_email, job_id
+        )
+
+    def _run_outbox(self,
+                    kind: str,
+                    recipients: List[Dict[str, str]],
+                    subject_template: str,
+                    body_template: str,
+                    from_email: Optional[str],
+                    job_id: Optional[str]) -> Dict[str, Any]:
+        """Queue one rendered message per recipient and deliver the job's pending messages."""
+        if not recipients or not subject_template or not body_template:
+            return {
+                "success": False,
+                "message": "Missing required fields: recipients, subject_template and body_template are required"
+            }
+
+        try:
+            template = MessageTemplate(subject_template, body_template)
+        except ValueError as e:
+            return {
+                "success": False,
+                "message": f"Invalid template: {str(e)}"
+            }
+
+        job_id = job_id or f"{kind}-{template.digest()}"
+        items, invalid = [], []
+        for recipient in recipients:
+            to = (recipient.get("to") or "").strip()
+            try:
+                if not to:
+                    raise KeyError("Missing recipient address 'to'")
+                subject, body = template.render(recipient)
+                # Header values with line breaks cannot be encoded; reject them before queueing
+                self._encode_message(to, subject, body, from_email)
+            except KeyError as e:
+                invalid.append({"to": to, "error": str(e.args[0])})
+                continue
+            except ValueError as e:
+                invalid.append({"to": to, "error": f"Invalid message: {str(e)}"})
+                continue
+            items.append({
+                "key": recipient.get("idempotency_key") or idempotency_key(job_id, to),
+                "to": to,
+                "subject": subject,
+                "body": body,
+                "from_email": from_email
+            })
+
+        if not self._ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first."
+            }
+        if kind == DRAFT:
+            missing = self._missing_scope(self.MODIFY_SCOPE)
+            if missing is not None:
+                return missing
+
+        try:
+            queued = self._outbox.enqueue(job_id, kind, items)
+            self._outbox.retry_failed(job_id)
+            self._recover_outbox(job_id)
+            keys = [item["key"] for item in items]
+            already_done = sum(state["status"] == DONE for state in self._outbox.items(job_id, keys))
+
+            start = time.monotonic()
+            with ThreadPoolExecutor(max_workers=self.SEND_WORKERS) as pool:
+                # Each worker runs in a copy of this context so its spans nest under the tool call
+                futures = [
+                    pool.submit(contextvars.copy_context().run, self._drain_outbox, job_id)
+                    for _ in range(min(self.SEND_WORKERS, max(len(items), 1)))
+                ]
+                delivered = sum(future.result() for future in futures)
+            seconds = time.monotonic() - start
+
+            states = self._outbox.items(job_id, keys)
+            failed = [{"to": state["to"], "error": state["error"]} for state in states if state["status"] == FAILED]
+            # Left in flight by another or an interrupted run, or with an unknown outcome
+            pending = [
+                {"to": state["to"], "status": state["status"], "error": state["error"]}
+                for state in states if state["status"] not in (DONE, FAILED)
+            ]
+            noun = "email(s) sent" if kind == SEND else "draft(s) created"
+            result = {
+                "success": not failed and not invalid and not pending,
+                "job_id": job_id,
+                "queued": queued,
+                "delivered": delivered,
+                "already_done": already_done,
+                "failed": failed,
+                "pending": pending,
+                "invalid": invalid,
+                "seconds": round(seconds, 3),
+                "messages_per_second": round(delivered / seconds, 2) if seconds > 0 else None,
+                "message": f"{delivered} {noun} ({delivered / seconds if seconds > 0 else 0:.1f}/s)."
+            }
+            if already_done:
+                result["message"] += f" {already_done} were already done by an earlier run and were skipped."
+            if failed:
+                result["message"] += (
+                    f" {len(failed)} failed; call again with the same job to retry them"
+                    " (messages already delivered are not sent twice)."
+                )
+            if pending:
+                result["message"] += (
+                    f" {len(pending)} not confirmed yet (in flight or outcome unknown); call again with the same"
+                    " job in a few minutes to finish them. They are checked with Gmail before being sent again."
+                )
+            if invalid:
+                result["message"] += (
+                    f" {len(invalid)} recipient(s) skipped: missing address or template fields, or invalid header values."
+                )
+            return result
+
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}"
+            }
+
+    def _recover_outbox(self, job_id: str) -> None:
+        """
+        Resolve messages a previous run left in flight.
+
+        Each queued message carries a Message-ID derived from its idempotency
+        key, so Gmail can tell whether it accepted a message whose request
+        failed ambiguously or was in flight when a run stopped. Only the
+        messages it has not seen go back into the queue; recent ones are left
+        unknown until Gmail's search can be trusted to find them.
+        """
+        keys = self._outbox.in_doubt(job_id)
+        if not keys:
+            return
+        service = self._require_service()
+        for key in keys:
+            response = self._execute(service.users().messages().list(
+                userId="me",
+                q=f"rfc822msgid:{message_id_header(key)[1:-1]}",
+                includeSpamTrash=True,
+                maxResults=1,
+                fields=MESSAGE_LIST_FIELDS
+            ), "messages.list")
+            messages = response.get("messages", [])
+            if messages:
+                self._outbox.mark_done(key, messages[0]["id"])
+            else:
+                self._outbox.release(key)
+
+    def _drain_outbox(self, job_id: str) -> int:
+        """Deliver a job's pending messages until none are left; returns how many this worker delivered."""
+        service = self._require_service()
+        delivered = 0
+        while True:
+            item = self._outbox.claim(job_id)
+            if item is None:
+                return delivered
+            try:
+                raw = self._encode_message(
+                    item["to"], item["subject"], item["body"], item["from_email"], message_id_header(item["key"])
+                )
+            except ValueError as e:
+                self._outbox.mark_failed(item["key"], f"Invalid message: {str(e)}")
+                continue
+            try:
+                if item["kind"] == SEND:
+                    response = self._execute(service.users().messages().send(userId="me", body=raw), "messages.send")
+                else:
+                    response = self._execute(
+                        service.users().drafts().create(userId="me", body={"message": raw}), "drafts.create"
+                    )
+            except Exception as e:
+                if is_rejected(e):
+                    self._outbox.mark_failed(item["key"], str(e))
+                else:
+                    # Gmail may have accepted it; the next run looks it up by Message-ID first
+                    self._outbox.mark_unknown(item["key"], str(e))
+                continue
+            self._outbox.mark_done(item["key"], response.get("id"))
+            delivered += 1
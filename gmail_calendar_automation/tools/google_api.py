@@ -0,0 +1,34 @@
+import importlib
+from typing import Any, Dict, Tuple
+
+# Names re-exported from the Google client libraries, imported on first access.
+# Importing googleapiclient and the OAuth stack costs a large share of startup
+# time, so modules reference them through this module instead.
+_LAZY_ATTRIBUTES: Dict[str, Tuple[str, str]] = {
+    "HttpError": ("googleapiclient.errors", "HttpError"),
+    "build": ("googleapiclient.discovery", "build"),
+    "build_from_document": ("googleapiclient.discovery", "build_from_document"),
+    "get_static_doc": ("googleapiclient.discovery_cache", "get_static_doc"),
+    "build_http": ("googleapiclient.http", "build_http"),
+    "HttpResponse": ("httplib2", "Response"),
+    "AuthorizedHttp": ("google_auth_httplib2", "AuthorizedHttp"),
+    "Credentials": ("google.oauth2.credentials", "Credentials"),
+    "Request": ("google.auth.transport.requests", "Request"),
+    "AuthorizedSession": ("google.auth.transport.requests", "AuthorizedSession"),
+    "RefreshError": ("google.auth.exceptions", "RefreshError"),
+    "InstalledAppFlow": ("google_auth_oauthlib.flow", "InstalledAppFlow"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a Google client attribute on first access and cache it on the module."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = getattr(importlib.import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
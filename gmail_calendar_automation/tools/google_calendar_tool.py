@@ -1,60 +1,96 @@
+import asyncio
+import itertools
 import os
-import json
-from typing import Dict, Any, Optional
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from google.auth.exceptions import RefreshError
+import uuid
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+from zoneinfo import ZoneInfo
+from typing import TYPE_CHECKING, Dict, Any, Optional, Iterator, List, Tuple
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.credential_manager import CredentialManager, get_credential_manager
+from gmail_calendar_automation.tools.service_cache import get_service
+from gmail_calendar_automation.tools.call_stats import CallStats
+from gmail_calendar_automation.tools.calendar_sync import (
+    CalendarSync, event_interval, parse_event_time, parse_rfc3339
+)
+from gmail_calendar_automation.tools.async_client import AsyncGoogleClient, GoogleApiError, CALENDAR_BASE_URL
+from gmail_calendar_automation.tools.rate_limiter import QuotaScheduler, calendar_scheduler, error_status, is_rejected
+from gmail_calendar_automation.tools.projection import (
+    DEFAULT_EVENT_FIELDS, STORE_EVENT_FIELDS, RECURRENCE_EVENT_FIELDS, apply_field_mask, merge_field_masks, list_fields
+)
+from gmail_calendar_automation.tools.recurrence import expand_events
+from gmail_calendar_automation.tools.tracing import traced_tool
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
 
+
+@traced_tool("calendar")
 class GoogleCalendarTool:
     """Tool for Google Calendar operations designed for AI agent use."""
 
     SCOPES = ["https://www.googleapis.com/auth/calendar"]
+    # events.list returns at most 2500 events per page
+    MAX_PAGE_SIZE = 2500
+    # Calendar accepts at most 50 sub-requests per batch HTTP request
+    BATCH_SIZE = 50
+    CONFLICT_POLICIES = ("ignore", "flag", "reject")
 
-    def __init__(self, app_credentials_path: str, user_token_path: str = os.getenv('TOKEN')):
+    def __init__(self,
+                 app_credentials_path: str,
+                 user_token_path: str = os.getenv('TOKEN'),
+                 use_event_cache: bool = os.getenv('CALENDAR_EVENT_CACHE', '').lower() in ('1', 'true'),
+                 event_fields: str = os.getenv('CALENDAR_EVENT_FIELDS') or DEFAULT_EVENT_FIELDS,
+                 credential_manager: Optional[CredentialManager] = None,
+                 local_recurrence: bool = os.getenv('CALENDAR_LOCAL_RECURRENCE', '').lower() in ('1', 'true'),
+                 scheduler: Optional[QuotaScheduler] = None):
         """
         Initialize Google Calendar tool.
 
         Args:
             user_token_path: Path to user token JSON file
             app_credentials_path: Path to app credentials JSON file
+            use_event_cache: Answer list_events from a local event store kept
+                current with incremental sync
+            event_fields: Event fields returned by list_events unless verbose,
+                in partial-response syntax (e.g. 'id,summary,start,end')
+            credential_manager: Credential manager to use instead of the one shared
+                by every tool using user_token_path, e.g. one per user (optional)
+            local_recurrence: Have list_events fetch recurring events once and
+                expand their instances locally instead of listing every instance
+            scheduler: Quota scheduler of the user, e.g. one per user (defaults to
+                the scheduler of the single-account tools)
         """
         self.user_token_path = user_token_path
         self.app_credentials_path = app_credentials_path
-        self._credentials = None
-        self._load_credentials()
-
-    def _load_credentials(self) -> None:
-        """Load credentials from token file if available."""
-        try:
-            self._credentials = Credentials.from_authorized_user_file(
-                self.user_token_path, self.SCOPES
+        self.use_event_cache = use_event_cache
+        self.event_fields = event_fields
+        self.local_recurrence = local_recurrence
+        self.call_stats = CallStats()
+        self.scheduler = scheduler or calendar_scheduler
+        self._sync = CalendarSync(self._execute, merge_field_masks(event_fields, STORE_EVENT_FIELDS))
+        if credential_manager is not None:
+            credential_manager.add_scopes(self.SCOPES)
+            self._credential_manager = credential_manager
+        else:
+            self._credential_manager = get_credential_manager(
+                user_token_path, app_credentials_path, self.SCOPES
             )
-        except (FileNotFoundError, json.JSONDecodeError):
-            self._credentials = None
+        self._async_client = AsyncGoogleClient(self._credential_manager)
+
+    @property
+    def credential_manager(self) -> CredentialManager:
+        """Credential manager holding this tool's OAuth credentials."""
+        return self._credential_manager
 
-    def _save_credentials(self, credentials: Credentials) -> None:
-        """Save credentials to token file."""
-        with open(self.user_token_path, 'w') as token_file:
-            token_file.write(credentials.to_json())
+    @property
+    def _credentials(self) -> Optional["Credentials"]:
+        """Credentials shared with every tool using the same credential manager."""
+        return self._credential_manager.credentials
 
     def _ensure_valid_credentials(self) -> bool:
         """Ensure credentials are valid and refresh if needed."""
-        if not self._credentials:
-            return False
-
-        if self._credentials.expired and self._credentials.refresh_token:
-            try:
-                self._credentials.refresh(Request())
-                self._save_credentials(self._credentials)
-                return True
-            except RefreshError:
-                return False
-
-        return not self._credentials.expired
+        return self._credential_manager.ensure_valid()
 
     def authenticate(self) -> Dict[str, Any]:
         """
@@ -64,12 +100,7 @@ class GoogleCalendarTool:
             Dict with success status and message
         """
         try:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                self.app_credentials_path, scopes=self.SCOPES
-            )
-            credentials = flow.run_local_server(port=0)
-            self._credentials = credentials
-            self._save_credentials(credentials)
+            self._credential_manager.authenticate()
 
             return {
                 "success": True,
@@ -95,19 +126,15 @@ class GoogleCalendarTool:
                 "message": "No credentials found. Please authenticate first."
             }
 
-        has_refresh_token = bool(self._credentials.refresh_token)
-        is_valid = self._ensure_valid_credentials()
-        is_expired = self._credentials.expired
-
-        return {
-            "authenticated": True,
-            "valid": is_valid,
-            'expired': is_expired,
-            "has_refresh_token": has_refresh_token,
-            "message": "Ready to access calendar" if is_valid else "Authentication required"
-        }
+        status = self._credential_manager.get_auth_status()
+        status["message"] = "Ready to access calendar" if status["valid"] else "Authentication required"
+        return status
 
-    def create_event(self, calendar_id: str, event: Dict[str, Any], send_notifications: bool = True) -> Dict[str, Any]:
+    def create_event(self,
+                     calendar_id: str,
+                     event: Dict[str, Any],
+                     send_notifications: bool = True,
+                     conflict_policy: str = "ignore") -> Dict[str, Any]:
         """
         Create an event in Google Calendar.
 
@@ -115,10 +142,16 @@ class GoogleCalendarTool:
             calendar_id: ID of the calendar where the event will be created.
             event: Event details as a dictionary.
             send_notifications: Whether to send notifications about the event creation.
+            conflict_policy: What to do when the event overlaps busy events:
+                "ignore" (create without checking), "flag" (create and report the
+                conflicts) or "reject" (do not create, report the conflicts).
 
         Returns:
             Dict with operation result.
         """
+        if conflict_policy not in self.CONFLICT_POLICIES:
+            return self._invalid_conflict_policy(conflict_policy)
+
         if not self._ensure_valid_credentials():
             return {
                 "success": False,
@@ -127,19 +160,24 @@ class GoogleCalendarTool:
             }
 
         try:
-            service = build("calendar", "v3", credentials=self._credentials)
-            created_event = service.events().insert(
+            service = get_service("calendar", "v3", self._credentials)
+            conflicts = []
+            if conflict_policy != "ignore":
+                conflicts = self._event_conflicts(service, calendar_id, event)
+                if conflicts and conflict_policy == "reject":
+                    return self._conflict_rejection(conflicts)
+
+            created_event = self._execute(service.events().insert(
                 calendarId=calendar_id, body=event, sendNotifications=send_notifications
-            ).execute()
+            ), "events.insert")
 
-            return {
-                "success": True,
-                "event_id": created_event.get("id"),
-                "html_link": created_event.get("htmlLink"),
-                "message": "Event created successfully."
-            }
+            # Recurring events are stored as expanded instances, which the next sync brings in
+            if not created_event.get("recurrence"):
+                self._sync.store(calendar_id).upsert(created_event)
+
+            return self._created_result(created_event, conflicts)
 
-        except HttpError as e:
+        except google_api.HttpError as e:
             return {
                 "success": False,
                 "message": f"Google Calendar API error: {e.reason}",
@@ -152,7 +190,14 @@ class GoogleCalendarTool:
                 "error_code": "UNKNOWN_ERROR"
             }
 
-    def list_events(self, calendar_id: str, max_results: int = 10, time_min: Optional[str] = None, time_max: Optional[str] = None) -> Dict[str, Any]:
+    def list_events(self,
+                    calendar_id: str,
+                    max_results: int = 10,
+                    time_min: Optional[str] = None,
+                    time_max: Optional[str] = None,
+                    use_cache: Optional[bool] = None,
+                    verbose: bool = False,
+                    local_recurrence: Optional[bool] = None) -> Dict[str, Any]:
         """
         List upcoming events from Google Calendar.
 
@@ -161,12 +206,19 @@ class GoogleCalendarTool:
             max_results: Maximum number of events to retrieve.
             time_min: The start time to filter events (ISO 8601 format). Defaults to today.
             time_max: The end time to filter events (ISO 8601 format).
+            use_cache: Answer from the local event store after an incremental sync.
+                Defaults to the tool's use_event_cache setting, and to True while
+                the calendar has a watch channel.
+            verbose: Return full event resources (attendees, reminders, conference
+                data...) instead of the compact default fields.
+            local_recurrence: Fetch each recurring event once and expand its
+                instances locally. Defaults to the tool's local_recurrence
+                setting; the local event store takes precedence. Only used
+                with time_max, since the listing cannot stop at max_results.
 
         Returns:
             Dict with success status and list of events.
         """
-        from datetime import datetime, timezone
-
         if time_min is None:
             time_min = datetime.now(timezone.utc).isoformat()
 
@@ -178,29 +230,438 @@ class GoogleCalendarTool:
             }
 
         try:
-            service = build("calendar", "v3", credentials=self._credentials)
-            events_result = service.events().list(
+            service = get_service("calendar", "v3", self._credentials)
+
+            # The event store only holds the compact fields, so verbose listings go to the API
+            if not verbose and self._use_cache(calendar_id, use_cache):
+                self._sync.sync(service, calendar_id, until=parse_rfc3339(time_max) if time_max else None)
+                events = self._sync.store(calendar_id).query(time_min, time_max, max_results)
+                events = apply_field_mask(events, self.event_fields)
+            elif time_max is not None and (self.local_recurrence if local_recurrence is None else local_recurrence):
+                events = list(itertools.islice(self._iter_expanded_events(
+                    service, calendar_id, time_min, time_max, None if verbose else self.event_fields
+                ), max_results))
+            else:
+                events = list(self.iter_events(
+                    calendar_id,
+                    time_min=time_min,
+                    time_max=time_max,
+                    page_size=min(max_results, self.MAX_PAGE_SIZE),
+                    limit=max_results,
+                    service=service,
+                    fields=None if verbose else self.event_fields
+                ))
+
+            self.call_stats.record_payload("list_events", events)
+            return {
+                "success": True,
+                "events": events,
+                "message": f"Retrieved {len(events)} events."
+            }
+
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": f"Google Calendar API error: {e.reason}",
+                "error_code": e.resp.status
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}",
+                "error_code": "UNKNOWN_ERROR"
+            }
+
+    def iter_events(self,
+                    calendar_id: str,
+                    time_min: Optional[str] = None,
+                    time_max: Optional[str] = None,
+                    page_size: int = 250,
+                    limit: Optional[int] = None,
+                    service=None,
+                    fields: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over events in a window, ordered by start time.
+
+        Pages are requested only as the caller consumes events, so stopping the
+        iteration early stops further API calls and only one page is held in memory.
+
+        Args:
+            calendar_id: ID of the calendar to retrieve events from
+            time_min: The start time to filter events (ISO 8601 format)
+            time_max: The end time to filter events (ISO 8601 format)
+            page_size: Number of events requested per page (at most 2500)
+            limit: Stop after this many events (unbounded when omitted)
+            service: Calendar service object to reuse (optional)
+            fields: Partial-response mask for each event (full resources when omitted)
+
+        Yields:
+            Event resources
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If a Calendar API request fails
+        """
+        if service is None:
+            if not self._ensure_valid_credentials():
+                raise PermissionError("Authentication required. Please call authenticate() first.")
+            service = get_service("calendar", "v3", self._credentials)
+
+        remaining = limit
+        page_token = None
+        while remaining is None or remaining > 0:
+            max_results = min(page_size, self.MAX_PAGE_SIZE)
+            if remaining is not None:
+                max_results = min(max_results, remaining)
+            response = self._execute(service.events().list(
                 calendarId=calendar_id,
                 maxResults=max_results,
                 singleEvents=True,
                 orderBy="startTime",
                 timeMin=time_min,
-                timeMax=time_max
-            ).execute()
+                timeMax=time_max,
+                pageToken=page_token,
+                fields=list_fields(fields, "nextPageToken") if fields else None
+            ), "events.list")
+
+            events = response.get("items", [])
+            if remaining is not None:
+                events = events[:remaining]
+                remaining -= len(events)
+            yield from events
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return
+
+    def _iter_expanded_events(self,
+                              service,
+                              calendar_id: str,
+                              time_min: Optional[str],
+                              time_max: Optional[str],
+                              fields: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the events in a window, expanding recurring events locally.
+
+        The listing uses singleEvents=False, so a recurring event comes back
+        once with its recurrence instead of once per instance, and
+        showDeleted=True, so cancelled instances can be left out. The
+        instances are generated lazily, ordered by start time with the other
+        events; recurrences that cannot be expanded locally are listed with
+        events.instances. The API cannot order such a listing, so every page
+        of the window is fetched: list_events only uses it with a time_max.
+        Modified instances moved out of the window are looked up separately,
+        so their original occurrences are not generated.
+
+        Args:
+            service: Calendar service object
+            calendar_id: ID of the calendar to retrieve events from
+            time_min: The start time to filter events (ISO 8601 format)
+            time_max: The end time to filter events (ISO 8601 format)
+            fields: Partial-response mask for each event (full resources when omitted)
+
+        Yields:
+            Event and instance resources
+        """
+        items: List[Dict[str, Any]] = []
+        time_zone = None
+        page_token = None
+        while True:
+            # orderBy=startTime requires singleEvents, so every page is fetched and merged locally
+            response = self._execute(service.events().list(
+                calendarId=calendar_id,
+                maxResults=self.MAX_PAGE_SIZE,
+                singleEvents=False,
+                showDeleted=True,
+                timeMin=time_min,
+                timeMax=time_max,
+                pageToken=page_token,
+                fields=list_fields(
+                    merge_field_masks(fields, RECURRENCE_EVENT_FIELDS), "nextPageToken", "timeZone"
+                ) if fields else None
+            ), "events.list[recurring]")
+            time_zone = response.get("timeZone", time_zone)
+            items.extend(response.get("items", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+        masters = [event for event in items if event.get("recurrence") and event.get("status") != "cancelled"]
+        # Only their original starts are used: the ones inside the window were listed in full above
+        items.extend(self._recurring_exceptions(service, calendar_id, masters))
+
+        def _instances(event: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+            page_token = None
+            while True:
+                response = self._execute(service.events().instances(
+                    calendarId=calendar_id,
+                    eventId=event["id"],
+                    timeMin=time_min,
+                    timeMax=time_max,
+                    pageToken=page_token,
+                    fields=list_fields(fields, "nextPageToken") if fields else None
+                ), "events.instances")
+                yield from response.get("items", [])
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    return
+
+        for event in expand_events(items, time_min, time_max, time_zone, fallback=_instances):
+            yield apply_field_mask(event, fields) if fields else event
+
+    def _recurring_exceptions(self,
+                              service,
+                              calendar_id: str,
+                              masters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        List the modified and cancelled instances of recurring events, wherever they were moved.
+
+        A time-bounded listing misses an instance moved out of the window, so
+        each event's instances are listed by iCalUID without time bounds, in
+        batch requests, with only the fields naming the occurrence they replace.
+
+        Args:
+            service: Calendar service object
+            calendar_id: ID of the calendar containing the events
+            masters: Recurring events, with their iCalUID
+
+        Returns:
+            Exception resources with id, status, recurringEventId and originalStartTime
+        """
+        masters = [master for master in masters if master.get("iCalUID")]
+
+        def _request(master: Dict[str, Any], page_token: Optional[str] = None):
+            return service.events().list(
+                calendarId=calendar_id,
+                iCalUID=master["iCalUID"],
+                singleEvents=False,
+                showDeleted=True,
+                maxResults=self.MAX_PAGE_SIZE,
+                pageToken=page_token,
+                fields="items(id,status,recurringEventId,originalStartTime),nextPageToken"
+            )
+
+        exceptions: List[Dict[str, Any]] = []
+        results = self._execute_batch(service, [_request(master) for master in masters], "events.list[exceptions]")
+        for master, (response, exception) in zip(masters, results):
+            if exception is not None:
+                raise exception
+            while True:
+                exceptions.extend(
+                    item for item in response.get("items", []) if item.get("recurringEventId") == master["id"]
+                )
+                if not response.get("nextPageToken"):
+                    break
+                response = self._execute(_request(master, response["nextPageToken"]), "events.list[exceptions]")
+        return exceptions
+
+    def delete_event(self, calendar_id: str, event_id: str) -> Dict[str, Any]:
+        """
+        Delete an event from Google Calendar.
+
+        Args:
+            calendar_id: ID of the calendar containing the event.
+            event_id: ID of the event to delete.
+
+        Returns:
+            Dict with operation result.
+        """
+        if not self._ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first."
+            }
+
+        try:
+            service = get_service("calendar", "v3", self._credentials)
+            self._execute(service.events().delete(calendarId=calendar_id, eventId=event_id), "events.delete")
+            self._sync.store(calendar_id).remove(event_id)
+
+            return {
+                "success": True,
+                "message": "Event deleted successfully."
+            }
+
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": f"Google Calendar API error: {str(e)}"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}"
+            }
+
+    def _use_cache(self, calendar_id: str, use_cache: Optional[bool]) -> bool:
+        """Whether list_events should answer from the local event store."""
+        if use_cache is not None:
+            return use_cache
+        return self.use_event_cache or self._sync.is_watched(calendar_id)
+
+    @staticmethod
+    def _events_url(calendar_id: str, event_id: Optional[str] = None) -> str:
+        """Return the REST URL of a calendar's events collection or of one event."""
+        url = f"{CALENDAR_BASE_URL}/calendars/{quote(calendar_id, safe='')}/events"
+        return f"{url}/{quote(event_id, safe='')}" if event_id else url
+
+    async def create_event_async(self,
+                                 calendar_id: str,
+                                 event: Dict[str, Any],
+                                 send_notifications: bool = True,
+                                 conflict_policy: str = "ignore") -> Dict[str, Any]:
+        """
+        Create an event in Google Calendar without blocking the event loop.
+
+        Args:
+            calendar_id: ID of the calendar where the event will be created.
+            event: Event details as a dictionary.
+            send_notifications: Whether to send notifications about the event creation.
+            conflict_policy: What to do when the event overlaps busy events:
+                "ignore" (create without checking), "flag" (create and report the
+                conflicts) or "reject" (do not create, report the conflicts).
 
-            events = events_result.get("items", [])
+        Returns:
+            Dict with operation result.
+        """
+        if conflict_policy not in self.CONFLICT_POLICIES:
+            return self._invalid_conflict_policy(conflict_policy)
 
+        if not await self._async_client.ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first.",
+                "error_code": "AUTH_REQUIRED"
+            }
+
+        try:
+            conflicts = []
+            if conflict_policy != "ignore":
+                # The event store is synced with the blocking client, so check in a worker thread
+                conflicts = await asyncio.to_thread(
+                    lambda: self._event_conflicts(get_service("calendar", "v3", self._credentials), calendar_id, event)
+                )
+                if conflicts and conflict_policy == "reject":
+                    return self._conflict_rejection(conflicts)
+
+            created_event = await self.scheduler.execute_async(
+                lambda: self._async_client.request(
+                    "POST", self._events_url(calendar_id),
+                    params={"sendNotifications": str(send_notifications).lower()},
+                    json=event
+                ),
+                "events.insert",
+                self.call_stats
+            )
+
+            if not created_event.get("recurrence"):
+                self._sync.store(calendar_id).upsert(created_event)
+
+            return self._created_result(created_event, conflicts)
+
+        except GoogleApiError as e:
+            return {
+                "success": False,
+                "message": f"Google Calendar API error: {e.reason}",
+                "error_code": e.status
+            }
+        except google_api.HttpError as e:
+            # Raised by the event store sync used for conflict checks
+            return {
+                "success": False,
+                "message": f"Google Calendar API error: {e.reason}",
+                "error_code": e.resp.status
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}",
+                "error_code": "UNKNOWN_ERROR"
+            }
+
+    async def list_events_async(self,
+                                calendar_id: str,
+                                max_results: int = 10,
+                                time_min: Optional[str] = None,
+                                time_max: Optional[str] = None,
+                                use_cache: Optional[bool] = None,
+                                verbose: bool = False,
+                                local_recurrence: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        List upcoming events from Google Calendar without blocking the event loop.
+
+        When the local event store or local recurrence expansion is used, the
+        listing runs in a worker thread.
+
+        Args:
+            calendar_id: ID of the calendar to retrieve events from.
+            max_results: Maximum number of events to retrieve.
+            time_min: The start time to filter events (ISO 8601 format). Defaults to today.
+            time_max: The end time to filter events (ISO 8601 format).
+            use_cache: Answer from the local event store after an incremental sync.
+                Defaults to the tool's use_event_cache setting, and to True while
+                the calendar has a watch channel.
+            verbose: Return full event resources (attendees, reminders, conference
+                data...) instead of the compact default fields.
+            local_recurrence: Fetch each recurring event once and expand its
+                instances locally. Defaults to the tool's local_recurrence
+                setting; the local event store takes precedence. Only used
+                with time_max, since the listing cannot stop at max_results.
+
+        Returns:
+            Dict with success status and list of events.
+        """
+        if not verbose and self._use_cache(calendar_id, use_cache):
+            return await asyncio.to_thread(self.list_events, calendar_id, max_results, time_min, time_max, True)
+        if time_max is not None and (self.local_recurrence if local_recurrence is None else local_recurrence):
+            return await asyncio.to_thread(
+                self.list_events, calendar_id, max_results, time_min, time_max, False, verbose, True
+            )
+
+        if time_min is None:
+            time_min = datetime.now(timezone.utc).isoformat()
+
+        if not await self._async_client.ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first.",
+                "error_code": "AUTH_REQUIRED"
+            }
+
+        try:
+            events = []
+            page_token = None
+            while len(events) < max_results:
+                params = {
+                    "maxResults": min(max_results - len(events), self.MAX_PAGE_SIZE),
+                    "singleEvents": "true",
+                    "orderBy": "startTime",
+                    "timeMin": time_min,
+                    "timeMax": time_max,
+                    "pageToken": page_token,
+                    "fields": None if verbose else list_fields(self.event_fields, "nextPageToken")
+                }
+                response = await self.scheduler.execute_async(
+                    lambda: self._async_client.request("GET", self._events_url(calendar_id), params=params),
+                    "events.list",
+                    self.call_stats
+                )
+                events.extend(response.get("items", [])[:max_results - len(events)])
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    break
+
+            self.call_stats.record_payload("list_events", events)
             return {
                 "success": True,
                 "events": events,
                 "message": f"Retrieved {len(events)} events."
             }
 
-        except HttpError as e:
+        except GoogleApiError as e:
             return {
                 "success": False,
                 "message": f"Google Calendar API error: {e.reason}",
-                "error_code": e.resp.status
+                "error_code": e.status
             }
         except Exception as e:
             return {
@@ -209,9 +670,9 @@ class GoogleCalendarTool:
                 "error_code": "UNKNOWN_ERROR"
             }
 
-    def delete_event(self, calendar_id: str, event_id: str) -> Dict[str, Any]:
+    async def delete_event_async(self, calendar_id: str, event_id: str) -> Dict[str, Any]:
         """
-        Delete an event from Google Calendar.
+        Delete an event from Google Calendar without blocking the event loop.
 
         Args:
             calendar_id: ID of the calendar containing the event.
@@ -220,22 +681,261 @@ class GoogleCalendarTool:
         Returns:
             Dict with operation result.
         """
-        if not self._ensure_valid_credentials():
+        if not await self._async_client.ensure_valid_credentials():
             return {
                 "success": False,
                 "message": "Authentication required. Please call authenticate() first."
             }
 
         try:
-            service = build("calendar", "v3", credentials=self._credentials)
-            service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+            await self.scheduler.execute_async(
+                lambda: self._async_client.request("DELETE", self._events_url(calendar_id, event_id)),
+                "events.delete",
+                self.call_stats
+            )
+            self._sync.store(calendar_id).remove(event_id)
 
             return {
                 "success": True,
                 "message": "Event deleted successfully."
             }
 
-        except HttpError as e:
+        except GoogleApiError as e:
+            return {
+                "success": False,
+                "message": f"Google Calendar API error: {str(e)}"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}"
+            }
+
+    def _execute(self, request, operation: str) -> Any:
+        """Execute a request through the shared Calendar quota scheduler."""
+        return self.scheduler.execute(request, operation, self.call_stats)
+
+    def _execute_batch(self, service, requests: List[Any], operation: str) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Execute requests through Calendar batch HTTP requests.
+
+        A failed batch request marks its events and those not sent yet as
+        failed, keeping the results of the batches that went through.
+
+        Args:
+            service: Calendar service object
+            requests: HttpRequest objects to execute
+            operation: Operation name used for call statistics
+
+        Returns:
+            List of (response, exception) pairs in the same order as requests
+        """
+        return self.scheduler.execute_batch(
+            service, requests, operation, self.BATCH_SIZE, self.call_stats, partial=True
+        )
+
+    @staticmethod
+    def _batch_error(exception: Exception) -> str:
+        """Describe a failed batch sub-request."""
+        if isinstance(exception, google_api.HttpError):
+            return f"Google Calendar API error: {exception.reason}"
+        return str(exception)
+
+    def create_events(self,
+                      calendar_id: str,
+                      events: List[Dict[str, Any]],
+                      send_notifications: bool = True) -> Dict[str, Any]:
+        """
+        Create many events in Google Calendar using batch requests.
+
+        Events are given IDs up front, so an insert that timed out or failed
+        with a server error is looked up instead of being reported as failed:
+        it may have been carried out.
+
+        Args:
+            calendar_id: ID of the calendar where the events will be created.
+            events: List of event details dictionaries.
+            send_notifications: Whether to send notifications about the event creation.
+
+        Returns:
+            Dict with overall status and one result per event, in input order.
+            Events whose creation could not be confirmed either way have the
+            status 'unknown': list the calendar before creating them again.
+        """
+        if not events:
+            return {
+                "success": False,
+                "message": "No events provided."
+            }
+
+        if not self._ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first.",
+                "error_code": "AUTH_REQUIRED"
+            }
+
+        try:
+            service = get_service("calendar", "v3", self._credentials)
+            # Event IDs use the base32hex alphabet, which hex digits are part of
+            events = [dict(event, id=event.get("id") or uuid.uuid4().hex) for event in events]
+            requests = [
+                service.events().insert(calendarId=calendar_id, body=event, sendNotifications=send_notifications)
+                for event in events
+            ]
+            outcomes = self._execute_batch(service, requests, "events.insert")
+            unknown = self._resolve_inserts(service, calendar_id, events, outcomes)
+
+            results = []
+            store = self._sync.store(calendar_id)
+            for index, (created_event, exception) in enumerate(outcomes):
+                if index in unknown:
+                    results.append({
+                        "index": index,
+                        "success": False,
+                        "status": "unknown",
+                        "event_id": events[index]["id"],
+                        "error": self._batch_error(exception)
+                    })
+                    continue
+                if exception is not None:
+                    results.append({
+                        "index": index,
+                        "success": False,
+                        "error": self._batch_error(exception),
+                        "error_code": error_status(exception) or "UNKNOWN_ERROR"
+                    })
+                    continue
+                if not created_event.get("recurrence"):
+                    store.upsert(created_event)
+                results.append({
+                    "index": index,
+                    "success": True,
+                    "event_id": created_event.get("id"),
+                    "html_link": created_event.get("htmlLink")
+                })
+
+            created = sum(1 for result in results if result["success"])
+            message = f"Created {created} of {len(events)} events."
+            if unknown:
+                message += (f" Whether {len(unknown)} were created is unknown: list the events"
+                            " before creating them again.")
+            return {
+                "success": created == len(events),
+                "results": results,
+                "message": message
+            }
+
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": f"Google Calendar API error: {e.reason}",
+                "error_code": e.resp.status
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}",
+                "error_code": "UNKNOWN_ERROR"
+            }
+
+    async def create_events_async(self,
+                                  calendar_id: str,
+                                  events: List[Dict[str, Any]],
+                                  send_notifications: bool = True) -> Dict[str, Any]:
+        """
+        Create many events in Google Calendar using batch requests, without blocking the event loop.
+
+        Args:
+            calendar_id: ID of the calendar where the events will be created.
+            events: List of event details dictionaries.
+            send_notifications: Whether to send notifications about the event creation.
+
+        Returns:
+            Dict with overall status and one result per event, in input order.
+            Events whose creation could not be confirmed either way have the
+            status 'unknown': list the calendar before creating them again.
+        """
+        # Batch requests go through googleapiclient, so the blocking variant is reused
+        return await asyncio.to_thread(self.create_events, calendar_id, events, send_notifications)
+
+    def _resolve_inserts(self,
+                         service,
+                         calendar_id: str,
+                         events: List[Dict[str, Any]],
+                         outcomes: List[Tuple[Any, Optional[Exception]]]) -> List[int]:
+        """
+        Look up inserted events whose outcome is unknown, by the IDs they were given.
+
+        Found events replace their failure in outcomes; events that are not
+        found keep it, since they were not created.
+
+        Args:
+            service: Calendar service object
+            calendar_id: ID of the calendar the events were inserted into
+            events: Inserted event bodies, with their IDs
+            outcomes: (event, exception) pairs of the inserts, updated in place
+
+        Returns:
+            Indexes of the events whose creation is still unknown
+        """
+        uncertain = [index for index, (_, exception) in enumerate(outcomes)
+                     if exception is not None and not is_rejected(exception)]
+        if not uncertain:
+            return []
+        requests = [service.events().get(calendarId=calendar_id, eventId=events[index]["id"]) for index in uncertain]
+        unknown = []
+        for index, (event, exception) in zip(uncertain, self._execute_batch(service, requests, "events.get")):
+            if exception is None:
+                outcomes[index] = (event, None)
+            elif error_status(exception) != 404:
+                unknown.append(index)
+        return unknown
+
+    def delete_events(self, calendar_id: str, event_ids: List[str]) -> Dict[str, Any]:
+        """
+        Delete many events from Google Calendar using batch requests.
+
+        Args:
+            calendar_id: ID of the calendar containing the events.
+            event_ids: IDs of the events to delete.
+
+        Returns:
+            Dict with overall status and one result per event ID, in input order.
+        """
+        if not event_ids:
+            return {
+                "success": False,
+                "message": "No event IDs provided."
+            }
+
+        if not self._ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first."
+            }
+
+        try:
+            service = get_service("calendar", "v3", self._credentials)
+            requests = [service.events().delete(calendarId=calendar_id, eventId=event_id) for event_id in event_ids]
+
+            results = []
+            store = self._sync.store(calendar_id)
+            for event_id, (_, exception) in zip(event_ids, self._execute_batch(service, requests, "events.delete")):
+                if exception is not None:
+                    results.append({"event_id": event_id, "success": False, "error": self._batch_error(exception)})
+                    continue
+                store.remove(event_id)
+                results.append({"event_id": event_id, "success": True})
+
+            deleted = sum(1 for result in results if result["success"])
+            return {
+                "success": deleted == len(event_ids),
+                "results": results,
+                "message": f"Deleted {deleted} of {len(event_ids)} events."
+            }
+
+        except google_api.HttpError as e:
             return {
                 "success": False,
                 "message": f"Google Calendar API error: {str(e)}"
@@ -245,3 +945,330 @@ class GoogleCalendarTool:
                 "success": False,
                 "message": f"Unexpected error: {str(e)}"
             }
+
+    async def delete_events_async(self, calendar_id: str, event_ids: List[str]) -> Dict[str, Any]:
+        """
+        Delete many events from Google Calendar using batch requests, without blocking the event loop.
+
+        Args:
+            calendar_id: ID of the calendar containing the events.
+            event_ids: IDs of the events to delete.
+
+        Returns:
+            Dict with overall status and one result per event ID, in input order.
+        """
+        return await asyncio.to_thread(self.delete_events, calendar_id, event_ids)
+
+    def watch_events(self,
+                     calendar_id: str,
+                     address: str,
+                     channel_id: str,
+                     token: Optional[str] = None,
+                     ttl_seconds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Open a notification channel for changes to a calendar's events.
+
+        Calendar POSTs to the address whenever an event changes. While the
+        channel is open, syncs of the calendar are skipped until
+        mark_events_changed() reports a change.
+
+        Args:
+            calendar_id: ID of the calendar to watch
+            address: HTTPS URL receiving the notifications
+            channel_id: Unique ID for the new channel
+            token: Secret echoed back in each notification (optional)
+            ttl_seconds: Requested channel lifetime (the API default when omitted)
+
+        Returns:
+            Channel resource with 'id', 'resourceId' and 'expiration' (ms since epoch)
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If the Calendar API request fails
+        """
+        if not self._ensure_valid_credentials():
+            raise PermissionError("Authentication required. Please call authenticate() first.")
+        service = get_service("calendar", "v3", self._credentials)
+
+        body: Dict[str, Any] = {"id": channel_id, "type": "web_hook", "address": address}
+        if token:
+            body["token"] = token
+        if ttl_seconds:
+            body["params"] = {"ttl": str(ttl_seconds)}
+        channel = self._execute(service.events().watch(calendarId=calendar_id, body=body), "events.watch")
+        self._sync.set_watch(calendar_id, int(channel["expiration"]) / 1000)
+        return channel
+
+    def stop_channel(self, channel_id: str, resource_id: str, calendar_id: Optional[str] = None) -> None:
+        """
+        Close a notification channel.
+
+        Args:
+            channel_id: ID of the channel
+            resource_id: Resource ID returned when the channel was opened
+            calendar_id: Calendar to take out of push mode (leave unset when a
+                replacement channel is already open)
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If the Calendar API request fails
+        """
+        if calendar_id is not None:
+            self._sync.set_watch(calendar_id, None)
+        if not self._ensure_valid_credentials():
+            raise PermissionError("Authentication required. Please call authenticate() first.")
+        service = get_service("calendar", "v3", self._credentials)
+        self._execute(service.channels().stop(body={"id": channel_id, "resourceId": resource_id}), "channels.stop")
+
+    def mark_events_changed(self, calendar_id: str) -> None:
+        """Record a change notification for a calendar."""
+        self._sync.mark_dirty(calendar_id)
+
+    def refresh_events(self, calendar_id: str) -> Dict[str, Any]:
+        """
+        Sync a calendar's local event store now, e.g. after a change notification.
+
+        Args:
+            calendar_id: ID of the calendar to sync
+
+        Returns:
+            Dict describing the sync that was performed
+
+        Raises:
+            PermissionError: If the user is not authenticated
+            HttpError: If a Calendar API request fails
+        """
+        if not self._ensure_valid_credentials():
+            raise PermissionError("Authentication required. Please call authenticate() first.")
+        return self._sync.sync(get_service("calendar", "v3", self._credentials), calendar_id)
+
+    @classmethod
+    def _invalid_conflict_policy(cls, conflict_policy: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "message": f"Invalid conflict_policy '{conflict_policy}'. Use one of: {', '.join(cls.CONFLICT_POLICIES)}.",
+            "error_code": "INVALID_ARGUMENT"
+        }
+
+    @staticmethod
+    def _conflict_rejection(conflicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "message": f"Event not created: it overlaps {len(conflicts)} existing event(s).",
+            "error_code": "CONFLICT",
+            "conflicts": conflicts
+        }
+
+    @staticmethod
+    def _created_result(created_event: Dict[str, Any], conflicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        result = {
+            "success": True,
+            "event_id": created_event.get("id"),
+            "html_link": created_event.get("htmlLink"),
+            "message": "Event created successfully."
+        }
+        if conflicts:
+            result["conflicts"] = conflicts
+            result["message"] = f"Event created successfully; it overlaps {len(conflicts)} existing event(s)."
+        return result
+
+    @staticmethod
+    def _conflict_summary(event: Dict[str, Any]) -> Dict[str, Any]:
+        """Compact description of a conflicting event."""
+        return {
+            "event_id": event.get("id"),
+            "summary": event.get("summary"),
+            "start": event["start"],
+            "end": event["end"]
+        }
+
+    def _event_conflicts(self, service, calendar_id: str, event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Return the busy events overlapping a proposed event.
+
+        The calendar's event store is brought up to date first (incrementally
+        after the first call). Only the first occurrence of a recurring
+        proposal is checked.
+
+        Args:
+            service: Calendar service object
+            calendar_id: ID of the calendar to check
+            event: Proposed event with 'start' and 'end'
+
+        Returns:
+            Compact descriptions of the conflicting events
+        """
+        store = self._sync.store(calendar_id)
+        interval = event_interval(event, store.time_zone)
+        if interval is None:
+            return []
+        self._sync.sync(service, calendar_id, until=interval[1])
+        # The calendar's time zone is known once it has been synced
+        interval = event_interval(event, store.time_zone)
+        return [self._conflict_summary(e) for e in store.conflicts(*interval, exclude_id=event.get("id"))]
+
+    def find_conflicts(self,
+                       calendar_id: str,
+                       start_time: str,
+                       end_time: str,
+                       time_zone: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find events that overlap a time range, e.g. to check for double-booking.
+
+        Free (transparent) events and events the user declined are not conflicts.
+
+        Args:
+            calendar_id: ID of the calendar to check.
+            start_time: Start of the time range (ISO 8601 format).
+            end_time: End of the time range (ISO 8601 format).
+            time_zone: IANA time zone for times without a UTC offset
+                (defaults to the calendar's time zone).
+
+        Returns:
+            Dict with success status and list of conflicting events.
+        """
+        if not self._ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first.",
+                "error_code": "AUTH_REQUIRED"
+            }
+
+        try:
+            service = get_service("calendar", "v3", self._credentials)
+            proposal = {
+                "start": {"dateTime": start_time, "timeZone": time_zone},
+                "end": {"dateTime": end_time, "timeZone": time_zone}
+            }
+            conflicts = self._event_conflicts(service, calendar_id, proposal)
+
+            return {
+                "success": True,
+                "conflicts": conflicts,
+                "message": f"Found {len(conflicts)} conflicting events." if conflicts else "The time range is free."
+            }
+
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": f"Google Calendar API error: {e.reason}",
+                "error_code": e.resp.status
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}",
+                "error_code": "UNKNOWN_ERROR"
+            }
+
+    async def find_conflicts_async(self,
+                                   calendar_id: str,
+                                   start_time: str,
+                                   end_time: str,
+                                   time_zone: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find events that overlap a time range without blocking the event loop.
+
+        Free (transparent) events and events the user declined are not conflicts.
+
+        Args:
+            calendar_id: ID of the calendar to check.
+            start_time: Start of the time range (ISO 8601 format).
+            end_time: End of the time range (ISO 8601 format).
+            time_zone: IANA time zone for times without a UTC offset
+                (defaults to the calendar's time zone).
+
+        Returns:
+            Dict with success status and list of conflicting events.
+        """
+        # The check syncs the local event store, so the blocking variant is reused
+        return await asyncio.to_thread(self.find_conflicts, calendar_id, start_time, end_time, time_zone)
+
+    def find_free_slots(self,
+                        calendar_id: str,
+                        time_min: str,
+                        time_max: str,
+                        duration_minutes: int = 30,
+                        time_zone: Optional[str] = None,
+                        max_results: int = 10) -> Dict[str, Any]:
+        """
+        Find free time slots of at least a given length in a time range.
+
+        Args:
+            calendar_id: ID of the calendar to check.
+            time_min: Start of the search range (ISO 8601 format).
+            time_max: End of the search range (ISO 8601 format).
+            duration_minutes: Minimum length of a free slot in minutes.
+            time_zone: IANA time zone for the input and returned times
+                (defaults to the calendar's time zone).
+            max_results: Maximum number of slots to return.
+
+        Returns:
+            Dict with success status and list of free slots (start/end).
+        """
+        if not self._ensure_valid_credentials():
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first.",
+                "error_code": "AUTH_REQUIRED"
+            }
+
+        try:
+            service = get_service("calendar", "v3", self._credentials)
+            store = self._sync.store(calendar_id)
+            self._sync.sync(service, calendar_id, until=parse_event_time({"dateTime": time_max}, time_zone))
+            time_zone = time_zone or store.time_zone
+            zone = ZoneInfo(time_zone) if time_zone else timezone.utc
+            start = parse_event_time({"dateTime": time_min}, time_zone)
+            end = parse_event_time({"dateTime": time_max}, time_zone)
+
+            slots = store.free_slots(start, end, timedelta(minutes=duration_minutes))
+            slots = [
+                {"start": slot_start.astimezone(zone).isoformat(), "end": slot_end.astimezone(zone).isoformat()}
+                for slot_start, slot_end in slots[:max_results]
+            ]
+
+            return {
+                "success": True,
+                "free_slots": slots,
+                "message": f"Found {len(slots)} free slots."
+            }
+
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": f"Google Calendar API error: {e.reason}",
+                "error_code": e.resp.status
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Unexpected error: {str(e)}",
+                "error_code": "UNKNOWN_ERROR"
+            }
+
+    async def find_free_slots_async(self,
+                                    calendar_id: str,
+                                    time_min: str,
+                                    time_max: str,
+                                    duration_minutes: int = 30,
+                                    time_zone: Optional[str] = None,
+                                    max_results: int = 10) -> Dict[str, Any]:
+        """
+        Find free time slots of at least a given length in a time range, without blocking the event loop.
+
+        Args:
+            calendar_id: ID of the calendar to check.
+            time_min: Start of the search range (ISO 8601 format).
+            time_max: End of the search range (ISO 8601 format).
+            duration_minutes: Minimum length of a free slot in minutes.
+            time_zone: IANA time zone for the input and returned times
+                (defaults to the calendar's time zone).
+            max_results: Maximum number of slots to return.
+
+        Returns:
+            Dict with success status and list of free slots (start/end).
+        """
+        return await asyncio.to_thread(
+            self.find_free_slots, calendar_id, time_min, time_max, duration_minutes, time_zone, max_results
+        )
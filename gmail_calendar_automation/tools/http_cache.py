@@ -0,0 +1,283 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple
+from urllib.parse import urlencode, urlsplit
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.tracing import tracer
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+# Seconds a cached response is served without asking the API, by URL path.
+# Past its TTL a response is revalidated with If-None-Match, so a TTL of 0
+# still saves the body transfer whenever the resource did not change.
+DEFAULT_TTLS: List[Tuple[str, float]] = [
+    (r"/messages/[^/]+/attachments/[^/]+$", 3600.0),  # attachments never change
+    (r"/messages/[^/]+$", 60.0),  # message content is immutable, labels are not
+    (r"/labels(/[^/]+)?$", 300.0),
+    (r"/events/[^/]+$", 30.0),
+    (r"/calendarList(/[^/]+)?$", 300.0),
+]
+
+# Methods that change resources; any of them drops the cached responses of its API
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+_BATCH_WRITE = re.compile(rb"^(?:POST|PUT|PATCH|DELETE) /", re.MULTILINE)
+
+# Per-entry overhead counted against the byte bound besides body and headers
+_ENTRY_OVERHEAD = 256
+
+
+def credential_key(credentials: "Credentials") -> str:
+    """Stable identity of the user behind credentials, so users never see each other's responses."""
+    secret = getattr(credentials, "refresh_token", None) or getattr(credentials, "token", None) or ""
+    return hashlib.sha1(secret.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Cache key URL of a request, with parameters in a canonical order."""
+    if not params:
+        return url
+    query = urlencode(sorted((key, value) for key, value in params.items() if value is not None), doseq=True)
+    return f"{url}?{query}" if query else url
+
+
+def _api(path: str) -> str:
+    """API of a request path, e.g. 'gmail/v1' for /gmail/v1/users/me/messages or /batch/gmail/v1."""
+    segments = [segment for segment in path.split("/") if segment]
+    if segments and segments[0] == "batch":
+        segments = segments[1:]
+    return "/".join(segments[:2])
+
+
+class ResponseCache:
+    """
+    Thread-safe, byte-bounded LRU cache of GET responses with their ETags.
+
+    A response is served from memory while its TTL lasts. After that the next
+    request carries If-None-Match with the stored ETag, and a 304 answer is
+    served from the cache without transferring the body again. Responses
+    without an ETag are only kept while they are fresh. Entries are keyed by
+    user and URL, and a write by a user drops that user's entries for the
+    API written to, so the tools read their own changes.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 2 ** 20, ttls: Optional[List[Tuple[str, float]]] = None):
+        """
+        Initialize response cache.
+
+        Args:
+            max_bytes: Maximum size of the cached bodies and headers (0 disables caching)
+            ttls: (URL path regex, seconds) pairs; the first match gives a
+                response's TTL, and unmatched responses get 0
+        """
+        self.max_bytes = max_bytes
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (DEFAULT_TTLS if ttls is None else ttls)]
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._metrics = {"hits": 0, "revalidated": 0, "misses": 0, "evictions": 0, "invalidations": 0, "bytes_saved": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def ttl(self, url: str) -> float:
+        """TTL in seconds of the response of a URL."""
+        path = urlsplit(url).path
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return 0.0
+
+    def lookup(self, user: str, url: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Find the cached response of a GET request.
+
+        Args:
+            user: credential_key of the requesting user
+            url: Request URL (see cache_url)
+
+        Returns:
+            Tuple of the entry (dict with etag, headers, content) or None, and
+            whether it is fresh and can be served without a request
+        """
+        with self._lock:
+            entry = self._entries.get((user, url))
+            if entry is None:
+                return None, False
+            self._entries.move_to_end((user, url))
+            fresh = time.monotonic() < entry["expires_at"]
+            if fresh:
+                self._metrics["hits"] += 1
+                self._metrics["bytes_saved"] += len(entry["content"])
+        if fresh:
+            tracer.record("http.cache", outcome="hit", url=url.split("?", 1)[0])
+        return entry, fresh
+
+    def store(self, user: str, url: str, etag: Optional[str], headers: Dict[str, Any], content: bytes) -> None:
+        """
+        Cache a 200 response of a GET request.
+
+        Args:
+            user: credential_key of the requesting user
+            url: Request URL (see cache_url)
+            etag: ETag response header, if any
+            headers: Response headers with 'status', lowercase names (kept to rebuild the response)
+            content: Response body
+        """
+        with self._lock:
+            self._metrics["misses"] += 1
+        tracer.record("http.cache", outcome="miss", url=url.split("?", 1)[0])
+        ttl = self.ttl(url)
+        if not self.enabled or (not etag and ttl <= 0):
+            return
+        size = len(content) + len(url) + sum(len(str(k)) + len(str(v)) for k, v in headers.items())
+        size += _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        entry = {
+            "etag": etag, "headers": headers, "content": content, "bytes": size,
+            "expires_at": time.monotonic() + ttl
+        }
+        with self._lock:
+            old = self._entries.pop((user, url), None)
+            if old is not None:
+                self._bytes -= old["bytes"]
+            self._entries[(user, url)] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["bytes"]
+                self._metrics["evictions"] += 1
+
+    def revalidated(self, user: str, url: str, entry: Dict[str, Any]) -> None:
+        """Record a 304 answer to a conditional request, renewing the entry's TTL."""
+        with self._lock:
+            self._metrics["revalidated"] += 1
+            self._metrics["bytes_saved"] += len(entry["content"])
+            entry["expires_at"] = time.monotonic() + self.ttl(url)
+        tracer.record("http.cache", outcome="revalidated", url=url.split("?", 1)[0])
+
+    def invalidate(self, user: str, url: Optional[str] = None) -> None:
+        """
+        Drop cached responses of a user.
+
+        Args:
+            user: credential_key of the user
+            url: Only drop responses of the API this URL belongs to (optional)
+        """
+        api = _api(urlsplit(url).path) if url else None
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if key[0] == user and (api is None or _api(urlsplit(key[1]).path) == api)
+            ]
+            for key in keys:
+                self._bytes -= self._entries.pop(key)["bytes"]
+            self._metrics["invalidations"] += len(keys)
+
+    def wrote(self, user: str, method: str, url: str, body: Any = None) -> None:
+        """
+        Drop the responses a request may have made stale.
+
+        Args:
+            user: credential_key of the requesting user
+            method: HTTP method
+            url: Request URL
+            body: Request body; batch requests only invalidate when a part writes
+        """
+        if method.upper() not in WRITE_METHODS:
+            return
+        if urlsplit(url).path.startswith("/batch/"):
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            if not body or not _BATCH_WRITE.search(body):
+                return
+        self.invalidate(user, url)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache statistics.
+
+        Returns:
+            Dict with entries, bytes, hits (served fresh), revalidated (304),
+            misses, hit ratio, evictions, invalidations and body bytes saved
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics.update(entries=len(self._entries), bytes=self._bytes)
+        lookups = metrics["hits"] + metrics["revalidated"] + metrics["misses"]
+        metrics["hit_ratio"] = (metrics["hits"] + metrics["revalidated"]) / lookups if lookups else None
+        return metrics
+
+
+class CachingHttp:
+    """
+    httplib2-compatible wrapper serving GET requests through a ResponseCache.
+
+    googleapiclient treats any status of 300 or more as an error, so 304
+    answers are turned back into the cached 200 response here. Cached
+    headers are plain dicts, shared with AsyncGoogleClient, and rebuilt into
+    an httplib2 response when served.
+    """
+
+    def __init__(self, http, cache: ResponseCache):
+        """
+        Initialize wrapper.
+
+        Args:
+            http: Transport to wrap; its credentials identify the user
+            cache: Response cache shared by the process
+        """
+        self.http = http
+        self.cache = cache
+
+    def _user(self) -> str:
+        credentials = getattr(self.http, "credentials", None)
+        return credential_key(credentials) if credentials is not None else ""
+
+    def request(self, uri: str, method: str = "GET", body: Any = None, headers: Any = None, **kwargs) -> Any:
+        if not self.cache.enabled:
+            return self.http.request(uri, method, body=body, headers=headers, **kwargs)
+        user = self._user()
+        if method.upper() != "GET":
+            response, content = self.http.request(uri, method, body=body, headers=headers, **kwargs)
+            if response.status < 400:
+                self.cache.wrote(user, method, uri, body)
+            return response, content
+
+        entry, fresh = self.cache.lookup(user, uri)
+        if fresh:
+            return google_api.HttpResponse(entry["headers"]), entry["content"]
+        headers = dict(headers or {})
+        if entry is not None and entry["etag"]:
+            headers["if-none-match"] = entry["etag"]
+        response, content = self.http.request(uri, method, body=body, headers=headers, **kwargs)
+        if response.status == 304 and entry is not None:
+            self.cache.revalidated(user, uri, entry)
+            return google_api.HttpResponse(entry["headers"]), entry["content"]
+        if response.status == 200:
+            self.cache.store(user, uri, response.get("etag"), dict(response), content)
+        return response, content
+
+    def __getattr__(self, name: str) -> Any:
+        # credentials, timeout, close()... are read from the wrapped transport
+        return getattr(self.http, name)
+
+
+# HTTP_CACHE_MB bounds the process-wide cache (default 32, 0 disables it)
+response_cache = ResponseCache(int(float(os.getenv("HTTP_CACHE_MB") or 32) * 2 ** 20))
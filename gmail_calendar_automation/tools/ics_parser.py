@@ -0,0 +1,271 @@
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# TZIDs commonly emitted by Outlook/Exchange, mapped to IANA zones
+WINDOWS_TIMEZONES = {
+    "UTC": "UTC",
+    "GMT Standard Time": "Europe/London",
+    "Greenwich Standard Time": "Atlantic/Reykjavik",
+    "W. Europe Standard Time": "Europe/Berlin",
+    "Romance Standard Time": "Europe/Paris",
+    "Central Europe Standard Time": "Europe/Budapest",
+    "Central European Standard Time": "Europe/Warsaw",
+    "E. Europe Standard Time": "Europe/Chisinau",
+    "FLE Standard Time": "Europe/Kiev",
+    "GTB Standard Time": "Europe/Bucharest",
+    "Russian Standard Time": "Europe/Moscow",
+    "Morocco Standard Time": "Africa/Casablanca",
+    "Eastern Standard Time": "America/New_York",
+    "Central Standard Time": "America/Chicago",
+    "Mountain Standard Time": "America/Denver",
+    "US Mountain Standard Time": "America/Phoenix",
+    "Pacific Standard Time": "America/Los_Angeles",
+    "Alaskan Standard Time": "America/Anchorage",
+    "Hawaiian Standard Time": "Pacific/Honolulu",
+    "Atlantic Standard Time": "America/Halifax",
+    "E. South America Standard Time": "America/Sao_Paulo",
+    "India Standard Time": "Asia/Kolkata",
+    "China Standard Time": "Asia/Shanghai",
+    "Tokyo Standard Time": "Asia/Tokyo",
+    "Singapore Standard Time": "Asia/Singapore",
+    "AUS Eastern Standard Time": "Australia/Sydney",
+    "New Zealand Standard Time": "Pacific/Auckland",
+}
+
+_DURATION_RE = re.compile(
+    r"^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+
+class IcsParseError(ValueError):
+    """Raised when an iCalendar component cannot be converted to a Calendar event."""
+
+
+def unfold_lines(text: str) -> List[str]:
+    """Join RFC 5545 folded content lines."""
+    lines: List[str] = []
+    for raw in re.split(r"\r\n|\n|\r", text):
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        elif raw:
+            lines.append(raw)
+    return lines
+
+
+def parse_content_line(line: str) -> Tuple[str, Dict[str, str], str]:
+    """
+    Split a content line into name, parameters and value.
+
+    Args:
+        line: Unfolded content line, e.g. 'DTSTART;TZID=Europe/Paris:20250101T090000'
+
+    Returns:
+        (upper-cased name, parameters with upper-cased keys, raw value)
+    """
+    params: Dict[str, str] = {}
+    in_quotes = False
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            head, value = line[:index], line[index + 1:]
+            break
+    else:
+        raise IcsParseError(f"Malformed content line: {line[:40]}")
+
+    parts = re.findall(r'(?:[^;"]|"[^"]*")+', head)
+    name = parts[0].upper()
+    for part in parts[1:]:
+        key, _, param_value = part.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name, params, value
+
+
+def unescape_text(value: str) -> str:
+    """Decode an iCalendar TEXT value."""
+    return re.sub(r"\\([\\;,nN])", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def resolve_timezone(tzid: str) -> Optional[str]:
+    """Map a TZID to an IANA zone name, or None if it is unknown."""
+    tzid = tzid.strip()
+    candidate = WINDOWS_TIMEZONES.get(tzid, tzid)
+    # Some producers prefix TZIDs with a path, e.g. '/mozilla.org/20050126_1/Europe/Paris'
+    if "/" in candidate and candidate.startswith("/"):
+        candidate = "/".join(candidate.split("/")[-2:])
+    try:
+        ZoneInfo(candidate)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+    return candidate
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse an iCalendar DURATION value."""
+    match = _DURATION_RE.match(value.strip())
+    if not match:
+        raise IcsParseError(f"Unsupported DURATION: {value}")
+    delta = timedelta(
+        weeks=int(match.group("weeks") or 0),
+        days=int(match.group("days") or 0),
+        hours=int(match.group("hours") or 0),
+        minutes=int(match.group("minutes") or 0),
+        seconds=int(match.group("seconds") or 0)
+    )
+    return -delta if match.group("sign") == "-" else delta
+
+
+def parse_date_value(value: str, params: Dict[str, str], default_tz: Optional[str]) -> Dict[str, str]:
+    """
+    Convert a DTSTART/DTEND value to a Calendar API start/end dict.
+
+    Args:
+        value: Property value, e.g. '20250101T090000Z' or '20250101'
+        params: Property parameters (VALUE, TZID)
+        default_tz: Zone for floating times (X-WR-TIMEZONE), if any
+
+    Returns:
+        Dict with 'date', or 'dateTime' and optionally 'timeZone'
+    """
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or re.fullmatch(r"\d{8}", value):
+        return {"date": datetime.strptime(value, "%Y%m%d").strftime("%Y-%m-%d")}
+
+    utc = value.endswith("Z")
+    try:
+        moment = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    except ValueError:
+        raise IcsParseError(f"Unsupported date-time: {value}")
+
+    if utc:
+        return {"dateTime": moment.strftime("%Y-%m-%dT%H:%M:%SZ")}
+
+    tzid = params.get("TZID") or default_tz
+    zone = resolve_timezone(tzid) if tzid else None
+    if zone is None:
+        raise IcsParseError(f"Unknown or missing time zone for {value}: {tzid}")
+    return {"dateTime": moment.strftime("%Y-%m-%dT%H:%M:%S"), "timeZone": zone}
+
+
+def _shift(value: Dict[str, str], delta: timedelta) -> Dict[str, str]:
+    """Return a start/end dict moved by delta."""
+    if "date" in value:
+        return {"date": (datetime.strptime(value["date"], "%Y-%m-%d") + delta).strftime("%Y-%m-%d")}
+    utc = value["dateTime"].endswith("Z")
+    moment = datetime.strptime(value["dateTime"].rstrip("Z"), "%Y-%m-%dT%H:%M:%S") + delta
+    shifted = {"dateTime": moment.strftime("%Y-%m-%dT%H:%M:%S") + ("Z" if utc else "")}
+    if "timeZone" in value:
+        shifted["timeZone"] = value["timeZone"]
+    return shifted
+
+
+def _vevent_to_event(props: List[Tuple[str, Dict[str, str], str]], default_tz: Optional[str]) -> Dict[str, Any]:
+    """Convert the properties of one VEVENT to a Calendar event payload."""
+    event: Dict[str, Any] = {}
+    recurrence: List[str] = []
+    attendees: List[Dict[str, str]] = []
+    duration: Optional[timedelta] = None
+
+    for name, params, value in props:
+        if name == "SUMMARY":
+            event["summary"] = unescape_text(value)
+        elif name == "DESCRIPTION":
+            event["description"] = unescape_text(value)
+        elif name == "LOCATION":
+            event["location"] = unescape_text(value)
+        elif name == "UID":
+            event["iCalUID"] = value.strip()
+        elif name == "DTSTART":
+            event["start"] = parse_date_value(value, params, default_tz)
+        elif name == "DTEND":
+            event["end"] = parse_date_value(value, params, default_tz)
+        elif name == "DURATION":
+            duration = parse_duration(value)
+        elif name in ("RRULE", "EXRULE"):
+            recurrence.append(f"{name}:{value}")
+        elif name in ("RDATE", "EXDATE"):
+            if "TZID" in params:
+                zone = resolve_timezone(params["TZID"])
+                if zone is None:
+                    raise IcsParseError(f"Unknown time zone in {name}: {params['TZID']}")
+                params = dict(params, TZID=zone)
+            param_text = "".join(f";{k}={v}" for k, v in params.items())
+            recurrence.append(f"{name}{param_text}:{value}")
+        elif name == "ATTENDEE" and value.lower().startswith("mailto:"):
+            attendee = {"email": value[len("mailto:"):]}
+            if params.get("CN"):
+                attendee["displayName"] = params["CN"]
+            if params.get("ROLE") == "OPT-PARTICIPANT":
+                attendee["optional"] = True
+            attendees.append(attendee)
+        elif name == "STATUS" and value.upper() == "CANCELLED":
+            event["status"] = "cancelled"
+
+    if "start" not in event:
+        raise IcsParseError("VEVENT has no DTSTART")
+    if "end" not in event:
+        if duration is not None:
+            event["end"] = _shift(event["start"], duration)
+        elif "date" in event["start"]:
+            event["end"] = _shift(event["start"], timedelta(days=1))
+        else:
+            event["end"] = dict(event["start"])
+    if recurrence:
+        event["recurrence"] = recurrence
+        # The Calendar API needs an explicit zone to expand recurring date-times
+        for key in ("start", "end"):
+            if "dateTime" in event[key] and "timeZone" not in event[key]:
+                event[key]["timeZone"] = "UTC"
+    if attendees:
+        event["attendees"] = attendees
+    return event
+
+
+def parse_ics(text: str) -> Dict[str, Any]:
+    """
+    Parse an iCalendar document into Calendar API event payloads.
+
+    Args:
+        text: iCalendar data (text/calendar)
+
+    Returns:
+        Dict with the iTIP 'method' (e.g. 'REQUEST', 'CANCEL'), parsed 'events'
+        and 'errors' for VEVENTs that could not be converted
+    """
+    method = None
+    default_tz = None
+    events: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    depth: List[str] = []
+    props: List[Tuple[str, Dict[str, str], str]] = []
+
+    for line in unfold_lines(text):
+        try:
+            name, params, value = parse_content_line(line)
+        except IcsParseError as e:
+            errors.append(str(e))
+            continue
+
+        if name == "BEGIN":
+            depth.append(value.upper())
+            if value.upper() == "VEVENT":
+                props = []
+        elif name == "END":
+            component = depth.pop() if depth else None
+            if component == "VEVENT":
+                try:
+                    events.append(_vevent_to_event(props, default_tz))
+                except IcsParseError as e:
+                    errors.append(str(e))
+        elif depth and depth[-1] == "VEVENT":
+            props.append((name, params, value))
+        elif depth == ["VCALENDAR"]:
+            if name == "METHOD":
+                method = value.strip().upper()
+            elif name == "X-WR-TIMEZONE":
+                default_tz = value.strip()
+
+    return {"method": method, "events": events, "errors": errors}
@@ -0,0 +1,126 @@
+import re
+from typing import Dict, List, Optional, Pattern
+
+# Intents the classifier can recognise; each maps to one leaf agent
+SEND_EMAIL = "gmail.send"
+READ_EMAIL = "gmail.read"
+ORGANIZE_EMAIL = "gmail.organize"
+CREATE_EVENT = "calendar.create"
+MANAGE_EVENTS = "calendar.manage"
+
+_MAIL_NOUNS = r"(e-?mails?|mails?|messages?|inbox|gmail)"
+_CALENDAR_NOUNS = r"(calendar|events?|meetings?|appointments?|agenda|schedule)"
+
+# Same keyword rules as the routing prompts, as patterns within one request
+INTENT_PATTERNS: Dict[str, List[str]] = {
+    SEND_EMAIL: [
+        rf"\b(send|write|compose|draft|reply|forward)\b.*\b{_MAIL_NOUNS}\b",
+        r"\b(send|write|email|e-mail|mail)\b.*\bto\s+\S+@\S+",
+        r"^(please\s+)?e-?mail\s+\S+@\S+",
+    ],
+    READ_EMAIL: [
+        rf"\b(read|check|show|list|search|find|get|retrieve|fetch|display|see|open)\b.*\b{_MAIL_NOUNS}\b",
+        rf"\b(unread|latest|recent|new|last)\b.*\b{_MAIL_NOUNS}\b",
+    ],
+    ORGANIZE_EMAIL: [
+        rf"\b(archive|label|delete|trash|remove|clean\s?up|tidy|move|mark)\b.*\b{_MAIL_NOUNS}\b",
+        rf"\b{_MAIL_NOUNS}\b.*\bas\s+(read|unread)\b",
+    ],
+    CREATE_EVENT: [
+        rf"\b(create|add|schedule|book|set up|put|plan|organi[sz]e)\b.*\b{_CALENDAR_NOUNS}\b",
+        r"^(please\s+|can you\s+|could you\s+)?(schedule|book)\b",
+    ],
+    MANAGE_EVENTS: [
+        rf"\b(list|show|view|see|display|check|get|delete|cancel|remove|clear)\b.*\b{_CALENDAR_NOUNS}\b",
+        rf"\bwhat('s| is| do i have)\b.*\b{_CALENDAR_NOUNS}\b",
+        rf"\b(upcoming|next|today'?s|tomorrow'?s)\b.*\b{_CALENDAR_NOUNS}\b",
+        r"\b(free|busy|available)\b.*\b(slots?|time|times)\b",
+        r"\b(conflicts?|double[- ]book(ed|ing)?)\b",
+    ],
+}
+
+# Requests that need the root agent's own tools or several agents
+AMBIGUOUS_PATTERNS = [r"\binvit(e|es|ation|ations)\b", r"\bics\b"]
+
+# Negations and conditionals: naming an action does not mean it is requested
+UNCERTAIN_PATTERNS = [
+    r"\b(not|never|cannot|dont|doesnt|didnt|wont|shouldnt|cant)\b|n't\b",
+    r"\b(if|unless|whether|in case)\b",
+]
+
+# Questions ("Did I send an email to bob@example.com?") are only routed when
+# they ask what the mailbox or calendar holds; requests phrased as questions
+# ("Can you send ...?") are routed like any request
+QUESTION_PATTERNS = [
+    r"\?",
+    r"^(did|do|does|have|has|had|was|were|is|are|am|why|who|whom|whose|when|where|which|what|how|"
+    r"should|shall|may|might|can|could|would|will)\b",
+]
+POLITE_REQUEST_PATTERN = r"^(please\s+)?(can|could|would|will)\s+you\b"
+LOOKUP_QUESTION_PATTERN = r"^(what|what's|which|when|do i have|have i got|are there|is there|any|am i|how many)\b"
+LOOKUP_INTENTS = (READ_EMAIL, MANAGE_EVENTS)
+
+# Longer requests tend to combine steps; leave those to the LLM router
+MAX_LENGTH = 300
+
+
+class IntentClassifier:
+    """
+    Keyword classifier routing unambiguous requests without an LLM call.
+
+    A request gets an intent only when the patterns of exactly one intent match,
+    it mentions only one of Gmail and Calendar, and nothing marks it as
+    ambiguous, negated or conditional. Questions only get a lookup intent.
+    Anything else returns None, leaving the decision to the LLM.
+    """
+
+    def __init__(self, patterns: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize classifier.
+
+        Args:
+            patterns: Regular expressions per intent (defaults to INTENT_PATTERNS)
+        """
+        self._patterns: Dict[str, List[Pattern]] = {
+            intent: [re.compile(pattern) for pattern in intent_patterns]
+            for intent, intent_patterns in (patterns or INTENT_PATTERNS).items()
+        }
+        self._ambiguous = [re.compile(pattern) for pattern in AMBIGUOUS_PATTERNS + UNCERTAIN_PATTERNS]
+        self._question = [re.compile(pattern) for pattern in QUESTION_PATTERNS]
+        self._polite_request = re.compile(POLITE_REQUEST_PATTERN)
+        self._lookup_question = re.compile(LOOKUP_QUESTION_PATTERN)
+        self._mail = re.compile(rf"\b{_MAIL_NOUNS}\b")
+        self._calendar = re.compile(rf"\b{_CALENDAR_NOUNS}\b")
+
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Return the intent of a request, or None when it is not clear-cut.
+
+        Args:
+            text: The user's message
+
+        Returns:
+            One of the intent constants, or None
+        """
+        text = " ".join(text.lower().replace("\u2019", "'").split())
+        if not text or len(text) > MAX_LENGTH:
+            return None
+        if any(pattern.search(text) for pattern in self._ambiguous):
+            return None
+        if self._mail.search(text) and self._calendar.search(text):
+            return None
+
+        matches = [
+            intent for intent, patterns in self._patterns.items()
+            if any(pattern.search(text) for pattern in patterns)
+        ]
+        if len(matches) != 1:
+            return None
+        if self._is_question(text) and not (matches[0] in LOOKUP_INTENTS and self._lookup_question.search(text)):
+            return None
+        return matches[0]
+
+    def _is_question(self, text: str) -> bool:
+        if self._polite_request.search(text):
+            return False
+        return any(pattern.search(text) for pattern in self._question)
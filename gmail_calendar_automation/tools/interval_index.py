@@ -0,0 +1,133 @@
+import bisect
+import threading
+from typing import Dict, Hashable, List, Optional, Tuple
+
+Interval = Tuple[float, float, Hashable]
+
+
+class _Node:
+    """Centered interval tree node holding the intervals that contain its center."""
+
+    __slots__ = ("center", "by_start", "starts", "by_end", "ends", "left", "right")
+
+    def __init__(self, intervals: List[Interval]):
+        starts = sorted(interval[0] for interval in intervals)
+        self.center = starts[len(starts) // 2]
+
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] <= self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        # Ascending by start and descending by end, so queries stop at the first miss
+        self.by_start = sorted(here, key=lambda interval: interval[0])
+        self.starts = [interval[0] for interval in self.by_start]
+        self.by_end = sorted(here, key=lambda interval: -interval[1])
+        self.ends = [-interval[1] for interval in self.by_end]
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+
+class IntervalIndex:
+    """
+    Index of half-open [start, end) intervals answering overlap queries in O(log n + k).
+
+    Intervals are keyed so they can be replaced or removed. Changes mark the
+    centered interval tree stale; it is rebuilt in O(n log n) on the next query,
+    so bursts of updates (e.g. a sync) cost a single rebuild.
+    """
+
+    def __init__(self):
+        self._intervals: Dict[Hashable, Tuple[float, float]] = {}
+        self._root: Optional[_Node] = None
+        self._stale = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def add(self, key: Hashable, start: float, end: float) -> None:
+        """Add or replace the interval stored under key; empty intervals are dropped."""
+        with self._lock:
+            if end > start:
+                self._intervals[key] = (start, end)
+            else:
+                self._intervals.pop(key, None)
+            self._stale = True
+
+    def remove(self, key: Hashable) -> None:
+        """Remove the interval stored under key, if any."""
+        with self._lock:
+            if self._intervals.pop(key, None) is not None:
+                self._stale = True
+
+    def clear(self) -> None:
+        """Remove all intervals."""
+        with self._lock:
+            self._intervals = {}
+            self._root = None
+            self._stale = False
+
+    def _tree(self) -> Optional[_Node]:
+        with self._lock:
+            if self._stale:
+                intervals = [(start, end, key) for key, (start, end) in self._intervals.items()]
+                self._root = _Node(intervals) if intervals else None
+                self._stale = False
+            return self._root
+
+    def overlapping(self, start: float, end: float) -> List[Tuple[float, float, Hashable]]:
+        """
+        Return the intervals overlapping [start, end).
+
+        Args:
+            start: Query start
+            end: Query end
+
+        Returns:
+            List of (start, end, key) tuples in no particular order
+        """
+        matches: List[Interval] = []
+        node = self._tree()
+        stack = [node] if node else []
+        while stack:
+            node = stack.pop()
+            if end <= node.center:
+                # Every interval here ends after the center, so only its start matters
+                matches.extend(node.by_start[:bisect.bisect_left(node.starts, end)])
+                if node.left:
+                    stack.append(node.left)
+            elif start > node.center:
+                matches.extend(node.by_end[:bisect.bisect_left(node.ends, -start)])
+                if node.right:
+                    stack.append(node.right)
+            else:
+                matches.extend(node.by_start)
+                stack.extend(child for child in (node.left, node.right) if child)
+        return matches
+
+    def gaps(self, start: float, end: float, min_length: float = 0.0) -> List[Tuple[float, float]]:
+        """
+        Return the free stretches of [start, end) not covered by any interval.
+
+        Args:
+            start: Window start
+            end: Window end
+            min_length: Shortest gap to report
+
+        Returns:
+            List of (start, end) gaps in ascending order
+        """
+        gaps = []
+        cursor = start
+        for busy_start, busy_end, _ in sorted(self.overlapping(start, end), key=lambda interval: interval[:2]):
+            if busy_start - cursor >= min_length and busy_start > cursor:
+                gaps.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if end - cursor >= min_length and end > cursor:
+            gaps.append((cursor, end))
+        return gaps
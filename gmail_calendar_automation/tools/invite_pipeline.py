@@ -0,0 +1,136 @@
+import threading
+from typing import Dict, Any, Optional, List
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.gmail_tool import GmailTool
+from gmail_calendar_automation.tools.google_calendar_tool import GoogleCalendarTool
+from gmail_calendar_automation.tools.ics_parser import parse_ics
+
+
+class InvitePipeline:
+    """
+    Deterministic path from Gmail meeting invitations to Calendar events.
+
+    Messages carrying a text/calendar part or .ics attachment are parsed and
+    turned into events without any model calls. Messages without a structured
+    invite are reported back so the agents can handle them with the LLM.
+    """
+
+    DEFAULT_QUERY = "filename:ics newer_than:30d"
+
+    def __init__(self, gmail: GmailTool, calendar: GoogleCalendarTool):
+        """
+        Initialize invite pipeline.
+
+        Args:
+            gmail: Gmail tool used to find and read invitations
+            calendar: Calendar tool used to create the events
+        """
+        self.gmail = gmail
+        self.calendar = calendar
+        self._processed: set = set()
+        self._lock = threading.Lock()
+
+    def import_calendar_invites(self,
+                                calendar_id: str = "primary",
+                                query: Optional[str] = None,
+                                max_messages: int = 20) -> Dict[str, Any]:
+        """
+        Import meeting invitations (.ics / text/calendar) from Gmail into Google Calendar.
+
+        Args:
+            calendar_id: ID of the calendar where events will be created.
+            query: Gmail search query selecting the messages to scan
+                (defaults to .ics attachments from the last 30 days).
+            max_messages: Maximum number of messages to scan.
+
+        Returns:
+            Dict with one result per message. Messages with status "needs_llm"
+            have no structured invite and must be read and handled manually.
+        """
+        if not self.gmail.get_auth_status().get("valid"):
+            return {
+                "success": False,
+                "message": "Authentication required. Please call authenticate() first."
+            }
+
+        try:
+            message_ids = list(self.gmail.iter_message_ids(query or self.DEFAULT_QUERY, limit=max_messages))
+        except google_api.HttpError as e:
+            return {
+                "success": False,
+                "message": f"Gmail API error: {str(e)}"
+            }
+
+        results: List[Dict[str, Any]] = []
+        pending_events: List[Dict[str, Any]] = []
+        pending_owner: List[Dict[str, Any]] = []
+
+        for message_id in message_ids:
+            with self._lock:
+                if message_id in self._processed:
+                    results.append({"message_id": message_id, "status": "already_processed"})
+                    continue
+
+            try:
+                invites = self.gmail.get_calendar_invites(message_id)
+            except google_api.HttpError as e:
+                results.append({"message_id": message_id, "status": "failed", "reason": f"Gmail API error: {str(e)}"})
+                continue
+
+            result: Dict[str, Any] = {"message_id": message_id, "events": []}
+            results.append(result)
+            if not invites:
+                result.update(status="needs_llm", reason="No calendar invite found in message.")
+                continue
+
+            parse_errors = []
+            message_events = []
+            for text in invites:
+                parsed = parse_ics(text)
+                parse_errors.extend(parsed["errors"])
+                if parsed["method"] == "CANCEL":
+                    # Events of the message's other parts are dropped with it
+                    result.update(status="needs_llm", reason="Invite is a cancellation.")
+                    break
+                message_events.extend(event for event in parsed["events"] if event.get("status") != "cancelled")
+
+            if "status" not in result:
+                if parse_errors and not message_events:
+                    result.update(status="needs_llm", reason="; ".join(parse_errors))
+                elif not message_events:
+                    result.update(status="needs_llm", reason="Invite contains no events.")
+                else:
+                    result["status"] = "imported"
+                    if parse_errors:
+                        result["warnings"] = parse_errors
+                    pending_events.extend(message_events)
+                    pending_owner.extend([result] * len(message_events))
+
+        if pending_events:
+            created = self.calendar.create_events(calendar_id, pending_events, send_notifications=False)
+            if "results" not in created:
+                return created
+            for owner, event, item in zip(pending_owner, pending_events, created["results"]):
+                entry = {"summary": event.get("summary"), "start": event["start"]}
+                if item["success"]:
+                    entry["event_id"] = item["event_id"]
+                elif item.get("error_code") == 409:
+                    # Duplicate iCalUID: the event is already in the calendar
+                    entry["already_exists"] = True
+                else:
+                    entry["error"] = item["error"]
+                    owner["status"] = "failed"
+                owner["events"].append(entry)
+
+        # Messages left to the LLM are reported again until an event is created for them
+        with self._lock:
+            self._processed.update(r["message_id"] for r in results if r["status"] == "imported")
+
+        imported = sum(1 for r in results if r["status"] == "imported")
+        needs_llm = sum(1 for r in results if r["status"] == "needs_llm")
+        return {
+            "success": True,
+            "results": results,
+            "message": f"Imported invites from {imported} of {len(message_ids)} messages; "
+                       f"{needs_llm} need manual handling."
+        }
@@ -0,0 +1,112 @@
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def lazy_instance(factory: Callable[[], T]) -> Callable[[], T]:
+    """
+    Wrap a factory so it runs once, on first call, and returns the same instance afterwards.
+
+    Args:
+        factory: Zero-argument callable creating the instance
+
+    Returns:
+        Thread-safe zero-argument accessor for the instance
+    """
+    lock = threading.Lock()
+    instance = []
+
+    @functools.wraps(factory)
+    def get() -> T:
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    return get
+
+
+def lazy_tool(get_instance: Callable[[], Any], method: Callable) -> Callable:
+    """
+    Expose a method of a lazily created object as a function tool.
+
+    The returned function has the method's name, docstring and signature
+    (without self), so agents see the same tool declaration, but the object
+    is only created when the tool is first called.
+
+    Args:
+        get_instance: Accessor returning the object, e.g. from lazy_instance
+        method: Unbound method, e.g. GmailTool.send_email
+
+    Returns:
+        Function or coroutine function forwarding calls to the object
+    """
+    name = method.__name__
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def tool(*args, **kwargs):
+            return await getattr(get_instance(), name)(*args, **kwargs)
+    else:
+        @functools.wraps(method)
+        def tool(*args, **kwargs):
+            return getattr(get_instance(), name)(*args, **kwargs)
+
+    signature = inspect.signature(method)
+    tool.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+    tool.__qualname__ = name
+    return tool
+
+
+def context_user_id(tool_context: Any) -> Optional[str]:
+    """Return the ADK session user ID of a tool call, or None outside an ADK session."""
+    if tool_context is None:
+        return None
+    user_id = getattr(tool_context, "user_id", None)
+    if user_id is None:
+        invocation_context = getattr(tool_context, "_invocation_context", None)
+        user_id = getattr(invocation_context, "user_id", None)
+    return user_id
+
+
+def user_tool(get_instance: Callable[[Optional[str]], Any], method: Callable) -> Callable:
+    """
+    Expose a method of a per-user object as a function tool.
+
+    Like lazy_tool, but the function also takes ADK's tool_context, which ADK
+    fills in and leaves out of the tool declaration, and calls the method on
+    the object of the session's user.
+
+    Args:
+        get_instance: Accessor returning the object of a user ID (None when there is no session)
+        method: Unbound method, e.g. GmailTool.send_email
+
+    Returns:
+        Function or coroutine function forwarding calls to the user's object
+    """
+    name = method.__name__
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def tool(*args, tool_context=None, **kwargs):
+            return await getattr(get_instance(context_user_id(tool_context)), name)(*args, **kwargs)
+    else:
+        @functools.wraps(method)
+        def tool(*args, tool_context=None, **kwargs):
+            return getattr(get_instance(context_user_id(tool_context)), name)(*args, **kwargs)
+
+    signature = inspect.signature(method)
+    parameters = list(signature.parameters.values())[1:]
+    context = inspect.Parameter("tool_context", inspect.Parameter.KEYWORD_ONLY, default=None)
+    # Keyword-only parameters go before **kwargs
+    position = len(parameters)
+    if parameters and parameters[-1].kind is inspect.Parameter.VAR_KEYWORD:
+        position -= 1
+    parameters.insert(position, context)
+    tool.__signature__ = signature.replace(parameters=parameters)
+    tool.__qualname__ = name
+    return tool
@@ -0,0 +1,286 @@
+import base64
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+
+def iter_parts(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Walk a Gmail message payload depth-first.
+
+    Args:
+        payload: 'payload' of a full-format Gmail message resource
+
+    Yields:
+        The payload itself and every nested MIME part
+    """
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        yield part
+        stack.extend(reversed(part.get("parts", [])))
+
+
+def decode_base64url(data: str) -> bytes:
+    """Decode Gmail's unpadded base64url body data."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def part_header(part: Dict[str, Any], name: str) -> str:
+    """Return a header of a MIME part, or an empty string."""
+    for header in part.get("headers", []):
+        if header["name"].lower() == name.lower():
+            return header["value"]
+    return ""
+
+
+def part_charset(part: Dict[str, Any], default: str = "utf-8") -> str:
+    """Return the charset declared in a part's Content-Type header, or default if it is missing or unknown."""
+    for param in part_header(part, "Content-Type").split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            charset = value.strip('"\'')
+            try:
+                codecs.lookup(charset)
+            except LookupError:
+                return default
+            return charset
+    return default
+
+
+def is_attachment(part: Dict[str, Any]) -> bool:
+    """Whether a MIME part is an attachment rather than part of the message body."""
+    return bool(part.get("filename")) or part_header(part, "Content-Disposition").lower().startswith("attachment")
+
+
+def find_body_part(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Pick the part holding the readable message body.
+
+    Plain text is preferred over HTML; attachments are never chosen.
+
+    Args:
+        payload: 'payload' of a full-format Gmail message resource
+
+    Returns:
+        The chosen text/plain or text/html part, or None if there is none
+    """
+    plain = html = None
+    for part in iter_parts(payload):
+        if is_attachment(part):
+            continue
+        mime_type = part.get("mimeType", "").lower()
+        if mime_type == "text/plain" and plain is None and part.get("body", {}).get("size", 0) > 0:
+            plain = part
+        elif mime_type == "text/html" and html is None:
+            html = part
+    return plain or html
+
+
+def attachment_parts(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Describe the attachments of a message without downloading them.
+
+    Args:
+        payload: 'payload' of a full-format Gmail message resource
+
+    Returns:
+        List of dicts with part_id, filename, mime_type, size and the
+        attachment_id to download the content with
+    """
+    return [
+        {
+            "part_id": part.get("partId"),
+            "filename": part.get("filename", ""),
+            "mime_type": part.get("mimeType"),
+            "size": part.get("body", {}).get("size", 0),
+            "attachment_id": part.get("body", {}).get("attachmentId")
+        }
+        for part in iter_parts(payload)
+        if is_attachment(part) and not part.get("parts")
+    ]
+
+
+def iter_base64url_chunks(data: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Decode base64url data a chunk at a time.
+
+    Args:
+        data: Unpadded base64url text
+        chunk_size: Characters decoded per chunk (rounded down to a multiple of 4)
+
+    Yields:
+        Decoded bytes, in order
+    """
+    chunk_size = max(4, chunk_size - chunk_size % 4)
+    for start in range(0, len(data), chunk_size):
+        yield decode_base64url(data[start:start + chunk_size])
+
+
+class HtmlTextExtractor(HTMLParser):
+    """Incremental HTML to plain text converter keeping paragraph breaks and link targets."""
+
+    BLOCK_TAGS = {"p", "div", "br", "tr", "li", "ul", "ol", "table", "h1", "h2", "h3", "h4", "h5", "h6",
+                  "blockquote", "pre", "hr", "section", "article", "header", "footer"}
+    SKIPPED_TAGS = {"script", "style", "head", "title", "noscript", "template"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pieces: List[str] = []
+        self.length = 0
+        self._skipping = 0
+
+    def _append(self, text: str) -> None:
+        self.pieces.append(text)
+        self.length += len(text)
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in self.SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag in self.BLOCK_TAGS:
+            self._append("\n- " if tag == "li" else "\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.SKIPPED_TAGS:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in self.BLOCK_TAGS and tag != "li":
+            self._append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skipping:
+            self._append(data)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of spaces and blank lines, as left by HTML markup or quoted replies."""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def extract_text(chunks: Iterable[bytes], mime_type: str, charset: str, max_chars: int) -> Tuple[str, bool]:
+    """
+    Turn a text part into readable text, stopping once max_chars is reached.
+
+    Chunks are consumed lazily, so only the beginning of a long body is
+    decoded when the budget is small.
+
+    Args:
+        chunks: Raw bytes of the part, e.g. from iter_base64url_chunks
+        mime_type: 'text/plain' or 'text/html'
+        charset: Charset of the part
+        max_chars: Maximum characters of text to return
+
+    Returns:
+        (text, truncated) where truncated tells whether text was cut off
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    html = HtmlTextExtractor() if mime_type.lower() == "text/html" else None
+    pieces: List[str] = html.pieces if html else []
+    length = 0
+
+    def _text() -> str:
+        if html:
+            html.close()
+        return normalize_text("".join(pieces))
+
+    for chunk in chunks:
+        decoded = decoder.decode(chunk)
+        if html:
+            html.feed(decoded)
+            length = html.length
+        else:
+            pieces.append(decoded)
+            length += len(decoded)
+        # Normalizing only shrinks the text, so check it once the raw text is long enough
+        if length > max_chars and len(normalize_text("".join(pieces))) > max_chars:
+            break
+    else:
+        tail = decoder.decode(b"", final=True)
+        if html:
+            html.feed(tail)
+        else:
+            pieces.append(tail)
+        text = _text()
+        if len(text) <= max_chars:
+            return text, False
+        return _truncate(text, max_chars), True
+
+    return _truncate(_text(), max_chars), True
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """Cut text to max_chars, preferring a word boundary."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    boundary = cut.rfind(" ")
+    return (cut[:boundary] if boundary > max_chars * 0.8 else cut).rstrip() + " …"
+
+
+class Base64urlStreamDecoder:
+    """Decode base64url text fed in arbitrary pieces, holding back at most three characters."""
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, text: str) -> bytes:
+        """Decode the complete 4-character groups available so far."""
+        text = self._pending + text
+        usable = len(text) - len(text) % 4
+        self._pending = text[usable:]
+        return base64.urlsafe_b64decode(text[:usable]) if usable else b""
+
+    def finish(self) -> bytes:
+        """Decode the unpadded remainder at the end of the data."""
+        pending, self._pending = self._pending, ""
+        return decode_base64url(pending) if pending else b""
+
+
+def iter_json_string_field(chunks: Iterable[bytes], field: str) -> Iterator[str]:
+    """
+    Stream the value of a string field out of a JSON document arriving in chunks.
+
+    Meant for responses such as {"data": "<base64url>"} whose value holds no
+    escape sequences, so the value is never held in memory as a whole.
+
+    Args:
+        chunks: Raw response body, in pieces
+        field: Name of the field
+
+    Yields:
+        Consecutive pieces of the field's value
+
+    Raises:
+        ValueError: If the document ends before the value is complete
+    """
+    key = f'"{field}"'
+    buffer = ""
+    in_value = found_key = False
+    for chunk in chunks:
+        buffer += chunk.decode("ascii", errors="replace")
+        if not found_key:
+            index = buffer.find(key)
+            if index < 0:
+                # Keep enough to match a key split across chunks
+                buffer = buffer[-len(key):]
+                continue
+            buffer = buffer[index + len(key):]
+            found_key = True
+        if not in_value:
+            index = buffer.find('"')
+            if index < 0:
+                buffer = ""
+                continue
+            buffer = buffer[index + 1:]
+            in_value = True
+        end = buffer.find('"')
+        if end >= 0:
+            yield buffer[:end]
+            return
+        yield buffer
+        buffer = ""
+    raise ValueError(f"Response ended before the end of field '{field}'")
@@ -0,0 +1,643 @@
+import base64
+import hmac
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Tuple, Callable, Iterable
+from urllib.parse import urlparse, parse_qs
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.credential_manager import CredentialManager
+from gmail_calendar_automation.tools.gmail_tool import GmailTool
+from gmail_calendar_automation.tools.google_calendar_tool import GoogleCalendarTool
+
+PUBSUB_BASE_URL = "https://pubsub.googleapis.com/v1"
+PUBSUB_SCOPE = "https://www.googleapis.com/auth/pubsub"
+
+
+def decode_pubsub_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode the JSON payload of a Pub/Sub message (Gmail sends emailAddress and historyId)."""
+    data = message.get("data")
+    if not data:
+        return {}
+    return json.loads(base64.b64decode(data))
+
+
+class LocalPublisher:
+    """
+    In-process stand-in for Google's notification senders.
+
+    Acts as a Pub/Sub topic with one pull subscription, exposing the same
+    pull/acknowledge interface as PubSubPullSubscriber, and can POST Calendar
+    channel notifications to a NotificationReceiver. This exercises the whole
+    notification path without Google Cloud.
+    """
+
+    def __init__(self, ack_deadline: float = 10.0):
+        """
+        Initialize local publisher.
+
+        Args:
+            ack_deadline: Seconds after which pulled but unacknowledged messages are redelivered
+        """
+        self.ack_deadline = ack_deadline
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._unacked: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, payload: Dict[str, Any]) -> str:
+        """Publish a JSON payload and return its message ID."""
+        message_id = uuid.uuid4().hex
+        self._queue.put({
+            "ackId": uuid.uuid4().hex,
+            "message": {
+                "data": base64.b64encode(json.dumps(payload).encode("utf-8")).decode("ascii"),
+                "messageId": message_id,
+                "publishTime": datetime.now(timezone.utc).isoformat()
+            }
+        })
+        return message_id
+
+    def publish_gmail_change(self, email_address: str, history_id: str) -> str:
+        """Publish a message shaped like Gmail's users.watch notifications."""
+        return self.publish({"emailAddress": email_address, "historyId": int(history_id)})
+
+    def pull(self, max_messages: int = 10, timeout: float = 10.0) -> List[Dict[str, Any]]:
+        """
+        Wait up to timeout for messages.
+
+        Args:
+            max_messages: Maximum number of messages to return
+            timeout: Seconds to wait for the first message
+
+        Returns:
+            Received messages with 'ackId' and 'message'
+        """
+        now = time.monotonic()
+        with self._lock:
+            for ack_id in [a for a, (deadline, _) in self._unacked.items() if deadline <= now]:
+                self._queue.put(self._unacked.pop(ack_id)[1])
+
+        try:
+            received = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(received) < max_messages:
+            try:
+                received.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        deadline = time.monotonic() + self.ack_deadline
+        with self._lock:
+            for message in received:
+                self._unacked[message["ackId"]] = (deadline, message)
+        return received
+
+    def acknowledge(self, ack_ids: List[str]) -> None:
+        """Acknowledge pulled messages so they are not redelivered."""
+        with self._lock:
+            for ack_id in ack_ids:
+                self._unacked.pop(ack_id, None)
+
+    @staticmethod
+    def push_calendar_change(url: str,
+                             channel_id: str,
+                             token: Optional[str] = None,
+                             resource_state: str = "exists") -> int:
+        """
+        POST a Calendar-style channel notification.
+
+        Args:
+            url: Receiver endpoint, e.g. NotificationReceiver.calendar_url
+            channel_id: Channel the notification belongs to
+            token: Channel token, if the channel was opened with one
+            resource_state: 'sync' for the initial handshake, 'exists' for changes
+
+        Returns:
+            HTTP status returned by the receiver
+        """
+        headers = {"X-Goog-Channel-ID": channel_id, "X-Goog-Resource-State": resource_state}
+        if token:
+            headers["X-Goog-Channel-Token"] = token
+        request = urllib.request.Request(url, data=b"", headers=headers, method="POST")
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+class PubSubPullSubscriber:
+    """
+    Pull subscriber for a Cloud Pub/Sub subscription, using the REST API.
+
+    Uses the user's OAuth credentials, which need the Pub/Sub scope: the scope is
+    added to the credential manager and takes effect on the next authenticate().
+    """
+
+    def __init__(self, subscription: str, credential_manager: CredentialManager):
+        """
+        Initialize Pub/Sub subscriber.
+
+        Args:
+            subscription: Subscription path, e.g. 'projects/my-project/subscriptions/gmail'
+            credential_manager: Source of OAuth credentials
+        """
+        self.subscription = subscription
+        self._credential_manager = credential_manager
+        self._credential_manager.add_scopes([PUBSUB_SCOPE])
+        self._session = None
+
+    def _post(self, method: str, body: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        if not self._credential_manager.ensure_valid():
+            raise PermissionError("Authentication required. Please call authenticate() first.")
+        credentials = self._credential_manager.credentials
+        if self._session is None or self._session.credentials is not credentials:
+            self._session = google_api.AuthorizedSession(credentials)
+        response = self._session.post(f"{PUBSUB_BASE_URL}/{self.subscription}:{method}", json=body, timeout=timeout)
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    def pull(self, max_messages: int = 10, timeout: float = 10.0) -> List[Dict[str, Any]]:
+        """
+        Pull messages; the server holds the request open while the subscription is empty.
+
+        Args:
+            max_messages: Maximum number of messages to return
+            timeout: Client-side bound on the wait in seconds
+
+        Returns:
+            Received messages with 'ackId' and 'message'
+        """
+        # Imported here like the rest of the Google transport stack; requests ships with google-auth
+        import requests
+
+        try:
+            return self._post("pull", {"maxMessages": max_messages}, timeout).get("receivedMessages", [])
+        except requests.exceptions.Timeout:
+            return []
+
+    def acknowledge(self, ack_ids: List[str]) -> None:
+        """Acknowledge pulled messages so they are not redelivered."""
+        self._post("acknowledge", {"ackIds": ack_ids}, 30)
+
+
+class NotificationReceiver:
+    """
+    Local HTTP endpoint for push notifications.
+
+    Calendar watch channels POST to CALENDAR_PATH with the channel in X-Goog-*
+    headers; Pub/Sub push subscriptions POST Gmail notifications to GMAIL_PATH.
+    Google only delivers to public HTTPS URLs, so in production the receiver
+    sits behind a TLS-terminating proxy or tunnel.
+    """
+
+    CALENDAR_PATH = "/calendar"
+    GMAIL_PATH = "/gmail"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, push_token: Optional[str] = None):
+        """
+        Initialize notification receiver.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            push_token: Secret expected in the '?token=' query of Pub/Sub push requests
+        """
+        self.host = host
+        self.port = port
+        self.push_token = push_token
+        self._channels: Dict[str, Tuple[Optional[str], Callable[[str], None]]] = {}
+        self._gmail_handler: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def calendar_url(self) -> str:
+        """Local URL of the Calendar endpoint."""
+        return f"http://{self.host}:{self.port}{self.CALENDAR_PATH}"
+
+    @property
+    def gmail_url(self) -> str:
+        """Local URL of the Pub/Sub push endpoint."""
+        return f"http://{self.host}:{self.port}{self.GMAIL_PATH}"
+
+    def register_channel(self, channel_id: str, token: Optional[str], handler: Callable[[str], None]) -> None:
+        """
+        Accept notifications for a Calendar channel.
+
+        Args:
+            channel_id: Channel ID
+            token: Channel token notifications must carry (optional)
+            handler: Called with the X-Goog-Resource-State of each notification
+        """
+        with self._lock:
+            self._channels[channel_id] = (token, handler)
+
+    def unregister_channel(self, channel_id: str) -> None:
+        """Stop accepting notifications for a Calendar channel."""
+        with self._lock:
+            self._channels.pop(channel_id, None)
+
+    def set_gmail_handler(self, handler: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+        """Set the callback receiving decoded Gmail notification payloads."""
+        self._gmail_handler = handler
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        if self._server is not None:
+            return
+        receiver = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                self.send_response(receiver._dispatch(self.path, self.headers, body))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="notification-receiver", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _dispatch(self, path: str, headers, body: bytes) -> int:
+        """Route one notification and return the HTTP status to answer with."""
+        url = urlparse(path)
+        if url.path == self.CALENDAR_PATH:
+            with self._lock:
+                registration = self._channels.get(headers.get("X-Goog-Channel-ID", ""))
+            if registration is None:
+                return 404
+            token, handler = registration
+            if token and not hmac.compare_digest(token, headers.get("X-Goog-Channel-Token", "")):
+                return 403
+            handler(headers.get("X-Goog-Resource-State", ""))
+            return 200
+
+        if url.path == self.GMAIL_PATH:
+            if self.push_token and not hmac.compare_digest(self.push_token, parse_qs(url.query).get("token", [""])[0]):
+                return 403
+            if self._gmail_handler is None:
+                return 404
+            try:
+                payload = decode_pubsub_message(json.loads(body).get("message", {}))
+            except (ValueError, AttributeError):
+                return 400
+            self._gmail_handler(payload)
+            return 204
+
+        return 404
+
+
+class NotificationManager:
+    """
+    Keeps Gmail and Calendar watches open and turns notifications into incremental syncs.
+
+    While a watch is active the tools skip their per-read syncs, so an idle
+    mailbox or calendar costs no API calls. A notification marks the local store
+    stale and, with auto_refresh, syncs it in the background so the next read is
+    answered locally. Watches are renewed before they expire; if renewal keeps
+    failing they lapse and the tools fall back to syncing on every read.
+    """
+
+    # Renew watches this many seconds before they expire
+    RENEW_MARGIN = 3600
+    # Gmail recommends calling users.watch again once a day
+    GMAIL_RENEW_INTERVAL = 24 * 3600
+    CALENDAR_CHANNEL_TTL = 7 * 24 * 3600
+    RETRY_DELAY = 60
+    PULL_TIMEOUT = 10
+
+    def __init__(self,
+                 gmail: Optional[GmailTool] = None,
+                 calendar: Optional[GoogleCalendarTool] = None,
+                 receiver: Optional[NotificationReceiver] = None,
+                 webhook_url: Optional[str] = None,
+                 topic_name: Optional[str] = None,
+                 subscriber=None,
+                 calendar_ids: Iterable[str] = ("primary",),
+                 auto_refresh: bool = True):
+        """
+        Initialize notification manager.
+
+        Args:
+            gmail: Gmail tool to keep current (optional)
+            calendar: Calendar tool to keep current (optional)
+            receiver: HTTP receiver for Calendar channels and Pub/Sub push (optional)
+            webhook_url: Public HTTPS URL forwarded to the receiver's Calendar endpoint
+            topic_name: Pub/Sub topic Gmail publishes mailbox changes to
+            subscriber: Pull subscriber for the topic, e.g. PubSubPullSubscriber or
+                LocalPublisher (not needed when the subscription pushes to the receiver)
+            calendar_ids: Calendars to watch
+            auto_refresh: Sync stores in the background as soon as a change is notified
+        """
+        self.gmail = gmail
+        self.calendar = calendar
+        self.receiver = receiver
+        self.webhook_url = webhook_url
+        self.topic_name = topic_name
+        self.subscriber = subscriber
+        self.calendar_ids = list(calendar_ids)
+        self.auto_refresh = auto_refresh
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._timers: Dict[str, threading.Timer] = {}
+        self._channels: Dict[str, Dict[str, Any]] = {}
+        self._gmail_watch: Optional[Dict[str, Any]] = None
+        self._consumer: Optional[threading.Thread] = None
+        self._refreshing: set = set()
+        self._refresh_pending: set = set()
+        self._errors: Dict[str, str] = {}
+        self._metrics = {
+            "calendar_notifications": 0,
+            "gmail_notifications": 0,
+            "refreshes": 0,
+            "renewals": 0,
+            "errors": 0
+        }
+
+    @classmethod
+    def from_env(cls,
+                 gmail: Optional[GmailTool] = None,
+                 calendar: Optional[GoogleCalendarTool] = None) -> Optional["NotificationManager"]:
+        """
+        Build a manager from environment settings.
+
+        Reads NOTIFICATION_HOST, NOTIFICATION_PORT, CALENDAR_WEBHOOK_URL,
+        CALENDAR_WATCH_IDS, GMAIL_PUBSUB_TOPIC, GMAIL_PUBSUB_SUBSCRIPTION and
+        GMAIL_PUSH_TOKEN.
+
+        Returns:
+            Manager, or None when notifications are not configured
+        """
+        port = os.getenv("NOTIFICATION_PORT")
+        topic_name = os.getenv("GMAIL_PUBSUB_TOPIC")
+        if not port and not topic_name:
+            return None
+
+        receiver = None
+        if port:
+            receiver = NotificationReceiver(os.getenv("NOTIFICATION_HOST", "127.0.0.1"), int(port),
+                                            os.getenv("GMAIL_PUSH_TOKEN"))
+        subscriber = None
+        subscription = os.getenv("GMAIL_PUBSUB_SUBSCRIPTION")
+        if subscription and gmail is not None:
+            subscriber = PubSubPullSubscriber(subscription, gmail.credential_manager)
+
+        return cls(
+            gmail=gmail,
+            calendar=calendar,
+            receiver=receiver,
+            webhook_url=os.getenv("CALENDAR_WEBHOOK_URL"),
+            topic_name=topic_name,
+            subscriber=subscriber,
+            calendar_ids=[c.strip() for c in os.getenv("CALENDAR_WATCH_IDS", "primary").split(",") if c.strip()]
+        )
+
+    def start(self) -> Dict[str, Any]:
+        """
+        Start the receiver and consumer and open the watches.
+
+        Watches that cannot be opened (e.g. before the user authenticates) are
+        retried every RETRY_DELAY seconds.
+
+        Returns:
+            Notification status, as returned by status()
+        """
+        self._stopped.clear()
+        if self.receiver is not None:
+            self.receiver.start()
+            if self.gmail is not None:
+                self.receiver.set_gmail_handler(self._on_gmail_notification)
+        if self.calendar is not None and self.webhook_url:
+            for calendar_id in self.calendar_ids:
+                self._watch_calendar(calendar_id)
+        if self.gmail is not None and self.topic_name:
+            self._watch_gmail()
+        if self.gmail is not None and self.subscriber is not None and self._consumer is None:
+            self._consumer = threading.Thread(target=self._consume, name="gmail-notifications", daemon=True)
+            self._consumer.start()
+        return self.status()
+
+    def stop(self) -> None:
+        """Close the watches and stop the receiver and consumer."""
+        self._stopped.set()
+        with self._lock:
+            timers = list(self._timers.values())
+            self._timers = {}
+        for timer in timers:
+            timer.cancel()
+
+        for calendar_id, channel in list(self._channels.items()):
+            if self.receiver is not None:
+                self.receiver.unregister_channel(channel["channel_id"])
+            try:
+                self.calendar.stop_channel(channel["channel_id"], channel["resource_id"], calendar_id)
+            except Exception:
+                # The channel expires on its own
+                pass
+        self._channels = {}
+
+        if self._gmail_watch is not None:
+            try:
+                self.gmail.stop_mailbox_watch()
+            except Exception:
+                pass
+            self._gmail_watch = None
+
+        if self.receiver is not None:
+            self.receiver.stop()
+        if self._consumer is not None:
+            self._consumer.join(timeout=self.PULL_TIMEOUT)
+            self._consumer = None
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Return watch state and notification metrics.
+
+        Returns:
+            Dict with open Calendar channels, the Gmail watch, counters and last errors
+        """
+        def _iso(timestamp: float) -> str:
+            return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+        with self._lock:
+            return {
+                "calendar_channels": {
+                    calendar_id: {"channel_id": channel["channel_id"], "expires_at": _iso(channel["expiration"])}
+                    for calendar_id, channel in self._channels.items()
+                },
+                "gmail_watch": {
+                    "history_id": self._gmail_watch["history_id"],
+                    "expires_at": _iso(self._gmail_watch["expiration"])
+                } if self._gmail_watch else None,
+                "metrics": dict(self._metrics),
+                "errors": dict(self._errors)
+            }
+
+    def _schedule(self, key: str, delay: float, action: Callable[[], Any]) -> None:
+        """Run action after delay, replacing any timer already scheduled under key."""
+        if self._stopped.is_set():
+            return
+        timer = threading.Timer(max(delay, 0), action)
+        timer.daemon = True
+        with self._lock:
+            previous = self._timers.pop(key, None)
+            self._timers[key] = timer
+        if previous is not None:
+            previous.cancel()
+        timer.start()
+
+    def _record_error(self, key: str, error: Exception) -> None:
+        with self._lock:
+            self._metrics["errors"] += 1
+            self._errors[key] = str(error)
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def _watch_calendar(self, calendar_id: str) -> None:
+        """Open (or replace) the channel for a calendar and schedule its renewal."""
+        key = f"calendar:{calendar_id}"
+        channel_id = uuid.uuid4().hex
+        token = secrets.token_urlsafe(24)
+        # Registered first: Calendar sends a 'sync' notification as soon as the channel opens
+        if self.receiver is not None:
+            self.receiver.register_channel(
+                channel_id, token, lambda state: self._on_calendar_notification(calendar_id, state)
+            )
+        try:
+            channel = self.calendar.watch_events(
+                calendar_id, self.webhook_url, channel_id, token=token, ttl_seconds=self.CALENDAR_CHANNEL_TTL
+            )
+        except Exception as e:
+            if self.receiver is not None:
+                self.receiver.unregister_channel(channel_id)
+            self._record_error(key, e)
+            self._schedule(key, self.RETRY_DELAY, lambda: self._watch_calendar(calendar_id))
+            return
+
+        expiration = int(channel["expiration"]) / 1000
+        with self._lock:
+            previous = self._channels.get(calendar_id)
+            self._channels[calendar_id] = {
+                "channel_id": channel_id,
+                "resource_id": channel["resourceId"],
+                "expiration": expiration
+            }
+            self._errors.pop(key, None)
+            if previous is not None:
+                self._metrics["renewals"] += 1
+
+        if previous is not None:
+            # The new channel is already open, so close the old one without leaving push mode
+            if self.receiver is not None:
+                self.receiver.unregister_channel(previous["channel_id"])
+            try:
+                self.calendar.stop_channel(previous["channel_id"], previous["resource_id"])
+            except Exception:
+                pass
+        self._schedule(key, expiration - time.time() - self.RENEW_MARGIN, lambda: self._watch_calendar(calendar_id))
+
+    def _watch_gmail(self) -> None:
+        """Start or renew the mailbox watch and schedule the next renewal."""
+        try:
+            response = self.gmail.watch_mailbox(self.topic_name)
+        except Exception as e:
+            self._record_error("gmail", e)
+            self._schedule("gmail", self.RETRY_DELAY, self._watch_gmail)
+            return
+
+        expiration = int(response["expiration"]) / 1000
+        with self._lock:
+            if self._gmail_watch is not None:
+                self._metrics["renewals"] += 1
+            self._gmail_watch = {"history_id": response["historyId"], "expiration": expiration}
+            self._errors.pop("gmail", None)
+        delay = min(expiration - time.time() - self.RENEW_MARGIN, self.GMAIL_RENEW_INTERVAL)
+        self._schedule("gmail", delay, self._watch_gmail)
+
+    def _on_calendar_notification(self, calendar_id: str, resource_state: str) -> None:
+        # 'sync' only confirms that the channel was opened
+        if resource_state == "sync":
+            return
+        self._count("calendar_notifications")
+        self.calendar.mark_events_changed(calendar_id)
+        if self.auto_refresh:
+            self._request_refresh(f"calendar:{calendar_id}", lambda: self.calendar.refresh_events(calendar_id))
+
+    def _on_gmail_notification(self, payload: Dict[str, Any]) -> None:
+        self._count("gmail_notifications")
+        history_id = payload.get("historyId")
+        stale = self.gmail.mark_mailbox_changed(str(history_id) if history_id is not None else None)
+        if stale and self.auto_refresh:
+            self._request_refresh("gmail", self.gmail.refresh_mailbox)
+
+    def _request_refresh(self, key: str, refresh: Callable[[], Any]) -> None:
+        """
+        Run refresh in the background, coalescing bursts of notifications.
+
+        At most one refresh per key runs at a time; notifications arriving
+        during a refresh cause exactly one more.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                self._refresh_pending.add(key)
+                return
+            self._refreshing.add(key)
+        threading.Thread(target=self._run_refresh, args=(key, refresh), daemon=True).start()
+
+    def _run_refresh(self, key: str, refresh: Callable[[], Any]) -> None:
+        while True:
+            try:
+                refresh()
+                self._count("refreshes")
+            except Exception as e:
+                # The store stays marked stale, so the next read syncs instead
+                self._record_error(f"refresh:{key}", e)
+            with self._lock:
+                if key not in self._refresh_pending:
+                    self._refreshing.discard(key)
+                    return
+                self._refresh_pending.discard(key)
+
+    def _consume(self) -> None:
+        """Pull Gmail notifications until stopped, backing off after failures."""
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                messages = self.subscriber.pull(max_messages=100, timeout=self.PULL_TIMEOUT)
+                for received in messages:
+                    try:
+                        payload = decode_pubsub_message(received.get("message", {}))
+                    except ValueError:
+                        payload = {}
+                    self._on_gmail_notification(payload)
+                if messages:
+                    self.subscriber.acknowledge([received["ackId"] for received in messages])
+                failures = 0
+            except Exception as e:
+                self._record_error("gmail:pull", e)
+                failures += 1
+                self._stopped.wait(min(self.RETRY_DELAY, 2 ** failures))
@@ -0,0 +1,147 @@
+import json
+from typing import Dict, Any, List
+
+# Event fields returned to the agent by default, in partial-response syntax
+DEFAULT_EVENT_FIELDS = "id,summary,start,end,location,status,recurringEventId,htmlLink,attendees(email,responseStatus)"
+# Fields the local event store needs for sync, conflict checks and recurrence handling
+STORE_EVENT_FIELDS = "id,status,start,end,recurringEventId,transparency,recurrence,attendees(self,responseStatus),iCalUID"
+# Fields local recurrence expansion needs from recurring events, their exceptions and single events
+RECURRENCE_EVENT_FIELDS = "id,iCalUID,status,start,end,recurrence,recurringEventId,originalStartTime"
+# Fields of a metadata-format message used by the email dict, the sync store and the index
+MESSAGE_METADATA_FIELDS = "id,labelIds,snippet,internalDate,payload/headers"
+MESSAGE_LIST_FIELDS = "messages/id,nextPageToken"
+# Full-format message; Gmail leaves attachment bodies out and returns their attachmentId
+MESSAGE_FULL_FIELDS = "id,threadId,labelIds,snippet,internalDate,sizeEstimate,payload"
+
+
+def _nested_parts_fields(fields: str, depth: int) -> str:
+    """Select fields of a MIME part and, recursively, of its child parts."""
+    if depth == 0:
+        return fields
+    return f"{fields},parts({_nested_parts_fields(fields, depth - 1)})"
+
+
+# MIME structure of a message without any body data, to locate attachments;
+# the mask needs an explicit level per nesting depth of multipart parts
+MESSAGE_PARTS_FIELDS = "id,payload(" + _nested_parts_fields(
+    "partId,mimeType,filename,headers,body(size,attachmentId)", 6
+) + ")"
+HISTORY_LIST_FIELDS = (
+    "history(messagesAdded/message/id,messagesDeleted/message/id,"
+    "labelsAdded(message/id,labelIds),labelsRemoved(message/id,labelIds)),historyId,nextPageToken"
+)
+
+# Rough average for English JSON text; good enough to compare payload sizes
+CHARS_PER_TOKEN = 4
+
+
+def parse_field_mask(mask: str) -> Dict[str, Any]:
+    """
+    Parse a partial-response field mask into a tree.
+
+    Supports the syntax of the Google APIs 'fields' parameter: comma-separated
+    fields, 'a/b' paths and 'a(b,c)' sub-selections.
+
+    Args:
+        mask: Field mask, e.g. 'id,start,attendees(email,responseStatus)'
+
+    Returns:
+        Nested dict; an empty dict selects the whole value
+    """
+    tree: Dict[str, Any] = {}
+    stack = [tree]
+    path: List[Dict[str, Any]] = []
+    name = ""
+
+    def _close_name():
+        nonlocal name
+        if name:
+            node = stack[-1]
+            for part in name.strip().split("/"):
+                node = node.setdefault(part, {})
+            path.append(node)
+            name = ""
+
+    for char in mask:
+        if char == ",":
+            _close_name()
+        elif char == "(":
+            _close_name()
+            stack.append(path[-1])
+        elif char == ")":
+            _close_name()
+            stack.pop()
+        else:
+            name += char
+    _close_name()
+    return tree
+
+
+def apply_field_mask(resource: Any, mask: Any) -> Any:
+    """
+    Keep only the fields selected by a mask, like a partial response would.
+
+    Args:
+        resource: Decoded API resource (dict, list or scalar)
+        mask: Field mask string or tree from parse_field_mask
+
+    Returns:
+        Projected copy of the resource
+    """
+    tree = parse_field_mask(mask) if isinstance(mask, str) else mask
+    if not tree:
+        return resource
+    if isinstance(resource, list):
+        return [apply_field_mask(item, tree) for item in resource]
+    if not isinstance(resource, dict):
+        return resource
+    return {key: apply_field_mask(resource[key], subtree) for key, subtree in tree.items() if key in resource}
+
+
+def merge_field_masks(*masks: str) -> str:
+    """Combine field masks into one selecting the union of their fields."""
+    def _merge(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+        for key, subtree in source.items():
+            if key not in target:
+                target[key] = subtree
+            elif not target[key] or not subtree:
+                # One side selects the whole value
+                target[key] = {}
+            else:
+                _merge(target[key], subtree)
+
+    def _format(tree: Dict[str, Any]) -> str:
+        return ",".join(f"{key}({_format(subtree)})" if subtree else key for key, subtree in tree.items())
+
+    merged: Dict[str, Any] = {}
+    for mask in masks:
+        _merge(merged, parse_field_mask(mask))
+    return _format(merged)
+
+
+def list_fields(item_fields: str, *collection_fields: str) -> str:
+    """
+    Build the field mask of a list response.
+
+    Args:
+        item_fields: Mask applied to each item
+        collection_fields: Top-level fields to keep, e.g. 'nextPageToken'
+
+    Returns:
+        Field mask such as 'nextPageToken,items(id,summary)'
+    """
+    return ",".join(list(collection_fields) + [f"items({item_fields})"])
+
+
+def payload_size(payload: Any) -> Dict[str, int]:
+    """
+    Measure a payload as it would be serialized for the model.
+
+    Args:
+        payload: JSON-serializable value
+
+    Returns:
+        Dict with compact JSON 'bytes' and estimated 'tokens'
+    """
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    return {"bytes": len(encoded), "tokens": -(-len(encoded) // CHARS_PER_TOKEN)}
@@ -0,0 +1,505 @@
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.call_stats import CallStats
+from gmail_calendar_automation.tools.async_client import GoogleApiError
+from gmail_calendar_automation.tools.tracing import tracer
+
+# Gmail quota units per method (https://developers.google.com/gmail/api/reference/quota)
+GMAIL_QUOTA_UNITS = {
+    "messages.send": 100,
+    "messages.get": 5,
+    "messages.list": 5,
+    "messages.modify": 5,
+    "messages.trash": 5,
+    "messages.batchModify": 50,
+    "messages.batchDelete": 50,
+    "messages.attachments.get": 5,
+    "drafts.create": 10,
+    "labels.list": 1,
+    "labels.create": 5,
+    "history.list": 2,
+    "users.getProfile": 1,
+    "users.watch": 100,
+    "users.stop": 50,
+}
+
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+# Operations that can safely run twice, so server errors and timeouts are retried.
+# Others (messages.send, drafts.create, events.insert...) may have completed
+# before failing and are only retried when the API rejected them for quota.
+IDEMPOTENT_OPERATIONS = {
+    "messages.get",
+    "messages.list",
+    "messages.modify",
+    "messages.trash",
+    "messages.batchModify",
+    "messages.batchDelete",
+    "messages.attachments.get",
+    "labels.list",
+    "history.list",
+    "users.getProfile",
+    "users.watch",
+    "users.stop",
+    "events.get",
+    "events.list",
+    "events.instances",
+    "events.delete",
+    "channels.stop",
+}
+
+
+class TokenBucket:
+    """
+    Token bucket with AIMD rate adaptation.
+
+    The refill rate is halved whenever the API reports throttling and grows
+    back additively after each successful call, up to the configured rate.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size in tokens
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, cost: float) -> float:
+        """
+        Take tokens, going into debt if necessary.
+
+        A cost above the capacity, such as a large batch, is charged in full:
+        the caller waits until the debt beyond the burst is paid off.
+
+        Args:
+            cost: Tokens needed by the call
+
+        Returns:
+            Seconds the caller must wait before making the call
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= cost
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def on_throttled(self) -> None:
+        """Halve the refill rate and drop any accumulated burst."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+            self._tokens = min(self._tokens, 0)
+
+    def on_success(self) -> None:
+        """Recover the refill rate additively."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+def is_transport_error(error: Exception) -> bool:
+    """Whether an error is a timeout or dropped connection, after which the call may or may not have run."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # httpx is only loaded by the async client
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(error, (httpx.TimeoutException, httpx.NetworkError))
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Return the Retry-After delay carried by an API error, if any."""
+    # Checked before HttpError, which needs googleapiclient imported
+    if is_transport_error(error):
+        return None
+    if isinstance(error, GoogleApiError):
+        value = error.retry_after
+    elif isinstance(error, google_api.HttpError):
+        value = error.resp.get("retry-after")
+    else:
+        return None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of a failed API call, or None when no answer was received."""
+    if is_transport_error(error):
+        return None
+    if isinstance(error, GoogleApiError):
+        return error.status
+    if isinstance(error, google_api.HttpError):
+        return error.resp.status
+    return None
+
+
+def is_rejected(error: Exception) -> bool:
+    """Whether a failed call was certainly not carried out: the API answered with a 4xx status."""
+    status = error_status(error)
+    return status is not None and 400 <= status < 500
+
+
+def is_idempotent(operation: str) -> bool:
+    """Whether an operation (e.g. 'events.list[sync]') can be repeated without side effects."""
+    return operation.split("[", 1)[0] in IDEMPOTENT_OPERATIONS
+
+
+def is_retryable(error: Exception, operation: Optional[str] = None) -> bool:
+    """
+    Whether a failed call can be retried.
+
+    Throttling (429 and rate-limit 403s) is always retryable, since the API
+    rejected the call without running it. Server errors, timeouts and
+    dropped connections are only retried for idempotent operations.
+
+    Args:
+        error: Error raised by the call
+        operation: Operation name; when omitted the call is taken as idempotent
+
+    Returns:
+        True if the call should be retried after a backoff
+    """
+    if is_transport_error(error):
+        return operation is None or is_idempotent(operation)
+    if isinstance(error, GoogleApiError):
+        status = error.status
+        content = error.content
+    elif isinstance(error, google_api.HttpError):
+        status = error.resp.status
+        try:
+            content = json.loads(error.content.decode("utf-8"))
+        except (ValueError, AttributeError):
+            content = {}
+    else:
+        return False
+
+    if status == 429:
+        return True
+    if status >= 500:
+        return operation is None or is_idempotent(operation)
+    if status == 403:
+        errors = content.get("error", {}).get("errors", []) if isinstance(content, dict) else []
+        return any(e.get("reason") in RATE_LIMIT_REASONS for e in errors)
+    return False
+
+
+class QuotaScheduler:
+    """
+    Shared scheduler pacing API calls against a quota and retrying throttled ones.
+
+    Calls take tokens from a bucket according to their cost, then run. Throttled
+    calls, and transient failures of idempotent ones, are retried with jittered
+    exponential backoff that honours Retry-After up to max_delay.
+
+    Google enforces quotas per user, so each user gets a scheduler of their
+    own; a project bucket shared by those schedulers caps the total rate of
+    the process. Only the user's bucket backs off when a call is throttled.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 capacity: float,
+                 costs: Optional[Dict[str, int]] = None,
+                 max_retries: int = 5,
+                 base_delay: float = 1.0,
+                 max_delay: float = 32.0,
+                 project_bucket: Optional[TokenBucket] = None):
+        """
+        Initialize quota scheduler.
+
+        Args:
+            rate: Quota units per second
+            capacity: Burst size in quota units
+            costs: Quota units per operation (operations not listed cost 1)
+            max_retries: Maximum retries for a throttled call
+            base_delay: First backoff delay in seconds
+            max_delay: Upper bound for a single backoff delay in seconds,
+                including delays asked for by Retry-After
+            project_bucket: Bucket shared with other users' schedulers, bounding
+                their combined rate (optional)
+        """
+        self.bucket = TokenBucket(rate, capacity)
+        self.project_bucket = project_bucket
+        self.costs = costs or {}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._metrics = {
+            "calls": 0,
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "throttle_wait_seconds": 0.0,
+            "throttled_responses": 0,
+            "retries": 0,
+            "backoff_seconds": 0.0
+        }
+
+    def cost(self, operation: str, count: int = 1) -> int:
+        """Quota units used by count calls of an operation."""
+        return self.costs.get(operation, 1) * count
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _enter_queue(self, cost: int) -> float:
+        with self._lock:
+            self._metrics["calls"] += 1
+            self._metrics["queue_depth"] += 1
+            self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], self._metrics["queue_depth"])
+        wait = self.bucket.reserve(cost)
+        if self.project_bucket is not None:
+            wait = max(wait, self.project_bucket.reserve(cost))
+        return wait
+
+    def _leave_queue(self, waited: float) -> None:
+        with self._lock:
+            self._metrics["queue_depth"] -= 1
+            self._metrics["throttle_wait_seconds"] += waited
+
+    def _record_retry(self, delay: float, error: Exception) -> None:
+        # A lost connection says nothing about the rate
+        throttled = not is_transport_error(error)
+        if throttled:
+            self.bucket.on_throttled()
+        with self._lock:
+            self._metrics["throttled_responses"] += throttled
+            self._metrics["retries"] += 1
+            self._metrics["backoff_seconds"] += delay
+
+    def acquire(self, operation: str, count: int = 1) -> None:
+        """Block until the bucket allows count calls of an operation."""
+        wait = self._enter_queue(self.cost(operation, count))
+        try:
+            if wait:
+                with tracer.span("quota.wait", operation=operation, seconds=round(wait, 3)):
+                    time.sleep(wait)
+        finally:
+            self._leave_queue(wait)
+
+    async def acquire_async(self, operation: str, count: int = 1) -> None:
+        """Wait without blocking the event loop until the bucket allows the calls."""
+        wait = self._enter_queue(self.cost(operation, count))
+        try:
+            if wait:
+                with tracer.span("quota.wait", operation=operation, seconds=round(wait, 3)):
+                    await asyncio.sleep(wait)
+        finally:
+            self._leave_queue(wait)
+
+    def execute(self, request, operation: str, call_stats: Optional[CallStats] = None) -> Any:
+        """
+        Execute a googleapiclient request within the quota, retrying throttled calls.
+
+        Args:
+            request: HttpRequest to execute
+            operation: Operation name (e.g. 'messages.list') used for cost and statistics
+            call_stats: Counter for API round-trips (optional)
+
+        Returns:
+            Decoded response
+
+        Raises:
+            HttpError: If the call fails permanently or retries are exhausted
+        """
+        return self.call(request.execute, operation, call_stats)
+
+    def call(self, call: Callable[[], Any], operation: str, call_stats: Optional[CallStats] = None) -> Any:
+        """
+        Run a blocking API call within the quota, retrying throttled calls.
+
+        Args:
+            call: Zero-argument callable making one attempt; it raises HttpError
+                or GoogleApiError on error responses
+            operation: Operation name used for cost and statistics
+            call_stats: Counter for API round-trips (optional)
+
+        Returns:
+            Result of the call
+
+        Raises:
+            HttpError, GoogleApiError: If the call fails permanently or retries are exhausted
+        """
+        call_stats = call_stats or CallStats()
+        for attempt in range(self.max_retries + 1):
+            self.acquire(operation)
+            try:
+                with call_stats.track(operation):
+                    response = call()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e, operation):
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                self._record_retry(delay, e)
+                with tracer.span("retry", operation=operation, attempt=attempt + 1, delay=round(delay, 3)):
+                    time.sleep(delay)
+                continue
+            self.bucket.on_success()
+            return response
+
+    async def execute_async(self,
+                            call: Callable[[], Awaitable[Any]],
+                            operation: str,
+                            call_stats: Optional[CallStats] = None) -> Any:
+        """
+        Await an API call within the quota, retrying throttled calls.
+
+        Args:
+            call: Zero-argument callable returning a new awaitable for each attempt
+            operation: Operation name used for cost and statistics
+            call_stats: Counter for API round-trips (optional)
+
+        Returns:
+            Result of the call
+
+        Raises:
+            GoogleApiError: If the call fails permanently or retries are exhausted
+        """
+        call_stats = call_stats or CallStats()
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async(operation)
+            try:
+                with call_stats.track(operation):
+                    response = await call()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e, operation):
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                self._record_retry(delay, e)
+                with tracer.span("retry", operation=operation, attempt=attempt + 1, delay=round(delay, 3)):
+                    await asyncio.sleep(delay)
+                continue
+            self.bucket.on_success()
+            return response
+
+    def execute_batch(self,
+                      service,
+                      requests: List[Any],
+                      operation: str,
+                      batch_size: int,
+                      call_stats: Optional[CallStats] = None,
+                      partial: bool = False) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Execute requests through batch HTTP requests within the quota.
+
+        Sub-requests that fail with throttling, or with transient errors when
+        the operation is idempotent, are retried in a new batch after a
+        backoff; other failures are returned as-is. A batch request that
+        times out or fails with a retryable error is retried the same way.
+
+        Args:
+            service: Service object used to create batch requests
+            requests: HttpRequest objects to execute
+            operation: Operation name of each sub-request
+            batch_size: Maximum sub-requests per batch
+            call_stats: Counter for API round-trips (optional)
+            partial: When a batch request itself fails, return the error for its
+                sub-requests and those not sent yet instead of raising, so the
+                results of earlier batches are not lost
+
+        Returns:
+            List of (response, exception) pairs in the same order as requests
+        """
+        call_stats = call_stats or CallStats()
+        results: List[Tuple[Any, Optional[Exception]]] = [(None, None)] * len(requests)
+
+        def _on_response(request_id: str, response: Any, exception: Optional[Exception]) -> None:
+            results[int(request_id)] = (response, exception)
+
+        pending = list(range(len(requests)))
+        for attempt in range(self.max_retries + 1):
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                batch = service.new_batch_http_request(callback=_on_response)
+                for index in chunk:
+                    batch.add(requests[index], request_id=str(index))
+                self.acquire(operation, len(chunk))
+                try:
+                    with call_stats.track(f"{operation}[batch]", sub_requests=len(chunk)):
+                        batch.execute()
+                except Exception as e:
+                    if is_retryable(e, operation):
+                        for index in chunk:
+                            if results[index][0] is None:
+                                results[index] = (None, e)
+                        continue
+                    if not partial:
+                        raise
+                    for index in pending[start:]:
+                        if results[index][0] is None:
+                            results[index] = (None, e)
+                    return results
+
+            throttled = [i for i in pending if results[i][1] is not None and is_retryable(results[i][1], operation)]
+            if not throttled or attempt == self.max_retries:
+                if not throttled:
+                    self.bucket.on_success()
+                break
+            delay = max(self._backoff_delay(attempt, results[i][1]) for i in throttled)
+            errors = [results[i][1] for i in throttled]
+            self._record_retry(delay, next((e for e in errors if not is_transport_error(e)), errors[0]))
+            with tracer.span("retry", operation=operation, attempt=attempt + 1, delay=round(delay, 3),
+                             sub_requests=len(throttled)):
+                time.sleep(delay)
+            pending = throttled
+
+        return results
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Return scheduler metrics.
+
+        Returns:
+            Dict with call count, current/max queue depth, time spent waiting
+            for quota, throttled responses, retries and backoff time
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["current_rate"] = self.bucket.rate
+        return metrics
+
+
+# Gmail allows 1,200,000 quota units per project per minute; GMAIL_PROJECT_QUOTA_UNITS
+# sets the per-second rate of a project with a different quota
+_gmail_project_rate = float(os.getenv("GMAIL_PROJECT_QUOTA_UNITS") or 20000)
+gmail_project_bucket = TokenBucket(_gmail_project_rate, _gmail_project_rate)
+# Calendar quotas are per project per minute; CALENDAR_PROJECT_RATE sets requests per second
+_calendar_project_rate = float(os.getenv("CALENDAR_PROJECT_RATE") or 500)
+calendar_project_bucket = TokenBucket(_calendar_project_rate, _calendar_project_rate)
+
+
+def new_gmail_scheduler() -> QuotaScheduler:
+    """Scheduler for one user's Gmail calls: 250 quota units per second, within the project quota."""
+    return QuotaScheduler(rate=250, capacity=250, costs=GMAIL_QUOTA_UNITS, project_bucket=gmail_project_bucket)
+
+
+def new_calendar_scheduler() -> QuotaScheduler:
+    """Scheduler for one user's Calendar calls: around 10 requests per second, within the project quota."""
+    return QuotaScheduler(rate=10, capacity=20, project_bucket=calendar_project_bucket)
+
+
+# Schedulers of the single-account tools, created without a scheduler of their own
+gmail_scheduler = new_gmail_scheduler()
+calendar_scheduler = new_calendar_scheduler()
@@ -0,0 +1,508 @@
+import calendar
+import heapq
+import itertools
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Dict, Any, Optional, List, Iterator, Iterable, Callable, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from gmail_calendar_automation.tools.calendar_sync import parse_event_time, parse_rfc3339
+from gmail_calendar_automation.tools.ics_parser import parse_content_line, resolve_timezone
+
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+FREQUENCIES = ("YEARLY", "MONTHLY", "WEEKLY", "DAILY")
+
+# Rule parts Google Calendar does not produce; rules using them are expanded by the API instead
+_UNSUPPORTED_PARTS = ("BYHOUR", "BYMINUTE", "BYSECOND", "BYWEEKNO")
+
+# A satisfiable rule matches at least once per Gregorian cycle of its interval
+_CYCLE_YEARS = 400
+
+
+class RecurrenceError(ValueError):
+    """Raised when a recurrence cannot be expanded locally."""
+
+
+def _parse_ints(value: str, name: str) -> List[int]:
+    try:
+        numbers = [int(part) for part in value.split(",")]
+    except ValueError:
+        raise RecurrenceError(f"Invalid {name}: {value}")
+    if 0 in numbers:
+        raise RecurrenceError(f"Invalid {name}: {value}")
+    return numbers
+
+
+class RecurrenceRule:
+    """
+    One RRULE or EXRULE, iterated lazily in wall-clock time.
+
+    Supports FREQ=YEARLY/MONTHLY/WEEKLY/DAILY with INTERVAL, COUNT, UNTIL,
+    BYMONTH, BYYEARDAY, BYMONTHDAY, BYDAY (with ordinals), BYSETPOS and WKST,
+    which covers the rules Google Calendar creates. Occurrences are generated
+    one period (year, month, week or day) at a time, so only the periods
+    iterated over are computed.
+    """
+
+    def __init__(self, text: str):
+        """
+        Parse a rule.
+
+        Args:
+            text: Rule value, e.g. 'FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20261231T235959Z'
+
+        Raises:
+            RecurrenceError: If the rule is malformed or uses unsupported parts
+        """
+        parts: Dict[str, str] = {}
+        for item in text.strip().split(";"):
+            if item:
+                name, _, value = item.partition("=")
+                parts[name.strip().upper()] = value.strip().upper()
+        self.freq = parts.get("FREQ")
+        if self.freq not in FREQUENCIES:
+            raise RecurrenceError(f"Unsupported FREQ: {self.freq}")
+        unsupported = [name for name in _UNSUPPORTED_PARTS if name in parts]
+        if unsupported:
+            raise RecurrenceError(f"Unsupported rule part(s): {', '.join(unsupported)}")
+
+        self.interval = int(parts.get("INTERVAL") or 1)
+        self.count = int(parts["COUNT"]) if "COUNT" in parts else None
+        if self.interval < 1 or (self.count is not None and self.count < 1):
+            raise RecurrenceError(f"Invalid INTERVAL or COUNT: {text}")
+        self.until = parts.get("UNTIL")
+        self.by_month = set(_parse_ints(parts["BYMONTH"], "BYMONTH")) if "BYMONTH" in parts else None
+        self.by_yearday = set(_parse_ints(parts["BYYEARDAY"], "BYYEARDAY")) if "BYYEARDAY" in parts else None
+        self.by_monthday = set(_parse_ints(parts["BYMONTHDAY"], "BYMONTHDAY")) if "BYMONTHDAY" in parts else None
+        self.by_setpos = _parse_ints(parts["BYSETPOS"], "BYSETPOS") if "BYSETPOS" in parts else None
+        self.wkst = WEEKDAYS.get(parts.get("WKST", "MO"))
+        if self.wkst is None:
+            raise RecurrenceError(f"Invalid WKST: {parts['WKST']}")
+        self.by_day: Optional[List[Tuple[Optional[int], int]]] = None
+        if "BYDAY" in parts:
+            self.by_day = []
+            for item in parts["BYDAY"].split(","):
+                ordinal, code = item[:-2], item[-2:]
+                if code not in WEEKDAYS or (ordinal and not ordinal.lstrip("+-").isdigit()):
+                    raise RecurrenceError(f"Invalid BYDAY: {item}")
+                self.by_day.append((int(ordinal) if ordinal else None, WEEKDAYS[code]))
+
+    def until_date(self, zone: tzinfo) -> Optional[datetime]:
+        """
+        UNTIL as a naive wall-clock datetime in the event's zone.
+
+        Args:
+            zone: Zone of the event's start
+
+        Returns:
+            Last allowed occurrence start, or None when the rule has no UNTIL
+        """
+        if not self.until:
+            return None
+        value = self.until
+        try:
+            if "T" not in value:
+                return datetime.combine(datetime.strptime(value, "%Y%m%d").date(), time.max)
+            parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+        except ValueError:
+            raise RecurrenceError(f"Invalid UNTIL: {value}")
+        if value.endswith("Z"):
+            return parsed.replace(tzinfo=timezone.utc).astimezone(zone).replace(tzinfo=None)
+        return parsed
+
+    def _period_start(self, day: date) -> date:
+        """First day of the period containing a day."""
+        if self.freq == "YEARLY":
+            return date(day.year, 1, 1)
+        if self.freq == "MONTHLY":
+            return date(day.year, day.month, 1)
+        if self.freq == "WEEKLY":
+            return day - timedelta(days=(day.weekday() - self.wkst) % 7)
+        return day
+
+    def _advance(self, period: date, periods: int) -> date:
+        """Start of the period a number of periods after another."""
+        if self.freq == "YEARLY":
+            return date(period.year + periods, 1, 1)
+        if self.freq == "MONTHLY":
+            month = period.year * 12 + period.month - 1 + periods
+            return date(month // 12, month % 12 + 1, 1)
+        if self.freq == "WEEKLY":
+            return period + timedelta(weeks=periods)
+        return period + timedelta(days=periods)
+
+    def _periods_between(self, first: date, day: date) -> int:
+        """Number of whole periods from the period starting at first to the one containing day."""
+        if self.freq == "YEARLY":
+            return day.year - first.year
+        if self.freq == "MONTHLY":
+            return (day.year - first.year) * 12 + day.month - first.month
+        if self.freq == "WEEKLY":
+            return (day - first).days // 7
+        return (day - first).days
+
+    @staticmethod
+    def _nth(day_number: int, length: int) -> Tuple[int, int]:
+        """Ordinal of a weekday within a month or year, from the start and from the end."""
+        return (day_number - 1) // 7 + 1, -((length - day_number) // 7 + 1)
+
+    def _matches_day(self, day: date, in_year: bool) -> bool:
+        if in_year:
+            number, length = day.timetuple().tm_yday, 366 if calendar.isleap(day.year) else 365
+        else:
+            number, length = day.day, calendar.monthrange(day.year, day.month)[1]
+        nth = self._nth(number, length)
+        return any(weekday == day.weekday() and (ordinal is None or ordinal in nth) for ordinal, weekday in self.by_day)
+
+    def _candidates(self, period: date, dtstart: date) -> List[date]:
+        """Dates of the occurrences in one period, in order."""
+        if self.freq == "WEEKLY":
+            days = [period + timedelta(days=offset) for offset in range(7)]
+        elif self.freq == "DAILY":
+            days = [period]
+        else:
+            months = range(1, 13) if self.freq == "YEARLY" else [period.month]
+            days = [
+                date(period.year, month, day)
+                for month in months if self.by_month is None or month in self.by_month
+                for day in range(1, calendar.monthrange(period.year, month)[1] + 1)
+            ]
+
+        if self.by_month is not None:
+            days = [day for day in days if day.month in self.by_month]
+        if self.by_yearday is not None:
+            def _yearday(day: date) -> bool:
+                number = day.timetuple().tm_yday
+                return number in self.by_yearday or number - (366 if calendar.isleap(day.year) else 365) - 1 in self.by_yearday
+            days = [day for day in days if _yearday(day)]
+        if self.by_monthday is not None:
+            def _monthday(day: date) -> bool:
+                length = calendar.monthrange(day.year, day.month)[1]
+                return day.day in self.by_monthday or day.day - length - 1 in self.by_monthday
+            days = [day for day in days if _monthday(day)]
+        if self.by_day is not None:
+            # Ordinals count within the year for YEARLY rules without BYMONTH, else within the month
+            in_year = self.freq == "YEARLY" and self.by_month is None
+            days = [day for day in days if self._matches_day(day, in_year)]
+
+        # Without day parts the rule repeats DTSTART's day in each period
+        if self.by_yearday is None and self.by_monthday is None and self.by_day is None:
+            if self.freq == "WEEKLY":
+                days = [day for day in days if day.weekday() == dtstart.weekday()]
+            elif self.freq == "MONTHLY" or (self.freq == "YEARLY" and self.by_month is not None):
+                days = [day for day in days if day.day == dtstart.day]
+            elif self.freq == "YEARLY":
+                days = [day for day in days if (day.month, day.day) == (dtstart.month, dtstart.day)]
+
+        if self.by_setpos is not None and days:
+            days = sorted({days[pos - 1 if pos > 0 else pos] for pos in self.by_setpos if -len(days) <= pos <= len(days)})
+        return days
+
+    def iter(self,
+             dtstart: datetime,
+             until: Optional[datetime] = None,
+             skip_to: Optional[date] = None,
+             include_dtstart: bool = True) -> Iterator[datetime]:
+        """
+        Iterate over occurrence starts in wall-clock time, in order.
+
+        Args:
+            dtstart: Naive wall-clock start of the first occurrence
+            until: Naive wall-clock bound replacing UNTIL (see until_date)
+            skip_to: Start at the period containing this day instead of
+                DTSTART's; ignored for COUNT rules, which count from DTSTART
+            include_dtstart: Whether DTSTART is the first occurrence (and counts
+                towards COUNT) even if the rule does not match it, as for RRULE;
+                EXRULEs only match it by their own pattern
+
+        Yields:
+            Naive wall-clock occurrence starts
+        """
+        emitted = 0
+        if include_dtstart:
+            if until is not None and dtstart > until:
+                return
+            yield dtstart
+            emitted = 1
+
+        first = self._period_start(dtstart.date())
+        skipped = 0
+        if skip_to is not None and self.count is None and skip_to > dtstart.date():
+            skipped = self._periods_between(first, skip_to) // self.interval * self.interval
+        last_hit_year = dtstart.year
+        for step in itertools.count(skipped, self.interval):
+            try:
+                period = self._advance(first, step)
+            except (ValueError, OverflowError):
+                return
+            if period.year - last_hit_year > _CYCLE_YEARS * self.interval:
+                return
+            for day in self._candidates(period, dtstart.date()):
+                occurrence = datetime.combine(day, dtstart.time())
+                if occurrence < dtstart or (include_dtstart and occurrence == dtstart):
+                    continue
+                if until is not None and occurrence > until:
+                    return
+                if self.count is not None and emitted >= self.count:
+                    return
+                last_hit_year = day.year
+                emitted += 1
+                yield occurrence
+
+
+def _zone(name: Optional[str]) -> tzinfo:
+    try:
+        return ZoneInfo(name) if name else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+class Recurrence:
+    """
+    The recurrence of a recurring Calendar event: its RRULE, EXRULE, RDATE and EXDATE lines.
+
+    Occurrences are computed in the wall-clock time of the event's zone, so a
+    09:00 meeting stays at 09:00 across daylight saving changes.
+    """
+
+    def __init__(self, lines: List[str], start: Dict[str, str], time_zone: Optional[str] = None):
+        """
+        Parse a recurrence.
+
+        Args:
+            lines: The event's 'recurrence' list
+            start: The event's 'start' value
+            time_zone: Calendar time zone, used when the start has none
+
+        Raises:
+            RecurrenceError: If a line is malformed or cannot be expanded locally
+        """
+        self.all_day = "date" in start and "dateTime" not in start
+        self.zone_name = start.get("timeZone") or time_zone
+        self.zone = _zone(self.zone_name)
+        self.dtstart = parse_event_time(start, time_zone).astimezone(self.zone).replace(tzinfo=None)
+        self.rules: List[RecurrenceRule] = []
+        self.exrules: List[RecurrenceRule] = []
+        self.rdates: List[datetime] = []
+        self.exdates: Set[datetime] = set()
+        self.exdays: Set[date] = set()
+
+        for line in lines:
+            try:
+                name, params, value = parse_content_line(line)
+            except ValueError:
+                raise RecurrenceError(f"Invalid recurrence line: {line}")
+            if name == "RRULE":
+                self.rules.append(RecurrenceRule(value))
+            elif name == "EXRULE":
+                self.exrules.append(RecurrenceRule(value))
+            elif name == "RDATE":
+                self.rdates.extend(self._parse_dates(value, params))
+            elif name == "EXDATE":
+                for moment in self._parse_dates(value, params):
+                    self.exdates.add(moment)
+                    if params.get("VALUE") == "DATE" or self.all_day:
+                        self.exdays.add(moment.date())
+        self.rdates.sort()
+
+    def _parse_dates(self, value: str, params: Dict[str, str]) -> List[datetime]:
+        """Parse an RDATE/EXDATE value to naive wall-clock datetimes in the event's zone."""
+        zone = self.zone
+        if "TZID" in params:
+            zone_name = resolve_timezone(params["TZID"])
+            if zone_name is None:
+                raise RecurrenceError(f"Unknown time zone: {params['TZID']}")
+            zone = ZoneInfo(zone_name)
+        moments = []
+        for item in value.split(","):
+            # Periods (start/end) recur at their start
+            item = item.strip().split("/", 1)[0]
+            try:
+                if "T" not in item:
+                    moments.append(datetime.combine(datetime.strptime(item, "%Y%m%d").date(), self.dtstart.time()))
+                    continue
+                parsed = datetime.strptime(item.rstrip("Z"), "%Y%m%dT%H%M%S")
+            except ValueError:
+                raise RecurrenceError(f"Invalid date in recurrence: {item}")
+            aware = parsed.replace(tzinfo=timezone.utc if item.endswith("Z") else zone)
+            moments.append(aware.astimezone(self.zone).replace(tzinfo=None))
+        return moments
+
+    def _excluded(self, occurrence: datetime) -> bool:
+        return occurrence in self.exdates or occurrence.date() in self.exdays
+
+    def iter_starts(self, after: Optional[datetime] = None) -> Iterator[datetime]:
+        """
+        Iterate over occurrence starts in order, without excluded dates.
+
+        Args:
+            after: Skip occurrences starting before this aware datetime; the
+                rules start computing at the period containing it
+
+        Yields:
+            Aware occurrence starts in the event's zone
+        """
+        skip_to = after.astimezone(self.zone).date() if after is not None else None
+        streams = [
+            rule.iter(self.dtstart, rule.until_date(self.zone), skip_to)
+            for rule in self.rules or [RecurrenceRule("FREQ=DAILY;COUNT=1")]
+        ]
+        streams.append(iter(self.rdates))
+        # Exclusion rules are iterated alongside, each advanced past the current occurrence
+        exclusions = [
+            [rule.iter(self.dtstart, rule.until_date(self.zone), skip_to, include_dtstart=False), None]
+            for rule in self.exrules
+        ]
+
+        previous = None
+        for occurrence in heapq.merge(*streams):
+            if occurrence == previous:
+                continue
+            previous = occurrence
+            if self._excluded(occurrence) or self._exrule_excluded(exclusions, occurrence):
+                continue
+            start = occurrence.replace(tzinfo=self.zone)
+            if after is not None and start < after:
+                continue
+            yield start
+
+    @staticmethod
+    def _exrule_excluded(exclusions: List[List[Any]], occurrence: datetime) -> bool:
+        for state in exclusions:
+            while state[1] is None or state[1] < occurrence:
+                state[1] = next(state[0], datetime.max)
+            if state[1] == occurrence:
+                return True
+        return False
+
+
+def _instance_id(event_id: str, start: datetime, all_day: bool) -> str:
+    """Instance ID in the format the Calendar API uses, e.g. 'abc_20260105T140000Z'."""
+    if all_day:
+        return f"{event_id}_{start.strftime('%Y%m%d')}"
+    return f"{event_id}_{start.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+
+
+def expand_event(event: Dict[str, Any],
+                 time_min: Optional[datetime] = None,
+                 time_max: Optional[datetime] = None,
+                 time_zone: Optional[str] = None,
+                 exceptions: Optional[Set[float]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily expand a recurring event into its instances in a window.
+
+    Args:
+        event: Recurring event with 'recurrence', 'start' and 'end'
+        time_min: Only instances ending after this aware datetime
+        time_max: Only instances starting before this aware datetime
+        time_zone: Calendar time zone, used for all-day events and starts without a zone
+        exceptions: Original start timestamps of instances that were modified
+            or cancelled; they are listed as events of their own
+
+    Yields:
+        Instance resources in start order, shaped like singleEvents=True results
+
+    Raises:
+        RecurrenceError: If the recurrence cannot be expanded locally
+    """
+    recurrence = Recurrence(event.get("recurrence", []), event["start"], time_zone)
+    zone = recurrence.zone
+    start = parse_event_time(event["start"], time_zone).astimezone(zone)
+    end = parse_event_time(event["end"], time_zone).astimezone(zone)
+    # Instances keep the event's wall-clock duration
+    duration = end.replace(tzinfo=None) - start.replace(tzinfo=None)
+    exceptions = exceptions or set()
+    template = {key: value for key, value in event.items() if key != "recurrence"}
+
+    after = time_min - max(duration, timedelta(0)) if time_min is not None else None
+    for occurrence in recurrence.iter_starts(after):
+        if time_max is not None and occurrence >= time_max:
+            return
+        occurrence_end = (occurrence.replace(tzinfo=None) + duration).replace(tzinfo=zone)
+        if time_min is not None and occurrence_end <= time_min:
+            continue
+        if occurrence.timestamp() in exceptions:
+            continue
+        if recurrence.all_day:
+            start_value = {"date": occurrence.date().isoformat()}
+            end_value = {"date": occurrence_end.date().isoformat()}
+        else:
+            start_value = {"dateTime": occurrence.isoformat()}
+            end_value = {"dateTime": occurrence_end.isoformat()}
+            if "timeZone" in event["start"]:
+                start_value["timeZone"] = event["start"]["timeZone"]
+            if "timeZone" in event["end"]:
+                end_value["timeZone"] = event["end"]["timeZone"]
+        yield dict(
+            template,
+            id=_instance_id(event["id"], occurrence, recurrence.all_day),
+            recurringEventId=event["id"],
+            originalStartTime=start_value,
+            start=start_value,
+            end=end_value
+        )
+
+
+def expand_events(items: Iterable[Dict[str, Any]],
+                  time_min: Optional[str] = None,
+                  time_max: Optional[str] = None,
+                  time_zone: Optional[str] = None,
+                  fallback: Optional[Callable[[Dict[str, Any]], Iterable[Dict[str, Any]]]] = None
+                  ) -> Iterator[Dict[str, Any]]:
+    """
+    Turn an events.list result with singleEvents=False into instances, in start order.
+
+    Single events and modified instances are passed through; recurring
+    events are expanded lazily, so only the instances consumed are built.
+    Cancelled instances (listed with showDeleted=True) remove their
+    occurrence, and other cancelled events are dropped.
+
+    Args:
+        items: Events from events.list with singleEvents=False and showDeleted=True
+        time_min: Window start (RFC 3339), matched against instance ends
+        time_max: Window end (RFC 3339), matched against instance starts
+        time_zone: Calendar time zone (the list response's timeZone)
+        fallback: Callable returning the instances of a recurring event whose
+            recurrence cannot be expanded locally, in start order (e.g. from
+            events.instances); such events are skipped when omitted
+
+    Yields:
+        Event and instance resources ordered by start time
+    """
+    window_min = parse_rfc3339(time_min) if time_min else None
+    window_max = parse_rfc3339(time_max) if time_max else None
+    masters, singles = [], []
+    exceptions: Dict[str, Set[float]] = {}
+    for event in items:
+        if event.get("recurringEventId") and event.get("originalStartTime"):
+            original = parse_event_time(event["originalStartTime"], time_zone).timestamp()
+            exceptions.setdefault(event["recurringEventId"], set()).add(original)
+        if event.get("status") == "cancelled":
+            continue
+        if event.get("recurrence"):
+            masters.append(event)
+        elif "start" in event and "end" in event:
+            start, end = parse_event_time(event["start"], time_zone), parse_event_time(event["end"], time_zone)
+            if (window_min is None or end > window_min) and (window_max is None or start < window_max):
+                singles.append(event)
+
+    def _keyed(events: Iterable[Dict[str, Any]]) -> Iterator[Tuple[float, int, Dict[str, Any]]]:
+        for event in events:
+            yield parse_event_time(event["start"], time_zone).timestamp(), next(order), event
+
+    def _instances(master: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        try:
+            # Parsing errors surface here, before the first instance
+            instances = expand_event(master, window_min, window_max, time_zone, exceptions.get(master["id"]))
+            first = next(instances, None)
+        except RecurrenceError:
+            if fallback is not None:
+                yield from fallback(master)
+            return
+        if first is not None:
+            yield first
+            yield from instances
+
+    order = itertools.count()
+    singles.sort(key=lambda event: parse_event_time(event["start"], time_zone))
+    streams = [_keyed(singles)] + [_keyed(_instances(master)) for master in masters]
+    for _, _, event in heapq.merge(*streams):
+        yield event
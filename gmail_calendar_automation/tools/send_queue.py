@@ -0,0 +1,282 @@
+import hashlib
+import sqlite3
+import string
+import threading
+import time
+from typing import Dict, Any, Optional, List, Tuple
+
+# Kinds of outbound items
+SEND = "send"
+DRAFT = "draft"
+
+# Item states; 'sending' and 'unknown' items may or may not have reached Gmail.
+# 'failed' items were rejected by Gmail and are safe to send again.
+PENDING = "pending"
+SENDING = "sending"
+UNKNOWN = "unknown"
+DONE = "done"
+FAILED = "failed"
+
+# Domain of the Message-ID header derived from an item's idempotency key
+MESSAGE_ID_DOMAIN = "outbox.gca.local"
+
+
+class MessageTemplate:
+    """
+    Subject and body template with {field} placeholders, parsed once and rendered per recipient.
+
+    Only plain field names are allowed, so a template cannot reach attributes
+    or items of the values it is rendered with. Literal braces are written
+    doubled, as with str.format.
+    """
+
+    def __init__(self, subject: str, body: str):
+        """
+        Initialize template.
+
+        Args:
+            subject: Subject template, e.g. 'Your seat for {event}'
+            body: Body template, e.g. 'Hi {name}, ...'
+
+        Raises:
+            ValueError: If a placeholder is malformed or not a plain field name
+        """
+        self.subject = subject
+        self.body = body
+        self._subject = self._parse(subject)
+        self._body = self._parse(body)
+        self.fields = sorted({field for _, field in self._subject + self._body if field is not None})
+
+    @staticmethod
+    def _parse(template: str) -> List[Tuple[str, Optional[str]]]:
+        segments = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(template):
+            if field is not None and (not field.isidentifier() or format_spec or conversion):
+                raise ValueError(f"Unsupported placeholder '{{{field}}}': use plain names such as {{name}}")
+            segments.append((literal, field))
+        return segments
+
+    @staticmethod
+    def _render(segments: List[Tuple[str, Optional[str]]], values: Dict[str, Any]) -> str:
+        return "".join(literal + ("" if field is None else str(values[field])) for literal, field in segments)
+
+    def render(self, values: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Render the subject and body for one recipient.
+
+        Args:
+            values: Field values
+
+        Returns:
+            Tuple of the subject and body
+
+        Raises:
+            KeyError: If a placeholder has no value
+        """
+        missing = [field for field in self.fields if field not in values]
+        if missing:
+            raise KeyError(f"Missing template field(s): {', '.join(missing)}")
+        return self._render(self._subject, values), self._render(self._body, values)
+
+    def digest(self) -> str:
+        """Short hash of the template text, identifying jobs that send it."""
+        return hashlib.sha1(f"{self.subject}\0{self.body}".encode("utf-8")).hexdigest()[:12]
+
+
+def idempotency_key(job_id: str, recipient: str) -> str:
+    """Default idempotency key of a job's message to one recipient."""
+    return hashlib.sha1(f"{job_id}\0{recipient.strip().lower()}".encode("utf-8")).hexdigest()
+
+
+def message_id_header(key: str) -> str:
+    """RFC 822 Message-ID of an item, by which Gmail can find it with an rfc822msgid: search."""
+    # Hashed so that any caller-supplied key gives a valid, unfolded header
+    return f"<{hashlib.sha1(key.encode('utf-8')).hexdigest()}@{MESSAGE_ID_DOMAIN}>"
+
+
+class SendQueue:
+    """
+    Persistent outbound queue of rendered emails and drafts.
+
+    Each item has an idempotency key, unique across the queue: enqueueing a
+    key again is a no-op, and an item is claimed by one worker at a time and
+    marked done once Gmail accepted it, so a retried job never sends a
+    message twice. Items whose request failed without a clear rejection, and
+    items left 'sending' by a crash, are listed by in_doubt() so the caller can
+    check with Gmail before sending them again.
+    """
+
+    # Items 'sending' for longer than this belong to a run that stopped
+    IN_DOUBT_AFTER = 300
+    # Gmail's search index lags the messages it accepts, so 'unknown' items are
+    # only looked up once they have been unknown this long
+    UNKNOWN_RECHECK_AFTER = 120
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Initialize send queue.
+
+        Args:
+            path: SQLite database file (defaults to an in-memory database)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                key TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                recipient TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                from_email TEXT,
+                status TEXT NOT NULL,
+                gmail_id TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS outbox_job_status ON outbox (job_id, status);
+        """)
+        self._conn.commit()
+
+    def enqueue(self, job_id: str, kind: str, items: List[Dict[str, Any]]) -> int:
+        """
+        Add rendered items to the queue, ignoring keys already present.
+
+        Args:
+            job_id: Job the items belong to
+            kind: SEND or DRAFT
+            items: Dicts with key, to, subject, body and optional from_email
+
+        Returns:
+            Number of items added
+        """
+        now = time.time()
+        rows = [
+            (item["key"], job_id, kind, item["to"], item["subject"], item["body"], item.get("from_email"), PENDING, now)
+            for item in items
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO outbox (key, job_id, kind, recipient, subject, body, from_email, status, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def retry_failed(self, job_id: str) -> int:
+        """Put a job's failed items back in the queue; returns how many."""
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE outbox SET status = ?, error = NULL, updated_at = ? WHERE job_id = ? AND status = ?",
+                (PENDING, time.time(), job_id, FAILED)
+            ).rowcount
+            self._conn.commit()
+            return count
+
+    def in_doubt(self, job_id: str) -> List[str]:
+        """
+        Keys of a job's items that may have reached Gmail without being marked done.
+
+        These are items whose request failed ambiguously (server error,
+        timeout, connection loss) and items that were being sent when an
+        earlier run stopped. Items claimed less than IN_DOUBT_AFTER seconds ago
+        are left out, since another run may still be sending them, and so are
+        items that became unknown less than UNKNOWN_RECHECK_AFTER seconds ago,
+        which a Gmail search might not find yet.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM outbox WHERE job_id = ?"
+                " AND ((status = ? AND updated_at <= ?) OR (status = ? AND updated_at <= ?))",
+                (job_id, UNKNOWN, now - self.UNKNOWN_RECHECK_AFTER, SENDING, now - self.IN_DOUBT_AFTER)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claim(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Take the next pending item of a job, marking it as being sent.
+
+        Args:
+            job_id: Job to take an item from
+
+        Returns:
+            Item dict, or None when the job has no pending items
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, kind, recipient, subject, body, from_email FROM outbox"
+                " WHERE job_id = ? AND status = ? ORDER BY rowid LIMIT 1",
+                (job_id, PENDING)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, updated_at = ? WHERE key = ?",
+                (SENDING, time.time(), row[0])
+            )
+            self._conn.commit()
+        return {
+            "key": row[0], "kind": row[1], "to": row[2], "subject": row[3], "body": row[4], "from_email": row[5]
+        }
+
+    def _finish(self, key: str, status: str, gmail_id: Optional[str] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, gmail_id = ?, error = ?, updated_at = ? WHERE key = ?",
+                (status, gmail_id, error, time.time(), key)
+            )
+            self._conn.commit()
+
+    def mark_done(self, key: str, gmail_id: Optional[str]) -> None:
+        """Record that Gmail accepted an item."""
+        self._finish(key, DONE, gmail_id=gmail_id)
+
+    def mark_failed(self, key: str, error: str) -> None:
+        """Record that Gmail rejected an item, so sending it again is safe."""
+        self._finish(key, FAILED, error=error)
+
+    def mark_unknown(self, key: str, error: str) -> None:
+        """Record that an item's request failed in a way that does not tell whether Gmail accepted it."""
+        self._finish(key, UNKNOWN, error=error)
+
+    def release(self, key: str) -> None:
+        """Return an item to the queue, e.g. after checking it never reached Gmail."""
+        self._finish(key, PENDING)
+
+    def counts(self, job_id: str) -> Dict[str, int]:
+        """Number of a job's items per status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM outbox WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall()
+        counts = {PENDING: 0, SENDING: 0, UNKNOWN: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def items(self, job_id: str, keys: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Return the state of a job's items.
+
+        Args:
+            job_id: Job to report on
+            keys: Only these idempotency keys (optional)
+
+        Returns:
+            Dicts with key, to, status, gmail_id and error, in queue order
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, recipient, status, gmail_id, error FROM outbox WHERE job_id = ? ORDER BY rowid", (job_id,)
+            ).fetchall()
+        wanted = set(keys) if keys is not None else None
+        return [
+            {"key": r[0], "to": r[1], "status": r[2], "gmail_id": r[3], "error": r[4]}
+            for r in rows if wanted is None or r[0] in wanted
+        ]
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
+from gmail_calendar_automation.tools import google_api
+from gmail_calendar_automation.tools.http_cache import CachingHttp, response_cache
+from gmail_calendar_automation.tools.tracing import tracer, TracedHttp
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+
+class ServiceCache:
+    """
+    Thread-safe cache of Google API service objects.
+
+    Services are keyed by (api, version, credential identity, thread). The
+    httplib2 transport inside a service is not thread-safe, so each thread gets
+    its own service object while the discovery document is parsed from disk
+    only once per process. The cache holds at most max_entries services and
+    drops the least recently used, so serving many users keeps memory bounded.
+    """
+
+    def __init__(self, root_url: Optional[str] = None, max_entries: int = 256):
+        """
+        Initialize service cache.
+
+        Args:
+            root_url: Send requests, including batch requests, to this root URL
+                instead of the Google API hosts (e.g. a local test server)
+            max_entries: Maximum number of cached service objects
+        """
+        self.root_url = root_url
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._discovery_docs: Dict[Tuple[str, str], Any] = {}
+        self._services: "OrderedDict[Tuple[str, str, int, int], Dict[str, Any]]" = OrderedDict()
+        self.evictions = 0
+
+    def _discovery_doc(self, api: str, version: str) -> Any:
+        """Return the static discovery document bundled with googleapiclient."""
+        key = (api, version)
+        with self._lock:
+            if key in self._discovery_docs:
+                return self._discovery_docs[key]
+        doc = google_api.get_static_doc(api, version)
+        if doc is not None and self.root_url:
+            # The batch endpoint is derived from rootUrl, so rewrite the document
+            # rather than passing client_options, which only moves the base URL
+            doc = json.loads(doc)
+            doc["rootUrl"] = doc["mtlsRootUrl"] = self.root_url
+        with self._lock:
+            self._discovery_docs[key] = doc
+        return doc
+
+    def get(self, api: str, version: str, credentials: "Credentials"):
+        """
+        Return a service object for the given API, building it if needed.
+
+        Args:
+            api: API name (e.g. 'gmail')
+            version: API version (e.g. 'v1')
+            credentials: Credentials the service is bound to
+
+        Returns:
+            googleapiclient Resource for the API
+        """
+        key = (api, version, id(credentials), threading.get_ident())
+        with self._lock:
+            entry = self._services.get(key)
+            if entry is not None:
+                self._services.move_to_end(key)
+        # A refreshed token means the credentials changed under the service
+        if entry and entry["credentials"] is credentials and entry["token"] == credentials.token:
+            return entry["service"]
+
+        with tracer.span("service.build", api=api, version=version):
+            doc = self._discovery_doc(api, version)
+            # Same transport build() would create from the credentials, wrapped to trace each
+            # request; GETs answered by the response cache never reach the traced transport
+            http = CachingHttp(
+                TracedHttp(google_api.AuthorizedHttp(credentials, http=google_api.build_http())), response_cache
+            )
+            if doc is not None:
+                service = google_api.build_from_document(doc, http=http)
+            else:
+                service = google_api.build(api, version, http=http, cache_discovery=False)
+
+        with self._lock:
+            self._services[key] = {
+                "service": service,
+                "credentials": credentials,
+                "token": credentials.token
+            }
+            self._services.move_to_end(key)
+            while len(self._services) > self.max_entries:
+                self._services.popitem(last=False)
+                self.evictions += 1
+        return service
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._services)
+
+    def invalidate(self, credentials: Optional["Credentials"] = None) -> None:
+        """
+        Drop cached services.
+
+        Args:
+            credentials: Only drop services bound to these credentials. Drops
+                every service when omitted.
+        """
+        with self._lock:
+            if credentials is None:
+                self._services.clear()
+                return
+            for key in [k for k, entry in self._services.items() if entry["credentials"] is credentials]:
+                del self._services[key]
+
+
+service_cache = ServiceCache(os.getenv("GOOGLE_API_ROOT_URL"), int(os.getenv("SERVICE_CACHE_SIZE") or 256))
+
+
+def get_service(api: str, version: str, credentials: "Credentials"):
+    """Return a cached service object from the process-wide cache."""
+    return service_cache.get(api, version, credentials)
@@ -0,0 +1,140 @@
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+from typing import Optional
+from urllib.parse import quote
+from gmail_calendar_automation.tools.credential_manager import atomic_write
+
+USER_PLACEHOLDER = "{user_id}"
+
+
+def user_path_component(user_id: str) -> str:
+    """
+    Quote a user ID for use as a file or directory name.
+
+    Distinct IDs give distinct names, and no name leaves its directory:
+    separators are quoted, and so are IDs made only of dots ('.', '..').
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        The quoted user ID
+
+    Raises:
+        ValueError: If the user ID is empty
+    """
+    if not user_id:
+        raise ValueError("User ID must not be empty")
+    quoted = quote(user_id, safe="@.-_")
+    if not quoted.strip("."):
+        return quoted.replace(".", "%2E")
+    return quoted
+
+
+class TokenStore(ABC):
+    """
+    Where the OAuth tokens of users are kept.
+
+    Subclasses implement load and save for one storage backend; credential
+    managers read a user's token only when that user's tools are first used.
+    """
+
+    # Whether different users get different tokens; a store with one shared
+    # token serves every user with the same Google account
+    per_user = True
+
+    @abstractmethod
+    def load(self, user_id: str) -> Optional[str]:
+        """Return the authorized-user JSON of a user, or None if there is none."""
+
+    @abstractmethod
+    def save(self, user_id: str, token_json: str) -> None:
+        """Store the authorized-user JSON of a user."""
+
+
+class FileTokenStore(TokenStore):
+    """
+    One JSON token file per user.
+
+    The path may contain {user_id}, e.g. 'tokens/{user_id}.json'. Without the
+    placeholder every user shares the one file, the single-account setup.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize file token store.
+
+        Args:
+            path: Token file path, optionally containing {user_id}
+        """
+        self.path = path
+        self.per_user = USER_PLACEHOLDER in (path or "")
+
+    def path_for(self, user_id: str) -> str:
+        """Token file of a user; the user ID is quoted so it cannot leave the directory."""
+        if not self.per_user:
+            return self.path
+        return self.path.replace(USER_PLACEHOLDER, user_path_component(user_id))
+
+    def load(self, user_id: str) -> Optional[str]:
+        try:
+            with open(self.path_for(user_id)) as token_file:
+                return token_file.read()
+        except (TypeError, FileNotFoundError):
+            return None
+
+    def save(self, user_id: str, token_json: str) -> None:
+        path = self.path_for(user_id)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        atomic_write(path, token_json)
+
+
+class SqliteTokenStore(TokenStore):
+    """Tokens of all users in one SQLite table, for deployments serving many accounts."""
+
+    def __init__(self, path: str):
+        """
+        Initialize SQLite token store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens (user_id TEXT PRIMARY KEY, token TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def load(self, user_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT token FROM tokens WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] if row else None
+
+    def save(self, user_id: str, token_json: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tokens (user_id, token, updated_at) VALUES (?, ?, ?)",
+                (user_id, token_json, time.time())
+            )
+            self._conn.commit()
+
+
+def token_store_from_env() -> TokenStore:
+    """
+    Create the token store configured in the environment.
+
+    TOKEN_STORE may be 'sqlite:<path>' or 'file:<path>'; otherwise the TOKEN
+    path is used as a FileTokenStore path (with or without {user_id}).
+    """
+    spec = os.getenv("TOKEN_STORE") or ""
+    if spec.startswith("sqlite:"):
+        return SqliteTokenStore(spec[len("sqlite:"):])
+    if spec.startswith("file:"):
+        return FileTokenStore(spec[len("file:"):])
+    return FileTokenStore(os.getenv("TOKEN"))
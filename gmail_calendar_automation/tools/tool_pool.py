@@ -0,0 +1,177 @@
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Iterable
+
+# Objects that belong to the program rather than to one entry
+_SHARED_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+    types.CodeType, types.FrameType
+)
+
+
+def approx_size(obj: Any, shared: Iterable[Any] = ()) -> int:
+    """
+    Estimate the memory held by an object and everything it references.
+
+    Sums sys.getsizeof over the object graph reached through containers,
+    instance dicts and slots. Classes, modules, functions and the objects in
+    shared are not counted, so the estimate covers what the object owns. Memory
+    held by C libraries (e.g. SQLite page caches) is not seen.
+
+    Args:
+        obj: Root of the object graph
+        shared: Objects referenced by obj but owned elsewhere
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen = {id(item) for item in shared}
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item, 0)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif not isinstance(item, (str, bytes, bytearray, int, float, bool)):
+            attributes = getattr(item, "__dict__", None)
+            if attributes is not None:
+                stack.append(attributes)
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return total
+
+
+class ToolPool:
+    """
+    Thread-safe LRU registry of per-key objects (e.g. the tools of each user).
+
+    Objects are created by the factory on first use and evicted least recently
+    used first once the pool holds more than max_entries objects or their
+    estimated memory exceeds max_bytes. Sizes are re-estimated on access at
+    most every measure_interval seconds, since objects grow as they are used.
+    """
+
+    def __init__(self,
+                 factory: Callable[[str], Any],
+                 max_entries: int = 1000,
+                 max_bytes: Optional[int] = None,
+                 on_evict: Optional[Callable[[str, Any], None]] = None,
+                 shared: Iterable[Any] = (),
+                 measure_interval: float = 30.0):
+        """
+        Initialize pool.
+
+        Args:
+            factory: Callable creating the object of a key
+            max_entries: Maximum number of objects kept
+            max_bytes: Maximum estimated memory of the objects (unbounded when omitted)
+            on_evict: Callable receiving each evicted key and object, e.g. to release resources
+            shared: Objects referenced by every entry, left out of the size estimates
+            measure_interval: Minimum seconds between size estimates of one entry
+        """
+        self.factory = factory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.shared = list(shared)
+        self.measure_interval = measure_interval
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _measure(self, entry: Dict[str, Any]) -> None:
+        """Re-estimate an entry's size; called with the lock held."""
+        size = approx_size(entry["value"], self.shared) if self.max_bytes is not None else 0
+        self._bytes += size - entry["bytes"]
+        entry["bytes"] = size
+        entry["measured_at"] = time.monotonic()
+
+    def get(self, key: str) -> Any:
+        """
+        Return the object of a key, creating it on first use.
+
+        Args:
+            key: Entry key, e.g. a user ID
+
+        Returns:
+            The key's object
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._metrics["hits"] += 1
+                self._entries.move_to_end(key)
+                if time.monotonic() - entry["measured_at"] < self.measure_interval:
+                    return entry["value"]
+                self._measure(entry)
+            else:
+                self._metrics["misses"] += 1
+                # Created under the lock so a key never gets two objects (e.g. two token refreshers)
+                entry = {"value": self.factory(key), "bytes": 0, "measured_at": 0.0}
+                self._entries[key] = entry
+                self._measure(entry)
+            evicted = self._evict(keep=key)
+
+        for evicted_key, evicted_value in evicted:
+            if self.on_evict is not None:
+                self.on_evict(evicted_key, evicted_value)
+        return entry["value"]
+
+    def _evict(self, keep: str) -> list:
+        """Drop least recently used entries until within bounds; called with the lock held."""
+        evicted = []
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, entry = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            del self._entries[key]
+            self._bytes -= entry["bytes"]
+            self._metrics["evictions"] += 1
+            evicted.append((key, entry["value"]))
+        return evicted
+
+    def discard(self, key: str) -> None:
+        """Drop the object of a key, if present."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry["bytes"]
+        if entry is not None and self.on_evict is not None:
+            self.on_evict(key, entry["value"])
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return pool statistics.
+
+        Returns:
+            Dict with entries, estimated bytes, hits, misses, hit rate and evictions
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics.update(entries=len(self._entries), bytes=self._bytes)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_rate"] = metrics["hits"] / lookups if lookups else None
+        return metrics
@@ -0,0 +1,397 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Callable
+
+# Finished spans kept in memory for inspection
+RECENT_SPANS = 1000
+METRIC_PREFIX = "gca"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_METRIC_HELP = {
+    "spans_total": ("counter", "Finished spans by name and status."),
+    "span_seconds_total": ("counter", "Time spent in spans by name."),
+    "tool_calls_total": ("counter", "Tool method calls by tool and outcome."),
+    "tool_seconds_total": ("counter", "Time spent in tool methods by tool."),
+    "http_requests_total": ("counter", "HTTP requests to Google APIs by operation and status code."),
+    "http_request_bytes_total": ("counter", "Request body bytes sent to Google APIs by operation."),
+    "http_response_bytes_total": ("counter", "Response body bytes received from Google APIs by operation."),
+    "retries_total": ("counter", "Retried API calls by operation."),
+    "credential_refreshes_total": ("counter", "OAuth access token refreshes by outcome."),
+    "service_builds_total": ("counter", "Google API service objects built by API."),
+    "http_cache_total": ("counter", "GET requests by response cache outcome (hit, revalidated, miss)."),
+    "routes_total": ("counter", "Agent turns by routing path (fast, sticky, llm) and answering agent."),
+    "metrics_write_errors_total": ("counter", "Failed writes of the metrics file."),
+}
+
+
+class Span:
+    """One timed step of a tool call (the call itself, a token refresh, an HTTP request...)."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent", "root", "attributes", "status",
+                 "start_time", "_start", "duration_ms", "breakdown")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.parent = parent
+        self.root = parent.root if parent else self
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms = 0.0
+        # Per-name totals of the descendants, kept on root spans only
+        self.breakdown: Dict[str, Dict[str, float]] = {}
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return an attribute of this span or, failing that, of its closest ancestor having it."""
+        span = self
+        while span is not None:
+            if name in span.attributes:
+                return span.attributes[name]
+            span = span.parent
+        return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "start": self.start_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if self.breakdown:
+            record["breakdown"] = self.breakdown
+        return record
+
+
+class JsonlSink:
+    """Append finished spans to a JSON Lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a") as trace_file:
+                trace_file.write(line)
+
+
+class Tracer:
+    """
+    Records spans around tool calls and the API work they do.
+
+    Spans nest through a context variable, so they follow asyncio tasks and
+    asyncio.to_thread calls. Finished spans go to the sinks and into
+    Prometheus-style counters; each root span also carries a breakdown of the
+    time and bytes of its descendants.
+    """
+
+    def __init__(self,
+                 sinks: Optional[List[Any]] = None,
+                 metrics_path: Optional[str] = None,
+                 metrics_interval: float = 15.0):
+        """
+        Initialize tracer.
+
+        Args:
+            sinks: Objects with an emit(record) method receiving every finished span
+            metrics_path: File rewritten with the Prometheus counters, e.g. for
+                the node_exporter textfile collector (optional)
+            metrics_interval: Least seconds between writes of the metrics file;
+                root spans schedule a write on a background thread rather than
+                syncing the file to disk themselves
+        """
+        self.sinks = list(sinks or [])
+        self.metrics_path = metrics_path
+        self.metrics_interval = metrics_interval
+        self.recent: deque = deque(maxlen=RECENT_SPANS)
+        self._lock = threading.Lock()
+        # Serializes metrics file writes so a slower writer never replaces newer counters
+        self._write_lock = threading.Lock()
+        self._write_timer: Optional[threading.Timer] = None
+        self._last_write = float("-inf")
+        self._counters: Dict[MetricKey, float] = {}
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """
+        Create a tracer writing to TRACE_FILE (JSON Lines) and METRICS_FILE (Prometheus text) when set.
+
+        METRICS_INTERVAL sets the seconds between metrics file writes (default 15);
+        the file is written once more when the process exits.
+        """
+        trace_path = os.getenv("TRACE_FILE")
+        tracer = cls(
+            [JsonlSink(trace_path)] if trace_path else [],
+            os.getenv("METRICS_FILE") or None,
+            float(os.getenv("METRICS_INTERVAL") or 15)
+        )
+        if tracer.metrics_path:
+            atexit.register(tracer.flush_metrics)
+        return tracer
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        """Return the innermost active span, if any."""
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Time a block as a span, nested under the current span.
+
+        Args:
+            name: Span name (e.g. 'http', 'credentials.refresh')
+            attributes: Initial span attributes
+
+        Yields:
+            The span, to add attributes while it runs
+        """
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.attributes.setdefault("error", type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration_ms = (time.perf_counter() - span._start) * 1000
+            self._finish(span)
+
+    def record(self, name: str, **attributes: Any) -> None:
+        """Record an instantaneous span, e.g. a decision, under the current span."""
+        with self.span(name, **attributes):
+            pass
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            if span.root is not span:
+                entry = span.root.breakdown.setdefault(span.name, {"count": 0, "ms": 0.0})
+                entry["count"] += 1
+                entry["ms"] = round(entry["ms"] + span.duration_ms, 3)
+                if "response_bytes" in span.attributes:
+                    entry["bytes"] = entry.get("bytes", 0) + span.attributes["response_bytes"]
+            self._count_span(span)
+            record = span.to_dict()
+            self.recent.append(record)
+
+        for sink in self.sinks:
+            try:
+                sink.emit(record)
+            except OSError:
+                pass
+        if span.root is span and self.metrics_path:
+            self._schedule_metrics_write()
+
+    def _schedule_metrics_write(self) -> None:
+        """Write the metrics file on a timer thread, at most once per metrics_interval."""
+        with self._lock:
+            if self._write_timer is not None:
+                return
+            delay = max(0.0, self._last_write + self.metrics_interval - time.monotonic())
+            timer = self._write_timer = threading.Timer(delay, self.flush_metrics)
+            timer.daemon = True
+        timer.start()
+
+    def flush_metrics(self) -> None:
+        """Write the metrics file now, if one is configured, cancelling any scheduled write."""
+        with self._lock:
+            timer, self._write_timer = self._write_timer, None
+            self._last_write = time.monotonic()
+        if timer is not None:
+            timer.cancel()
+        if not self.metrics_path:
+            return
+        try:
+            self.write_metrics(self.metrics_path)
+        except OSError:
+            # Surfaced in the next successful write
+            with self._lock:
+                self._add("metrics_write_errors_total", 1)
+
+    def _add(self, metric: str, value: float, **labels: Any) -> None:
+        key = (metric, tuple(sorted(
+            (name, str(label).lower() if isinstance(label, bool) else str(label)) for name, label in labels.items()
+        )))
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def _count_span(self, span: Span) -> None:
+        """Update the counters for a finished span; called with the lock held."""
+        seconds = span.duration_ms / 1000
+        self._add("spans_total", 1, span=span.name, status=span.status)
+        self._add("span_seconds_total", seconds, span=span.name)
+
+        operation = span.get("operation", "unknown")
+        if span.name == "tool":
+            tool = span.attributes.get("tool", "unknown")
+            self._add("tool_calls_total", 1, tool=tool, success=span.attributes.get("success", span.status == "ok"))
+            self._add("tool_seconds_total", seconds, tool=tool)
+        elif span.name == "http":
+            self._add("http_requests_total", 1, operation=operation, code=span.attributes.get("status_code", "error"))
+            self._add("http_request_bytes_total", span.attributes.get("request_bytes", 0), operation=operation)
+            self._add("http_response_bytes_total", span.attributes.get("response_bytes", 0), operation=operation)
+        elif span.name == "http.cache":
+            self._add("http_cache_total", 1, outcome=span.attributes.get("outcome", "unknown"))
+        elif span.name == "retry":
+            self._add("retries_total", 1, operation=operation)
+        elif span.name == "credentials.refresh":
+            self._add("credential_refreshes_total", 1, status=span.status)
+        elif span.name == "service.build":
+            self._add("service_builds_total", 1, api=span.attributes.get("api", "unknown"))
+        elif span.name == "route":
+            self._add("routes_total", 1, path=span.attributes.get("path"), route=span.attributes.get("route") or "none")
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Return the counters.
+
+        Returns:
+            Dict mapping 'metric{label="value",...}' to its value
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        return {self._series(metric, labels): value for (metric, labels), value in sorted(counters.items())}
+
+    @staticmethod
+    def _series(metric: str, labels: Tuple[Tuple[str, str], ...]) -> str:
+        def _escape(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+        return f"{METRIC_PREFIX}_{metric}{{{rendered}}}" if rendered else f"{METRIC_PREFIX}_{metric}"
+
+    def prometheus_text(self) -> str:
+        """Render the counters in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+        lines = []
+        described = set()
+        for (metric, labels), value in counters:
+            if metric not in described:
+                metric_type, help_text = _METRIC_HELP.get(metric, ("untyped", metric))
+                lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+                lines.append(f"# TYPE {METRIC_PREFIX}_{metric} {metric_type}")
+                described.add(metric)
+            text = str(int(value)) if value == int(value) else repr(round(value, 6))
+            lines.append(f"{self._series(metric, labels)} {text}")
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self, path: str) -> None:
+        """
+        Write the Prometheus text to path, replacing the file atomically.
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        # Imported here because credential_manager traces its token refreshes
+        from gmail_calendar_automation.tools.credential_manager import atomic_write
+        with self._write_lock:
+            atomic_write(path, self.prometheus_text())
+
+    def reset(self) -> None:
+        """Clear the counters and the recent spans."""
+        with self._lock:
+            self._counters.clear()
+            self.recent.clear()
+
+
+tracer = Tracer.from_env()
+
+
+def _tool_result(span: Span, result: Any) -> Any:
+    if isinstance(result, dict) and "success" in result:
+        span.set(success=bool(result["success"]))
+    return result
+
+
+def traced_tool(component: str) -> Callable[[type], type]:
+    """
+    Class decorator wrapping each public method of a tool in a 'tool' span.
+
+    Generator methods (iter_*) are left alone: they run interleaved with the
+    caller, so their work is traced by the spans of the calls they make.
+
+    Args:
+        component: Prefix of the span's tool attribute, e.g. 'gmail'
+
+    Returns:
+        Decorator returning the class with wrapped methods
+    """
+    def _wrap(method: Callable, tool: str) -> Callable:
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def traced(*args, **kwargs):
+                with tracer.span("tool", tool=tool) as span:
+                    return _tool_result(span, await method(*args, **kwargs))
+        else:
+            @functools.wraps(method)
+            def traced(*args, **kwargs):
+                with tracer.span("tool", tool=tool) as span:
+                    return _tool_result(span, method(*args, **kwargs))
+        return traced
+
+    def decorate(cls: type) -> type:
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(member) or inspect.isgeneratorfunction(member):
+                continue
+            setattr(cls, name, _wrap(member, f"{component}.{name}"))
+        return cls
+
+    return decorate
+
+
+class TracedHttp:
+    """
+    httplib2-compatible wrapper recording an 'http' span for each request.
+
+    googleapiclient sends every request, including batch requests, through
+    http.request(), so wrapping the service's transport captures them all.
+    """
+
+    def __init__(self, http):
+        """
+        Initialize wrapper.
+
+        Args:
+            http: Transport to wrap, e.g. a google_auth_httplib2.AuthorizedHttp
+        """
+        self.http = http
+
+    def request(self, uri: str, method: str = "GET", body: Any = None, headers: Any = None, **kwargs) -> Any:
+        with tracer.span("http", method=method, url=uri.split("?", 1)[0]) as span:
+            if body is not None:
+                span.set(request_bytes=len(body))
+            response, content = self.http.request(uri, method, body=body, headers=headers, **kwargs)
+            span.set(status_code=response.status, response_bytes=len(content or b""))
+            if response.status >= 400:
+                span.status = "error"
+            return response, content
+
+    def __getattr__(self, name: str) -> Any:
+        # credentials, timeout, close()... are read from the wrapped transport
+        return getattr(self.http, name)
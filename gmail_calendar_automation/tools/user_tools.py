@@ -0,0 +1,176 @@
+import os
+import threading
+from typing import Optional
+from gmail_calendar_automation.tools.credential_manager import CredentialManager
+from gmail_calendar_automation.tools.gmail_tool import GmailTool
+from gmail_calendar_automation.tools.google_calendar_tool import GoogleCalendarTool
+from gmail_calendar_automation.tools.http_cache import response_cache, credential_key
+from gmail_calendar_automation.tools.invite_pipeline import InvitePipeline
+from gmail_calendar_automation.tools.lazy import lazy_instance
+from gmail_calendar_automation.tools.rate_limiter import (
+    gmail_project_bucket, calendar_project_bucket, new_gmail_scheduler, new_calendar_scheduler
+)
+from gmail_calendar_automation.tools.service_cache import service_cache
+from gmail_calendar_automation.tools.token_store import (
+    TokenStore, USER_PLACEHOLDER, token_store_from_env, user_path_component
+)
+from gmail_calendar_automation.tools.tool_pool import ToolPool
+
+# Pool key of the single account of a deployment whose token store is not per user,
+# and of calls made without a user (e.g. push notifications)
+DEFAULT_USER = "default"
+
+
+def user_path(path: Optional[str], user_id: str, per_user: bool, directory: bool = False) -> Optional[str]:
+    """
+    Derive a user's copy of a local store path.
+
+    '{user_id}' in the path is replaced by the user ID. Otherwise, when users
+    have separate tokens, the user ID is inserted before the extension, or
+    appended as a subdirectory of a directory, so that users never share a
+    sync store, index, queue or attachments.
+
+    Args:
+        path: Configured path, or None when the store is disabled
+        user_id: User the path is for
+        per_user: Whether users have separate tokens
+        directory: Whether the path names a directory
+
+    Returns:
+        The user's path, or None
+
+    Raises:
+        ValueError: If the user ID is empty
+    """
+    if not path:
+        return None
+    safe_id = user_path_component(user_id)
+    if USER_PLACEHOLDER in path:
+        return path.replace(USER_PLACEHOLDER, safe_id)
+    if not per_user:
+        return path
+    if directory:
+        return os.path.join(path, safe_id)
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{safe_id}{ext}"
+
+
+class UserTools:
+    """
+    The Gmail and Calendar tools of one user, sharing one credential manager.
+
+    Each user has quota schedulers of their own, since Google's rate limits
+    are per user; one user being throttled does not slow the others.
+    """
+
+    def __init__(self, user_id: str, token_store: TokenStore, app_credentials_path: Optional[str]):
+        """
+        Initialize user tools; the tools themselves are created on first use.
+
+        Args:
+            user_id: User the tools act for
+            token_store: Store holding the user's OAuth token
+            app_credentials_path: Path to app credentials JSON file
+        """
+        self.user_id = user_id
+        self.credential_manager = CredentialManager(
+            None, app_credentials_path, token_store=token_store, user_id=user_id
+        )
+        self._per_user = token_store.per_user
+        self.gmail_scheduler = new_gmail_scheduler()
+        self.calendar_scheduler = new_calendar_scheduler()
+        self._lock = threading.Lock()
+        self._gmail: Optional[GmailTool] = None
+        self._calendar: Optional[GoogleCalendarTool] = None
+        self._invite_pipeline: Optional[InvitePipeline] = None
+
+    def _path(self, variable: str) -> Optional[str]:
+        return user_path(os.getenv(variable), self.user_id, self._per_user)
+
+    @property
+    def gmail(self) -> GmailTool:
+        """The user's Gmail tool."""
+        with self._lock:
+            if self._gmail is None:
+                self._gmail = GmailTool(
+                    self.credential_manager.app_credentials_path,
+                    None,
+                    sync_store_path=self._path("GMAIL_SYNC_STORE"),
+                    index_path=self._path("GMAIL_INDEX_PATH"),
+                    bulk_checkpoint_path=self._path("GMAIL_BULK_CHECKPOINT"),
+                    send_queue_path=self._path("GMAIL_SEND_QUEUE"),
+                    credential_manager=self.credential_manager,
+                    scheduler=self.gmail_scheduler,
+                    attachments_dir=user_path(GmailTool.ATTACHMENTS_DIR, self.user_id, self._per_user, directory=True)
+                )
+            return self._gmail
+
+    @property
+    def calendar(self) -> GoogleCalendarTool:
+        """The user's Google Calendar tool."""
+        with self._lock:
+            if self._calendar is None:
+                self._calendar = GoogleCalendarTool(
+                    self.credential_manager.app_credentials_path,
+                    None,
+                    credential_manager=self.credential_manager,
+                    scheduler=self.calendar_scheduler
+                )
+            return self._calendar
+
+    @property
+    def invite_pipeline(self) -> InvitePipeline:
+        """The user's pipeline from Gmail invitations to Calendar events."""
+        gmail, calendar = self.gmail, self.calendar
+        with self._lock:
+            if self._invite_pipeline is None:
+                self._invite_pipeline = InvitePipeline(gmail, calendar)
+            return self._invite_pipeline
+
+    def close(self) -> None:
+        """Release the cached service objects and API responses of the user."""
+        credentials = self.credential_manager.credentials
+        if credentials is not None:
+            service_cache.invalidate(credentials)
+            response_cache.invalidate(credential_key(credentials))
+
+
+@lazy_instance
+def get_token_store() -> TokenStore:
+    """Token store configured in the environment (TOKEN_STORE or TOKEN), created on first use."""
+    return token_store_from_env()
+
+
+@lazy_instance
+def get_user_pool() -> ToolPool:
+    """
+    Process-wide pool of UserTools, configured from the environment on first use.
+
+    TOOL_POOL_MAX_USERS bounds the number of users whose tools are kept in
+    memory (default 1000) and TOOL_POOL_MAX_MB their estimated memory.
+    """
+    token_store = get_token_store()
+    app_credentials_path = os.getenv("CREDENTIALS")
+    max_mb = os.getenv("TOOL_POOL_MAX_MB")
+    return ToolPool(
+        lambda user_id: UserTools(user_id, token_store, app_credentials_path),
+        max_entries=int(os.getenv("TOOL_POOL_MAX_USERS") or 1000),
+        max_bytes=int(float(max_mb) * 2 ** 20) if max_mb else None,
+        on_evict=lambda user_id, tools: tools.close(),
+        shared=(token_store, gmail_project_bucket, calendar_project_bucket, service_cache, response_cache)
+    )
+
+
+def get_user_tools(user_id: Optional[str] = None) -> UserTools:
+    """
+    Return the tools of a user, creating them on first use.
+
+    Args:
+        user_id: ADK session user ID. Ignored when the token store holds a
+            single shared token; calls without a user get DEFAULT_USER.
+
+    Returns:
+        The user's UserTools
+    """
+    key = user_id if user_id and get_token_store().per_user else DEFAULT_USER
+    return get_user_pool().get(key)
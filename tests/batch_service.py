@@ -0,0 +1,44 @@
+"""In-process stand-in for the batch endpoint of a googleapiclient service."""
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id):
+        self._requests.append((request, request_id))
+
+    def execute(self):
+        self._service.batches.append(len(self._requests))
+        failure = self._service.batch_failures.pop(0) if self._service.batch_failures else None
+        if failure is not None:
+            raise failure
+        for request, request_id in self._requests:
+            outcome = request()
+            if isinstance(outcome, Exception):
+                self._callback(request_id, None, outcome)
+            else:
+                self._callback(request_id, outcome, None)
+
+
+class FakeBatchService:
+    """
+    Batch endpoint whose sub-requests are callables returning a response or an exception.
+
+    batch_failures lists what each batch request raises in turn (None lets it through).
+    """
+
+    def __init__(self, batch_failures=()):
+        self.batches = []
+        self.batch_failures = list(batch_failures)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+def flaky(response, failures=()):
+    """Request failing with each of failures in turn, then answering response."""
+    failures = list(failures)
+    return lambda: failures.pop(0) if failures else response
@@ -0,0 +1,114 @@
+from collections import Counter
+
+from gmail_calendar_automation.tools.bulk_mail import (
+    BATCH_DELETE, BATCH_MODIFY, BulkCheckpoint, BulkMailEngine, bulk_job_id
+)
+
+
+class _Messages:
+    def __init__(self, mailbox):
+        self._mailbox = mailbox
+
+    def list(self, userId, q, maxResults, pageToken=None, fields=None):
+        def request():
+            offset = int(pageToken or 0)
+            page = self._mailbox.ids[offset:offset + maxResults]
+            response = {"messages": [{"id": message_id} for message_id in page]}
+            if offset + maxResults < len(self._mailbox.ids):
+                response["nextPageToken"] = str(offset + maxResults)
+            return response
+        return request
+
+    def batchModify(self, userId, body):
+        return lambda: self._mailbox.applied.append((BATCH_MODIFY, body))
+
+    def batchDelete(self, userId, body):
+        return lambda: self._mailbox.applied.append((BATCH_DELETE, body))
+
+
+class _Mailbox:
+    """Gmail service whose requests are callables, with the calls made to it counted."""
+
+    def __init__(self, count, fail_on=()):
+        self.ids = [f"m{number}" for number in range(count)]
+        self.applied = []
+        self.calls = Counter()
+        self.fail_on = set(fail_on)
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return _Messages(self)
+
+    def execute(self, request, operation):
+        self.calls[operation] += 1
+        if (operation, self.calls[operation]) in self.fail_on:
+            raise RuntimeError(f"{operation} failed")
+        return request()
+
+
+def _engine(mailbox, checkpoint=None):
+    return BulkMailEngine(lambda: mailbox, mailbox.execute, checkpoint, workers=1)
+
+
+def _processed_ids(mailbox):
+    return [message_id for _, body in mailbox.applied for message_id in body["ids"]]
+
+
+def test_ids_are_listed_in_full_pages_and_sent_in_chunks_of_1000():
+    mailbox = _Mailbox(2600)
+
+    result = _engine(mailbox).run(BATCH_MODIFY, "older_than:1y", {"removeLabelIds": ["INBOX"]})
+
+    assert result["done"] and result["processed"] == 2600
+    assert mailbox.calls == {"messages.list": 6, BATCH_MODIFY: 3}
+    assert [len(body["ids"]) for _, body in mailbox.applied] == [1000, 1000, 600]
+    assert all(body["removeLabelIds"] == ["INBOX"] for _, body in mailbox.applied)
+    assert sorted(_processed_ids(mailbox)) == sorted(mailbox.ids)
+
+
+def test_limit_stops_listing_early():
+    mailbox = _Mailbox(2600)
+
+    result = _engine(mailbox).run(BATCH_DELETE, "in:trash", limit=700)
+
+    assert result["processed"] == 700
+    assert mailbox.calls == {"messages.list": 2, BATCH_DELETE: 1}
+
+
+def test_failed_job_resumes_after_last_finished_chunk(tmp_path):
+    path = str(tmp_path / "bulk.json")
+    mailbox = _Mailbox(2600, fail_on={(BATCH_MODIFY, 2)})
+
+    first = _engine(mailbox, BulkCheckpoint(path)).run(BATCH_MODIFY, "label:old", {"addLabelIds": ["L"]})
+    assert "error" in first and first["processed"] == 1000
+
+    mailbox.fail_on.clear()
+    second = _engine(mailbox, BulkCheckpoint(path)).run(BATCH_MODIFY, "label:old", {"addLabelIds": ["L"]})
+    assert second["resumed"] and second["done"] and second["processed"] == 2600
+    # The resumed run starts after the finished chunk; later chunks may run again
+    processed = Counter(_processed_ids(mailbox))
+    assert set(processed) == set(mailbox.ids)
+    assert all(processed[f"m{number}"] == 1 for number in range(1000))
+
+
+def test_finished_job_runs_again_from_the_start():
+    mailbox = _Mailbox(300)
+    checkpoint = BulkCheckpoint()
+    _engine(mailbox, checkpoint).run(BATCH_DELETE, "in:spam")
+
+    result = _engine(mailbox, checkpoint).run(BATCH_DELETE, "in:spam")
+
+    assert not result["resumed"] and result["processed"] == 300
+    assert mailbox.calls[BATCH_DELETE] == 2
+
+
+def test_checkpoint_persists_jobs(tmp_path):
+    path = str(tmp_path / "bulk.json")
+    job_id = bulk_job_id(BATCH_DELETE, "in:spam", {})
+    BulkCheckpoint(path).update(job_id, processed=5, done=False)
+
+    assert BulkCheckpoint(path).get(job_id)["processed"] == 5
+    assert bulk_job_id(BATCH_DELETE, "in:spam", {}) == job_id
+    assert bulk_job_id(BATCH_DELETE, "in:trash", {}) != job_id
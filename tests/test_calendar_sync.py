@@ -0,0 +1,109 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from gmail_calendar_automation.tools.calendar_sync import CalendarSync, parse_rfc3339
+
+
+def _event(event_id, day):
+    return {
+        "id": event_id,
+        "start": {"dateTime": f"2026-03-{day:02d}T09:00:00Z"},
+        "end": {"dateTime": f"2026-03-{day:02d}T10:00:00Z"},
+    }
+
+
+class _Calendars:
+    """events.list of a few calendars, recording each listing; a gate holds a calendar's next listing."""
+
+    def __init__(self, events):
+        self.events_by_calendar = events
+        self.changes = {}
+        self.listings = []
+        self.gates = {}
+        self.held = threading.Event()
+
+    def events(self):
+        return self
+
+    def list(self, **params):
+        def request():
+            self.listings.append(params)
+            calendar_id = params["calendarId"]
+            gate = self.gates.pop(calendar_id, None)
+            if params["syncToken"] is None:
+                items = self.events_by_calendar.get(calendar_id, [])
+            else:
+                items = self.changes.get(calendar_id, [])
+            if gate is not None:
+                self.held.set()
+                gate.wait(5)
+            return {"items": list(items), "nextSyncToken": f"token{len(self.listings)}", "timeZone": "UTC"}
+        return request
+
+
+def _sync():
+    return CalendarSync(lambda request, operation: request())
+
+
+def test_full_sync_is_bounded_and_later_syncs_are_incremental():
+    service = _Calendars({"primary": [_event("a", 2)]})
+    sync = _sync()
+
+    assert sync.sync(service, "primary") == {"mode": "full", "changed": 1}
+    full = service.listings[0]
+    assert full["singleEvents"] and full["syncToken"] is None
+    time_max = parse_rfc3339(full["timeMax"])
+    assert time_max - datetime.now(timezone.utc) > CalendarSync.SYNC_HORIZON - timedelta(minutes=1)
+    assert sync.store("primary").horizon == time_max
+
+    service.changes["primary"] = [_event("b", 3)]
+    assert sync.sync(service, "primary") == {"mode": "incremental", "changed": 1}
+    incremental = service.listings[1]
+    assert incremental["syncToken"] == "token1" and incremental["timeMax"] is None
+    assert sorted(event["id"] for event in sync.store("primary").events()) == ["a", "b"]
+
+
+def test_query_past_the_horizon_reloads_up_to_it():
+    service = _Calendars({"primary": [_event("a", 2)]})
+    sync = _sync()
+    sync.sync(service, "primary")
+    until = datetime.now(timezone.utc) + 2 * CalendarSync.SYNC_HORIZON
+
+    assert sync.sync(service, "primary", until=until)["mode"] == "full"
+    assert parse_rfc3339(service.listings[1]["timeMax"]) == until
+    assert sync.sync(service, "primary", until=until)["mode"] == "incremental"
+
+
+def test_slow_calendar_does_not_block_other_calendars_or_queries():
+    service = _Calendars({"slow": [_event("s", 2)], "fast": [_event("f", 2)]})
+    release = service.gates["slow"] = threading.Event()
+    sync = _sync()
+    slow = threading.Thread(target=sync.sync, args=(service, "slow"))
+    slow.start()
+    service.held.wait(5)
+    try:
+        assert sync.sync(service, "fast")["mode"] == "full"
+        # The slow calendar's store answers from its previous state meanwhile
+        assert sync.store("slow").query("2026-03-01T00:00:00Z", "2026-04-01T00:00:00Z") == []
+    finally:
+        release.set()
+        slow.join(5)
+    assert [event["id"] for event in sync.store("slow").events()] == ["s"]
+
+
+def test_older_listing_does_not_overwrite_newer_one():
+    service = _Calendars({"primary": [_event("old", 2)]})
+    release = service.gates["primary"] = threading.Event()
+    sync = _sync()
+    results = []
+    first = threading.Thread(target=lambda: results.append(sync.sync(service, "primary")))
+    first.start()
+    service.held.wait(5)
+
+    service.events_by_calendar["primary"] = [_event("new", 3)]
+    assert sync.sync(service, "primary")["mode"] == "full"
+    release.set()
+    first.join(5)
+
+    assert results == [{"mode": "superseded", "changed": 0}]
+    assert [event["id"] for event in sync.store("primary").events()] == ["new"]
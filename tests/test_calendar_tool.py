@@ -0,0 +1,134 @@
+import asyncio
+import inspect
+import threading
+
+import pytest
+
+from gmail_calendar_automation.tools import google_calendar_tool
+from gmail_calendar_automation.tools.async_client import GoogleApiError
+from gmail_calendar_automation.tools.google_calendar_tool import GoogleCalendarTool
+from gmail_calendar_automation.tools.rate_limiter import QuotaScheduler
+from tests.batch_service import FakeBatchService
+
+
+class _Calendar(FakeBatchService):
+    """Calendar whose inserts are carried out, or not, but whose batch answer can be lost."""
+
+    def __init__(self, batch_failures=(), lost=(), get_failures=()):
+        super().__init__(batch_failures)
+        self.created = {}
+        self.inserts = []
+        self._lost = set(lost)
+        self._get_failures = list(get_failures)
+
+    def events(self):
+        return self
+
+    def insert(self, calendarId, body, sendNotifications):
+        def _insert():
+            self.inserts.append(body["id"])
+            self.created[body["id"]] = dict(body)
+            if body["summary"] in self._lost:
+                return TimeoutError("timed out")
+            return dict(body)
+        return _insert
+
+    def get(self, calendarId, eventId):
+        def _get():
+            if self._get_failures:
+                return self._get_failures.pop(0)
+            return dict(self.created[eventId]) if eventId in self.created else GoogleApiError(404, "Not Found")
+        return _get
+
+
+@pytest.fixture
+def calendar(monkeypatch):
+    def _calendar(service):
+        tool = GoogleCalendarTool(
+            "credentials.json", None, credential_manager=None,
+            scheduler=QuotaScheduler(rate=1e6, capacity=1e6, base_delay=0.001, max_delay=0.001)
+        )
+        monkeypatch.setattr(tool, "_ensure_valid_credentials", lambda: True)
+        monkeypatch.setattr(google_calendar_tool, "get_service", lambda *args: service)
+        return tool
+    return _calendar
+
+
+def _events(*summaries):
+    return [
+        {"summary": summary, "start": {"dateTime": "2026-03-02T09:00:00Z"}, "end": {"dateTime": "2026-03-02T10:00:00Z"}}
+        for summary in summaries
+    ]
+
+
+def test_events_are_created_with_client_ids_in_one_batch(calendar):
+    service = _Calendar()
+
+    result = calendar(service).create_events("primary", _events("a", "b", "c"))
+
+    assert result["success"]
+    assert [r["event_id"] for r in result["results"]] == service.inserts
+    assert all(len(event_id) == 32 for event_id in service.inserts)
+    assert service.batches == [3]
+
+
+def test_lost_answer_is_resolved_by_looking_the_event_up(calendar):
+    service = _Calendar(lost={"b"})
+
+    result = calendar(service).create_events("primary", _events("a", "b"))
+
+    assert result["success"]
+    assert [r["success"] for r in result["results"]] == [True, True]
+    # events.insert is not retried: the event is found by its ID instead
+    assert len(service.inserts) == 2
+
+
+def test_failed_batch_request_reports_events_that_were_not_created(calendar):
+    # Failures are described through googleapiclient's HttpError
+    pytest.importorskip("googleapiclient")
+    service = _Calendar(batch_failures=[GoogleApiError(502, "Bad Gateway")])
+
+    result = calendar(service).create_events("primary", _events("a", "b"))
+
+    assert not result["success"]
+    assert [r.get("status") for r in result["results"]] == [None, None]
+    assert "unknown" not in result["message"]
+
+
+def test_unresolved_inserts_are_reported_as_unknown(calendar):
+    # Failures are described through googleapiclient's HttpError
+    pytest.importorskip("googleapiclient")
+    service = _Calendar(lost={"a"}, get_failures=[TimeoutError("timed out")] * 6)
+
+    result = calendar(service).create_events("primary", _events("a", "b"))
+
+    assert [r.get("status") for r in result["results"]] == ["unknown", None]
+    assert result["results"][1]["success"]
+    assert "list the events" in result["message"]
+
+
+@pytest.mark.parametrize("name, args", [
+    ("create_events", ("primary", _events("a"), False)),
+    ("delete_events", ("primary", ["abc"])),
+    ("find_conflicts", ("primary", "2026-03-02T09:00:00Z", "2026-03-02T10:00:00Z", None)),
+    ("find_free_slots", ("primary", "2026-03-02T09:00:00Z", "2026-03-02T18:00:00Z", 30, None, 10)),
+])
+def test_async_variants_run_off_the_event_loop(calendar, monkeypatch, name, args):
+    tool = calendar(_Calendar())
+    calls = []
+    monkeypatch.setattr(tool, name, lambda *call_args: calls.append((call_args, threading.get_ident())) or {"success": True})
+
+    assert asyncio.run(getattr(tool, f"{name}_async")(*args)) == {"success": True}
+    assert calls[0][0] == args
+    assert calls[0][1] != threading.get_ident()
+
+
+def test_calendar_agents_register_async_tools():
+    pytest.importorskip("google.adk")
+    from gmail_calendar_automation.sub_agents.google_calendar_agent import agent
+
+    for leaf in (agent.google_calendar_creator_agent, agent.google_calendar_manager_agent):
+        # Authentication tools run the OAuth flow, which waits for the user anyway
+        blocking = [tool.__name__ for tool in leaf.tools
+                    if not inspect.iscoroutinefunction(tool) and tool.__name__ not in ("authenticate", "get_auth_status")]
+        assert blocking == [], leaf.name
@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+
+from gmail_calendar_automation.tools.email_index import EmailIndex, _duration_cutoff, _parse_date, translate_query
+from gmail_calendar_automation.tools.gmail_sync import GmailSync
+
+
+def _message(message_id, sender="alice@example.com", subject="Hello", labels=("INBOX",), internal_date=0):
+    return {
+        "id": message_id,
+        "labelIds": list(labels),
+        "internalDate": str(internal_date),
+        "payload": {"headers": [{"name": "From", "value": sender}, {"name": "Subject", "value": subject}]},
+    }
+
+
+def _millis(*args, tz=timezone.utc):
+    return int(datetime(*args, tzinfo=tz).timestamp() * 1000)
+
+
+def test_label_and_sender_operators():
+    conditions, params, fts_clauses, include_hidden = translate_query('is:unread -in:inbox from:"Alice Smith"')
+
+    assert conditions == ["labels LIKE ?", "labels NOT LIKE ?"]
+    assert params == ["% UNREAD %", "% INBOX %"]
+    assert fts_clauses == ['sender : "Alice Smith"']
+    assert not include_hidden
+
+
+def test_is_read_negates_unread():
+    assert translate_query("is:read")[:2] == (["labels NOT LIKE ?"], ["% UNREAD %"])
+
+
+def test_trash_and_spam_are_flagged():
+    assert translate_query("in:trash")[3]
+    assert translate_query("in:spam")[3]
+
+
+def test_queries_the_index_cannot_answer():
+    for query in ("invoice", '"quarterly report"', "from:me", "-from:bob", "has:attachment",
+                  "label:my-project", "after:yesterday", "newer_than:3w", "-after:2026/01/01"):
+        assert translate_query(query) is None, query
+
+
+def test_dates_are_midnight_pacific_time():
+    # Gmail reads dates in Pacific time: 08:00 UTC in winter, 07:00 UTC in summer
+    assert _parse_date("2026/01/15") == _millis(2026, 1, 15, 8)
+    assert _parse_date("2026-07-15") == _millis(2026, 7, 15, 7)
+    assert _parse_date("07/15/2026") == _millis(2026, 7, 15, 7)
+    assert _parse_date("1767225600") == 1767225600 * 1000
+    assert _parse_date("15.07.2026") is None
+
+
+def test_after_and_before_conditions():
+    conditions, params, _, _ = translate_query("after:2026/01/01 before:2026/02/01")
+
+    assert conditions == ["internal_date >= ?", "internal_date < ?"]
+    assert params == [_millis(2026, 1, 1, 8), _millis(2026, 2, 1, 8)]
+
+
+def test_durations_use_calendar_months():
+    now = datetime(2026, 3, 31, 12, tzinfo=timezone.utc)
+
+    assert _duration_cutoff("2d", now) == _millis(2026, 3, 29, 12)
+    # February has no 31st
+    assert _duration_cutoff("1m", now) == _millis(2026, 2, 28, 12)
+    assert _duration_cutoff("13m", now) == _millis(2025, 2, 28, 12)
+    assert _duration_cutoff("1y", now) == _millis(2025, 3, 31, 12)
+    assert _duration_cutoff("1w", now) is None
+    assert _duration_cutoff("m", now) is None
+
+
+class _Service:
+    """Builds no real requests: the fake execute answers by operation name."""
+
+    def users(self):
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+
+def _synced_index(messages, fail=()):
+    index = EmailIndex()
+
+    def fetch_metadata(message_ids, service):
+        return [
+            {"id": message_id, "error": "HttpError 500"} if message_id in fail else messages[message_id]
+            for message_id in message_ids
+        ]
+
+    def execute(request, operation):
+        if operation == "users.getProfile":
+            return {"historyId": "100"}
+        return {"messages": [{"id": message_id} for message_id in messages]}
+
+    result = GmailSync(index, fetch_metadata, execute).sync(_Service())
+    return index, result
+
+
+def test_search_answers_from_a_complete_index():
+    messages = {f"m{i}": _message(f"m{i}", internal_date=1000 + i) for i in range(3)}
+    index, result = _synced_index(messages)
+
+    assert result == {"mode": "full", "added": 3, "failed": 0}
+    assert [email["id"] for email in index.search("in:inbox", 2)] == ["m2", "m1"]
+    # Fewer matches than requested: older ones may exist outside the window
+    assert index.search("in:inbox", 5) is None
+
+
+def test_failed_fetch_leaves_the_index_incomplete():
+    messages = {f"m{i}": _message(f"m{i}", internal_date=1000 + i) for i in range(3)}
+    index, result = _synced_index(messages, fail={"m2"})
+
+    assert result["failed"] == 1
+    assert index.history_id is None
+    assert index.search("in:inbox", 1) is None
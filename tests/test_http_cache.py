@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from benchmarks.fake_google import FakeGoogleBackend
+from gmail_calendar_automation.tools.http_cache import CachingHttp, ResponseCache, cache_url
+
+GMAIL = "https://gmail.googleapis.com/gmail/v1/users/me"
+CALENDAR = "https://www.googleapis.com/calendar/v3/calendars/primary"
+
+
+def test_cache_url_orders_parameters_and_drops_none():
+    assert cache_url(GMAIL + "/labels") == GMAIL + "/labels"
+    assert cache_url(GMAIL + "/messages", {"q": "x", "maxResults": 5, "pageToken": None}) == (
+        GMAIL + "/messages?maxResults=5&q=x"
+    )
+
+
+def test_ttl_by_path():
+    cache = ResponseCache()
+
+    assert cache.ttl(GMAIL + "/messages/abc/attachments/def") == 3600
+    assert cache.ttl(GMAIL + "/messages/abc?format=full") == 60
+    assert cache.ttl(GMAIL + "/messages?q=x") == 0
+
+
+def test_fresh_entry_is_served_and_expired_one_is_revalidated(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("gmail_calendar_automation.tools.http_cache.time.monotonic", lambda: now[0])
+    cache = ResponseCache()
+    url = GMAIL + "/messages/abc"
+    cache.store("u", url, '"v1"', {"status": "200"}, b"body")
+
+    entry, fresh = cache.lookup("u", url)
+    assert fresh and entry["content"] == b"body"
+
+    now[0] += 61
+    entry, fresh = cache.lookup("u", url)
+    assert not fresh and entry["etag"] == '"v1"'
+    cache.revalidated("u", url, entry)
+    assert cache.lookup("u", url)[1]
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["revalidated"], stats["misses"]) == (2, 1, 1)
+
+
+def test_response_without_etag_or_ttl_is_not_kept():
+    cache = ResponseCache()
+    cache.store("u", GMAIL + "/messages?q=x", None, {"status": "200"}, b"page")
+
+    assert len(cache) == 0
+
+
+def test_entries_are_per_user():
+    cache = ResponseCache()
+    url = GMAIL + "/labels"
+    cache.store("alice", url, '"v1"', {"status": "200"}, b"labels")
+
+    assert cache.lookup("bob", url) == (None, False)
+    assert cache.lookup("alice", url)[0] is not None
+
+
+def test_byte_bound_evicts_least_recently_used():
+    cache = ResponseCache(max_bytes=2600)
+    for name in ("a", "b", "c"):
+        cache.store("u", f"{GMAIL}/messages/{name}", '"v"', {"status": "200"}, b"x" * 500)
+    cache.lookup("u", GMAIL + "/messages/a")
+    cache.store("u", GMAIL + "/messages/d", '"v"', {"status": "200"}, b"x" * 500)
+
+    assert cache.stats()["bytes"] <= 2600
+    assert cache.lookup("u", GMAIL + "/messages/a")[0] is not None
+    assert cache.lookup("u", GMAIL + "/messages/b")[0] is None
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_disabled_cache_keeps_nothing():
+    cache = ResponseCache(max_bytes=0)
+    cache.store("u", GMAIL + "/labels", '"v1"', {"status": "200"}, b"labels")
+
+    assert not cache.enabled
+    assert len(cache) == 0
+
+
+def test_write_drops_that_users_entries_of_the_api_written_to():
+    cache = ResponseCache()
+    for user in ("u", "other"):
+        cache.store(user, GMAIL + "/labels", '"v1"', {"status": "200"}, b"labels")
+    cache.store("u", CALENDAR + "/events/e1", '"v1"', {"status": "200"}, b"event")
+
+    cache.wrote("u", "GET", GMAIL + "/labels")
+    assert len(cache) == 3
+    cache.wrote("u", "POST", GMAIL + "/messages/send")
+    assert cache.lookup("u", GMAIL + "/labels")[0] is None
+    assert cache.lookup("other", GMAIL + "/labels")[0] is not None
+    assert cache.lookup("u", CALENDAR + "/events/e1")[0] is not None
+
+
+def test_batch_invalidates_only_when_a_part_writes():
+    cache = ResponseCache()
+    cache.store("u", GMAIL + "/labels", '"v1"', {"status": "200"}, b"labels")
+
+    cache.wrote("u", "POST", "https://www.googleapis.com/batch/gmail/v1", b"GET /gmail/v1/users/me/labels\r\n")
+    assert len(cache) == 1
+    cache.wrote("u", "POST", "https://www.googleapis.com/batch/gmail/v1", "DELETE /gmail/v1/users/me/labels/L1\r\n")
+    assert len(cache) == 0
+
+
+class _BackendHttp:
+    """httplib2-style transport answering from a FakeGoogleBackend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        httplib2 = pytest.importorskip("httplib2")
+        target = uri.split("googleapis.com", 1)[1]
+        status, content_type, content, extra = self.backend.handle_http(method, target, headers or {}, body or b"")
+        response = httplib2.Response(dict({"status": str(status), "content-type": content_type},
+                                          **{k.lower(): v for k, v in extra.items()}))
+        return response, content
+
+
+def test_caching_http_saves_round_trips_against_fake_backend():
+    pytest.importorskip("httplib2")
+    backend = FakeGoogleBackend(messages=3, events=0)
+    http = CachingHttp(_BackendHttp(backend), ResponseCache(ttls=[(r"/profile$", 60.0)]))
+    message_id = json.loads(http.request(GMAIL + "/messages?maxResults=1")[1])["messages"][0]["id"]
+
+    for _ in range(3):
+        response, content = http.request(GMAIL + "/profile")
+        assert response.status == 200 and json.loads(content)["emailAddress"] == "me@example.com"
+    for _ in range(3):
+        response, content = http.request(f"{GMAIL}/messages/{message_id}")
+        assert response.status == 200 and json.loads(content)["id"] == message_id
+
+    # The profile is fetched once; the message (TTL 0) is revalidated with 304 answers
+    assert backend.round_trips["users.getProfile"] == 1
+    assert backend.round_trips["messages.get"] == 3
+    assert backend.not_modified == 2
@@ -0,0 +1,59 @@
+import pytest
+
+from benchmarks.bench_router import LABELLED_REQUESTS
+from gmail_calendar_automation.tools import intent
+from gmail_calendar_automation.tools.intent import IntentClassifier
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return IntentClassifier()
+
+
+def test_labelled_requests_are_never_misrouted(classifier):
+    for text, expected in LABELLED_REQUESTS:
+        predicted = classifier.classify(text)
+        assert predicted is None or predicted == expected, text
+
+
+def test_labelled_requests_hit_rate(classifier):
+    routed = sum(classifier.classify(text) is not None for text, _ in LABELLED_REQUESTS)
+    assert routed / len(LABELLED_REQUESTS) >= 0.75
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Send an email to bob@x.com saying hi", intent.SEND_EMAIL),
+    ("Can you send an email to bob@x.com?", intent.SEND_EMAIL),
+    ("Please archive all emails from the newsletter", intent.ORGANIZE_EMAIL),
+    ("Do I have any new emails?", intent.READ_EMAIL),
+    ("What's on my calendar tomorrow?", intent.MANAGE_EVENTS),
+    ("Schedule a meeting with Tom at 3pm", intent.CREATE_EVENT),
+])
+def test_clear_requests(classifier, text, expected):
+    assert classifier.classify(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    # Questions about past actions
+    "Did I send an email to bob@x.com yesterday?",
+    "Have I replied to the email from Alice",
+    "Did I delete the meeting with Tom?",
+    "Why did you archive my emails?",
+    # Negations
+    "Do not send the email to bob@x.com",
+    "Don't delete the emails from my boss",
+    "Don’t schedule a meeting on Friday",
+    "Never forward mails from HR to jane@x.com",
+    # Conditionals
+    "Send the email to bob@x.com if he confirms",
+    "Delete the meeting unless Tom accepts",
+    "Can you check whether I emailed bob@x.com",
+])
+def test_questions_negations_and_conditionals_go_to_the_llm(classifier, text):
+    assert classifier.classify(text) is None
+
+
+@pytest.mark.parametrize("text", ["", "yes", "Send the agenda of tomorrow's meeting by email",
+                                  "Import the invite from my inbox", "x " * 200])
+def test_ambiguous_requests_go_to_the_llm(classifier, text):
+    assert classifier.classify(text) is None
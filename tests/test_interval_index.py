@@ -0,0 +1,79 @@
+import random
+
+from gmail_calendar_automation.tools.interval_index import IntervalIndex
+
+
+def _keys(index, start, end):
+    return sorted(key for _, _, key in index.overlapping(start, end))
+
+
+def test_overlapping_is_half_open():
+    index = IntervalIndex()
+    index.add("a", 10, 20)
+
+    assert _keys(index, 0, 10) == []
+    assert _keys(index, 20, 30) == []
+    assert _keys(index, 19, 21) == ["a"]
+    assert _keys(index, 12, 15) == ["a"]
+    assert _keys(index, 0, 100) == ["a"]
+
+
+def test_overlapping_matches_brute_force():
+    rng = random.Random(7)
+    index = IntervalIndex()
+    intervals = {}
+    for key in range(500):
+        start = rng.uniform(0, 1000)
+        intervals[key] = (start, start + rng.uniform(1, 50))
+        index.add(key, *intervals[key])
+
+    for _ in range(200):
+        start = rng.uniform(-10, 1010)
+        end = start + rng.uniform(0.5, 100)
+        expected = sorted(key for key, (s, e) in intervals.items() if s < end and e > start)
+        assert _keys(index, start, end) == expected
+
+
+def test_add_replaces_and_remove_drops():
+    index = IntervalIndex()
+    index.add("a", 0, 10)
+    index.add("b", 5, 15)
+    assert _keys(index, 0, 20) == ["a", "b"]
+
+    index.add("a", 100, 110)
+    assert _keys(index, 0, 20) == ["b"]
+    assert _keys(index, 100, 101) == ["a"]
+
+    index.remove("b")
+    index.remove("missing")
+    assert _keys(index, 0, 20) == []
+    assert len(index) == 1
+
+
+def test_empty_interval_removes_key():
+    index = IntervalIndex()
+    index.add("a", 0, 10)
+    index.add("a", 10, 10)
+
+    assert len(index) == 0
+    assert index.overlapping(0, 100) == []
+
+
+def test_gaps():
+    index = IntervalIndex()
+    index.add("a", 10, 20)
+    index.add("b", 15, 30)
+    index.add("c", 40, 45)
+
+    assert index.gaps(0, 50) == [(0, 10), (30, 40), (45, 50)]
+    assert index.gaps(0, 50, min_length=6) == [(0, 10), (30, 40)]
+    assert index.gaps(12, 28) == []
+
+
+def test_clear():
+    index = IntervalIndex()
+    index.add("a", 0, 10)
+    index.clear()
+
+    assert len(index) == 0
+    assert index.gaps(0, 10) == [(0, 10)]
@@ -0,0 +1,71 @@
+from gmail_calendar_automation.tools.invite_pipeline import InvitePipeline
+
+
+def _ics(method, uid, summary="Review"):
+    return "\r\n".join([
+        "BEGIN:VCALENDAR",
+        f"METHOD:{method}",
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"SUMMARY:{summary}",
+        "DTSTART:20260302T090000Z",
+        "DTEND:20260302T100000Z",
+        "END:VEVENT",
+        "END:VCALENDAR",
+        "",
+    ])
+
+
+class _Gmail:
+    def __init__(self, invites):
+        self.invites = invites
+
+    def get_auth_status(self):
+        return {"valid": True}
+
+    def iter_message_ids(self, query, limit):
+        return list(self.invites)[:limit]
+
+    def get_calendar_invites(self, message_id):
+        return self.invites[message_id]
+
+
+class _Calendar:
+    def __init__(self):
+        self.created = []
+
+    def create_events(self, calendar_id, events, send_notifications):
+        self.created.extend(events)
+        return {"results": [{"success": True, "event_id": f"e{number}"} for number, _ in enumerate(events)]}
+
+
+def _run(invites):
+    calendar = _Calendar()
+    result = InvitePipeline(_Gmail(invites), calendar).import_calendar_invites()
+    return {r["message_id"]: r for r in result["results"]}, calendar
+
+
+def test_invites_are_imported():
+    results, calendar = _run({"m1": [_ics("REQUEST", "a@x")]})
+
+    assert results["m1"]["status"] == "imported"
+    assert [event["summary"] for event in calendar.created] == ["Review"]
+    assert results["m1"]["events"][0]["event_id"] == "e0"
+
+
+def test_cancel_in_later_part_drops_events_of_earlier_parts():
+    results, calendar = _run({
+        "m1": [_ics("REQUEST", "a@x", "Planning"), _ics("CANCEL", "a@x", "Planning")],
+        "m2": [_ics("REQUEST", "b@x", "Standup")],
+    })
+
+    assert results["m1"]["status"] == "needs_llm" and results["m1"]["events"] == []
+    assert results["m2"]["status"] == "imported"
+    assert [event["summary"] for event in calendar.created] == ["Standup"]
+
+
+def test_message_without_invite_needs_llm():
+    results, calendar = _run({"m1": []})
+
+    assert results["m1"]["status"] == "needs_llm"
+    assert calendar.created == []
@@ -0,0 +1,131 @@
+import pytest
+
+from gmail_calendar_automation.tools.async_client import GoogleApiError
+from gmail_calendar_automation.tools.rate_limiter import (
+    QuotaScheduler, TokenBucket, is_retryable, retry_after_seconds
+)
+from tests.batch_service import FakeBatchService, flaky
+
+
+def _scheduler(**kwargs):
+    kwargs.setdefault("base_delay", 0.001)
+    kwargs.setdefault("max_delay", 0.001)
+    return QuotaScheduler(rate=1e6, capacity=1e6, **kwargs)
+
+
+def test_costs_above_capacity_are_charged_in_full():
+    bucket = TokenBucket(rate=250, capacity=250)
+
+    # A 100-message batch costs 500 units: the 250 beyond the burst take a second
+    assert bucket.reserve(500) == pytest.approx(1.0, abs=0.01)
+    assert bucket.reserve(250) == pytest.approx(2.0, abs=0.01)
+
+
+def test_throttling_halves_the_rate_and_success_recovers_it():
+    bucket = TokenBucket(rate=100, capacity=100)
+
+    bucket.on_throttled()
+    assert bucket.rate == 50
+    bucket.on_success()
+    assert bucket.rate == 55
+
+
+@pytest.mark.parametrize("error, operation, expected", [
+    (GoogleApiError(429, "Too Many Requests"), "messages.send", True),
+    (GoogleApiError(403, "Forbidden", {"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}), "messages.send", True),
+    (GoogleApiError(403, "Forbidden", {"error": {"errors": [{"reason": "insufficientPermissions"}]}}), "messages.get", False),
+    (GoogleApiError(503, "Unavailable"), "messages.get", True),
+    (GoogleApiError(503, "Unavailable"), "messages.send", False),
+    (GoogleApiError(500, "Internal"), "events.list[recurring]", True),
+    (GoogleApiError(404, "Not Found"), "messages.get", False),
+    (TimeoutError("timed out"), "messages.get", True),
+    (ConnectionResetError("reset"), "events.list", True),
+    (TimeoutError("timed out"), "events.insert", False),
+])
+def test_is_retryable(error, operation, expected):
+    assert is_retryable(error, operation) is expected
+
+
+def test_retry_after_is_capped():
+    scheduler = _scheduler(max_delay=5)
+    error = GoogleApiError(429, "Too Many Requests", retry_after="3600")
+
+    assert retry_after_seconds(error) == 3600
+    assert scheduler._backoff_delay(0, error) == 5
+
+
+def test_call_retries_transport_errors_of_idempotent_operations():
+    scheduler = _scheduler()
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionResetError("reset by peer")
+        return "ok"
+
+    assert scheduler.call(call, "messages.get") == "ok"
+    metrics = scheduler.metrics()
+    assert metrics["retries"] == 2
+    # A dropped connection does not slow the bucket down
+    assert metrics["throttled_responses"] == 0
+    assert metrics["current_rate"] == 1e6
+
+
+def test_call_does_not_retry_timeouts_of_other_operations():
+    scheduler = _scheduler()
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        raise TimeoutError("timed out")
+
+    with pytest.raises(TimeoutError):
+        scheduler.call(call, "messages.send")
+    assert len(attempts) == 1
+
+
+def test_batch_retries_throttled_sub_requests_only():
+    scheduler = _scheduler()
+    service = FakeBatchService()
+    requests = [
+        flaky("a", []),
+        flaky("b", [GoogleApiError(429, "Too Many Requests")]),
+        flaky("c", [GoogleApiError(404, "Not Found")]),
+    ]
+
+    results = scheduler.execute_batch(service, requests, "messages.get", batch_size=2)
+
+    assert [response for response, _ in results] == ["a", "b", None]
+    assert results[2][1].status == 404
+    # Two chunks, then one retry batch for the throttled request
+    assert service.batches == [2, 1, 1]
+
+
+def test_batch_request_timeout_is_retried_for_idempotent_operations():
+    scheduler = _scheduler()
+    service = FakeBatchService(batch_failures=[TimeoutError("timed out")])
+
+    results = scheduler.execute_batch(service, [flaky("a", []), flaky("b", [])], "events.list", batch_size=10)
+
+    assert results == [("a", None), ("b", None)]
+    assert service.batches == [2, 2]
+
+
+def test_batch_request_failure_with_partial_keeps_earlier_results():
+    scheduler = _scheduler()
+    failure = TimeoutError("timed out")
+    service = FakeBatchService(batch_failures=[None, failure])
+    requests = [flaky(name, []) for name in "abc"]
+
+    results = scheduler.execute_batch(service, requests, "events.insert", batch_size=1, partial=True)
+
+    assert results == [("a", None), (None, failure), (None, failure)]
+
+
+def test_batch_request_failure_without_partial_raises():
+    scheduler = _scheduler()
+    service = FakeBatchService(batch_failures=[GoogleApiError(400, "Bad Request")])
+
+    with pytest.raises(GoogleApiError):
+        scheduler.execute_batch(service, [flaky("a", [])], "events.insert", batch_size=10)
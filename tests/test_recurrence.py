@@ -0,0 +1,190 @@
+import itertools
+from datetime import datetime, timezone
+
+import pytest
+
+from gmail_calendar_automation.tools.recurrence import (
+    Recurrence, RecurrenceError, RecurrenceRule, expand_event, expand_events
+)
+
+
+def _starts(lines, start, count=10, after=None, time_zone=None):
+    return list(itertools.islice(Recurrence(lines, start, time_zone).iter_starts(after), count))
+
+
+def _event(recurrence, start="2026-03-02T09:00:00", end="2026-03-02T10:00:00", zone="America/New_York"):
+    return {
+        "id": "abc",
+        "summary": "Standup",
+        "recurrence": recurrence,
+        "start": {"dateTime": start, "timeZone": zone},
+        "end": {"dateTime": end, "timeZone": zone},
+    }
+
+
+def test_weekly_keeps_wall_clock_time_across_dst():
+    starts = _starts(["RRULE:FREQ=WEEKLY;COUNT=3"], {"dateTime": "2026-03-01T09:00:00", "timeZone": "America/New_York"})
+
+    assert [start.hour for start in starts] == [9, 9, 9]
+    # Daylight saving time starts on 2026-03-08
+    assert [start.utcoffset().total_seconds() / 3600 for start in starts] == [-5, -4, -4]
+
+
+def test_expanded_instance_ids_follow_the_utc_offset():
+    event = _event(["RRULE:FREQ=WEEKLY;COUNT=2"], "2026-03-01T09:00:00", "2026-03-01T10:00:00")
+
+    instances = list(expand_event(event))
+
+    assert [instance["id"] for instance in instances] == ["abc_20260301T140000Z", "abc_20260308T130000Z"]
+    assert instances[1]["end"]["dateTime"] == "2026-03-08T10:00:00-04:00"
+
+
+def test_daily_keeps_occurrence_at_nonexistent_local_time_and_later_days_unshifted():
+    starts = _starts(["RRULE:FREQ=DAILY;COUNT=3"], {"dateTime": "2026-03-07T02:30:00", "timeZone": "America/New_York"})
+
+    assert [start.replace(tzinfo=None) for start in starts] == [
+        datetime(2026, 3, 7, 2, 30), datetime(2026, 3, 8, 2, 30), datetime(2026, 3, 9, 2, 30)
+    ]
+
+
+def test_bysetpos_last_weekday_of_month():
+    starts = _starts(
+        ["RRULE:FREQ=MONTHLY;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1;COUNT=4"],
+        {"dateTime": "2026-01-30T17:00:00", "timeZone": "Europe/Berlin"}
+    )
+
+    assert [start.date().isoformat() for start in starts] == ["2026-01-30", "2026-02-27", "2026-03-31", "2026-04-30"]
+
+
+def test_bysetpos_first_and_second_to_last():
+    starts = _starts(
+        ["RRULE:FREQ=MONTHLY;BYDAY=MO;BYSETPOS=1,-2;COUNT=4"],
+        {"dateTime": "2026-06-01T09:00:00", "timeZone": "UTC"}
+    )
+
+    assert [start.date().isoformat() for start in starts] == ["2026-06-01", "2026-06-22", "2026-07-06", "2026-07-20"]
+
+
+def test_exdate_with_tzid_in_another_zone():
+    # 15:00 in Berlin is the 09:00 New York occurrence of 2026-03-03
+    starts = _starts(
+        ["RRULE:FREQ=DAILY;COUNT=3", "EXDATE;TZID=Europe/Berlin:20260303T150000"],
+        {"dateTime": "2026-03-02T09:00:00", "timeZone": "America/New_York"}
+    )
+
+    assert [start.date().isoformat() for start in starts] == ["2026-03-02", "2026-03-04"]
+
+
+def test_exdate_with_tzid_not_matching_an_occurrence_is_ignored():
+    starts = _starts(
+        ["RRULE:FREQ=DAILY;COUNT=2", "EXDATE;TZID=Europe/Berlin:20260303T090000"],
+        {"dateTime": "2026-03-02T09:00:00", "timeZone": "America/New_York"}
+    )
+
+    assert len(starts) == 2
+
+
+def test_exdate_in_utc_and_as_date():
+    starts = _starts(
+        ["RRULE:FREQ=DAILY;COUNT=4", "EXDATE:20260303T140000Z", "EXDATE;VALUE=DATE:20260304"],
+        {"dateTime": "2026-03-02T09:00:00", "timeZone": "America/New_York"}
+    )
+
+    assert [start.date().isoformat() for start in starts] == ["2026-03-02", "2026-03-05"]
+
+
+def test_exdate_counts_towards_count():
+    starts = _starts(
+        ["RRULE:FREQ=WEEKLY;COUNT=3", "EXDATE;TZID=America/New_York:20260309T090000"],
+        {"dateTime": "2026-03-02T09:00:00", "timeZone": "America/New_York"}
+    )
+
+    assert [start.date().isoformat() for start in starts] == ["2026-03-02", "2026-03-16"]
+
+
+def test_count_limits_occurrences():
+    assert len(_starts(["RRULE:FREQ=DAILY;COUNT=5"], {"date": "2026-01-01"}, count=50, time_zone="UTC")) == 5
+
+
+def test_count_is_counted_from_dtstart_when_skipping_ahead():
+    after = datetime(2026, 1, 20, tzinfo=timezone.utc)
+    starts = _starts(["RRULE:FREQ=WEEKLY;COUNT=4"], {"dateTime": "2026-01-01T09:00:00Z"}, after=after)
+
+    assert [start.date().isoformat() for start in starts] == ["2026-01-22"]
+
+
+def test_until_in_utc_is_inclusive():
+    starts = _starts(
+        ["RRULE:FREQ=DAILY;UNTIL=20260305T140000Z"],
+        {"dateTime": "2026-03-02T09:00:00", "timeZone": "America/New_York"},
+        count=50
+    )
+
+    assert [start.date().isoformat() for start in starts] == ["2026-03-02", "2026-03-03", "2026-03-04", "2026-03-05"]
+
+
+def test_until_across_dst_change():
+    # 09:00 New York on 2026-03-09 is 13:00 UTC, after the change
+    starts = _starts(
+        ["RRULE:FREQ=DAILY;UNTIL=20260309T130000Z"],
+        {"dateTime": "2026-03-07T09:00:00", "timeZone": "America/New_York"},
+        count=50
+    )
+
+    assert starts[-1].date().isoformat() == "2026-03-09"
+
+
+def test_until_as_date_for_all_day_events():
+    starts = _starts(["RRULE:FREQ=WEEKLY;UNTIL=20260115"], {"date": "2026-01-01"}, count=50, time_zone="UTC")
+
+    assert [start.date().isoformat() for start in starts] == ["2026-01-01", "2026-01-08", "2026-01-15"]
+
+
+def test_count_and_until_together_stop_at_the_first_limit():
+    start = {"dateTime": "2026-03-02T09:00:00Z"}
+
+    assert len(_starts(["RRULE:FREQ=DAILY;COUNT=2;UNTIL=20260310T000000Z"], start, count=50)) == 2
+    assert len(_starts(["RRULE:FREQ=DAILY;COUNT=20;UNTIL=20260304T090000Z"], start, count=50)) == 3
+
+
+def test_malformed_rules_are_rejected():
+    for text in ("FREQ=SECONDLY", "FREQ=DAILY;COUNT=0", "FREQ=WEEKLY;BYDAY=XX", "FREQ=DAILY;WKST=ZZ"):
+        with pytest.raises(RecurrenceError):
+            RecurrenceRule(text)
+
+
+def test_moved_exception_outside_window_removes_its_occurrence():
+    master = _event(["RRULE:FREQ=DAILY;COUNT=3"], zone="UTC", start="2026-03-02T09:00:00", end="2026-03-02T10:00:00")
+    # The 2026-03-03 occurrence was moved to April: only its original start is known
+    moved = {
+        "id": "abc_20260303T090000Z",
+        "status": "confirmed",
+        "recurringEventId": "abc",
+        "originalStartTime": {"dateTime": "2026-03-03T09:00:00Z"},
+    }
+
+    events = list(expand_events([master, moved], "2026-03-01T00:00:00Z", "2026-03-10T00:00:00Z", "UTC"))
+
+    assert [event["id"] for event in events] == ["abc_20260302T090000Z", "abc_20260304T090000Z"]
+
+
+def test_cancelled_instance_and_modified_instance_in_window():
+    master = _event(["RRULE:FREQ=DAILY;COUNT=3"], zone="UTC", start="2026-03-02T09:00:00", end="2026-03-02T10:00:00")
+    cancelled = {
+        "id": "abc_20260302T090000Z",
+        "status": "cancelled",
+        "recurringEventId": "abc",
+        "originalStartTime": {"dateTime": "2026-03-02T09:00:00Z"},
+    }
+    modified = {
+        "id": "abc_20260303T090000Z",
+        "status": "confirmed",
+        "recurringEventId": "abc",
+        "originalStartTime": {"dateTime": "2026-03-03T09:00:00Z"},
+        "start": {"dateTime": "2026-03-03T11:00:00Z"},
+        "end": {"dateTime": "2026-03-03T12:00:00Z"},
+    }
+
+    events = list(expand_events([master, cancelled, modified], "2026-03-01T00:00:00Z", "2026-03-10T00:00:00Z", "UTC"))
+
+    assert [event["start"]["dateTime"] for event in events] == ["2026-03-03T11:00:00Z", "2026-03-04T09:00:00+00:00"]
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from gmail_calendar_automation.router import FAST_PATH, LLM, STICKY, FastPathRouter
+from gmail_calendar_automation.tools import intent
+
+
+class _Leaf(BaseAgent):
+    """Answers every turn with one event."""
+
+    async def _run_async_impl(self, ctx):
+        yield Event(author=self.name, invocation_id=ctx.invocation_id)
+
+
+class _LlmRouter(BaseAgent):
+    """Stands in for the LLM router: hands every turn to its first sub-agent."""
+
+    async def _run_async_impl(self, ctx):
+        async for event in self.sub_agents[0].run_async(ctx):
+            yield event
+
+
+def _router():
+    sender, reader = _Leaf(name="sender"), _Leaf(name="reader")
+    fallback = _LlmRouter(name="llm_router", sub_agents=[_LlmRouter(name="gmail_router", sub_agents=[reader, sender])])
+    return FastPathRouter(
+        name="root",
+        fallback=fallback,
+        routes={intent.SEND_EMAIL: "sender", intent.READ_EMAIL: "reader"}
+    )
+
+
+def _run(router, texts):
+    """Run one turn per text in a session, returning the authors of each turn's events."""
+    async def _turns():
+        service = InMemorySessionService()
+        session = await service.create_session(app_name="test", user_id="user")
+        authors = []
+        for number, text in enumerate(texts):
+            user_content = types.Content(role="user", parts=[types.Part(text=text)])
+            session.events.append(Event(author="user", invocation_id=f"turn-{number}", content=user_content))
+            ctx = InvocationContext(
+                session_service=service,
+                invocation_id=f"turn-{number}",
+                agent=router,
+                session=session,
+                user_content=user_content
+            )
+            events = [event async for event in router.run_async(ctx)]
+            session.events.extend(events)
+            authors.append([event.author for event in events])
+        return authors
+
+    return asyncio.run(_turns())
+
+
+def test_clear_request_takes_the_fast_path():
+    router = _router()
+
+    assert _run(router, ["Send an email to bob@x.com saying hi"]) == [["sender"]]
+    assert router.stats.snapshot()["paths"][FAST_PATH] == 1
+
+
+@pytest.mark.parametrize("text", [
+    "Did I send an email to bob@x.com yesterday?",
+    "Do not send the email to bob@x.com",
+    "Send the email to bob@x.com if he confirms",
+])
+def test_questions_negations_and_conditionals_use_the_llm_router(text):
+    router = _router()
+
+    # The stand-in LLM router picks the reader, which the fast path would not have done
+    assert _run(router, [text]) == [["reader"]]
+    snapshot = router.stats.snapshot()
+    assert snapshot["paths"][LLM] == 1
+    assert snapshot["routes"] == {"reader": 1}
+
+
+def test_follow_up_stays_with_the_previous_leaf():
+    router = _router()
+
+    assert _run(router, ["Send an email to bob@x.com saying hi", "yes"]) == [["sender"], ["sender"]]
+    assert router.stats.snapshot()["paths"][STICKY] == 1
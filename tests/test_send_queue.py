@@ -0,0 +1,153 @@
+import pytest
+
+from gmail_calendar_automation.tools.gmail_tool import GmailTool
+from gmail_calendar_automation.tools.send_queue import (
+    DONE, FAILED, PENDING, SEND, SENDING, UNKNOWN, MessageTemplate, SendQueue, idempotency_key, message_id_header
+)
+
+
+def _queue(*recipients, job_id="job"):
+    queue = SendQueue()
+    queue.enqueue(job_id, SEND, [
+        {"key": idempotency_key(job_id, to), "to": to, "subject": "Hi", "body": "Hello"} for to in recipients
+    ])
+    return queue
+
+
+def _status(queue, job_id="job"):
+    return [item["status"] for item in queue.items(job_id)]
+
+
+def test_enqueue_ignores_keys_already_queued():
+    queue = _queue("a@x.com", "b@x.com")
+
+    again = queue.enqueue("job", SEND, [{"key": idempotency_key("job", "A@x.com "), "to": "a@x.com",
+                                         "subject": "Hi", "body": "Hello"}])
+    assert again == 0
+    assert queue.counts("job")[PENDING] == 2
+
+
+def test_claim_takes_each_item_once_in_order():
+    queue = _queue("a@x.com", "b@x.com")
+
+    assert queue.claim("job")["to"] == "a@x.com"
+    assert queue.claim("job")["to"] == "b@x.com"
+    assert queue.claim("job") is None
+    assert _status(queue) == [SENDING, SENDING]
+
+
+def test_done_failed_and_retry():
+    queue = _queue("a@x.com", "b@x.com")
+    first, second = queue.claim("job"), queue.claim("job")
+
+    queue.mark_done(first["key"], "gmail-1")
+    queue.mark_failed(second["key"], "400 Bad Request")
+    assert _status(queue) == [DONE, FAILED]
+
+    assert queue.retry_failed("job") == 1
+    assert _status(queue) == [DONE, PENDING]
+
+
+def test_recently_unknown_items_are_not_in_doubt_yet():
+    queue = _queue("a@x.com")
+    item = queue.claim("job")
+    queue.mark_unknown(item["key"], "timed out")
+
+    # Gmail's search may not find a message it accepted moments ago
+    assert queue.in_doubt("job") == []
+    queue.UNKNOWN_RECHECK_AFTER = 0
+    assert queue.in_doubt("job") == [item["key"]]
+
+
+def test_items_being_sent_are_only_in_doubt_after_a_while():
+    queue = _queue("a@x.com")
+    item = queue.claim("job")
+
+    assert queue.in_doubt("job") == []
+    queue.IN_DOUBT_AFTER = 0
+    assert queue.in_doubt("job") == [item["key"]]
+
+
+def test_release_returns_an_item_to_the_queue():
+    queue = _queue("a@x.com")
+    item = queue.claim("job")
+    queue.mark_unknown(item["key"], "timed out")
+
+    queue.release(item["key"])
+    assert queue.claim("job")["key"] == item["key"]
+
+
+def test_message_id_header_is_stable_and_valid():
+    header = message_id_header("key with spaces\nand a newline")
+
+    assert header == message_id_header("key with spaces\nand a newline")
+    assert header.startswith("<") and header.endswith("@outbox.gca.local>")
+    assert "\n" not in header and " " not in header
+
+
+def test_template_fields_and_rendering():
+    template = MessageTemplate("Seat for {event}", "Hi {name}, {{literal}} braces")
+
+    assert template.fields == ["event", "name"]
+    assert template.render({"event": "Launch", "name": "Ann"}) == ("Seat for Launch", "Hi Ann, {literal} braces")
+    with pytest.raises(KeyError):
+        template.render({"event": "Launch"})
+    with pytest.raises(ValueError):
+        MessageTemplate("{name.__class__}", "")
+
+
+class _Mailbox:
+    """Answers rfc822msgid: searches for the Message-IDs Gmail has indexed."""
+
+    def __init__(self, indexed):
+        self.indexed = set(indexed)
+        self.searches = []
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, q, **kwargs):
+        self.searches.append(q)
+        message_id = q[len("rfc822msgid:"):]
+        return {"messages": [{"id": "gmail-" + message_id[:6]}]} if message_id in self.indexed else {}
+
+
+@pytest.fixture
+def gmail(monkeypatch):
+    def _gmail(mailbox, queue):
+        tool = GmailTool("credentials.json", None)
+        tool._outbox = queue
+        monkeypatch.setattr(tool, "_require_service", lambda service=None: mailbox)
+        monkeypatch.setattr(tool, "_execute", lambda request, operation: request)
+        return tool
+    return _gmail
+
+
+def test_recovery_marks_found_items_done_and_releases_the_rest(gmail):
+    queue = _queue("a@x.com", "b@x.com")
+    first, second = queue.claim("job"), queue.claim("job")
+    queue.mark_unknown(first["key"], "timed out")
+    queue.mark_unknown(second["key"], "503 Service Unavailable")
+    queue.UNKNOWN_RECHECK_AFTER = 0
+    mailbox = _Mailbox({message_id_header(first["key"])[1:-1]})
+
+    gmail(mailbox, queue)._recover_outbox("job")
+
+    assert _status(queue) == [DONE, PENDING]
+    assert len(mailbox.searches) == 2
+
+
+def test_recovery_leaves_recently_unknown_items_alone(gmail):
+    queue = _queue("a@x.com")
+    item = queue.claim("job")
+    queue.mark_unknown(item["key"], "timed out")
+    # Accepted by Gmail, but not searchable yet
+    mailbox = _Mailbox(set())
+
+    gmail(mailbox, queue)._recover_outbox("job")
+
+    assert _status(queue) == [UNKNOWN]
+    assert mailbox.searches == []
@@ -0,0 +1,60 @@
+from gmail_calendar_automation.tools.tracing import Tracer
+
+
+def _root_spans(tracer, count):
+    for _ in range(count):
+        with tracer.span("tool", tool="list_events"):
+            pass
+
+
+def _wait_for_write(tracer):
+    timer = tracer._write_timer
+    if timer is not None:
+        timer.join(5)
+
+
+def test_metrics_file_is_written_in_the_background_at_most_once_per_interval(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.prom"
+    tracer = Tracer(metrics_path=str(path), metrics_interval=60)
+    writes = []
+    write_metrics = tracer.write_metrics
+    monkeypatch.setattr(tracer, "write_metrics", lambda target: writes.append(target) or write_metrics(target))
+
+    _root_spans(tracer, 1)
+    _wait_for_write(tracer)
+    _root_spans(tracer, 50)
+
+    # The first span's write ran; the others wait for the interval to pass
+    assert len(writes) == 1
+    assert tracer._write_timer is not None
+    tracer.flush_metrics()
+    assert len(writes) == 2 and tracer._write_timer is None
+    assert 'gca_spans_total{span="tool",status="ok"} 51' in path.read_text()
+
+
+def test_child_spans_do_not_schedule_writes(tmp_path):
+    tracer = Tracer(metrics_path=str(tmp_path / "metrics.prom"), metrics_interval=60)
+    tracer.flush_metrics()
+
+    with tracer.span("tool"):
+        tracer.record("retry", operation="events.list")
+        assert tracer._write_timer is None
+    assert tracer._write_timer is not None
+    tracer.flush_metrics()
+
+
+def test_failed_write_is_counted(tmp_path):
+    tracer = Tracer(metrics_path=str(tmp_path / "missing" / "metrics.prom"), metrics_interval=0)
+
+    tracer.flush_metrics()
+
+    assert tracer.metrics()["gca_metrics_write_errors_total"] == 1
+
+
+def test_no_metrics_file_means_no_writes():
+    tracer = Tracer()
+
+    _root_spans(tracer, 3)
+
+    assert tracer._write_timer is None
+    assert tracer.metrics()['gca_spans_total{span="tool",status="ok"}'] == 3
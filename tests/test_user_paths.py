@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from gmail_calendar_automation.tools.token_store import FileTokenStore, user_path_component
+from gmail_calendar_automation.tools.user_tools import user_path
+
+
+@pytest.mark.parametrize("user_id", [".", "..", "...", "../tokens", "a/../../b", "..\\x", "/etc/passwd", "%2E%2E"])
+def test_user_paths_stay_in_their_directory(tmp_path, user_id):
+    base = str(tmp_path / "attachments")
+
+    for path in (user_path(base, user_id, per_user=True, directory=True),
+                 user_path(os.path.join(base, "{user_id}"), user_id, per_user=True)):
+        assert os.path.dirname(os.path.normpath(path)) == base
+        assert os.path.basename(path) not in ("", ".", "..")
+
+
+def test_token_paths_stay_in_their_directory(tmp_path):
+    store = FileTokenStore(str(tmp_path / "tokens" / "{user_id}"))
+
+    assert os.path.dirname(os.path.normpath(store.path_for(".."))) == str(tmp_path / "tokens")
+    assert store.path_for("..") != store.path_for(".")
+
+
+def test_distinct_ids_get_distinct_components():
+    user_ids = [".", "..", "%2E", "%2E%2E", "a.b", "a/b", "a%2Fb", "alice@example.com"]
+
+    assert len({user_path_component(user_id) for user_id in user_ids}) == len(user_ids)
+    assert user_path_component("alice@example.com") == "alice@example.com"
+
+
+def test_empty_user_id_is_rejected():
+    with pytest.raises(ValueError):
+        user_path_component("")
+    with pytest.raises(ValueError):
+        user_path("store.json", "", per_user=True)
+
+
+def test_stem_suffix_and_shared_paths():
+    assert user_path("store/index.db", "..", per_user=True) == "store/index.%2E%2E.db"
+    assert user_path("store/index.db", "..", per_user=False) == "store/index.db"
+    assert user_path(None, "alice", per_user=True) is None